@@ -0,0 +1,93 @@
+"""Time failover against the number of cloudlets in flight when the disaster hits.
+
+Uses the in-process engine (scripts/des_engine.py): cloudlets are bound
+round-robin to the four primary and two backup VMs, then every cloudlet
+running on a primary VM is cancelled and restarted on a backup VM. The
+indexed path only touches the affected cloudlets. For comparison, the
+scan path walks every submitted cloudlet and checks it against the
+received set, as a broker without an index would.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from des_engine import (BACKUP_VM, CLOUDLET_LENGTH, PRIMARY_VM, SUBMIT_TIME,  # noqa: E402
+                        TimeSharedVm, reroute)
+from run_benchmarks import parse_size  # noqa: E402
+
+DEFAULT_DEPTHS = "1000,10000,100000,1M"
+PRIMARY_VMS, BACKUP_VMS = 4, 2
+# Fraction of cloudlets already returned when the disaster hits; the scan still visits them
+RETURNED_FRACTION = 0.5
+
+def loaded_vms(depth):
+    """VMs with `depth` cloudlets still running and as many already returned"""
+    specs = [PRIMARY_VM] * PRIMARY_VMS + [BACKUP_VM] * BACKUP_VMS
+    vms = [TimeSharedVm(vm_id, mips, pes) for vm_id, (mips, pes) in enumerate(specs)]
+    total = int(depth / (1 - RETURNED_FRACTION))
+    lengths = np.full(total, float(CLOUDLET_LENGTH))
+    vm_ids = np.arange(total) % len(vms)
+    running = np.arange(total) >= total - depth
+    for vm in vms:
+        mine = np.flatnonzero((vm_ids == vm.vm_id) & running)
+        vm.submit(SUBMIT_TIME, mine, lengths[mine])
+    return vms, lengths, vm_ids, running
+
+def scan_in_flight(submitted, received, primary_vm_ids):
+    """What failover costs without an index: one pass over every submitted cloudlet"""
+    return [cloudlet_id for cloudlet_id, vm_id in submitted
+            if cloudlet_id not in received and vm_id in primary_vm_ids]
+
+def best_of(repeats, fn):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def measure(depth, repeats):
+    indexed = []
+    for _ in range(repeats):
+        vms, lengths, _, _ = loaded_vms(depth)
+        started = time.perf_counter()
+        moved, _ = reroute(1.0, vms[:PRIMARY_VMS], vms[PRIMARY_VMS:], lengths)
+        indexed.append(time.perf_counter() - started)
+
+    _, _, vm_ids, running = loaded_vms(depth)
+    submitted = list(zip(range(len(vm_ids)), vm_ids.tolist()))
+    received = set(np.flatnonzero(~running).tolist())
+    scan_s = best_of(repeats, lambda: scan_in_flight(submitted, received, set(range(PRIMARY_VMS))))
+    return {'depth': depth, 'submitted': len(submitted), 'rerouted': int(len(moved)),
+            'indexed_s': round(min(indexed), 6), 'scan_s': round(scan_s, 6)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark failover latency against queue depth")
+    parser.add_argument("--depths", default=DEFAULT_DEPTHS,
+                        help="Comma-separated numbers of in-flight cloudlets, e.g. 1000,1e5,1M")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per depth; the fastest is reported")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'in flight':>12} {'submitted':>12} {'rerouted':>10} {'indexed':>12} {'list scan':>12}")
+    for depth in [parse_size(s) for s in args.depths.split(',') if s.strip()]:
+        result = measure(depth, args.repeats)
+        results.append(result)
+        print(f"{result['depth']:>12,} {result['submitted']:>12,} {result['rerouted']:>10,} "
+              f"{result['indexed_s'] * 1000:>10.2f}ms {result['scan_s'] * 1000:>10.2f}ms")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
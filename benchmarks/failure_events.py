@@ -0,0 +1,60 @@
+"""Compare polling for failures with sampling them up front, on long horizons.
+
+Uses the in-process engine (scripts/des_engine.py). More cloudlets make a
+longer run, and with a rare failure the polling listener spends most of
+its events on checks that draw "no failure". The sampled model schedules
+one event per failure whatever the horizon. Both use the same Bernoulli
+model, so they fail with the same probability at each check.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from des_engine import simulate  # noqa: E402
+from run_benchmarks import parse_size  # noqa: E402
+
+DEFAULT_SIZES = "1000,10000,100000"
+
+def measure(n_cloudlets, failure_probability, seed, poll, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        stats = {}
+        started = time.perf_counter()
+        columns, _, transitions = simulate(n_cloudlets, seed=seed, failure_probability=failure_probability,
+                                           poll=poll, stats=stats)
+        best = min(best, time.perf_counter() - started)
+    return {'events': stats['events'], 'seconds': round(best, 6), 'failures': len(transitions),
+            'horizon': float(columns['FinishTime'].max()) if len(columns['FinishTime']) else 0.0}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark failure polling against pre-sampled failures")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated cloudlet counts, e.g. 1000,1e5")
+    parser.add_argument("--failure-probability", type=float, default=1e-4,
+                        help="Chance of a failure at each 10-second check")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the failure draw")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per size; the fastest is reported")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'cloudlets':>10} {'horizon':>12} {'polled events':>14} {'sampled events':>15} "
+          f"{'polled':>10} {'sampled':>10}")
+    for size in [parse_size(s) for s in args.sizes.split(',') if s.strip()]:
+        polled = measure(size, args.failure_probability, args.seed, True, args.repeats)
+        sampled = measure(size, args.failure_probability, args.seed, False, args.repeats)
+        results.append({'cloudlets': size, 'polled': polled, 'sampled': sampled})
+        print(f"{size:>10,} {sampled['horizon']:>12,.0f} {polled['events']:>14,} {sampled['events']:>15,} "
+              f"{polled['seconds']:>9.3f}s {sampled['seconds']:>9.3f}s")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure the run-history store as it grows to tens of thousands of runs.
+
+Fills a fresh SQLite store (scripts/run_history.py) with copies of one
+in-process engine run, cycling through the scheduling policies so the
+scenario index has several keys. At each checkpoint it reports the insert
+rate so far and how long the report's trend queries take, next to
+reloading the last --trend-runs metrics CSVs, which is what comparing runs
+took before the store.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from des_engine import run  # noqa: E402
+from run_benchmarks import parse_size  # noqa: E402
+from run_history import DEFAULT_TREND_RUNS, connect, record_run, trend  # noqa: E402
+from scheduling import POLICIES  # noqa: E402
+
+DEFAULT_CHECKPOINTS = "1000,10000,30000"
+
+def best_of(repeats, fn):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark run-history inserts and trend queries")
+    parser.add_argument("--runs", default=DEFAULT_CHECKPOINTS,
+                        help="Comma-separated store sizes to measure at, e.g. 1000,3e4")
+    parser.add_argument("--cloudlets", type=int, default=20, help="Cloudlets per stored run")
+    parser.add_argument("--trend-runs", type=int, default=DEFAULT_TREND_RUNS, help="Runs each trend compares with")
+    parser.add_argument("--repeats", type=int, default=5, help="Query repeats; the fastest is reported")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    checkpoints = sorted(parse_size(s) for s in args.runs.split(',') if s.strip())
+    df, index = run(args.cloudlets, disaster_time=20.0, failure_probability=0.0)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # The pre-store way: one metrics CSV per run, all reloaded to compare
+        csv_paths = []
+        for i in range(args.trend_runs + 1):
+            csv_paths.append(tmp / f"metrics_{i}.csv")
+            df.to_csv(csv_paths[-1], index=False)
+        csv_seconds = best_of(args.repeats, lambda: [pd.read_csv(p) for p in csv_paths])
+
+        conn = connect(tmp / 'history.sqlite')
+        stored, insert_seconds = 0, 0.0
+        print(f"{'stored runs':>12} {'rows':>12} {'runs/s':>10} {'trend':>10} {'reload CSVs':>12}")
+        for checkpoint in checkpoints:
+            started = time.perf_counter()
+            while stored < checkpoint:
+                scenario = {'scheduler': POLICIES[stored % len(POLICIES)], 'seed': stored}
+                record_run(conn, df, index, scenario=scenario)
+                stored += 1
+            insert_seconds += time.perf_counter() - started
+            latest = conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+            trend_seconds = best_of(args.repeats, lambda: trend(conn, latest, args.trend_runs))
+            result = {'runs': stored, 'rows': stored * len(df), 'runs_per_second': round(stored / insert_seconds, 1),
+                      'trend_seconds': round(trend_seconds, 6), 'csv_reload_seconds': round(csv_seconds, 6)}
+            results.append(result)
+            print(f"{stored:>12,} {result['rows']:>12,} {result['runs_per_second']:>10,.0f} "
+                  f"{trend_seconds * 1000:>8.2f}ms {csv_seconds * 1000:>10.2f}ms")
+        conn.close()
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Check pooled percentiles from quantile sketches against the exact ones.
+
+Simulates runs with the in-process engine (scripts/des_engine.py), each
+with its own seed, failure draws and cloudlet lengths, and saves each run's
+sketches (scripts/quantile_sketch.py) to a throwaway directory. At each
+checkpoint it pools the sketch files the way the report does and reports
+the merge time, its peak traced memory, the bytes on disk and the worst
+rank error of p50-p99.9 against np.quantile over every pooled value.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from des_engine import CLOUDLET_LENGTH, run  # noqa: E402
+from quantile_sketch import (METRICS, SKETCH_SUFFIX, merge_sketch_files, save_sketches,  # noqa: E402
+                            sketch_files, sketch_run)
+from run_benchmarks import parse_size  # noqa: E402
+
+DEFAULT_CHECKPOINTS = "100,1000"
+QUANTILES = np.array([0.5, 0.9, 0.95, 0.99, 0.999])
+
+def run_values(df, disaster_time):
+    finish = df['FinishTime'].to_numpy(dtype=np.float64)
+    delay = finish[finish > disaster_time] - disaster_time if disaster_time is not None else np.empty(0)
+    return {'FinishTime': finish, 'ExecutionTime': df['ExecutionTime'].to_numpy(dtype=np.float64),
+            'RecoveryDelay': delay}
+
+def worst_rank_error(digest, values):
+    ordered = np.sort(values)
+    ranks = np.searchsorted(ordered, digest.quantile(QUANTILES)) / len(ordered)
+    return float(np.abs(ranks - QUANTILES).max())
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled quantile sketches against exact percentiles")
+    parser.add_argument("--runs", default=DEFAULT_CHECKPOINTS,
+                        help="Comma-separated run counts to pool at, e.g. 100,1e3")
+    parser.add_argument("--cloudlets", type=int, default=2000, help="Cloudlets per run")
+    parser.add_argument("--failure-probability", type=float, default=0.02,
+                        help="Chance the primary fails at each check")
+    parser.add_argument("--length-spread", type=float, default=0.5,
+                        help="Vary cloudlet lengths uniformly by up to this fraction")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    checkpoints = sorted(parse_size(s) for s in args.runs.split(',') if s.strip())
+    exact = {name: [] for name in METRICS}
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        sketch_dir = Path(tmp)
+        done, sketch_seconds = 0, 0.0
+        print(f"{'runs':>8} {'values':>12} {'sketch/run':>11} {'merge':>9} {'merge peak':>11} "
+              f"{'on disk':>10} {'exact':>10} {'worst rank error':>17}")
+        for checkpoint in checkpoints:
+            while done < checkpoint:
+                rng = np.random.default_rng(done)
+                lengths = np.round(CLOUDLET_LENGTH * rng.uniform(1 - args.length_spread, 1 + args.length_spread,
+                                                                 args.cloudlets))
+                df, index = run(args.cloudlets, lengths=lengths, seed=done,
+                                failure_probability=args.failure_probability)
+                started = time.perf_counter()
+                save_sketches(sketch_run(df, index.first_disaster_time), sketch_dir / f"{done:08d}{SKETCH_SUFFIX}")
+                sketch_seconds += time.perf_counter() - started
+                for name, values in run_values(df, index.first_disaster_time).items():
+                    exact[name].append(values)
+                done += 1
+
+            paths = sketch_files(sketch_dir)
+            started = time.perf_counter()
+            pooled = merge_sketch_files(paths)
+            merge_seconds = time.perf_counter() - started
+            # Traced separately, as tracemalloc slows the merge down
+            tracemalloc.start()
+            merge_sketch_files(paths)
+            merge_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            errors = {}
+            for name, digest in pooled.digests.items():
+                values = np.concatenate(exact[name])
+                if len(values):
+                    errors[name] = worst_rank_error(digest, values)
+            values = sum(len(v) for arrays in exact.values() for v in arrays)
+            result = {'runs': done, 'values': values, 'sketch_seconds_per_run': round(sketch_seconds / done, 6),
+                      'merge_seconds': round(merge_seconds, 4), 'merge_peak_bytes': merge_peak,
+                      'sketch_bytes': sum(p.stat().st_size for p in paths), 'exact_bytes': values * 8,
+                      'worst_rank_error': {name: round(e, 6) for name, e in errors.items()}}
+            results.append(result)
+            print(f"{done:>8,} {values:>12,} {result['sketch_seconds_per_run'] * 1000:>9.2f}ms "
+                  f"{merge_seconds:>8.2f}s {merge_peak / 1e6:>9.1f}MB {result['sketch_bytes'] / 1e6:>8.1f}MB "
+                  f"{result['exact_bytes'] / 1e6:>8.1f}MB {max(errors.values()):>17.4%}")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Check that the external-asset report stays the same size as runs grow.
+
+For each size, simulates a run with the in-process engine and generates the
+report twice in fresh interpreters: with the charts inlined, and with
+--assets external. It reports the wall time, the HTML bytes (all a browser
+needs before first paint, as the CSS is inline and the images load lazily),
+the chart files and the cloudlet table pages. The benchmark fails if the
+external HTML at the largest size is more than --max-html-growth larger
+than at the smallest.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from report_startup import prepare, report_command  # noqa: E402
+from run_benchmarks import DEFAULT_RESULTS_DIR, environment, parse_size  # noqa: E402
+
+DEFAULT_SIZES = "1000,100k,1M"
+MODES = ('inline', 'external')
+
+def measure(workdir, metrics_path, mode):
+    cmd = report_command(workdir, metrics_path, '--no-cache', '--assets', mode)
+    started = time.perf_counter()
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+    result = {'wall_s': round(time.perf_counter() - started, 4), 'html_bytes': (workdir / 'index.html').stat().st_size}
+    if mode == 'external':
+        assets = workdir / 'report_assets'
+        result['chart_bytes'] = {p.name: p.stat().st_size for p in sorted(assets.iterdir()) if p.is_file()}
+        pages = [p.stat().st_size for p in (assets / 'cloudlets').glob('page-*.json')]
+        result['table_pages'] = len(pages)
+        result['largest_page_bytes'] = max(pages, default=0)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark report size against the number of cloudlets")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated cloudlet counts, e.g. 1000,1e6")
+    parser.add_argument("--max-html-growth", type=float, default=0.1,
+                        help="Allowed fractional growth of the external HTML from the smallest size to the largest")
+    parser.add_argument("--output", default=None,
+                        help="Results JSON (default: benchmarks/results/size-<timestamp>.json)")
+    args = parser.parse_args()
+
+    sizes = sorted(parse_size(s) for s in args.sizes.split(',') if s.strip())
+    results = []
+    print(f"{'cloudlets':>10} {'mode':<9} {'wall':>8} {'HTML':>10} {'charts':>10} {'pages':>7} {'largest page':>13}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            metrics_path = prepare(workdir, size)
+            for mode in MODES:
+                result = {'cloudlets': size, 'mode': mode, **measure(workdir, metrics_path, mode)}
+                results.append(result)
+                charts = sum(result.get('chart_bytes', {}).values())
+                print(f"{size:>10,} {mode:<9} {result['wall_s']:>7.2f}s {result['html_bytes'] / 1e3:>8.1f}KB "
+                      f"{charts / 1e3 if charts else 0:>8.1f}KB {result.get('table_pages', 0):>7,} "
+                      f"{result.get('largest_page_bytes', 0) / 1e3:>11.1f}KB")
+
+    report = {'environment': environment(), 'results': results}
+    if args.output is None:
+        DEFAULT_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output_path = DEFAULT_RESULTS_DIR / f"size-{datetime.now():%Y%m%d-%H%M%S}.json"
+    else:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"Results written to {output_path}")
+
+    external = [r for r in results if r['mode'] == 'external']
+    smallest, largest = external[0]['html_bytes'], external[-1]['html_bytes']
+    if largest > smallest * (1 + args.max_html_growth):
+        print(f"Regression: the external HTML grew from {smallest:,} to {largest:,} bytes")
+        sys.exit(1)
+    print(f"External HTML stayed within {args.max_html_growth:.0%}: {smallest:,} to {largest:,} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Guard the report's cold-start time, the cost that dominates parameter sweeps.
+
+Runs scripts/generate_html_report.py in fresh interpreters over a small run
+from the in-process engine and takes the fastest of --repeats wall times
+for each path through it: an HTML cache hit, a cache miss whose charts are
+cached, --no-charts, and a full render. Each path also runs once under
+-X importtime; the fast paths fail the benchmark if they import pandas or
+matplotlib. With --compare, any path slower than its baseline by more than
+--threshold fails it too.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / 'scripts'
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from columnar import columnar_path_for, write_columns  # noqa: E402
+from des_engine import run  # noqa: E402
+from generate_metrics import write_metadata  # noqa: E402
+from run_benchmarks import DEFAULT_RESULTS_DIR, environment  # noqa: E402
+
+REPORT_SCRIPT = SCRIPTS_DIR / 'generate_html_report.py'
+HEAVY_MODULES = ('pandas', 'matplotlib')
+# Paths through the report that must not load the plotting stack
+FAST_PATHS = ('cached', 'charts_cached', 'no_charts')
+
+def prepare(workdir, cloudlets):
+    """Metrics CSV, column store and metadata for one engine run"""
+    df, index = run(cloudlets)
+    metrics_path = workdir / 'results' / 'metrics.csv'
+    metrics_path.parent.mkdir(parents=True)
+    df.to_csv(metrics_path, index=False)
+    write_columns(df, columnar_path_for(metrics_path))
+    write_metadata(index, metrics_path.parent)
+    return metrics_path
+
+def report_command(workdir, metrics_path, *extra):
+    return [sys.executable, str(REPORT_SCRIPT), '--metrics', str(metrics_path), '--output', str(workdir / 'index.html'),
+            '--cache-dir', str(workdir / 'cache'), '--reports-dir', str(workdir / 'reports'),
+            '--history', str(workdir / 'history.sqlite'), '--render-workers', '1', *extra]
+
+def drop_cached_html(workdir):
+    for path in (workdir / 'cache').glob('*'):
+        if path.suffix in ('.html', '.json'):
+            path.unlink()
+
+def time_path(cmd, repeats, before=None):
+    best = float('inf')
+    for _ in range(repeats):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def heavy_imports(cmd, before=None):
+    """Top-level heavy packages the command imports, from -X importtime's report on stderr"""
+    if before is not None:
+        before()
+    completed = subprocess.run([cmd[0], '-X', 'importtime', *cmd[1:]], stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, text=True, check=True)
+    modules = {line.rsplit('|', 1)[-1].strip() for line in completed.stderr.splitlines() if '|' in line}
+    return sorted(name for name in HEAVY_MODULES if name in modules)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML report's cold-start time")
+    parser.add_argument("--cloudlets", type=int, default=20, help="Cloudlets in the reported run")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per path; the fastest is reported")
+    parser.add_argument("--output", default=None,
+                        help="Results JSON (default: benchmarks/results/startup-<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed fractional slowdown")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="Ignore slowdowns of paths faster than this, such as bare interpreter start-up")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        metrics_path = prepare(workdir, args.cloudlets)
+        # One full render fills the cache the cached paths read from
+        subprocess.run(report_command(workdir, metrics_path), stdout=subprocess.DEVNULL, check=True)
+        paths = {
+            'interpreter': ([sys.executable, '-c', 'pass'], None),
+            'cached': (report_command(workdir, metrics_path), None),
+            'charts_cached': (report_command(workdir, metrics_path), lambda: drop_cached_html(workdir)),
+            'no_charts': (report_command(workdir, metrics_path, '--no-cache', '--no-charts'), None),
+            'full': (report_command(workdir, metrics_path, '--no-cache'), None),
+        }
+        print(f"{'path':<16} {'best':>9}  heavy imports")
+        for name, (cmd, before) in paths.items():
+            seconds = time_path(cmd, args.repeats, before)
+            imported = heavy_imports(cmd, before) if name != 'interpreter' else []
+            results[name] = {'wall_s': round(seconds, 4), 'heavy_imports': imported}
+            print(f"{name:<16} {seconds:>8.3f}s  {', '.join(imported) or '-'}")
+
+    report = {'environment': environment(), 'cloudlets': args.cloudlets, 'results': results}
+    if args.output is None:
+        DEFAULT_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output_path = DEFAULT_RESULTS_DIR / f"startup-{datetime.now():%Y%m%d-%H%M%S}.json"
+    else:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"Results written to {output_path}")
+
+    failed = False
+    for name in FAST_PATHS:
+        if results[name]['heavy_imports']:
+            print(f"Regression: the {name} path imports {', '.join(results[name]['heavy_imports'])}")
+            failed = True
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))['results']
+        for name, result in results.items():
+            base = baseline.get(name)
+            if base is None or result['wall_s'] < args.min_seconds:
+                continue
+            if result['wall_s'] > base['wall_s'] * (1 + args.threshold):
+                print(f"Regression: {name} took {result['wall_s']:.3f}s against {base['wall_s']:.3f}s")
+                failed = True
+        if not failed:
+            print(f"No path slower than the baseline by more than {args.threshold:.0%}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Time the metrics and report pipeline on synthetic logs of increasing size.
+
+Each size runs in its own interpreter so peak RSS is not inherited from a
+smaller run. Results are written as JSON; --compare flags stages that got
+slower or hungrier than a stored baseline.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_DIR = BENCH_DIR.parent
+SCRIPTS_DIR = PROJECT_DIR / 'scripts'
+DEFAULT_SIZES = "20,1000,100000"
+DEFAULT_DATA_DIR = BENCH_DIR / '.data'
+DEFAULT_RESULTS_DIR = BENCH_DIR / 'results'
+# Below this many rows the RSS high-water mark is dominated by the interpreter's and
+# the allocator's fixed costs rather than the parser's
+MEMORY_BUDGET_MIN_ROWS = 1000000
+# MB of RSS extraction may add per million rows; typed arrays need about 140 at 1M
+DEFAULT_MEMORY_BUDGET_MB = 200.0
+
+def parse_size(text):
+    """Accept 20, 100000, 1e6 or 10M"""
+    text = text.strip().lower()
+    scale = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    if scale > 1:
+        text = text[:-1]
+    return int(float(text) * scale)
+
+def peak_rss_mb():
+    """Process high-water RSS; ru_maxrss is in KiB on Linux and bytes on macOS"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class StageTimer:
+    """Records wall time and the RSS high-water mark after each named stage"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def run(self, name, fn, *args, **kwargs):
+        peak_before = peak_rss_mb()
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        peak_after = peak_rss_mb()
+        self.stages[name] = {
+            'wall_s': round(time.perf_counter() - started, 6),
+            'peak_rss_mb': round(peak_after, 2),
+            # How far this stage pushed the high-water mark; 0 when it stayed under an earlier peak
+            'rss_growth_mb': round(peak_after - peak_before, 2),
+        }
+        return result
+
+def ensure_log(size, data_dir, events=False):
+    """Synthetic log (or event stream) for `size` cloudlets, generated once and reused across runs"""
+    from synthetic_log import write_synthetic_events, write_synthetic_log
+
+    if events:
+        log_path, write = data_dir / str(size) / 'results' / 'events.bin', write_synthetic_events
+    else:
+        log_path, write = data_dir / str(size) / 'logs' / 'simulation_log.txt', write_synthetic_log
+    if not log_path.exists():
+        print(f"Generating synthetic {'event stream' if events else 'log'} with {size:,} cloudlets...")
+        tmp_path = log_path.with_name(log_path.name + '.tmp')
+        write(tmp_path, size)
+        os.replace(tmp_path, log_path)
+    return log_path
+
+def run_stages(log_path, workers, render_workers):
+    """Run every pipeline stage in this process and return the timings"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import contextlib
+    import io
+    from columnar import columnar_path_for, write_columns
+    from aggregate import aggregate_metrics
+    from generate_metrics import extract_metrics_from_log
+    from report import charts, metrics, template
+
+    results_dir = log_path.parent.parent / 'results'
+    results_dir.mkdir(parents=True, exist_ok=True)
+    metrics_path = results_dir / 'metrics.csv'
+    html_path = results_dir / 'index.html'
+    perf_path = results_dir / 'performance_metrics.png'
+    vm_path = results_dir / 'vm_utilization.png'
+    timer = StageTimer()
+
+    # The scripts report progress with print(); keep it out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = timer.run('metrics.extract', extract_metrics_from_log, log_path, workers=workers)
+        timer.run('metrics.write_csv', df.to_csv, metrics_path, index=False)
+        timer.run('metrics.write_columnar', write_columns, df, columnar_path_for(metrics_path))
+        del df
+
+        df = timer.run('report.load_metrics', metrics.load_metrics, metrics_path)
+        disaster_time = metrics.read_disaster_time(results_dir / 'metadata.csv')
+        # Importing matplotlib is what charts.load_figures spends its time on
+        timer.run('report.init_render_worker', charts.load_figures)
+        stats = timer.run('report.aggregate', aggregate_metrics, df)
+        rendered = timer.run('report.render_charts', charts.render_charts, df, stats, disaster_time,
+                             None, workers=render_workers)
+        perf_path.write_bytes(rendered['performance_metrics.png'][1])
+        vm_path.write_bytes(rendered['vm_utilization.png'][1])
+        images = timer.run('report.encode_images',
+                           lambda: (template.get_image_base64(perf_path), template.get_image_base64(vm_path)))
+        html = timer.run('report.render_html', template.render_html, stats, disaster_time, *images, 'metrics.csv')
+        timer.run('report.write_html', html_path.write_text, html, encoding='utf-8')
+
+    return {'rows': len(df), 'stages': timer.stages}
+
+def run_size(size, args):
+    """Benchmark one size in a fresh interpreter and return its result record"""
+    log_path = ensure_log(size, Path(args.data_dir), args.events)
+    result_path = log_path.parent.parent / 'benchmark.json'
+    cmd = [sys.executable, str(Path(__file__).resolve()), '--worker', str(log_path),
+           '--result', str(result_path), '--workers', str(args.workers),
+           '--render-workers', str(args.render_workers)]
+    started = time.perf_counter()
+    completed = subprocess.run(cmd)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark for {size:,} cloudlets failed with exit code {completed.returncode}")
+    record = json.loads(result_path.read_text(encoding='utf-8'))
+    record.update(size=size, input='events' if args.events else 'log', log_bytes=log_path.stat().st_size,
+                  total_wall_s=round(time.perf_counter() - started, 6),
+                  peak_rss_mb=max(stage['peak_rss_mb'] for stage in record['stages'].values()))
+    return record
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+def compare(current, baseline, threshold, min_seconds):
+    """Stages that regressed by more than `threshold` (fractional) against the baseline"""
+    base_by_size = {(record['size'], record.get('input', 'log')): record for record in baseline['results']}
+    regressions = []
+    for record in current['results']:
+        base = base_by_size.get((record['size'], record['input']))
+        if base is None:
+            print(f"No baseline for {record['size']:,} cloudlets; skipping")
+            continue
+        for stage, timing in record['stages'].items():
+            base_timing = base['stages'].get(stage)
+            if base_timing is None:
+                continue
+            # Sub-noise stages are reported but never fail the comparison on wall time
+            if timing['wall_s'] >= min_seconds and timing['wall_s'] > base_timing['wall_s'] * (1 + threshold):
+                regressions.append((record['size'], stage, 'wall_s', base_timing['wall_s'], timing['wall_s']))
+        if record['peak_rss_mb'] > base['peak_rss_mb'] * (1 + threshold):
+            regressions.append((record['size'], 'total', 'peak_rss_mb', base['peak_rss_mb'], record['peak_rss_mb']))
+    return regressions
+
+def extract_mb_per_million(record):
+    """RSS the metrics extraction added, scaled to one million cloudlets"""
+    growth = record['stages']['metrics.extract']['rss_growth_mb']
+    return growth * 1e6 / record['size'] if record['size'] else 0.0
+
+def traced_extraction_mb_per_million(log_path, workers=1):
+    """Peak memory allocated while extracting metrics from `log_path`, per million rows, traced by tracemalloc.
+
+    Unlike RSS growth this counts only the parser's own allocations, so it
+    scales with the rows even for small logs. Tracing slows the parser
+    several times over, which is why the timed stages do not use it.
+    """
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import contextlib
+    import io
+    import tracemalloc
+    from generate_metrics import extract_metrics_from_log
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = extract_metrics_from_log(log_path, workers=workers, sketches=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024) * 1e6 / len(df) if len(df) else 0.0
+
+def check_memory_budget(report, budget_mb):
+    """Sizes whose extraction grew RSS by more than `budget_mb` per million rows"""
+    return [(record['size'], extract_mb_per_million(record)) for record in report['results']
+            if record['size'] >= MEMORY_BUDGET_MIN_ROWS and extract_mb_per_million(record) > budget_mb]
+
+def print_summary(report):
+    for record in report['results']:
+        print(f"\n{record['size']:,} cloudlets ({record['log_bytes'] / 1e6:.1f} MB log): "
+              f"{record['total_wall_s']:.2f}s, peak RSS {record['peak_rss_mb']:.1f} MB")
+        for stage, timing in record['stages'].items():
+            print(f"  {stage:<28} {timing['wall_s']:>10.4f}s {timing['peak_rss_mb']:>10.1f} MB")
+        if record['size'] >= MEMORY_BUDGET_MIN_ROWS:
+            print(f"  extraction memory: {extract_mb_per_million(record):.1f} MB per million cloudlets")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metrics extraction and report generation")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="Comma-separated cloudlet counts, e.g. 20,1e5,1M,10M")
+    parser.add_argument("--workers", type=int, default=1, help="Parser workers passed to extract_metrics_from_log")
+    parser.add_argument("--render-workers", type=int, default=1, help="Processes used to render chart figures")
+    parser.add_argument("--events", action="store_true",
+                        help="Benchmark the binary event stream reader instead of the text log parser")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR), help="Where synthetic logs are generated and kept")
+    parser.add_argument("--output", default=None, help="Results JSON (default: benchmarks/results/bench-<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed fractional slowdown or RSS growth")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="Ignore wall-time regressions in stages faster than this")
+    parser.add_argument("--memory-budget-mb", type=float, default=DEFAULT_MEMORY_BUDGET_MB,
+                        help="Fail if metric extraction grows RSS by more than this many MB per million "
+                             f"cloudlets (checked for sizes of at least {MEMORY_BUDGET_MIN_ROWS:,}; 0 disables; "
+                             f"default {DEFAULT_MEMORY_BUDGET_MB:g})")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--result", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        record = run_stages(Path(args.worker), args.workers, args.render_workers)
+        Path(args.result).write_text(json.dumps(record), encoding='utf-8')
+        return
+
+    report = {'environment': environment(), 'results': []}
+    for size in [parse_size(s) for s in args.sizes.split(',') if s.strip()]:
+        report['results'].append(run_size(size, args))
+    print_summary(report)
+
+    if args.output is None:
+        DEFAULT_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output_path = DEFAULT_RESULTS_DIR / f"bench-{datetime.now():%Y%m%d-%H%M%S}.json"
+    else:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nResults written to {output_path}")
+
+    failed = False
+    if args.memory_budget_mb > 0:
+        over_budget = check_memory_budget(report, args.memory_budget_mb)
+        for size, mb_per_million in over_budget:
+            print(f"Over memory budget: {size:,} cloudlets used {mb_per_million:.1f} MB per million "
+                  f"(budget {args.memory_budget_mb:.1f} MB)")
+        failed = bool(over_budget)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(report, baseline, args.threshold, args.min_seconds)
+        if not regressions:
+            print(f"No regressions against {args.compare} (threshold {args.threshold:.0%})")
+        else:
+            print(f"Regressions against {args.compare} (threshold {args.threshold:.0%}):")
+            for size, stage, metric, before, after in regressions:
+                print(f"  {size:,} cloudlets  {stage:<28} {metric}: {before} -> {after}")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
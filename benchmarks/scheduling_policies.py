@@ -0,0 +1,83 @@
+"""Compare the broker's cloudlet scheduling policies on makespan and average completion time.
+
+Uses the in-process engine (scripts/des_engine.py), which binds and
+re-plans cloudlets exactly as DisasterAwareBroker does with each
+--scheduler policy. By default no disaster happens. --disaster-at takes
+a fraction of the round-robin makespan and forces the disaster at that
+point, so the re-plan onto the backup VMs is measured too. --length-spread
+varies cloudlet lengths around the usual 10000 MI.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'scripts'))
+
+from des_engine import CLOUDLET_LENGTH, run  # noqa: E402
+from run_benchmarks import parse_size  # noqa: E402
+from scheduling import POLICIES  # noqa: E402
+
+DEFAULT_SIZES = "20,1000,10000,100000"
+
+def cloudlet_lengths(n, spread, seed):
+    if spread <= 0:
+        return np.full(n, float(CLOUDLET_LENGTH))
+    rng = np.random.default_rng(seed)
+    return np.round(CLOUDLET_LENGTH * rng.uniform(1 - spread, 1 + spread, n))
+
+def measure(n, policy, lengths, disaster_time):
+    started = time.perf_counter()
+    df, _ = run(n, lengths=lengths, scheduler=policy, disaster_time=disaster_time, failure_probability=0.0)
+    elapsed = time.perf_counter() - started
+    return {'policy': policy, 'cloudlets': n, 'makespan': float(df['FinishTime'].max()),
+            'mean_completion': float(df['FinishTime'].mean()), 'seconds': round(elapsed, 6)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cloudlet scheduling policies")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated cloudlet counts, e.g. 20,1e5")
+    parser.add_argument("--policies", default=','.join(POLICIES), help="Comma-separated policies to compare")
+    parser.add_argument("--disaster-at", type=float, default=None,
+                        help="Force the disaster at this fraction of the round-robin makespan, e.g. 0.3")
+    parser.add_argument("--length-spread", type=float, default=0.0,
+                        help="Vary cloudlet lengths uniformly by up to this fraction, e.g. 0.5")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the cloudlet lengths")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    policies = [p.strip() for p in args.policies.split(',') if p.strip()]
+    unknown = [p for p in policies if p not in POLICIES]
+    if unknown or not 0.0 <= args.length_spread < 1.0:
+        print(f"Error: policies must be among {', '.join(POLICIES)} and --length-spread in [0, 1)")
+        sys.exit(1)
+
+    results = []
+    # Makespans are compared with the first policy listed
+    print(f"{'cloudlets':>10} {'policy':>14} {'makespan':>12} {'mean completion':>16} "
+          f"{'vs ' + policies[0]:>17} {'sim time':>10}")
+    for n in [parse_size(s) for s in args.sizes.split(',') if s.strip()]:
+        lengths = cloudlet_lengths(n, args.length_spread, args.seed)
+        disaster_time = None
+        if args.disaster_at is not None:
+            baseline, _ = run(n, lengths=lengths, failure_probability=0.0)
+            disaster_time = float(baseline['FinishTime'].max()) * args.disaster_at
+        reference = None
+        for policy in policies:
+            result = measure(n, policy, lengths, disaster_time)
+            results.append(result)
+            reference = reference or result
+            change = result['makespan'] / reference['makespan'] - 1
+            print(f"{n:>10,} {policy:>14} {result['makespan']:>12,.2f} {result['mean_completion']:>16,.2f} "
+                  f"{change:>+17.1%} {result['seconds']:>9.3f}s")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
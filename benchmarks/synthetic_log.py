@@ -0,0 +1,152 @@
+"""Synthetic CloudSim logs in the exact format DisasterRecoverySimulation writes.
+
+The generated run mirrors the checked-in results/simulation_log.txt at any
+scale: four primary VMs (1000 MIPS, 2 PEs) and two backup VMs (500 MIPS,
+1 PE) hosted in datacenter #3, cloudlets of 10000 MI bound round-robin, a
+time-shared scheduler, one DISASTER! line and the CLOUDLET DETAILS table.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+CLOUDLET_LENGTH = 10000
+DATACENTER_ID = 3
+VM_SPECS = [(1000, 2)] * 4 + [(500, 1)] * 2  # (MIPS, PEs) as in DatacenterFactory.createVms
+START_TIME = 0.1
+WRITE_BATCH = 200000
+
+def decimal_format(values):
+    """Java DecimalFormat("###.##") for an array: two decimals at most, no trailing zeros"""
+    return [f"{v:.2f}".rstrip('0').rstrip('.') for v in values]
+
+def simulate(n_cloudlets):
+    """Finish times of a time-shared run where every cloudlet has the same length"""
+    vm_ids = np.arange(n_cloudlets) % len(VM_SPECS)
+    per_vm = np.bincount(vm_ids, minlength=len(VM_SPECS))
+    mips = np.array([m for m, _ in VM_SPECS], dtype=np.float64)
+    pes = np.array([p for _, p in VM_SPECS], dtype=np.float64)
+    # Every cloudlet on a VM shares its capacity, so they all finish together
+    exec_per_vm = CLOUDLET_LENGTH * np.maximum(per_vm, pes) / (mips * pes)
+    exec_time = exec_per_vm[vm_ids]
+    return vm_ids, exec_time, START_TIME + exec_time
+
+def write_synthetic_log(path, n_cloudlets, disaster_time=20.0):
+    """Write a synthetic simulation log with `n_cloudlets` cloudlets to `path`"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    vm_ids, exec_time, finish_time = simulate(n_cloudlets)
+    # The broker receives cloudlets in order of completion, VM by VM
+    order = np.lexsort((np.arange(n_cloudlets), vm_ids, finish_time))
+    received_at = np.round(finish_time - 0.0005, 4)
+
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("Initialising...\nInitialising...\nStarting CloudSim version 3.0\n"
+                "Broker_0 is starting...\nPrimaryDC is starting...\nBackupDC is starting...\n"
+                "Entities started.\n0.0: Broker_0: Cloud Resource List received with 2 resource(s)\n")
+        for vm in range(len(VM_SPECS)):
+            f.write(f"0.0: Broker_0: Trying to Create VM #{vm} in PrimaryDC\n")
+        for vm in range(len(VM_SPECS)):
+            f.write(f"0.1: Broker_0: VM #{vm} has been created in Datacenter #{DATACENTER_ID}, Host #{vm % 2}\n")
+
+        for lo in range(0, n_cloudlets, WRITE_BATCH):
+            hi = min(lo + WRITE_BATCH, n_cloudlets)
+            f.write(''.join(f"0.1: Broker_0: Sending cloudlet {i} to VM #{vm}\n"
+                            for i, vm in zip(range(lo, hi), vm_ids[lo:hi].tolist())))
+
+        disaster_written = False
+        for lo in range(0, n_cloudlets, WRITE_BATCH):
+            batch = order[lo:lo + WRITE_BATCH]
+            lines = []
+            for i, t in zip(batch.tolist(), received_at[batch].tolist()):
+                if not disaster_written and t > disaster_time:
+                    lines.append(f"DISASTER! Primary datacenter failure at time: {disaster_time}\n"
+                                 "Rerouted 0 cloudlets to backup datacenter.\n")
+                    disaster_written = True
+                lines.append(f"{t!r}: Broker_0: Cloudlet {i} received\n")
+            f.write(''.join(lines))
+        if not disaster_written:
+            f.write(f"DISASTER! Primary datacenter failure at time: {disaster_time}\n"
+                    "Rerouted 0 cloudlets to backup datacenter.\n")
+
+        end = float(received_at.max()) if n_cloudlets else 0.0
+        f.write(f"{end!r}: Broker_0: All Cloudlets executed. Finishing...\n")
+        for vm in range(len(VM_SPECS)):
+            f.write(f"{end!r}: Broker_0: Destroying VM #{vm}\n")
+        f.write("Broker_0 is shutting down...\nSimulation: No more future events\n"
+                "CloudInformationService: Notify all CloudSim entities for shutting down.\n"
+                "Broker_0 is shutting down...\nPrimaryDC is shutting down...\nBackupDC is shutting down...\n"
+                "Simulation completed.\nSimulation completed.\n\n")
+
+        avg_exec = float(exec_time.mean()) if n_cloudlets else 0.0
+        f.write("========== SIMULATION RESULTS ==========\n"
+                f"Number of Cloudlets: {n_cloudlets}\n"
+                "===== PERFORMANCE METRICS =====\n"
+                "avgWaitTime: 0\n"
+                f"avgExecutionTime: {decimal_format([avg_exec])[0]}\n"
+                "===== FAILOVER INFORMATION =====\n"
+                f"    Failure occurred at time: {decimal_format([disaster_time])[0]}\n"
+                "===== CLOUDLET DETAILS =====\n"
+                "\tID\tSTATUS\tDC\tVM\tTime\tStart Time\tFinish Time\n")
+        start_text = decimal_format([START_TIME])[0]
+        for lo in range(0, n_cloudlets, WRITE_BATCH):
+            batch = order[lo:lo + WRITE_BATCH]
+            exec_text = decimal_format(exec_time[batch])
+            finish_text = decimal_format(finish_time[batch])
+            f.write(''.join(f"\t{i}\tSuccess\t{DATACENTER_ID}\t{vm}\t{e}\t{start_text}\t{t}\n"
+                            for i, vm, e, t in zip(batch.tolist(), vm_ids[batch].tolist(), exec_text, finish_text)))
+        f.write("Metrics saved to results/metrics.csv\nSimulation finished!\n")
+    return path
+
+def write_synthetic_events(path, n_cloudlets, disaster_time=20.0):
+    """Write the binary event stream EventStreamWriter produces for the same synthetic run"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+    from event_stream import KIND_CODES, RECORD, write_events
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    vm_ids, exec_time, finish_time = simulate(n_cloudlets)
+    order = np.lexsort((np.arange(n_cloudlets), vm_ids, finish_time))
+    vms = np.arange(len(VM_SPECS))
+
+    def block(kind, count, time, ids=-1, vm=-1, aux=-1):
+        records = np.zeros(count, dtype=RECORD)
+        records['kind'], records['time'] = KIND_CODES[kind], time
+        records['id'], records['vm'], records['aux'] = ids, vm, aux
+        return records
+
+    # Receipts arrive in completion order; the disaster lands between them at its time
+    receipts = block('receipt', n_cloudlets, finish_time[order], order, vm_ids[order])
+    split = int(np.searchsorted(receipts['time'], disaster_time, side='right'))
+    cloudlets = block('cloudlet', n_cloudlets, finish_time[order], order, vm_ids[order], DATACENTER_ID)
+    cloudlets['status'] = 4  # Cloudlet.SUCCESS
+    cloudlets['exec'] = exec_time[order]
+    cloudlets['start'] = START_TIME
+    cloudlets['finish'] = finish_time[order]
+
+    records = np.concatenate([
+        block('vm_created', len(vms), START_TIME, vm=vms, aux=DATACENTER_ID),
+        block('submit', n_cloudlets, START_TIME, np.arange(n_cloudlets), vm_ids),
+        receipts[:split],
+        block('disaster', 1, disaster_time),
+        block('reroute_summary', 1, disaster_time, aux=0),
+        receipts[split:],
+        cloudlets,
+    ])
+    return write_events(path, records)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic CloudSim disaster recovery log")
+    parser.add_argument("--cloudlets", type=int, default=20, help="Number of cloudlets")
+    parser.add_argument("--disaster-time", type=float, default=20.0, help="Time of the DISASTER! event")
+    parser.add_argument("--output", required=True, help="Path of the log to write")
+    parser.add_argument("--events", action="store_true",
+                        help="Write the binary event stream instead of the text log")
+    args = parser.parse_args()
+    write = write_synthetic_events if args.events else write_synthetic_log
+    path = write(args.output, args.cloudlets, args.disaster_time)
+    print(f"Wrote {args.cloudlets} cloudlets to {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import numpy as np
+
+# VMs 0-3 live in the primary datacenter, 4+ in the backup (see DatacenterFactory.createVms)
+PRIMARY_VM_COUNT = 4
+PERCENTILES = (50, 95, 99)
+
+def _column(df, name, dtype):
+    """A column as a NumPy array; `df` is a DataFrame or a report.metrics.MetricsTable"""
+    if name not in df.columns:
+        return None
+    return np.asarray(df[name], dtype=dtype)
+
+def affected_mask(df):
+    """Boolean AffectedByFailover without materialising strings for categorical columns"""
+    if 'AffectedByFailover' not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    column = df['AffectedByFailover']
+    if hasattr(column, 'cat'):
+        categories = list(column.cat.categories)
+        if 'Yes' not in categories:
+            return np.zeros(len(df), dtype=bool)
+        return column.cat.codes.to_numpy() == categories.index('Yes')
+    column = np.asarray(column)
+    if column.dtype == bool:
+        return column
+    return column == 'Yes'
+
+def _group_codes(keys):
+    """Small non-negative integer keys index bincount directly; anything else goes through unique"""
+    if len(keys) and keys.min() >= 0 and keys.max() < (1 << 20):
+        return keys, None
+    labels, codes = np.unique(keys, return_inverse=True)
+    return codes, labels
+
+def _grouped(keys, columns):
+    """Per-key count and sums of each column, dropping keys that never occur"""
+    codes, labels = _group_codes(keys)
+    counts = np.bincount(codes)
+    sums = {name: np.bincount(codes, weights=values, minlength=len(counts)) for name, values in columns.items()}
+    present = np.nonzero(counts)[0]
+    ids = present if labels is None else labels[present]
+    counts = counts[present]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = {name: total[present] / counts for name, total in sums.items()}
+    return {'ids': ids, 'counts': counts, 'means': means}
+
+def aggregate_metrics(df):
+    """All report statistics from one vectorised pass over the metrics columns.
+
+    Per-VM, per-datacenter and affected/unaffected groups are computed with
+    bincount over the same arrays, and the completion-time percentiles with
+    a single partition.
+    """
+    n = len(df)
+    exec_time = _column(df, 'ExecutionTime', np.float64)
+    wait_time = _column(df, 'WaitTime', np.float64)
+    finish_time = _column(df, 'FinishTime', np.float64)
+    vm_ids = _column(df, 'VMId', np.int64)
+    dc_ids = _column(df, 'DatacenterID', np.int64)
+    affected = affected_mask(df)
+
+    timed = {}
+    if exec_time is not None:
+        timed['ExecutionTime'] = exec_time
+    if wait_time is not None:
+        timed['WaitTime'] = wait_time
+
+    # Affected (1) vs unaffected (0), in one bincount per column
+    flag = affected.astype(np.intp)
+    flag_counts = np.bincount(flag, minlength=2)
+    flag_exec = np.bincount(flag, weights=exec_time, minlength=2) if exec_time is not None else np.zeros(2)
+    affected_tasks = int(flag_counts[1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_exec_time = flag_exec.sum() / n if exec_time is not None and n else 0
+        avg_wait_time = wait_time.sum() / n if wait_time is not None and n else 0
+        group_exec = flag_exec / flag_counts
+
+    # Calculate failover impact if applicable
+    if affected_tasks > 0 and exec_time is not None:
+        avg_affected = group_exec[1]
+        avg_unaffected = group_exec[0]
+        impact_ratio = avg_affected / avg_unaffected if avg_unaffected > 0 else 0
+    else:
+        avg_affected = 0
+        avg_unaffected = avg_exec_time
+        impact_ratio = 0
+
+    if finish_time is not None and n:
+        finish_percentiles = dict(zip(PERCENTILES, np.percentile(finish_time, PERCENTILES)))
+    else:
+        finish_percentiles = {p: 0.0 for p in PERCENTILES}
+
+    return {
+        'total_tasks': n,
+        'affected_tasks': affected_tasks,
+        'affected_percentage': affected_tasks / n * 100 if n > 0 else 0,
+        'avg_exec_time': avg_exec_time,
+        'avg_wait_time': avg_wait_time,
+        'avg_affected': avg_affected,
+        'avg_unaffected': avg_unaffected,
+        'impact_ratio': impact_ratio,
+        'finish_percentiles': finish_percentiles,
+        'makespan': float(finish_time.max()) if finish_time is not None and n else 0.0,
+        'per_vm': _grouped(vm_ids, timed) if vm_ids is not None else None,
+        'per_datacenter': _grouped(dc_ids, timed) if dc_ids is not None else None,
+    }
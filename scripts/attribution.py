@@ -0,0 +1,161 @@
+import re
+from array import array
+
+import numpy as np
+
+# Event kinds recorded per cloudlet
+EVENT_REROUTE = 0
+EVENT_MIGRATION = 1
+EVENT_RECEIPT = 2
+EVENT_NAMES = {EVENT_REROUTE: 'reroute', EVENT_MIGRATION: 'migration', EVENT_RECEIPT: 'receipt'}
+
+DISASTER_PATTERN = re.compile(r"DISASTER!.*time:\s*(\d+(?:\.\d+)?)")
+RECOVERY_PATTERN = re.compile(r"RECOVERY!.*time:\s*(\d+(?:\.\d+)?)")
+# FailoverManager.describe: "Primary datacenter" for the primary, "Datacenter <name>" for other domains
+DOMAIN_PATTERN = re.compile(r"(?:DISASTER|RECOVERY)! Datacenter (\S+)")
+PRIMARY_DOMAIN = 'PrimaryDC'
+REROUTE_PATTERN = re.compile(r"Cloudlet (\d+)\b.*\brerouted", re.IGNORECASE)
+MIGRATION_PATTERN = re.compile(r"Cloudlet (\d+)\b.*\bmigrated", re.IGNORECASE)
+RECEIPT_PATTERN = re.compile(r"Cloudlet (\d+) received")
+CLOCK_PATTERN = re.compile(r"^(\d+(?:\.\d+)?(?:[eE][-+]?\d+)?): ")
+
+def match_event(line):
+    """Classify a log line as a per-cloudlet event.
+
+    Returns (kind, cloudlet_id, time) or None. The time is the simulation
+    clock prefix of the line, or NaN when the line has none.
+    """
+    if 'loudlet' not in line:
+        return None
+    if ' received' in line:
+        match, kind = RECEIPT_PATTERN.search(line), EVENT_RECEIPT
+    else:
+        match, kind = REROUTE_PATTERN.search(line), EVENT_REROUTE
+        if match is None:
+            match, kind = MIGRATION_PATTERN.search(line), EVENT_MIGRATION
+    if match is None:
+        return None
+    clock = CLOCK_PATTERN.match(line)
+    return kind, int(match.group(1)), float(clock.group(1)) if clock else float('nan')
+
+def match_disaster(line):
+    """Return ('start'|'end', time, domain) for DISASTER!/RECOVERY! lines, otherwise None"""
+    if 'DISASTER!' in line:
+        match, kind = DISASTER_PATTERN.search(line), 'start'
+    elif 'RECOVERY!' in line:
+        match, kind = RECOVERY_PATTERN.search(line), 'end'
+    else:
+        return None
+    if match is None:
+        return None
+    domain = DOMAIN_PATTERN.search(line)
+    return kind, float(match.group(1)), domain.group(1) if domain else PRIMARY_DOMAIN
+
+class EventLog:
+    """Growable typed columns of per-cloudlet events"""
+
+    def __init__(self):
+        self.ids = array('i')
+        self.kinds = array('b')
+        self.times = array('d')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, kind, cloudlet_id, time):
+        self.ids.append(cloudlet_id)
+        self.kinds.append(kind)
+        self.times.append(time)
+
+    def extend(self, other):
+        self.ids.extend(other.ids)
+        self.kinds.extend(other.kinds)
+        self.times.extend(other.times)
+
+def disaster_intervals(transitions):
+    """Turn ordered ('start'|'end', time, domain) transitions into merged, sorted interval arrays.
+
+    An interval opens when the first failure domain goes down and closes
+    when none is down any more; a domain's RECOVERY! only ends its own
+    DISASTER!. An interval with no recovery stays open until the end of the run.
+    """
+    starts, ends = [], []
+    down = set()
+    open_start = None
+    for kind, time, domain in transitions:
+        if kind == 'start':
+            if not down:
+                open_start = time
+            down.add(domain)
+        elif domain in down:
+            down.discard(domain)
+            if not down:
+                starts.append(open_start)
+                ends.append(max(time, open_start))
+    if down:
+        starts.append(open_start)
+        ends.append(np.inf)
+
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order], ends[order]
+
+    # Merge overlaps so the ends are sorted as well
+    merged_starts, merged_ends = [], []
+    for start, end in zip(starts, ends):
+        if merged_ends and start <= merged_ends[-1]:
+            merged_ends[-1] = max(merged_ends[-1], end)
+        else:
+            merged_starts.append(start)
+            merged_ends.append(end)
+    return np.asarray(merged_starts, dtype=np.float64), np.asarray(merged_ends, dtype=np.float64)
+
+class FailoverIndex:
+    """Per-log index of cloudlet events and disaster intervals used for failover attribution"""
+
+    def __init__(self, events, transitions):
+        ids = np.frombuffer(events.ids, dtype=np.int32) if len(events) else np.empty(0, dtype=np.int32)
+        kinds = np.frombuffer(events.kinds, dtype=np.int8) if len(events) else np.empty(0, dtype=np.int8)
+        times = np.frombuffer(events.times, dtype=np.float64) if len(events) else np.empty(0)
+
+        # Sort events by cloudlet ID once so lookups are a binary search
+        order = np.argsort(ids, kind='stable')
+        self.event_ids = ids[order]
+        self.event_kinds = kinds[order]
+        self.event_times = times[order]
+
+        moved = self.event_kinds != EVENT_RECEIPT
+        self.moved_ids = np.unique(self.event_ids[moved])
+        self.disaster_starts, self.disaster_ends = disaster_intervals(transitions)
+
+    @property
+    def first_disaster_time(self):
+        return float(self.disaster_starts[0]) if len(self.disaster_starts) else None
+
+    def events_for(self, cloudlet_id):
+        """All (kind name, time) events recorded for one cloudlet, in log order"""
+        lo = np.searchsorted(self.event_ids, cloudlet_id, side='left')
+        hi = np.searchsorted(self.event_ids, cloudlet_id, side='right')
+        return [(EVENT_NAMES[int(k)], float(t))
+                for k, t in zip(self.event_kinds[lo:hi], self.event_times[lo:hi])]
+
+    def classify(self, cloudlet_ids, start_times, finish_times):
+        """Boolean mask of cloudlets affected by failover.
+
+        A cloudlet is affected if the log records it being rerouted or
+        migrated, or if its [start, finish] window overlaps a disaster
+        interval.
+        """
+        cloudlet_ids = np.asarray(cloudlet_ids)
+        start_times = np.asarray(start_times, dtype=np.float64)
+        finish_times = np.asarray(finish_times, dtype=np.float64)
+
+        affected = np.isin(cloudlet_ids, self.moved_ids)
+        if len(self.disaster_starts):
+            # Last disaster that started before each cloudlet finished; merged
+            # intervals have sorted ends, so it is the only one worth checking
+            last = np.searchsorted(self.disaster_starts, finish_times, side='left') - 1
+            valid = last >= 0
+            affected[valid] |= self.disaster_ends[last[valid]] > start_times[valid]
+        return affected
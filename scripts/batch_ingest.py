@@ -0,0 +1,152 @@
+import glob
+import hashlib
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from columnar import write_columns
+from generate_metrics import parse_log
+from quantile_sketch import SKETCH_DIR, SKETCH_SUFFIX, save_sketches, sketch_run
+
+LOG_SUFFIXES = ('.txt', '.log', '.gz', '.zst')
+RUNS_FILE = 'runs.csv'
+METRICS_FILE = 'metrics.csv'
+RUN_COLUMNS = ['RunID', 'ContentHash', 'LogPath', 'DisasterTime', 'DisasterCount',
+               'FailureOccurred', 'CloudletCount', 'IngestedAt']
+
+def resolve_logs(spec):
+    """Expand a directory or glob pattern into a sorted list of log files"""
+    path = Path(spec)
+    if path.is_dir():
+        logs = [p for p in path.iterdir() if p.is_file() and p.suffix.lower() in LOG_SUFFIXES]
+    else:
+        logs = [Path(p) for p in glob.glob(spec, recursive=True) if Path(p).is_file()]
+    return sorted(logs)
+
+def content_hash(path, block_size=1 << 20):
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_ingested_hashes(output_dir):
+    """Content hashes of runs already present in the batch dataset"""
+    runs_path = Path(output_dir) / RUNS_FILE
+    if not runs_path.exists():
+        return set()
+    return set(pd.read_csv(runs_path, usecols=['ContentHash'])['ContentHash'])
+
+def drop_unrecorded_rows(output_dir):
+    """Remove metrics.csv rows whose run is not in runs.csv and return how many were removed.
+
+    A batch interrupted between appending a run's metrics and recording it
+    leaves such rows behind, and the run is parsed again on the next ingest.
+    The file is rewritten to a temporary file and swapped in with os.replace.
+    """
+    output_dir = Path(output_dir)
+    metrics_path = output_dir / METRICS_FILE
+    if not metrics_path.exists():
+        return 0
+    runs_path = output_dir / RUNS_FILE
+    recorded = set(pd.read_csv(runs_path, usecols=['RunID'], dtype={'RunID': str})['RunID']) \
+        if runs_path.exists() else set()
+
+    def is_recorded(line):
+        # RunID is the first column, and run IDs are hex digests, never quoted
+        return line.split(',', 1)[0] in recorded
+
+    with open(metrics_path, encoding='utf-8', newline='') as f:
+        f.readline()
+        orphans = sum(1 for line in f if not is_recorded(line))
+    if not orphans:
+        return 0
+    tmp_path = metrics_path.with_name(metrics_path.name + '.tmp')
+    with open(metrics_path, encoding='utf-8', newline='') as src, \
+            open(tmp_path, 'w', encoding='utf-8', newline='') as dst:
+        dst.write(src.readline())
+        dst.writelines(line for line in src if is_recorded(line))
+    os.replace(tmp_path, metrics_path)
+    print(f"Warning: Removed {orphans} rows from {metrics_path} left by an interrupted ingest")
+    return orphans
+
+def ingest_run(log_path, digest):
+    """Parse one log in a worker process and return (run metadata, metrics DataFrame, quantile sketches)"""
+    df, index = parse_log(log_path)
+    disaster_time = index.first_disaster_time
+    run = {
+        'RunID': digest[:16],
+        'ContentHash': digest,
+        'LogPath': str(log_path),
+        'DisasterTime': disaster_time,
+        'DisasterCount': len(index.disaster_starts),
+        'FailureOccurred': 'Yes' if disaster_time is not None else 'No',
+        'CloudletCount': len(df),
+        'IngestedAt': datetime.now().isoformat(timespec='seconds'),
+    }
+    return run, df, sketch_run(df, disaster_time)
+
+def _append_csv(df, path):
+    df.to_csv(path, mode='a', header=not path.exists(), index=False)
+
+def ingest_batch(spec, output_dir, workers=1):
+    """Parse every new log matching `spec` into one combined dataset under `output_dir`.
+
+    Logs whose content hash is already recorded in runs.csv are skipped, so
+    re-running over the same directory only ingests new runs, and metrics
+    rows of runs an interrupted batch never recorded are dropped before they
+    are parsed again. Returns the number of runs added.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True, parents=True)
+    runs_path = output_dir / RUNS_FILE
+    metrics_path = output_dir / METRICS_FILE
+
+    logs = resolve_logs(spec)
+    if not logs:
+        print(f"Warning: No simulation logs matched {spec}")
+        return 0
+
+    drop_unrecorded_rows(output_dir)
+    ingested = load_ingested_hashes(output_dir)
+    pending = {}
+    for log_path in logs:
+        digest = content_hash(log_path)
+        if digest in ingested or digest in pending.values():
+            continue
+        pending[log_path] = digest
+    print(f"Found {len(logs)} logs, {len(logs) - len(pending)} already ingested, {len(pending)} to parse")
+
+    added = 0
+    with ProcessPoolExecutor(max_workers=max(workers, 1)) as pool:
+        futures = {pool.submit(ingest_run, log_path, digest): log_path
+                   for log_path, digest in pending.items()}
+        # Append each run as soon as it finishes so an interrupted batch keeps its progress
+        for future in as_completed(futures):
+            log_path = futures[future]
+            try:
+                run, df, sketches = future.result()
+            except Exception as e:
+                print(f"Error ingesting {log_path}: {e}")
+                traceback.print_exc()
+                continue
+            if df.empty:
+                print(f"Warning: No cloudlet data found in {log_path}; run not recorded")
+                continue
+
+            write_columns(df, output_dir / 'runs' / f"{run['RunID']}.columns")
+            save_sketches(sketches, output_dir / SKETCH_DIR / f"{run['RunID']}{SKETCH_SUFFIX}")
+            df.insert(0, 'RunID', run['RunID'])
+            _append_csv(df, metrics_path)
+            # runs.csv is written last: a run only counts as ingested once its rows are on disk
+            _append_csv(pd.DataFrame([run], columns=RUN_COLUMNS), runs_path)
+            added += 1
+            print(f"Ingested run {run['RunID']} ({run['CloudletCount']} cloudlets) from {log_path}")
+
+    print(f"Batch dataset in {output_dir}: {added} new runs")
+    return added
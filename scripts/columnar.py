@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+SCHEMA_VERSION = 1
+SCHEMA_FILE = 'schema.json'
+
+# Storage type of every metrics column; categoricals are stored as int8 codes
+COLUMN_TYPES = {
+    'CloudletID': 'int32',
+    'Status': 'category',
+    'DatacenterID': 'int32',
+    'VMId': 'int32',
+    'ExecutionTime': 'float64',
+    'StartTime': 'float64',
+    'FinishTime': 'float64',
+    'WaitTime': 'float64',
+    'AffectedByFailover': 'category',
+}
+
+def columnar_path_for(csv_path):
+    """Location of the typed column store that sits next to a metrics CSV"""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.stem + '.columns')
+
+def write_columns(df, store_path):
+    """Write a metrics DataFrame as one .npy file per column plus a schema header"""
+    import pandas as pd
+
+    store_path = Path(store_path)
+    tmp_path = store_path.with_name(store_path.name + '.tmp')
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+
+    schema = {'version': SCHEMA_VERSION, 'rows': int(len(df)), 'columns': []}
+    for name in df.columns:
+        kind = COLUMN_TYPES.get(name)
+        entry = {'name': name, 'file': f"{name}.npy"}
+        if kind == 'category':
+            values = pd.Categorical(df[name])
+            np.save(tmp_path / entry['file'], values.codes.astype(np.int8))
+            entry.update(dtype='category', categories=[str(c) for c in values.categories])
+        elif kind is not None:
+            values = df[name].to_numpy(dtype=kind)
+            entry['dtype'] = kind
+            if len(values) and (values == values[0]).all():
+                # Constant columns (WaitTime is always 0 today) need no file at all
+                del entry['file']
+                entry['constant'] = values[0].item()
+            else:
+                np.save(tmp_path / entry['file'], values)
+        else:
+            # Columns outside the known schema are kept as plain float64 when numeric
+            column = df[name]
+            if not pd.api.types.is_numeric_dtype(column):
+                continue
+            np.save(tmp_path / entry['file'], column.to_numpy(dtype=np.float64))
+            entry['dtype'] = 'float64'
+        schema['columns'].append(entry)
+
+    with open(tmp_path / SCHEMA_FILE, 'w', encoding='utf-8') as f:
+        json.dump(schema, f, indent=2)
+
+    # Swap the finished store into place so readers never see a partial one
+    if store_path.exists():
+        old_path = store_path.with_name(store_path.name + '.old')
+        if old_path.exists():
+            shutil.rmtree(old_path)
+        os.replace(store_path, old_path)
+        os.replace(tmp_path, store_path)
+        shutil.rmtree(old_path)
+    else:
+        os.replace(tmp_path, store_path)
+    return store_path
+
+def read_column_arrays(store_path, mmap=True, names=None):
+    """Load a column store as NumPy arrays without pandas.
+
+    Returns (rows, arrays, categories): categorical columns are their int8
+    codes in `arrays`, with their category labels in `categories`. `names`
+    limits which columns are loaded.
+    """
+    store_path = Path(store_path)
+    with open(store_path / SCHEMA_FILE, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    if schema.get('version') != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported column store version {schema.get('version')} in {store_path}")
+
+    mmap_mode = 'r' if mmap else None
+    arrays, categories = {}, {}
+    for entry in schema['columns']:
+        if names is not None and entry['name'] not in names:
+            continue
+        if 'constant' in entry:
+            # Zero-stride view: a constant column costs no memory
+            arrays[entry['name']] = np.broadcast_to(np.array(entry['constant'], dtype=entry['dtype']),
+                                                    (schema['rows'],))
+            continue
+        arrays[entry['name']] = np.load(store_path / entry['file'], mmap_mode=mmap_mode)
+        if entry['dtype'] == 'category':
+            categories[entry['name']] = entry['categories']
+    return schema['rows'], arrays, categories
+
+def read_columns(store_path, mmap=True):
+    """Load a column store as a DataFrame, memory-mapping the column files"""
+    import pandas as pd
+
+    _, arrays, categories = read_column_arrays(store_path, mmap)
+    data = {name: pd.Categorical.from_codes(values, categories[name]) if name in categories else values
+            for name, values in arrays.items()}
+    return pd.DataFrame(data, copy=False)
+
+def is_fresh(store_path, csv_path):
+    """True when the column store exists and is at least as new as its CSV"""
+    store_path, csv_path = Path(store_path), Path(csv_path)
+    if not (store_path / SCHEMA_FILE).exists():
+        return False
+    if not csv_path.exists():
+        return True
+    return (store_path / SCHEMA_FILE).stat().st_mtime >= csv_path.stat().st_mtime
@@ -0,0 +1,624 @@
+"""Discrete-event engine for the DisasterRecoverySimulation model, without a JVM.
+
+Mirrors what DatacenterFactory, CloudletManager, FailoverManager and the
+disaster listener build in Java: four primary VMs (1000 MIPS, 2 PEs) in
+the primary datacenter and two backup VMs (500 MIPS, 1 PE) in the backup
+one, cloudlets bound by the broker's scheduling policy (scheduling.py,
+round-robin by default), and time-shared VM scheduling.
+Failures of the primary datacenter are sampled up front from the same
+failure models (failure_models.py) and java.util.Random stream, so a seed
+and model spec give the same failure times as `DisasterRecoverySimulation
+--seed --failure-model`. On a failure, cloudlets in flight on primary VMs
+restart on backup VMs; a repair only makes the primary able to fail again.
+Backup failure domains are not modelled.
+run_to_disaster() stops a run at the first failure with a Snapshot
+(snapshot.py) and resume() continues one with a chosen recovery strategy,
+which is how recovery_variants.py branches variants at the disaster.
+Results are written in the metrics.csv/metadata.csv schema
+generate_metrics.py produces.
+"""
+import argparse
+import heapq
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from attribution import EVENT_MIGRATION, EVENT_REROUTE, PRIMARY_DOMAIN, EventLog, FailoverIndex
+from columnar import columnar_path_for, write_columns
+from failure_models import NEVER, SPEC_HELP, BernoulliFailureModel, parse_failure_model
+from scheduling import DEFAULT_POLICY, POLICIES, assign
+from generate_metrics import build_metrics_frame, open_log, parse_log, write_metadata
+from live_tail import VM_CREATED_PATTERN
+from snapshot import CLOUDLET_RECORD, PENDING, RECEIVED, RUNNING, Snapshot
+
+# DatacenterFactory.createDatacenter: (name, hosts, PEs per host, MIPS per PE)
+DATACENTERS = [('PrimaryDC', 2, 4, 3000), ('BackupDC', 2, 2, 1500)]
+# CloudSim entity IDs: the shutdown entity, the CIS and Broker_0 come before the datacenters
+FIRST_DATACENTER_ID = 3
+PRIMARY_DATACENTER_ID, BACKUP_DATACENTER_ID = FIRST_DATACENTER_ID, FIRST_DATACENTER_ID + 1
+PRIMARY_VM = (1000, 2)  # (MIPS per PE, PEs) from DatacenterFactory.createVms
+BACKUP_VM = (500, 1)
+CLOUDLET_LENGTH = 10000  # CloudletManager.createCloudlets, one PE each
+# VMs are acknowledged after CloudSim's minimum time between events; cloudlets are sent then
+SUBMIT_TIME = 0.1
+CHECK_INTERVAL = 10.0  # BernoulliFailureModel.DEFAULT_INTERVAL
+DEFAULT_FAILURE_PROBABILITY = 0.5
+# Cloudlets whose remaining work differs by less than this finish in the same event
+WORK_EPSILON = 1e-9
+
+# Event kinds in processing order when several fall on the same time
+EVENT_SUBMIT, EVENT_COMPLETE, EVENT_CHECK, EVENT_DISASTER, EVENT_REPAIR = 0, 1, 2, 3, 4
+
+STRATEGY_HELP = ("reroute[:POLICY] (restart on the backup VMs, as the Java broker does), "
+                 "migrate[:POLICY] (carry on there with the work left) or "
+                 "wait[:SECONDS] (hold the work until the primary is repaired)")
+
+class JavaRandom:
+    """java.util.Random's 48-bit LCG, so seeds draw the same numbers as the Java simulation"""
+
+    MULTIPLIER = 0x5DEECE66D
+    MASK = (1 << 48) - 1
+
+    def __init__(self, seed):
+        self.seed = (seed ^ self.MULTIPLIER) & self.MASK
+
+    @classmethod
+    def from_state(cls, state):
+        """Carry on a stream from its internal 48-bit state, as recorded in a snapshot"""
+        random = cls(0)
+        random.seed = state & cls.MASK
+        return random
+
+    def next(self, bits):
+        self.seed = (self.seed * self.MULTIPLIER + 0xB) & self.MASK
+        value = self.seed >> (48 - bits)
+        # Java narrows the result to a signed 32-bit int
+        return value - (1 << 32) if value >= 1 << 31 else value
+
+    def next_double(self):
+        return ((self.next(26) << 27) + self.next(27)) * (1.0 / (1 << 53))
+
+class TimeSharedVm:
+    """CloudletSchedulerTimeShared for one VM, tracked as virtual progress.
+
+    Every running one-PE cloudlet gets mips * pes / max(running, pes) MIPS,
+    so all of them advance by the same amount of work; a cloudlet finishes
+    when that shared progress reaches the progress at its arrival plus its
+    length. Targets are kept sorted, so the next batch of completions is
+    always at the head.
+    """
+
+    def __init__(self, vm_id, mips, pes):
+        self.vm_id = vm_id
+        self.mips = mips
+        self.pes = pes
+        self.progress = 0.0
+        self.updated_at = 0.0
+        self.targets = np.empty(0)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.head = 0
+        self.version = 0
+
+    @property
+    def running(self):
+        return len(self.targets) - self.head
+
+    def rate(self):
+        return self.mips * self.pes / max(self.running, self.pes)
+
+    def advance(self, now):
+        if self.running:
+            self.progress += (now - self.updated_at) * self.rate()
+        self.updated_at = now
+
+    def submit(self, now, cloudlet_ids, lengths):
+        self.advance(now)
+        targets = np.concatenate([self.targets[self.head:], self.progress + lengths])
+        ids = np.concatenate([self.ids[self.head:], cloudlet_ids])
+        order = np.argsort(targets, kind='stable')
+        self.targets, self.ids, self.head = targets[order], ids[order], 0
+
+    def next_completion(self):
+        if not self.running:
+            return None
+        return self.updated_at + max(self.targets[self.head] - self.progress, 0.0) / self.rate()
+
+    def complete(self, now):
+        """Cloudlet IDs that finish at `now`, all taken in one batch"""
+        self.advance(now)
+        end = int(np.searchsorted(self.targets, self.targets[self.head] + WORK_EPSILON, side='right'))
+        done = self.ids[self.head:end]
+        self.head = end
+        # Pin progress to the finished target so rounding does not drift across batches
+        self.progress = max(self.progress, self.targets[end - 1])
+        return done
+
+    def remaining(self, now):
+        """IDs of the running cloudlets and the work each has left at `now`"""
+        self.advance(now)
+        return self.ids[self.head:], np.maximum(self.targets[self.head:] - self.progress, 0.0)
+
+    def cancel(self, now):
+        """Remove every running cloudlet and return (IDs, work left); costs O(running), not O(all cloudlets)"""
+        cancelled, work = self.remaining(now)
+        self.targets, self.ids, self.head = self.targets[:0], self.ids[:0], 0
+        return cancelled, work
+
+def place_vms(vm_specs, vm_datacenters):
+    """Check that each VM fits the hosts of the datacenter it is bound to.
+
+    VmAllocationPolicySimple puts each VM on the host with the most room
+    left; a VM that fits nowhere in its datacenter is never created.
+    """
+    free = {FIRST_DATACENTER_ID + dc: [pes * mips] * hosts for dc, (_, hosts, pes, mips) in enumerate(DATACENTERS)}
+    for vm_id, ((mips, pes), datacenter_id) in enumerate(zip(vm_specs, vm_datacenters)):
+        hosts = free[datacenter_id]
+        host = max(range(len(hosts)), key=lambda h: (hosts[h], -h))
+        if hosts[host] < mips * pes:
+            raise ValueError(f"VM #{vm_id} does not fit in datacenter #{datacenter_id}")
+        hosts[host] -= mips * pes
+
+def reroute(now, sources, targets, lengths, policy=DEFAULT_POLICY, restart=True):
+    """Cancel the cloudlets running on `sources` and move them to `targets` as `policy` re-plans them.
+
+    Like DisasterAwareBroker.rerouteCloudlets, cloudlets move in ID order,
+    the plan counts the full length of whatever the targets are already
+    running, and nothing is cancelled when there is no VM to move them to.
+    Moved cloudlets start over unless `restart` is false, in which case
+    they carry on with the work they had left.
+    Returns the moved cloudlet IDs and the VM each one went to.
+    """
+    if not targets:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    queued = [float(lengths[vm.ids[vm.head:]].sum()) for vm in targets]
+    cancelled = [vm.cancel(now) for vm in sources]
+    if cancelled:
+        ids = np.concatenate([c[0] for c in cancelled])
+        work = np.concatenate([c[1] for c in cancelled])
+        order = np.argsort(ids, kind='stable')
+        ids, work = ids[order], work[order]
+    else:
+        ids, work = np.empty(0, dtype=np.int64), np.empty(0)
+    if restart:
+        work = lengths[ids]
+    slots = assign(policy, work, [vm.mips for vm in targets], [vm.pes for vm in targets], queued)
+    for slot, vm in enumerate(targets):
+        mine = slots == slot
+        if mine.any():
+            vm.submit(now, ids[mine], work[mine])
+    return ids, np.array([vm.vm_id for vm in targets], dtype=np.int64)[slots]
+
+def parse_strategy(spec, scheduler=DEFAULT_POLICY):
+    """Parse a recovery strategy spec (see STRATEGY_HELP) into (name, policy or outage seconds)"""
+    name, _, argument = spec.strip().partition(':')
+    if name in ('reroute', 'migrate'):
+        policy = argument or scheduler
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown scheduling policy '{policy}' (expected {', '.join(POLICIES)})")
+        return name, policy
+    if name == 'wait':
+        if not argument:
+            return name, None
+        try:
+            seconds = float(argument)
+        except ValueError:
+            seconds = -1.0
+        if not seconds > 0:
+            raise ValueError(f"Outage length must be a positive number of seconds, not '{argument}'")
+        return name, seconds
+    raise ValueError(f"Unknown recovery strategy '{spec}' (expected {STRATEGY_HELP})")
+
+class Simulation:
+    """The state of one run: VMs, cloudlet times, pending events and what the failures did.
+
+    simulate() drives one from t=0; resume() rebuilds one from a Snapshot
+    and carries on from the disaster with the recovery strategy given.
+    """
+
+    def __init__(self, vms, datacenter_of, lengths, vm_ids, scheduler=DEFAULT_POLICY, failure_model=None,
+                 random=None, strategy=('reroute', None)):
+        self.vms = vms
+        self.datacenter_of = datacenter_of
+        self.primary = [vm for vm in vms if datacenter_of[vm.vm_id] == PRIMARY_DATACENTER_ID]
+        self.backup = [vm for vm in vms if datacenter_of[vm.vm_id] == BACKUP_DATACENTER_ID]
+        self.lengths = lengths
+        self.vm_ids = vm_ids
+        self.start = np.full(len(lengths), np.nan)
+        self.finish = np.full(len(lengths), np.nan)
+        self.completion_order = []
+        self.completed = 0
+        self.scheduler = scheduler
+        self.failure_model = failure_model
+        self.random = random
+        self.strategy, self.strategy_argument = strategy
+        # Without sampled failures (a forced disaster time, or polling) the primary is never repaired
+        self.sample_failures = True
+        self.poll = False
+        self.primary_down = False
+        # Cloudlets held off the failed primary by the wait strategy: (VM ID, cloudlet IDs, work left)
+        self.held = []
+        self.events = []
+        self.sequence = 0
+        self.processed = 0
+        self.events_log = EventLog()
+        self.transitions = []
+
+    def schedule(self, at, kind, payload):
+        heapq.heappush(self.events, (at, kind, self.sequence, payload))
+        self.sequence += 1
+
+    def reschedule(self, vm):
+        vm.version += 1
+        at = vm.next_completion()
+        if at is not None:
+            self.schedule(at, EVENT_COMPLETE, (vm.vm_id, vm.version))
+
+    def schedule_failure(self, after):
+        """DisasterRecoverySimulationEventListener.scheduleFailure: one event per failure"""
+        at = self.failure_model.next_failure(after, self.random)
+        if at != NEVER:
+            self.schedule(at, EVENT_DISASTER, None)
+
+    def failover(self, now):
+        """DisasterRecoverySimulationEventListener.performFailover, or the strategy replacing it"""
+        self.transitions.append(('start', now, PRIMARY_DOMAIN))
+        self.primary_down = True
+        if self.strategy == 'wait':
+            for vm in self.primary:
+                ids, work = vm.cancel(now)
+                if len(ids):
+                    self.held.append((vm.vm_id, ids, work))
+            return
+        restart = self.strategy == 'reroute'
+        moved, moved_to = reroute(now, self.primary, self.backup, self.lengths, self.strategy_argument, restart)
+        self.vm_ids[moved] = moved_to
+        if restart:
+            self.start[moved] = now
+        kind = EVENT_REROUTE if restart else EVENT_MIGRATION
+        for cloudlet_id in moved.tolist():
+            self.events_log.add(kind, cloudlet_id, now)
+
+    def disaster(self, now):
+        self.failover(now)
+        repair = NEVER
+        if self.strategy == 'wait' and self.strategy_argument is not None:
+            repair = self.strategy_argument
+        elif self.sample_failures:
+            repair = self.failure_model.repair_duration(now, self.random)
+        if repair != NEVER:
+            self.schedule(now + repair, EVENT_REPAIR, None)
+        elif self.strategy == 'wait':
+            raise ValueError("The primary datacenter is never repaired, so waiting for it never ends; "
+                             "give the outage length as wait:SECONDS")
+
+    def repair(self, now):
+        """The primary is back and can fail again; held cloudlets carry on where they stopped. Returns their VM IDs"""
+        self.transitions.append(('end', now, PRIMARY_DOMAIN))
+        self.primary_down = False
+        resumed = {vm_id for vm_id, _, _ in self.held}
+        for vm_id, ids, work in self.held:
+            self.vms[vm_id].submit(now, ids, work)
+        self.held = []
+        if self.sample_failures:
+            self.schedule_failure(now)
+        return resumed
+
+    def capture(self, now):
+        """Snapshot of the run at `now`, with running cloudlets' progress brought up to date"""
+        n = len(self.lengths)
+        state = np.full(n, PENDING, dtype=np.int8)
+        remaining = self.lengths.copy()
+        state[~np.isnan(self.finish)] = RECEIVED
+        remaining[state == RECEIVED] = 0.0
+        for vm in self.vms:
+            ids, work = vm.remaining(now)
+            state[ids] = RUNNING
+            remaining[ids] = work
+        vms = [(vm.vm_id, self.datacenter_of[vm.vm_id], vm.mips, vm.pes) for vm in self.vms]
+        cloudlets = np.empty(n, dtype=CLOUDLET_RECORD)
+        cloudlets['id'] = np.arange(n)
+        cloudlets['vm'] = self.vm_ids
+        cloudlets['state'] = state
+        cloudlets['length'] = self.lengths
+        cloudlets['remaining'] = remaining
+        cloudlets['start'] = self.start
+        cloudlets['finish'] = self.finish
+        random_state = self.random.seed if self.random is not None else -1
+        return Snapshot(now, vms, cloudlets, random_state)
+
+    def run(self, stop_at_disaster=False):
+        """Process events until none are left; with `stop_at_disaster`, return a Snapshot at the first failure"""
+        events = self.events
+        n_cloudlets = len(self.lengths)
+        # Everything due at the same time is handled as one batch, like a CloudSim clock tick
+        while events:
+            now = events[0][0]
+            touched = set()
+            while events and events[0][0] == now:
+                _, kind, _, payload = heapq.heappop(events)
+                self.processed += 1
+                if kind == EVENT_SUBMIT:
+                    vm_id, cloudlet_ids = payload
+                    if self.primary_down and self.strategy == 'wait' and self.vms[vm_id] in self.primary:
+                        self.held.append((vm_id, cloudlet_ids, self.lengths[cloudlet_ids]))
+                    else:
+                        self.vms[vm_id].submit(now, cloudlet_ids, self.lengths[cloudlet_ids])
+                    # Time-shared VMs start every cloudlet as soon as it arrives
+                    self.start[cloudlet_ids] = now
+                    touched.add(vm_id)
+                elif kind == EVENT_COMPLETE:
+                    vm_id, version = payload
+                    if version != self.vms[vm_id].version:
+                        continue  # superseded by a later submission or completion
+                    done = self.vms[vm_id].complete(now)
+                    self.finish[done] = now
+                    self.completion_order.append(np.sort(done))
+                    self.completed += len(done)
+                    touched.add(vm_id)
+                elif self.completed >= n_cloudlets:
+                    continue  # the broker is done; the listener cancels its pending failures
+                elif kind == EVENT_DISASTER:
+                    if stop_at_disaster:
+                        return self.capture(now)
+                    self.disaster(now)
+                    touched.update(range(len(self.vms)))
+                elif kind == EVENT_REPAIR:
+                    touched.update(self.repair(now))
+                elif self.random.next_double() < self.failure_model.probability:
+                    if stop_at_disaster:
+                        return self.capture(now)
+                    self.disaster(now)
+                    touched.update(range(len(self.vms)))
+                else:
+                    self.schedule(now + self.failure_model.interval, EVENT_CHECK, None)
+            for vm_id in touched:
+                self.reschedule(self.vms[vm_id])
+        return None
+
+    def columns(self):
+        """Received cloudlets as the columns LogScanner provides"""
+        vm_ids, start, finish = self.vm_ids, self.start, self.finish
+        order = np.concatenate(self.completion_order) if self.completion_order else np.empty(0, dtype=np.int64)
+        # Within one time the broker receives VM by VM, then by cloudlet ID, as in the log
+        order = order[np.lexsort((order, vm_ids[order], finish[order]))]
+        return {
+            'CloudletID': order.astype(np.int32),
+            'Status': pd.Categorical.from_codes(np.zeros(len(order), dtype=np.int8), categories=['Success']),
+            'DatacenterID': self.datacenter_of[vm_ids[order]],
+            'VMId': vm_ids[order].astype(np.int32),
+            'ExecutionTime': finish[order] - start[order],
+            'StartTime': start[order],
+            'FinishTime': finish[order],
+            # Cloudlets are (re)submitted as they start, so none of them waits
+            'WaitTime': np.zeros(len(order)),
+        }
+
+def start_simulation(n_cloudlets, primary_vms=4, backup_vms=2, lengths=None, seed=None,
+                     failure_probability=DEFAULT_FAILURE_PROBABILITY, disaster_time=None, vm_datacenters=None,
+                     failure_model=None, poll=False, scheduler=DEFAULT_POLICY):
+    """Build the model at t=0 with its first submissions and failure scheduled; see simulate()"""
+    if failure_model is None:
+        failure_model = BernoulliFailureModel(failure_probability)
+    if poll and not isinstance(failure_model, BernoulliFailureModel):
+        raise ValueError("Only the Bernoulli failure model can be polled")
+    vm_specs = [PRIMARY_VM] * primary_vms + [BACKUP_VM] * backup_vms
+    if vm_datacenters is None:
+        vm_datacenters = [PRIMARY_DATACENTER_ID] * primary_vms + [BACKUP_DATACENTER_ID] * backup_vms
+    place_vms(vm_specs, vm_datacenters)
+    datacenter_of = np.asarray(vm_datacenters, dtype=np.int32)
+    vms = [TimeSharedVm(vm_id, mips, pes) for vm_id, (mips, pes) in enumerate(vm_specs)]
+    if lengths is None:
+        lengths = np.full(n_cloudlets, float(CLOUDLET_LENGTH))
+    lengths = np.asarray(lengths, dtype=np.float64)
+    # The broker binds cloudlets with its scheduling policy; failover rebinds them
+    vm_ids = np.array([vm.vm_id for vm in vms], dtype=np.int64)[
+        assign(scheduler, lengths, [vm.mips for vm in vms], [vm.pes for vm in vms])]
+
+    sim = Simulation(vms, datacenter_of, lengths, vm_ids, scheduler, failure_model, strategy=('reroute', scheduler))
+    for vm in vms:
+        mine = np.flatnonzero(vm_ids == vm.vm_id)
+        if len(mine):
+            sim.schedule(SUBMIT_TIME, EVENT_SUBMIT, (vm.vm_id, mine))
+    if disaster_time is not None:
+        sim.sample_failures = False
+        sim.schedule(float(disaster_time), EVENT_DISASTER, None)
+    else:
+        if seed is None:
+            seed = int(time.time() * 1000)  # System.currentTimeMillis(), the Java default
+        sim.random = JavaRandom(seed)
+        if poll:
+            sim.poll, sim.sample_failures = True, False
+            sim.schedule(failure_model.interval, EVENT_CHECK, None)
+        else:
+            sim.schedule_failure(0.0)
+    return sim
+
+def simulate(n_cloudlets, stats=None, **kwargs):
+    """Run the model and return (columns, cloudlet events, disaster transitions) as LogScanner provides them.
+
+    Keyword arguments: `primary_vms`, `backup_vms`, `lengths`, `seed`,
+    `failure_probability`, `disaster_time`, `scheduler` and:
+    `vm_datacenters` overrides where each VM is created (primary VMs in the
+    primary datacenter and backup VMs in the backup one by default).
+    `failure_model` defaults to the Bernoulli model with `failure_probability`.
+    With `poll`, the Bernoulli draw is instead made at an event every
+    CHECK_INTERVAL, as the listener did before failures were sampled up
+    front; it is kept as the baseline for benchmarks/failure_events.py. If
+    given, `stats` receives the number of events processed. `scheduler`
+    names the policy that binds cloudlets to VMs and re-plans them on failover.
+    """
+    sim = start_simulation(n_cloudlets, **kwargs)
+    sim.run()
+    if stats is not None:
+        stats['events'] = sim.processed
+    return sim.columns(), sim.events_log, sim.transitions
+
+def run_to_disaster(n_cloudlets, **kwargs):
+    """Simulate up to the first failure of the primary and return a Snapshot of that moment, or None if it never fails.
+
+    Takes simulate()'s keyword arguments except `poll`.
+    """
+    if kwargs.get('poll'):
+        raise ValueError("Snapshots need sampled failures, not polling")
+    return start_simulation(n_cloudlets, **kwargs).run(stop_at_disaster=True)
+
+def resume(snapshot, strategy='reroute', scheduler=DEFAULT_POLICY, failure_model=None, seed=None, stats=None):
+    """Continue a run from a disaster Snapshot and return what simulate() returns.
+
+    The disaster is handled with `strategy` (see STRATEGY_HELP) and any
+    later failures of the primary follow `failure_model`; without one the
+    primary is never repaired, as with a forced disaster time. Failures
+    carry on the snapshot's java.util.Random stream when it has one, so
+    resuming with the run's own scheduler and failure model reproduces the
+    full run; otherwise they are drawn from `seed`. `scheduler` binds any
+    cloudlets not yet bound and is the default policy of reroute and migrate.
+    """
+    name, argument = parse_strategy(strategy, scheduler)
+    vm_records, records = snapshot.vms, snapshot.cloudlets
+    # VM and cloudlet IDs index the engine's arrays, as they do for the Java simulation's 0-based IDs
+    if not np.array_equal(vm_records['id'], np.arange(len(vm_records))):
+        raise ValueError("Snapshot VM IDs must be 0, 1, 2, ... in order")
+    if not np.array_equal(records['id'], np.arange(len(records))):
+        raise ValueError("Snapshot cloudlet IDs must be 0, 1, 2, ...")
+    now = snapshot.clock
+    vms = [TimeSharedVm(int(r['id']), float(r['mips']), int(r['pes'])) for r in vm_records]
+    datacenter_of = vm_records['datacenter'].astype(np.int32)
+    lengths = records['length'].astype(np.float64)
+    vm_ids = records['vm'].astype(np.int64)
+    state = records['state']
+
+    if snapshot.random_state >= 0:
+        random = JavaRandom.from_state(snapshot.random_state)
+    else:
+        random = JavaRandom(0 if seed is None else seed)
+    sim = Simulation(vms, datacenter_of, lengths, vm_ids, scheduler, failure_model, random, (name, argument))
+    sim.sample_failures = failure_model is not None
+    sim.start[:] = records['start']
+    sim.finish[:] = records['finish']
+    received = np.flatnonzero(state == RECEIVED)
+    sim.completion_order.append(received)
+    sim.completed = len(received)
+
+    # Running cloudlets pick up where they were; pending ones are sent when the broker would send them
+    remaining = records['remaining'].astype(np.float64)
+    unbound = (state == PENDING) & (vm_ids < 0)
+    if unbound.any():
+        vm_ids[unbound] = np.array([vm.vm_id for vm in vms], dtype=np.int64)[
+            assign(scheduler, lengths[unbound], [vm.mips for vm in vms], [vm.pes for vm in vms])]
+    for vm in vms:
+        running = np.flatnonzero((state == RUNNING) & (vm_ids == vm.vm_id))
+        if len(running):
+            vm.submit(now, running, remaining[running])
+        pending = np.flatnonzero((state == PENDING) & (vm_ids == vm.vm_id))
+        if len(pending):
+            sim.schedule(max(SUBMIT_TIME, now), EVENT_SUBMIT, (vm.vm_id, pending))
+
+    if sim.completed < len(lengths):
+        sim.disaster(now)
+    for vm in vms:
+        sim.reschedule(vm)
+    sim.run()
+    if stats is not None:
+        stats['events'] = sim.processed
+    return sim.columns(), sim.events_log, sim.transitions
+
+def run(n_cloudlets, **kwargs):
+    """Simulate and return (metrics DataFrame, FailoverIndex)"""
+    columns, events, transitions = simulate(n_cloudlets, **kwargs)
+    index = FailoverIndex(events, transitions)
+    return build_metrics_frame(columns, index), index
+
+def validate(log_path, tolerance=0.005):
+    """Compare the engine with a simulation log at the log's printed precision; returns mismatch messages"""
+    expected, expected_index = parse_log(log_path)
+    if expected.empty:
+        return [f"No cloudlet data found in {log_path}"]
+    # The log's seed is not known, so its disaster time and VM placement are replayed directly
+    vm_datacenters = {}
+    with open_log(log_path) as f:
+        for line in f:
+            match = VM_CREATED_PATTERN.search(line)
+            if match:
+                vm_datacenters[int(match.group(1))] = int(match.group(2))
+    placement = [vm_datacenters[vm] for vm in sorted(vm_datacenters)] if vm_datacenters else None
+    actual, _ = run(len(expected), disaster_time=expected_index.first_disaster_time, failure_probability=0.0,
+                    vm_datacenters=placement)
+
+    problems = []
+    if list(actual['CloudletID']) != list(expected['CloudletID']):
+        problems.append("Cloudlets are received in a different order")
+    for column in ('Status', 'DatacenterID', 'VMId', 'AffectedByFailover'):
+        if list(actual[column].astype(str)) != list(expected[column].astype(str)):
+            problems.append(f"{column} differs")
+    for column in ('ExecutionTime', 'StartTime', 'FinishTime'):
+        # The log prints times with DecimalFormat("###.##")
+        diff = np.abs(actual[column].round(2).to_numpy() - expected[column].to_numpy())
+        if len(diff) and diff.max() > tolerance:
+            problems.append(f"{column} differs by up to {diff.max():.4f}")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the disaster recovery model in-process and write metrics.csv")
+    parser.add_argument("--cloudlets", type=int, default=20, help="Number of cloudlets")
+    parser.add_argument("--primary-vms", type=int, default=4, help="VMs with the primary spec (1000 MIPS, 2 PEs)")
+    parser.add_argument("--backup-vms", type=int, default=2, help="VMs with the backup spec (500 MIPS, 1 PE)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed of the disaster draw; matches DisasterRecoverySimulation --seed")
+    parser.add_argument("--failure-probability", type=float, default=DEFAULT_FAILURE_PROBABILITY,
+                        help="Chance of a disaster at each 10-second check")
+    parser.add_argument("--failure-model", default=None,
+                        help=f"Failure model of the primary datacenter: {SPEC_HELP} (default: bernoulli)")
+    parser.add_argument("--scheduler", choices=POLICIES, default=DEFAULT_POLICY,
+                        help="How cloudlets are bound to VMs and re-planned on failover")
+    parser.add_argument("--disaster-time", type=float, default=None, help="Force the disaster at this time")
+    parser.add_argument("--output", default=None, help="Output path for metrics CSV (default: results/des/metrics.csv)")
+    parser.add_argument("--no-columnar", action="store_true",
+                        help="Skip writing the typed column store next to the metrics CSV")
+    parser.add_argument("--validate", default=None, metavar="LOG",
+                        help="Check the engine against a simulation log instead of writing metrics")
+    args = parser.parse_args()
+
+    if args.validate:
+        problems = validate(args.validate)
+        for problem in problems:
+            print(f"Mismatch: {problem}")
+        if problems:
+            sys.exit(1)
+        print(f"Engine matches {args.validate}")
+        return
+
+    if args.output is None:
+        output_path = Path(__file__).resolve().parent.parent / 'results' / 'des' / 'metrics.csv'
+    else:
+        output_path = Path(args.output)
+    output_path.parent.mkdir(exist_ok=True, parents=True)
+
+    started = time.perf_counter()
+    try:
+        failure_model = None
+        if args.failure_model:
+            failure_model = parse_failure_model(args.failure_model, args.failure_probability)
+        df, index = run(args.cloudlets, primary_vms=args.primary_vms, backup_vms=args.backup_vms, seed=args.seed,
+                        failure_probability=args.failure_probability, disaster_time=args.disaster_time,
+                        failure_model=failure_model, scheduler=args.scheduler)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Simulated {len(df)} cloudlets in {time.perf_counter() - started:.3f}s")
+    if index.first_disaster_time is not None:
+        print(f"Disaster at time: {index.first_disaster_time}")
+    else:
+        print("No failure occurred during simulation.")
+
+    df.to_csv(output_path, index=False)
+    if index.first_disaster_time is not None:
+        write_metadata(index, output_path.parent)
+    print(f"Metrics saved to {output_path}")
+    if not args.no_columnar:
+        print(f"Saved typed column store to {write_columns(df, columnar_path_for(output_path))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from attribution import EVENT_MIGRATION, EVENT_RECEIPT, EVENT_REROUTE, EventLog
+
+# Written by EventStreamWriter.java next to simulation_log.txt
+EVENT_STREAM_SUFFIX = '.bin'
+MAGIC = b'DRSEVENT'
+HEADER = np.dtype([('magic', 'S8'), ('version', '>i4'), ('record_size', '>i4')])
+
+# Mirrors the kind constants in EventStreamWriter.java
+EVENT_KINDS = {
+    0: 'vm_created', 1: 'submit', 2: 'receipt', 3: 'disaster', 4: 'recovery',
+    5: 'reroute', 6: 'reroute_summary', 7: 'migration', 8: 'cloudlet',
+}
+KIND_CODES = {name: code for code, name in EVENT_KINDS.items()}
+ATTRIBUTION_KINDS = {'receipt': EVENT_RECEIPT, 'reroute': EVENT_REROUTE, 'migration': EVENT_MIGRATION}
+
+# One big-endian record per event; cloudlet records fill every field, other events only some
+RECORD = np.dtype([
+    ('kind', 'i1'), ('status', 'i1'), ('reserved', '>i2'),
+    ('id', '>i4'), ('vm', '>i4'), ('aux', '>i4'),
+    ('time', '>f8'), ('exec', '>f8'), ('start', '>f8'), ('finish', '>f8'), ('wait', '>f8'),
+])
+
+# Cloudlet.getStatusString() for each Cloudlet status code in CloudSim 3.0.3
+CLOUDLET_STATUS_NAMES = ['Created', 'Ready', 'Queued', 'InExec', 'Success', 'Failed',
+                         'Canceled', 'Paused', 'Resumed', 'Failed_resource_unavailable']
+
+def is_event_stream(path):
+    return Path(path).suffix.lower() == EVENT_STREAM_SUFFIX
+
+def read_records(path):
+    """Memory-map the records of an event stream as one structured array"""
+    path = Path(path)
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError(f"{path} is not a simulation event stream")
+    version, record_size = int(header['version'][0]), int(header['record_size'][0])
+    if record_size < RECORD.itemsize:
+        raise ValueError(f"Unsupported event stream record size {record_size} (version {version})")
+
+    body = path.stat().st_size - HEADER.itemsize
+    count = body // record_size
+    if body % record_size:
+        # A simulation that was killed mid-write leaves a partial last record
+        print(f"Warning: Ignoring {body % record_size} trailing bytes of a partial event record")
+    if count == 0:
+        return np.zeros(0, dtype=RECORD)
+    # Zero-copy view; striding by record_size skips fields appended by newer versions
+    mm = np.memmap(path, dtype=np.uint8, mode='r')
+    return np.ndarray((count,), dtype=RECORD, buffer=mm, offset=HEADER.itemsize, strides=(record_size,))
+
+class EventStreamScan:
+    """Typed columns and events read from a binary event stream, shaped like LogScanner"""
+
+    def __init__(self, records):
+        kinds = records['kind']
+        cloudlets = records[kinds == KIND_CODES['cloudlet']]
+        # Like the CLOUDLET DETAILS table, only the first record per cloudlet counts
+        _, first = np.unique(cloudlets['id'], return_index=True)
+        cloudlets = cloudlets[np.sort(first)]
+        status = cloudlets['status'].astype(np.intp)
+        known = (status >= 0) & (status < len(CLOUDLET_STATUS_NAMES))
+        status_codes = np.where(known, status, len(CLOUDLET_STATUS_NAMES)).astype(np.int8)
+        self.columns = {
+            'CloudletID': cloudlets['id'].astype(np.int32),
+            'Status': pd.Categorical.from_codes(status_codes, categories=CLOUDLET_STATUS_NAMES + ['Unknown'])
+                      .remove_unused_categories(),
+            'DatacenterID': cloudlets['aux'].astype(np.int32),
+            'VMId': cloudlets['vm'].astype(np.int32),
+            'ExecutionTime': cloudlets['exec'].astype(np.float64),
+            'StartTime': cloudlets['start'].astype(np.float64),
+            'FinishTime': cloudlets['finish'].astype(np.float64),
+            'WaitTime': cloudlets['wait'].astype(np.float64),
+        }
+
+        self.events = EventLog()
+        attributed = np.zeros(len(records), dtype=np.int8) - 1
+        for name, kind in ATTRIBUTION_KINDS.items():
+            attributed[kinds == KIND_CODES[name]] = kind
+        selected = records[attributed >= 0]
+        self.events.ids.frombytes(selected['id'].astype(np.int32).tobytes())
+        self.events.kinds.frombytes(attributed[attributed >= 0].tobytes())
+        self.events.times.frombytes(selected['time'].astype(np.float64).tobytes())
+
+        transitions = records[(kinds == KIND_CODES['disaster']) | (kinds == KIND_CODES['recovery'])]
+        # aux holds the failure domain's index in FailoverManager, or -1 in streams that predate it
+        self.disaster_transitions = [
+            ('start' if kind == KIND_CODES['disaster'] else 'end', float(time), domain)
+            for kind, time, domain in zip(transitions['kind'].tolist(), transitions['time'].tolist(),
+                                          transitions['aux'].tolist())
+        ]
+
+    @property
+    def found_details(self):
+        return len(self.columns['CloudletID']) > 0
+
+def scan_events(path):
+    """Load an event stream in one read; no line splitting or regexes are involved"""
+    scan = EventStreamScan(read_records(path))
+    if not scan.found_details:
+        print("Warning: No cloudlet records found in event stream")
+    return scan
+
+def write_events(path, records):
+    """Write a structured RECORD array as an event stream (used by synthetic benchmarks)"""
+    header = np.array([(MAGIC, 1, RECORD.itemsize)], dtype=HEADER)
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(np.ascontiguousarray(records, dtype=RECORD).tobytes())
+    return Path(path)
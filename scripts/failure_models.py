@@ -0,0 +1,129 @@
+"""Failure models of the Java simulation (FailureModel.java and its subclasses).
+
+Each model gives the time of a domain's next failure and how long the
+failure lasts, sampled up front from a java.util.Random-compatible
+generator, so a seed gives the same failure times as the Java simulation.
+Specs use the same syntax as DisasterRecoverySimulation --failure-model.
+"""
+import math
+from bisect import bisect_left
+from pathlib import Path
+
+NEVER = math.inf
+DEFAULT_INTERVAL = 10.0  # BernoulliFailureModel.DEFAULT_INTERVAL, the listener's old check interval
+SPEC_HELP = "bernoulli[:P[:INTERVAL]], exponential:MTBF[:MTTR], weibull:SHAPE:SCALE[:MTTR] or trace:FILE"
+
+def sample_exponential(mean, random):
+    # 1 - next_double() is in (0, 1], so the logarithm is finite
+    return -mean * math.log(1.0 - random.next_double())
+
+def require_positive(what, value):
+    if not value > 0:
+        raise ValueError(f"{what} must be positive, got {value}")
+
+class BernoulliFailureModel:
+    """Fails with a fixed probability at each check; the checks until a failure are drawn as one geometric sample"""
+
+    def __init__(self, probability, interval=DEFAULT_INTERVAL):
+        if not 0.0 <= probability <= 1.0:
+            raise ValueError(f"Failure probability must be in [0, 1], got {probability}")
+        require_positive("Check interval", interval)
+        self.probability = probability
+        self.interval = interval
+
+    def next_failure(self, time, random):
+        if self.probability <= 0.0:
+            return NEVER
+        first_check = (math.floor(time / self.interval) + 1) * self.interval
+        if self.probability >= 1.0:
+            return first_check
+        checks = math.floor(math.log(1.0 - random.next_double()) / math.log1p(-self.probability))
+        return first_check + checks * self.interval
+
+    def repair_duration(self, failure_time, random):
+        return NEVER
+
+class ExponentialFailureModel:
+    def __init__(self, mtbf, mttr=NEVER):
+        require_positive("MTBF", mtbf)
+        require_positive("MTTR", mttr)
+        self.mtbf = mtbf
+        self.mttr = mttr
+
+    def next_failure(self, time, random):
+        return time + sample_exponential(self.mtbf, random)
+
+    def repair_duration(self, failure_time, random):
+        return NEVER if self.mttr == NEVER else sample_exponential(self.mttr, random)
+
+class WeibullFailureModel:
+    def __init__(self, shape, scale, mttr=NEVER):
+        require_positive("Weibull shape", shape)
+        require_positive("Weibull scale", scale)
+        require_positive("MTTR", mttr)
+        self.shape = shape
+        self.scale = scale
+        self.mttr = mttr
+
+    def next_failure(self, time, random):
+        return time + self.scale * (-math.log(1.0 - random.next_double())) ** (1.0 / self.shape)
+
+    def repair_duration(self, failure_time, random):
+        return NEVER if self.mttr == NEVER else sample_exponential(self.mttr, random)
+
+class TraceFailureModel:
+    """Failure times and optional repair durations replayed from a file, one failure per line"""
+
+    def __init__(self, failures):
+        self.failures = sorted(failures)
+        self.times = [time for time, _ in self.failures]
+
+    @classmethod
+    def load(cls, path):
+        failures = []
+        with open(path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                fields = line.replace(',', ' ').split()
+                try:
+                    time = float(fields[0])
+                    duration = float(fields[1]) if len(fields) > 1 else NEVER
+                except ValueError:
+                    time, duration = -1.0, 0.0
+                if time < 0 or not duration > 0:
+                    raise ValueError(f"Invalid failure on line {line_number} of {path}: {line}")
+                failures.append((time, duration))
+        return cls(failures)
+
+    def next_failure(self, time, random):
+        i = bisect_left(self.times, time)
+        return self.times[i] if i < len(self.times) else NEVER
+
+    def repair_duration(self, failure_time, random):
+        i = bisect_left(self.times, failure_time)
+        return self.failures[i][1] if i < len(self.times) and self.times[i] == failure_time else NEVER
+
+def parse_failure_model(spec, default_probability):
+    """FailureModel.parse: build a model from a spec such as 'exponential:300:60'"""
+    name, _, rest = spec.partition(':')
+    name = name.lower()
+    if name == 'trace' and rest:
+        try:
+            return TraceFailureModel.load(Path(rest))
+        except OSError as e:
+            raise ValueError(f"Cannot read failure trace {rest}: {e}") from None
+
+    try:
+        values = [float(part) for part in rest.split(':')] if rest else []
+    except ValueError:
+        raise ValueError(f"Invalid number in failure model '{spec}'") from None
+    if name == 'bernoulli' and len(values) <= 2:
+        return BernoulliFailureModel(values[0] if values else default_probability,
+                                     values[1] if len(values) > 1 else DEFAULT_INTERVAL)
+    if name == 'exponential' and len(values) in (1, 2):
+        return ExponentialFailureModel(*values)
+    if name == 'weibull' and len(values) in (2, 3):
+        return WeibullFailureModel(*values)
+    raise ValueError(f"Unknown failure model '{spec}' (expected {SPEC_HELP})")
@@ -1,481 +1,5 @@
-import markdown
-import os
-import sys
-import pandas as pd
-import matplotlib.pyplot as plt
-from pathlib import Path
-import base64
-import io
-import argparse
-from datetime import datetime
-
-# Function to generate base64 encoded image
-def get_image_base64(image_path):
-    try:
-        if os.path.exists(image_path):
-            with open(image_path, "rb") as image_file:
-                encoded_string = base64.b64encode(image_file.read()).decode('utf-8')
-                return f"data:image/png;base64,{encoded_string}"
-        else:
-            print(f"Warning: Image file not found at {image_path}")
-    except Exception as e:
-        print(f"Error encoding image: {e}")
-    return ""
-
-def main():
-    parser = argparse.ArgumentParser(description="Generate HTML report from simulation metrics")
-    parser.add_argument("--metrics", default=None, help="Path to metrics CSV file")
-    parser.add_argument("--output", default=None, help="Output path for HTML report")
-    
-    args = parser.parse_args()
-    
-    # Use Path for cross-platform compatibility
-    script_path = Path(__file__).resolve()
-    script_dir = script_path.parent
-    project_dir = script_dir.parent
-    
-    # Set up directories using pathlib for cross-platform compatibility
-    reports_dir = project_dir / 'reports'
-    results_dir = project_dir / 'results'
-    
-    # Determine output path for HTML report
-    if args.output is None:
-        output_html_path = project_dir / 'index.html'
-    else:
-        output_html_path = Path(args.output)
-    
-    # Determine metrics file path
-    if args.metrics is None:
-        metrics_csv_path = results_dir / 'metrics.csv'
-    else:
-        metrics_csv_path = Path(args.metrics)
-    
-    # Ensure directories exist
-    reports_dir.mkdir(exist_ok=True, parents=True)
-    results_dir.mkdir(exist_ok=True, parents=True)
-    
-    print(f"Using metrics file: {metrics_csv_path}")
-    print(f"Output HTML report will be saved to: {output_html_path}")
-    
-    # Check if metrics file exists
-    if not metrics_csv_path.exists():
-        print(f"Warning: Metrics file not found at {metrics_csv_path}")
-        # Create a simple metrics file for demonstration if needed
-        
-        # Create sample data based on the simulation log
-        data = {
-            'CloudletID': list(range(20)),
-            'VMId': [0, 1, 2, 3, 4, 5] * 3 + [0, 1],
-            'StartTime': [0.1] * 20,
-            'FinishTime': [15.1] * 6 + [20.1] * 8 + [60.1] * 6,
-            'ExecutionTime': [15] * 6 + [20] * 8 + [60] * 6,
-            'WaitTime': [0] * 20,
-            'AffectedByFailover': ['No'] * 14 + ['Yes'] * 6  # Assuming VMs 4 and 5 were affected
-        }
-        
-        df = pd.DataFrame(data)
-        df.to_csv(metrics_csv_path, index=False)
-        print(f"Created sample metrics file at {metrics_csv_path}")
-    else:
-        try:
-            # Read the existing metrics file
-            df = pd.read_csv(metrics_csv_path)
-            print(f"Read existing metrics file with {len(df)} records")
-            
-            # Check for required columns and add if missing
-            required_columns = ['CloudletID', 'VMId', 'StartTime', 'FinishTime', 'ExecutionTime', 'WaitTime', 'AffectedByFailover']
-            
-            for column in required_columns:
-                if column not in df.columns:
-                    if column == 'AffectedByFailover':
-                        # Based on the simulation log: VMs 4-5 took longer (60s), might be affected by failover
-                        df['AffectedByFailover'] = df['VMId'].apply(lambda x: 'Yes' if x in [4, 5] else 'No')
-                    else:
-                        print(f"Warning: Required column '{column}' missing from metrics file")
-                        # Add default values for missing columns
-                        if column == 'WaitTime':
-                            df['WaitTime'] = 0.0
-                        elif column in ['StartTime', 'FinishTime', 'ExecutionTime']:
-                            df[column] = 0.0
-                        elif column == 'CloudletID':
-                            df['CloudletID'] = range(len(df))
-                        elif column == 'VMId':
-                            df['VMId'] = 0
-            
-            # Check for metadata to get disaster time
-            disaster_time = 20.0  # Default disaster time
-            metadata_path = results_dir / 'metadata.csv'
-            if metadata_path.exists():
-                try:
-                    metadata = pd.read_csv(metadata_path)
-                    disaster_row = metadata[metadata['Parameter'] == 'DisasterTime']
-                    if not disaster_row.empty:
-                        disaster_time = float(disaster_row.iloc[0]['Value'])
-                except Exception as e:
-                    print(f"Error reading metadata: {e}")
-            
-            # Update the CSV file with any added columns
-            df.to_csv(metrics_csv_path, index=False)
-        except Exception as e:
-            print(f"Error reading metrics file: {e}")
-            print("Creating default metrics data...")
-            
-            # Create default data if file read fails
-            data = {
-                'CloudletID': list(range(20)),
-                'VMId': [0, 1, 2, 3, 4, 5] * 3 + [0, 1],
-                'StartTime': [0.1] * 20,
-                'FinishTime': [15.1] * 6 + [20.1] * 8 + [60.1] * 6,
-                'ExecutionTime': [15] * 6 + [20] * 8 + [60] * 6,
-                'WaitTime': [0] * 20,
-                'AffectedByFailover': ['No'] * 14 + ['Yes'] * 6
-            }
-            df = pd.DataFrame(data)
-    
-    # Set default matplotlib style for consistent appearance across platforms
-    plt.style.use('seaborn-v0_8-darkgrid')
-    
-    try:
-        # Configure matplotlib to use Agg backend which works on all platforms without display
-        plt.switch_backend('Agg')
-        
-        # Generate performance metrics chart
-        perf_metrics_path = reports_dir / 'performance_metrics.png'
-        plt.figure(figsize=(15, 8))
-        
-        # Plot 1: Execution Time by VM
-        plt.subplot(2, 2, 1)
-        if 'VMId' in df.columns and 'ExecutionTime' in df.columns:
-            avg_exec_by_vm = df.groupby('VMId')['ExecutionTime'].mean()
-            plt.bar(avg_exec_by_vm.index, avg_exec_by_vm.values, 
-                    color=['blue' if i < 4 else 'orange' for i in avg_exec_by_vm.index])
-            plt.title('Average Execution Time by VM')
-            plt.xlabel('VM ID')
-            plt.ylabel('Execution Time (seconds)')
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-        else:
-            plt.text(0.5, 0.5, 'Missing required data columns', 
-                    horizontalalignment='center', verticalalignment='center')
-        
-        # Plot 2: Tasks per VM
-        plt.subplot(2, 2, 2)
-        if 'VMId' in df.columns:
-            tasks_per_vm = df['VMId'].value_counts().sort_index()
-            plt.bar(tasks_per_vm.index, tasks_per_vm.values, 
-                    color=['blue' if i < 4 else 'orange' for i in tasks_per_vm.index])
-            plt.title('Number of Tasks Processed by Each VM')
-            plt.xlabel('VM ID')
-            plt.ylabel('Number of Tasks')
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-        else:
-            plt.text(0.5, 0.5, 'Missing VM data', 
-                    horizontalalignment='center', verticalalignment='center')
-        
-        # Plot 3: Task Completion Timeline
-        plt.subplot(2, 1, 2)
-        if all(col in df.columns for col in ['FinishTime', 'CloudletID', 'AffectedByFailover']):
-            df_sorted = df.sort_values('FinishTime')
-            colors = ['red' if x == 'Yes' else 'green' for x in df_sorted['AffectedByFailover']]
-            plt.scatter(df_sorted['FinishTime'], df_sorted['CloudletID'], c=colors)
-            
-            # Get disaster time from metadata or use default
-            disaster_time = 20.0  # Default
-            metadata_path = results_dir / 'metadata.csv'
-            if metadata_path.exists():
-                try:
-                    metadata = pd.read_csv(metadata_path)
-                    disaster_row = metadata[metadata['Parameter'] == 'DisasterTime']
-                    if not disaster_row.empty:
-                        disaster_time = float(disaster_row.iloc[0]['Value'])
-                except Exception as e:
-                    print(f"Error reading disaster time from metadata: {e}")
-            
-            # Add failover event marker
-            plt.axvline(x=disaster_time, color='r', linestyle='--', label=f'Disaster Event ({disaster_time}s)')
-            plt.legend()
-            plt.title('Task Completion Timeline')
-            plt.xlabel('Simulation Time (seconds)')
-            plt.ylabel('Cloudlet ID')
-            plt.grid(True, linestyle='--', alpha=0.7)
-        else:
-            plt.text(0.5, 0.5, 'Missing timeline data', 
-                    horizontalalignment='center', verticalalignment='center')
-        
-        plt.tight_layout()
-        plt.savefig(perf_metrics_path, dpi=100)
-        print(f"Saved performance metrics chart to {perf_metrics_path}")
-        
-        # Generate VM utilization chart
-        vm_util_path = reports_dir / 'vm_utilization.png'
-        plt.figure(figsize=(10, 6))
-        if 'VMId' in df.columns:
-            tasks_per_vm = df['VMId'].value_counts().sort_index()
-            bars = plt.bar(tasks_per_vm.index, tasks_per_vm.values)
-            plt.title('Tasks Processed by Each VM')
-            plt.xlabel('VM ID')
-            plt.ylabel('Number of Tasks')
-            
-            # Apply colors to differentiate primary and backup VMs
-            for i, bar in enumerate(bars):
-                if tasks_per_vm.index[i] < 4:
-                    bar.set_color('steelblue')  # Primary VMs
-                else:
-                    bar.set_color('darkorange')  # Backup VMs
-            
-            plt.grid(axis='y', linestyle='--', alpha=0.7)
-        else:
-            plt.text(0.5, 0.5, 'Missing VM data', 
-                    horizontalalignment='center', verticalalignment='center')
-        
-        plt.savefig(vm_util_path, dpi=100)
-        print(f"Saved VM utilization chart to {vm_util_path}")
-        
-        # Calculate statistics for the report
-        total_tasks = len(df)
-        affected_tasks = len(df[df['AffectedByFailover'] == 'Yes']) if 'AffectedByFailover' in df.columns else 0
-        affected_percentage = affected_tasks/total_tasks*100 if total_tasks > 0 else 0
-        avg_exec_time = df['ExecutionTime'].mean() if 'ExecutionTime' in df.columns else 0
-        avg_wait_time = df['WaitTime'].mean() if 'WaitTime' in df.columns else 0
-        
-        # Calculate failover impact if applicable
-        if affected_tasks > 0 and 'ExecutionTime' in df.columns and 'AffectedByFailover' in df.columns:
-            avg_affected = df[df['AffectedByFailover'] == 'Yes']['ExecutionTime'].mean()
-            avg_unaffected = df[df['AffectedByFailover'] == 'No']['ExecutionTime'].mean()
-            impact_ratio = avg_affected / avg_unaffected if avg_unaffected > 0 else 0
-        else:
-            avg_affected = 0
-            avg_unaffected = avg_exec_time
-            impact_ratio = 0
-        
-        # Get base64 encoded images for inline display
-        perf_metrics_b64 = get_image_base64(perf_metrics_path)
-        vm_util_b64 = get_image_base64(vm_util_path)
-        
-        # Get relative path for results directory (for download link)
-        # Use a relative path that works in both Windows and Linux
-        rel_results_path = os.path.relpath(results_dir, output_html_path.parent)
-        metrics_rel_path = os.path.join(rel_results_path, 'metrics.csv').replace('\\', '/')
-        
-        # HTML Template with embedded images and dynamic data
-        html_template = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Disaster Recovery Simulation Report</title>
-            <style>
-                :root {{
-                    --primary-color: #2c3e50;
-                    --secondary-color: #3498db;
-                    --accent-color: #e74c3c;
-                    --background-color: #f8f9fa;
-                    --card-background: #ffffff;
-                    --text-color: #333333;
-                    --border-color: #dddddd;
-                }}
-                
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    max-width: 1100px;
-                    margin: 0 auto;
-                    padding: 2rem;
-                    background-color: var(--background-color);
-                    color: var(--text-color);
-                    line-height: 1.6;
-                }}
-                
-                h1, h2, h3 {{
-                    color: var(--primary-color);
-                    margin-top: 2rem;
-                }}
-                
-                h1 {{
-                    text-align: center;
-                    border-bottom: 2px solid var(--secondary-color);
-                    padding-bottom: 1rem;
-                    margin-bottom: 2rem;
-                }}
-                
-                .stats-container {{
-                    display: flex;
-                    flex-wrap: wrap;
-                    justify-content: space-between;
-                    margin: 2rem 0;
-                }}
-                
-                .stat-card {{
-                    background-color: var(--card-background);
-                    border-radius: 8px;
-                    padding: 1.5rem;
-                    margin-bottom: 1rem;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                    flex: 1 1 200px;
-                    margin: 0.5rem;
-                    text-align: center;
-                }}
-                
-                .stat-value {{
-                    font-size: 2rem;
-                    font-weight: bold;
-                    color: var(--secondary-color);
-                    margin: 0.5rem 0;
-                }}
-                
-                .stat-label {{
-                    font-size: 0.9rem;
-                    color: #666;
-                }}
-                
-                .chart-container {{
-                    background-color: var(--card-background);
-                    border-radius: 8px;
-                    padding: 1.5rem;
-                    margin: 2rem 0;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }}
-                
-                .chart-container h2 {{
-                    margin-top: 0;
-                    border-bottom: 1px solid var(--border-color);
-                    padding-bottom: 0.5rem;
-                }}
-                
-                img {{
-                    max-width: 100%;
-                    height: auto;
-                    margin: 1rem auto;
-                    display: block;
-                }}
-                
-                .disaster-event {{
-                    background-color: #fff3cd;
-                    border-left: 5px solid #ffc107;
-                    padding: 1rem;
-                    margin: 2rem 0;
-                    border-radius: 0 8px 8px 0;
-                }}
-                
-                .disaster-event h3 {{
-                    color: #856404;
-                    margin-top: 0;
-                }}
-                
-                .analysis-container {{
-                    background-color: var(--card-background);
-                    border-radius: 8px;
-                    padding: 1.5rem;
-                    margin: 2rem 0;
-                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-                }}
-                
-                .download-link {{
-                    display: inline-block;
-                    background-color: var(--secondary-color);
-                    color: white;
-                    padding: 0.8rem 1.5rem;
-                    text-decoration: none;
-                    border-radius: 8px;
-                    margin-top: 2rem;
-                    font-weight: bold;
-                    transition: background-color 0.3s;
-                }}
-                
-                .download-link:hover {{
-                    background-color: #2980b9;
-                }}
-                
-                footer {{
-                    text-align: center;
-                    margin-top: 3rem;
-                    padding-top: 1rem;
-                    color: #666;
-                    font-size: 0.9rem;
-                    border-top: 1px solid var(--border-color);
-                }}
-                
-                @media (max-width: 768px) {{
-                    .stats-container {{
-                        flex-direction: column;
-                    }}
-                    
-                    .stat-card {{
-                        margin-bottom: 1rem;
-                    }}
-                }}
-            </style>
-        </head>
-        <body>
-            <h1>Disaster Recovery Simulation Report</h1>
-            
-            <div class="stats-container">
-                <div class="stat-card">
-                    <div class="stat-value">{total_tasks}</div>
-                    <div class="stat-label">Total Tasks Processed</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="stat-value">{affected_tasks}</div>
-                    <div class="stat-label">Tasks Affected by Failover ({affected_percentage:.1f}%)</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="stat-value">{avg_exec_time:.2f}s</div>
-                    <div class="stat-label">Average Execution Time</div>
-                </div>
-                
-                <div class="stat-card">
-                    <div class="stat-value">{avg_wait_time:.2f}s</div>
-                    <div class="stat-label">Average Wait Time</div>
-                </div>
-            </div>
-            
-            <div class="disaster-event">
-                <h3>Disaster Event Information</h3>
-                <p>A disaster event occurred at simulation time <strong>{disaster_time:.1f} seconds</strong>.</p>
-                <p>Tasks rerouted to backup datacenter: <strong>{affected_tasks}</strong></p>
-            </div>
-            
-            <div class="analysis-container">
-                <h2>Failover Analysis</h2>
-                
-                {'<p>Based on the simulation results, the following tasks were affected by the disaster event:</p>' if affected_tasks > 0 else '<p>No tasks were directly affected by the failover, which suggests one of the following scenarios:</p>'}
-                
-                {f'<ul><li>Average execution time for tasks affected by failover: <strong>{avg_affected:.2f} seconds</strong></li><li>Average execution time for unaffected tasks: <strong>{avg_unaffected:.2f} seconds</strong></li><li>Performance impact ratio (affected/unaffected): <strong>{impact_ratio:.2f}</strong></li></ul>' if affected_tasks > 0 else '<ul><li>All tasks had already completed before the disaster</li><li>The remaining tasks were able to continue execution without interruption</li><li>The backup datacenter successfully handled the workload with minimal impact</li></ul>'}
-            </div>
-            
-            <div class="chart-container">
-                <h2>Performance Metrics Visualization</h2>
-                {'<img src="' + perf_metrics_b64 + '" alt="Performance Metrics Chart">' if perf_metrics_b64 else '<p>Performance metrics chart not available</p>'}
-            </div>
-            
-            <div class="chart-container">
-                <h2>VM Utilization</h2>
-                {'<img src="' + vm_util_b64 + '" alt="VM Utilization Chart">' if vm_util_b64 else '<p>VM utilization chart not available</p>'}
-                <p><strong>Note:</strong> Blue bars represent VMs in the Primary Datacenter, orange bars represent VMs in the Backup Datacenter.</p>
-            </div>
-            
-            <a class="download-link" href="{metrics_rel_path}" download="metrics.csv" type="text/csv">Download Raw Metrics (CSV)</a>
-            
-            <footer>
-                <p>Generated by CloudSim Disaster Recovery Simulation</p>
-                <p>© Cloud Computing Tools and Techniques Lab {datetime.now().year}</p>
-            </footer>
-        </body>
-        </html>
-        """
-        
-        # Write the HTML to a file
-        with open(output_html_path, "w", encoding="utf-8") as f:
-            f.write(html_template)
-        
-        print(f"Enhanced HTML report generated at {output_html_path}")
-        
-    except Exception as e:
-        print(f"Error generating report: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)  # Exit with error code
+"""Generate the HTML report from simulation metrics; the report itself is the report package."""
+from report.cli import main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
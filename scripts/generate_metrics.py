@@ -1,115 +1,262 @@
+import numpy as np
 import pandas as pd
 import argparse
-import os
 import sys
 from pathlib import Path
-import re
+import gzip
+import io
+from array import array
 
-def extract_metrics_from_log(log_file_path):
-    """Extract metrics from CloudSim simulation log"""
+from attribution import EventLog, FailoverIndex, match_disaster, match_event
+from columnar import columnar_path_for, write_columns
+from event_stream import is_event_stream, scan_events
+from instrument import TIMINGS_FILE, stage, start_run
+from quantile_sketch import save_sketches, sketch_path_for, sketch_run
+from run_history import DEFAULT_HISTORY, record_log_run
+
+DETAILS_HEADER = "===== CLOUDLET DETAILS ====="
+
+def open_log(log_file_path):
+    """Open a simulation log for line-by-line reading, decompressing .gz/.zst logs on the fly"""
+    log_file_path = Path(log_file_path)
+    suffix = log_file_path.suffix.lower()
+    if suffix == '.gz':
+        return gzip.open(log_file_path, 'rt', encoding='utf-8')
+    if suffix == '.zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Reading .zst logs requires the 'zstandard' package (pip install zstandard)")
+        raw = open(log_file_path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(reader, encoding='utf-8')
+    return open(log_file_path, 'r', encoding='utf-8')
+
+METRICS_COLUMNS = ['CloudletID', 'Status', 'DatacenterID', 'VMId', 'ExecutionTime',
+                   'StartTime', 'FinishTime', 'WaitTime', 'AffectedByFailover']
+
+class LogScanner:
+    """Single-pass state machine over the lines of a CloudSim simulation log"""
+
+    # Parser states
+    SCANNING = 0        # Before the CLOUDLET DETAILS section
+    DETAILS_HEADER = 1  # Section marker seen, waiting for the column header line
+    DETAILS_ROWS = 2    # Reading cloudlet rows until the first blank line
+    DETAILS_DONE = 3    # Only the first CLOUDLET DETAILS section is used
+
+    def __init__(self):
+        self.state = self.SCANNING
+        # One typed buffer per row field; Status holds codes into status_names
+        self.buffers = {name: array(ROW_TYPECODES[name]) for name in ROW_FIELDS}
+        self._row_buffers = [self.buffers[name] for name in ROW_FIELDS]
+        self.status_names = []
+        self._status_codes = {}
+        self.events = EventLog()
+        self.disaster_transitions = []
+
+    @property
+    def found_details(self):
+        return self.state != self.SCANNING
+
+    @property
+    def columns(self):
+        return typed_columns(self.buffers, self.status_names)
+
+    def feed(self, line):
+        """Consume one log line"""
+        line = line.rstrip('\r\n')
+
+        if self.state == self.DETAILS_ROWS:
+            # A whitespace-only line ends the section just like an empty one
+            if not line.strip():
+                self.state = self.DETAILS_DONE
+            else:
+                self._parse_row(line)
+            return
+        if self.state == self.DETAILS_HEADER:
+            # The column header is the first non-blank line after the marker
+            if line.strip():
+                self.state = self.DETAILS_ROWS
+            return
+        if self.state == self.SCANNING and line.startswith(DETAILS_HEADER):
+            self.state = self.DETAILS_HEADER
+            return
+
+        # DISASTER!/RECOVERY! lines bound the disaster intervals
+        transition = match_disaster(line)
+        if transition is not None:
+            self.disaster_transitions.append(transition)
+            return
+        # Reroute, migration and receipt lines feed the attribution index
+        event = match_event(line)
+        if event is not None:
+            self.events.add(*event)
+
+    def _parse_row(self, line):
+        # Handle both space and tab delimiters
+        row = parse_cloudlet_row(line.split())
+        if row is None:
+            return
+        if row is ROW_ERROR:
+            print(f"Warning: Error parsing cloudlet data line: {line}")
+            return
+        status = self._status_codes.get(row[1])
+        if status is None:
+            status = self._status_codes[row[1]] = len(self.status_names)
+            self.status_names.append(row[1])
+        buffers = self._row_buffers
+        buffers[0].append(row[0])
+        buffers[1].append(status)
+        for buffer, value in zip(buffers[2:], row[2:]):
+            buffer.append(value)
+
+ROW_FIELDS = ['CloudletID', 'Status', 'DatacenterID', 'VMId', 'ExecutionTime', 'StartTime', 'FinishTime']
+ROW_TYPECODES = {'CloudletID': 'i', 'Status': 'h', 'DatacenterID': 'i', 'VMId': 'i',
+                 'ExecutionTime': 'd', 'StartTime': 'd', 'FinishTime': 'd'}
+TYPECODE_DTYPES = {'i': np.int32, 'h': np.int16, 'd': np.float64}
+AFFECTED_CATEGORIES = ['No', 'Yes']
+ROW_ERROR = object()
+
+def typed_columns(buffers, status_names):
+    """Zero-copy NumPy views over typed row buffers, with Status as a categorical over its codes"""
+    columns = {name: np.frombuffer(buffer, dtype=TYPECODE_DTYPES[buffer.typecode])
+               for name, buffer in buffers.items()}
+    columns['Status'] = pd.Categorical.from_codes(columns['Status'], categories=status_names)
+    return columns
+
+def parse_cloudlet_row(parts):
+    """Convert the whitespace-split fields of a CLOUDLET DETAILS row into typed values.
+
+    Returns None for lines that are too short to be rows and ROW_ERROR for
+    lines that look like rows but do not parse.
+    """
+    if len(parts) < 7:  # Ensure we have enough data points
+        return None
+    try:
+        return (int(parts[0]), parts[1], int(parts[2]), int(parts[3]),
+                float(parts[4]), float(parts[5]), float(parts[6]))
+    except (ValueError, IndexError):
+        return ROW_ERROR
+
+def build_metrics_frame(columns, index):
+    """Build the metrics DataFrame from parsed columns and classify failover impact.
+
+    The DataFrame wraps the column arrays without copying them, and the
+    failover flag is a two-category categorical over one byte per row.
+    """
+    df = pd.DataFrame({name: columns[name] for name in ROW_FIELDS}, copy=False)
+    if df.empty:
+        return df
+
+    # The log only prints rounded times without waits; the event stream carries real wait times
+    df['WaitTime'] = columns['WaitTime'] if 'WaitTime' in columns else 0.0
+
+    affected = index.classify(df['CloudletID'].to_numpy(), df['StartTime'].to_numpy(),
+                              df['FinishTime'].to_numpy())
+    df['AffectedByFailover'] = pd.Categorical.from_codes(affected.astype(np.int8), categories=AFFECTED_CATEGORIES)
+    return df[METRICS_COLUMNS]
+
+def save_metadata(index, log_file_path):
+    """Save simulation parameters discovered in the log to results/metadata.csv"""
+    write_metadata(index, Path(log_file_path).parent.parent / 'results')
+
+def save_run_sketches(df, index, log_file_path):
+    """Save the run's quantile sketches under results/sketches/, next to metadata.csv"""
+    path = sketch_path_for(Path(log_file_path).parent.parent / 'results', log_file_path)
+    save_sketches(sketch_run(df, index.first_disaster_time), path)
+    print(f"Saved quantile sketches to {path}")
+
+def write_metadata(index, results_dir):
+    """Write the disaster time and count of a FailoverIndex to results_dir/metadata.csv"""
+    # Create a metadata dataframe to store simulation parameters
+    metadata = pd.DataFrame([
+        {'Parameter': 'DisasterTime', 'Value': index.first_disaster_time},
+        {'Parameter': 'DisasterCount', 'Value': len(index.disaster_starts)},
+    ], dtype=object)
+
+    # Save metadata to results directory (create if it doesn't exist)
+    results_dir = Path(results_dir)
+    results_dir.mkdir(exist_ok=True, parents=True)
+
+    metadata_path = results_dir / 'metadata.csv'
+    metadata.to_csv(metadata_path, index=False)
+    print(f"Saved simulation metadata to {metadata_path}")
+
+def scan_log(log_file_path):
+    """Read the log once, line by line, so memory stays constant in the log size"""
+    scanner = LogScanner()
+    with open_log(log_file_path) as f:
+        for line in f:
+            scanner.feed(line)
+    if not scanner.found_details:
+        print("Warning: Could not find CLOUDLET DETAILS section in log")
+    return scanner
+
+def parse_log(log_file_path, workers=1):
+    """Parse a simulation log or binary event stream into (metrics DataFrame, FailoverIndex) without writing any files"""
+    log_file_path = Path(log_file_path)
+    if is_event_stream(log_file_path):
+        workers = 1
+    elif workers > 1 and log_file_path.suffix.lower() in ('.gz', '.zst'):
+        print("Note: Compressed logs cannot be memory-mapped; parsing with a single worker")
+        workers = 1
+
+    # Reading and regex matching are interleaved line by line, so they are one stage
+    with stage('parse') as record:
+        if is_event_stream(log_file_path):
+            scanner = scan_events(log_file_path)
+        elif workers > 1:
+            from parallel_parse import scan_log_parallel
+            scanner = scan_log_parallel(log_file_path, workers)
+        else:
+            scanner = scan_log(log_file_path)
+        record['rows'] = len(scanner.columns['CloudletID'])
+        record['events'] = len(scanner.events)
+
+    # Index reroute/migration/receipt events and disaster intervals once per log
+    with stage('index'):
+        index = FailoverIndex(scanner.events, scanner.disaster_transitions)
+    with stage('build_frame') as record:
+        df = build_metrics_frame(scanner.columns, index)
+        record['rows'] = len(df)
+    return df, index
+
+def extract_metrics_from_log(log_file_path, workers=1, history=None, metrics_path=None, sketches=True):
+    """Extract metrics from CloudSim simulation log in a single streaming pass.
+
+    With `history`, the run is also recorded in that run-history store
+    (run_history.py) as the run written to `metrics_path`. With `sketches`,
+    its quantile sketches (quantile_sketch.py) are saved for the report.
+    """
     try:
         log_file_path = Path(log_file_path)
         if not log_file_path.exists():
             print(f"Error: Log file not found at {log_file_path}")
             return pd.DataFrame()
-            
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            log_content = f.read()
-            
-        # Parse the simulation log to get cloudlet details
-        cloudlet_data = []
-        
-        # Find the cloudlet details section
-        cloudlet_sections = re.findall(r"===== CLOUDLET DETAILS =====\s+([\s\S]+?)(?=\n\n|$)", log_content)
-        cloudlet_section = cloudlet_sections[0] if cloudlet_sections else ""
-        
-        if cloudlet_section:
-            # Skip the header line and process data lines
-            lines = cloudlet_section.strip().split('\n')
-            if len(lines) > 1:  # Ensure we have data beyond the header
-                header_line = lines[0]
-                data_lines = lines[1:]
-                
-                for line in data_lines:
-                    # Parse each line of cloudlet data - handle both space and tab delimiters
-                    parts = [part.strip() for part in re.split(r'\s+', line) if part.strip()]
-                    if len(parts) >= 7:  # Ensure we have enough data points
-                        try:
-                            cloudlet_id = int(parts[0])
-                            status = parts[1]
-                            dc_id = int(parts[2])
-                            vm_id = int(parts[3])
-                            exec_time = float(parts[4])
-                            start_time = float(parts[5])
-                            finish_time = float(parts[6])
-                            
-                            # Calculate wait time (usually 0 in this simulation)
-                            wait_time = 0.0  # Can be calculated as start_time - submission_time if available
-                            
-                            # Determine if affected by failover - look for rerouting information in log
-                            affected_by_failover = "No"
-                            routing_pattern = rf"Cloudlet {cloudlet_id}.*rerouted|migrated|failover"
-                            if re.search(routing_pattern, log_content, re.IGNORECASE):
-                                affected_by_failover = "Yes"
-                            # Backup detection method based on VM ID or increased execution time
-                            elif vm_id >= 4 or exec_time > 30.0:  # Assuming VMs 4+ are backup or longer execution indicates failover
-                                affected_by_failover = "Yes"
-                            
-                            cloudlet_data.append({
-                                'CloudletID': cloudlet_id,
-                                'Status': status,
-                                'DatacenterID': dc_id,
-                                'VMId': vm_id,
-                                'ExecutionTime': exec_time,
-                                'StartTime': start_time,
-                                'FinishTime': finish_time,
-                                'WaitTime': wait_time,
-                                'AffectedByFailover': affected_by_failover
-                            })
-                        except (ValueError, IndexError) as e:
-                            print(f"Warning: Error parsing cloudlet data line: {line}")
-                            print(f"Error details: {e}")
-        else:
-            print("Warning: Could not find CLOUDLET DETAILS section in log")
-        
-        # Find the disaster event time
-        disaster_time = None
-        disaster_pattern = r"DISASTER!.*time:\s*(\d+\.\d+)"
-        disaster_match = re.search(disaster_pattern, log_content)
-        if disaster_match:
-            try:
-                disaster_time = float(disaster_match.group(1))
-                print(f"Found disaster event at time: {disaster_time}")
-                
-                # Update affected_by_failover based on disaster time if available
-                for item in cloudlet_data:
-                    if item['StartTime'] > disaster_time or (
-                       item['StartTime'] <= disaster_time and item['FinishTime'] > disaster_time):
-                        item['AffectedByFailover'] = "Yes"
-            except Exception as e:
-                print(f"Warning: Could not parse disaster time: {e}")
-        
-        # Create a DataFrame
-        df = pd.DataFrame(cloudlet_data)
+
+        df, index = parse_log(log_file_path, workers)
+
+        disaster_time = index.first_disaster_time
+        if disaster_time is not None:
+            print(f"Found disaster event at time: {disaster_time}")
+            if len(index.disaster_starts) > 1:
+                print(f"Found {len(index.disaster_starts)} disaster intervals in total")
         
         if df.empty:
             print("Warning: No cloudlet data found in the log")
         
         # Add disaster time to metadata if available
         if disaster_time is not None:
-            # Create a metadata dataframe to store simulation parameters
-            metadata = pd.DataFrame([{
-                'Parameter': 'DisasterTime',
-                'Value': disaster_time
-            }])
-            
-            # Save metadata to results directory (create if it doesn't exist)
-            results_dir = Path(log_file_path).parent.parent / 'results'
-            results_dir.mkdir(exist_ok=True, parents=True)
-            
-            metadata_path = results_dir / 'metadata.csv'
-            metadata.to_csv(metadata_path, index=False)
-            print(f"Saved simulation metadata to {metadata_path}")
+            with stage('save_metadata'):
+                save_metadata(index, log_file_path)
+        
+        if sketches and not df.empty:
+            with stage('save_sketches', rows=len(df)):
+                save_run_sketches(df, index, log_file_path)
+        
+        if history is not None and not df.empty:
+            with stage('record_history', rows=len(df)):
+                record_log_run(history, df, index, log_file_path, metrics_path)
         
         return df
     
@@ -121,13 +268,56 @@ def extract_metrics_from_log(log_file_path):
 
 def main():
     parser = argparse.ArgumentParser(description="Generate metrics CSV from CloudSim log")
-    parser.add_argument("--log", default="cloudsim_log.txt", help="Path to CloudSim log file")
+    parser.add_argument("--log", default="cloudsim_log.txt", help="Path to CloudSim log file (.gz and .zst logs are read transparently)")
+    parser.add_argument("--events", default=None,
+                        help="Read the simulation's binary event stream (results/events.bin) instead of "
+                             "scraping the text log; times are not rounded")
     parser.add_argument("--output", default=None, help="Output path for metrics CSV")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parse the log in N processes over memory-mapped chunks (uncompressed logs only); "
+                             "in --batch mode, parse N logs at a time")
+    parser.add_argument("--no-columnar", action="store_true",
+                        help="Skip writing the typed column store next to the metrics CSV")
+    parser.add_argument("--batch", default=None,
+                        help="Directory or glob of simulation logs to ingest into one combined dataset")
+    parser.add_argument("--batch-output", default=None,
+                        help="Output directory for the combined batch dataset (default: results/batch)")
+    parser.add_argument("--follow", action="store_true",
+                        help="Tail the log while the simulation is still writing it, flushing metric snapshots")
+    parser.add_argument("--interval", type=float, default=5.0,
+                        help="Seconds between metrics.csv/metadata.csv snapshots in --follow mode")
+    parser.add_argument("--idle-timeout", type=float, default=60.0,
+                        help="In --follow mode, stop after this many seconds without new log output")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY),
+                        help="SQLite run-history store each extracted run is added to (default: results/history.sqlite)")
+    parser.add_argument("--no-history", action="store_true", help="Do not record the run in the run-history store")
+    parser.add_argument("--no-sketches", action="store_true",
+                        help="Do not save the run's quantile sketches under results/sketches/")
+    parser.add_argument("--profile", nargs='?', const='parse', default=None, metavar="STAGE",
+                        help="Run one stage under cProfile and save its stats next to the timings "
+                             "(default stage: parse)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record per-stage peak memory with tracemalloc (slower)")
     
     args = parser.parse_args()
     
+    if args.batch is not None:
+        from batch_ingest import ingest_batch
+        if args.batch_output is None:
+            batch_output = Path(__file__).resolve().parent.parent / 'results' / 'batch'
+        else:
+            batch_output = Path(args.batch_output)
+        start_run('generate_metrics', batch_output / TIMINGS_FILE, args.profile, args.trace_memory)
+        # Each log is parsed by one process of the pool
+        with stage('batch'):
+            ingest_batch(args.batch, batch_output, workers=args.workers)
+        return
+    
     # Use platform-independent path handling
-    log_path = Path(args.log)
+    log_path = Path(args.events if args.events is not None else args.log)
+    if args.follow and is_event_stream(log_path):
+        print("Error: --follow tails the text log; use --log with --follow")
+        sys.exit(1)
     
     # Default output path is in 'results' directory relative to script's parent directory
     if args.output is None:
@@ -141,17 +331,42 @@ def main():
     # Ensure the output directory exists
     output_dir = output_path.parent
     output_dir.mkdir(exist_ok=True, parents=True)
+    # Stage timings go next to metrics.csv and metadata.csv, one NDJSON line per run
+    start_run('generate_metrics', output_dir / TIMINGS_FILE, args.profile, args.trace_memory)
     
     print(f"Reading log from: {log_path}")
     print(f"Output will be saved to: {output_path}")
     
+    if args.follow:
+        from live_tail import follow_log
+        with stage('follow') as record:
+            df = follow_log(log_path, output_path, interval=args.interval,
+                            idle_timeout=args.idle_timeout, columnar=not args.no_columnar)
+            record['rows'] = len(df)
+        if df.empty:
+            print("No metrics data was extracted from the log")
+            sys.exit(1)  # Exit with error code
+        print(f"Final metrics saved to {output_path} ({len(df)} cloudlets)")
+        return
+    
     # Extract metrics
-    df = extract_metrics_from_log(log_path)
+    with stage('extract') as record:
+        df = extract_metrics_from_log(log_path, workers=args.workers,
+                                      history=None if args.no_history else args.history, metrics_path=output_path,
+                                      sketches=not args.no_sketches)
+        record['rows'] = len(df)
     
     if not df.empty:
         # Save to CSV
-        df.to_csv(output_path, index=False)
+        with stage('write_csv', rows=len(df)):
+            df.to_csv(output_path, index=False)
         print(f"Successfully extracted metrics from log and saved to {output_path}")
+        
+        # Save the typed column store that the report memory-maps
+        if not args.no_columnar:
+            with stage('write_columnar', rows=len(df)):
+                store_path = write_columns(df, columnar_path_for(output_path))
+            print(f"Saved typed column store to {store_path}")
         print(f"Total cloudlets processed: {len(df)}")
     else:
         print("No metrics data was extracted from the log")
@@ -0,0 +1,157 @@
+import atexit
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TIMINGS_FILE = 'timings.ndjson'
+
+def peak_rss_mb():
+    """High-water RSS of this process, or None where the platform does not report it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 2)
+
+def _child_cpu():
+    times = os.times()
+    return times.children_user + times.children_system
+
+class Instrumentation:
+    """Per-stage wall time, CPU time, memory peaks and row counts for one script run.
+
+    Stages nest; each record names its parent. Memory peaks come from
+    tracemalloc when `trace_memory` is set (it slows allocation-heavy stages
+    down, so it is opt-in), and the process RSS high-water mark is recorded
+    either way. The stage named by `profile_stage` also runs under cProfile.
+    """
+
+    def __init__(self, script, profile_stage=None, trace_memory=False, profile_dir=None):
+        self.script = script
+        self.profile_stage = profile_stage
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir else Path.cwd()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.started = time.perf_counter()
+        self.records = []
+        self._stack = []
+        self._child_peaks = []
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _fold_peak(self):
+        """Carry the traced peak so far up to the enclosing stage before it is reset"""
+        if self.trace_memory and self._child_peaks:
+            self._child_peaks[-1] = max(self._child_peaks[-1], tracemalloc.get_traced_memory()[1])
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time the enclosed block; extra fields such as `rows` can be set on the yielded record"""
+        record = {'stage': name, 'parent': self._stack[-1] if self._stack else None}
+        if rows is not None:
+            record['rows'] = rows
+        if self.trace_memory:
+            self._fold_peak()
+            tracemalloc.reset_peak()
+        self._stack.append(name)
+        self._child_peaks.append(0)
+        profiler = cProfile.Profile() if name == self.profile_stage else None
+
+        wall, cpu, child_cpu = time.perf_counter(), time.process_time(), _child_cpu()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = repr(e)
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['wall_s'] = round(time.perf_counter() - wall, 6)
+            record['cpu_s'] = round(time.process_time() - cpu, 6)
+            record['child_cpu_s'] = round(_child_cpu() - child_cpu, 6)
+            self._stack.pop()
+            child_peak = self._child_peaks.pop()
+            if self.trace_memory:
+                record['peak_traced_bytes'] = max(child_peak, tracemalloc.get_traced_memory()[1])
+                if self._child_peaks:
+                    self._child_peaks[-1] = max(self._child_peaks[-1], record['peak_traced_bytes'])
+                tracemalloc.reset_peak()
+            record['peak_rss_mb'] = peak_rss_mb()
+            self.records.append(record)
+            if profiler is not None:
+                self.dump_profile(name, profiler)
+
+    def record(self, name, **fields):
+        """Add a stage that was timed elsewhere, e.g. in a worker process"""
+        self.records.append({'stage': name, 'parent': self._stack[-1] if self._stack else None, **fields})
+
+    def dump_profile(self, name, profiler):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f"profile-{self.script}-{name}.pstats"
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(15)
+        print(summary.getvalue())
+        print(f"Saved cProfile stats for stage '{name}' to {path}")
+
+    def summary(self):
+        return {
+            'script': self.script,
+            'started_at': self.started_at,
+            'argv': sys.argv[1:],
+            'total_wall_s': round(time.perf_counter() - self.started, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': self.records,
+        }
+
+    def write(self, path):
+        """Append this run as one NDJSON line"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.summary()) + '\n')
+        return path
+
+_active = None
+
+def start_run(script, timings_path, profile_stage=None, trace_memory=False):
+    """Activate instrumentation for this process and append its record to `timings_path` at exit"""
+    global _active
+    timings_path = Path(timings_path)
+    _active = Instrumentation(script, profile_stage, trace_memory, profile_dir=timings_path.parent)
+
+    def finish(instrumentation=_active):
+        try:
+            instrumentation.write(timings_path)
+        except OSError as e:
+            print(f"Warning: could not write stage timings to {timings_path}: {e}")
+    atexit.register(finish)
+    return _active
+
+@contextmanager
+def stage(name, rows=None):
+    """Record a stage on the active run; a no-op when instrumentation was never started"""
+    if _active is None:
+        yield {}
+        return
+    with _active.stage(name, rows) as record:
+        yield record
+
+def record(name, **fields):
+    if _active is not None:
+        _active.record(name, **fields)
@@ -0,0 +1,182 @@
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from attribution import EVENT_RECEIPT, CLOCK_PATTERN, FailoverIndex
+from columnar import columnar_path_for, write_columns
+from generate_metrics import METRICS_COLUMNS, LogScanner, build_metrics_frame
+
+SEND_PATTERN = re.compile(r"Sending cloudlet (\d+) to VM #(\d+)")
+VM_CREATED_PATTERN = re.compile(r"VM #(\d+) has been created in Datacenter #(\d+)")
+FINISHED_MARKER = "Simulation finished!"
+
+class LiveMetrics:
+    """Running aggregates over a simulation log that is still being written"""
+
+    def __init__(self):
+        self.scanner = LogScanner()
+        self.clock = 0.0
+        self.vm_datacenter = {}
+        self.sent = {}          # cloudlet ID -> (send time, VM ID)
+        self.received = {}      # cloudlet ID -> receipt time
+        self.completions_per_vm = Counter()
+        self.finished = False
+
+    def feed(self, line):
+        """Consume one complete log line"""
+        clock = CLOCK_PATTERN.match(line)
+        if clock:
+            self.clock = max(self.clock, float(clock.group(1)))
+
+        event_count = len(self.scanner.events)
+        self.scanner.feed(line)
+        if len(self.scanner.events) > event_count and self.scanner.events.kinds[-1] == EVENT_RECEIPT:
+            cloudlet_id = self.scanner.events.ids[-1]
+            if cloudlet_id not in self.received:
+                self.received[cloudlet_id] = self.scanner.events.times[-1]
+                if cloudlet_id in self.sent:
+                    self.completions_per_vm[self.sent[cloudlet_id][1]] += 1
+            return
+
+        if 'Sending cloudlet' in line:
+            send = SEND_PATTERN.search(line)
+            if send:
+                # A resend (e.g. after a reroute) moves the cloudlet to its new VM
+                self.sent[int(send.group(1))] = (self.clock, int(send.group(2)))
+        elif 'has been created' in line:
+            created = VM_CREATED_PATTERN.search(line)
+            if created:
+                self.vm_datacenter[int(created.group(1))] = int(created.group(2))
+        elif line.startswith(FINISHED_MARKER):
+            self.finished = True
+
+    @property
+    def in_flight(self):
+        return sum(1 for cloudlet_id in self.sent if cloudlet_id not in self.received)
+
+    def index(self):
+        return FailoverIndex(self.scanner.events, self.scanner.disaster_transitions)
+
+    def time_since_disaster(self, index):
+        if index.first_disaster_time is None:
+            return None
+        return self.clock - index.disaster_starts[-1]
+
+    def metrics_frame(self, index):
+        """Final CLOUDLET DETAILS rows once printed, otherwise provisional rows for received cloudlets"""
+        if self.scanner.state == LogScanner.DETAILS_DONE or self.finished:
+            df = build_metrics_frame(self.scanner.columns, index)
+            if not df.empty:
+                return df
+
+        ids = np.fromiter(self.received, dtype=np.int32, count=len(self.received))
+        finish = np.fromiter(self.received.values(), dtype=np.float64, count=len(self.received))
+        start = np.array([self.sent.get(i, (np.nan, -1))[0] for i in ids], dtype=np.float64)
+        vms = np.array([self.sent.get(i, (np.nan, -1))[1] for i in ids], dtype=np.int32)
+        affected = index.classify(ids, start, finish)
+        df = pd.DataFrame({
+            'CloudletID': ids,
+            'Status': 'Success',
+            'DatacenterID': np.array([self.vm_datacenter.get(v, -1) for v in vms], dtype=np.int32),
+            'VMId': vms,
+            'ExecutionTime': finish - start,
+            'StartTime': start,
+            'FinishTime': finish,
+            'WaitTime': 0.0,
+            'AffectedByFailover': np.where(affected, "Yes", "No"),
+        })
+        return df[METRICS_COLUMNS]
+
+    def metadata_frame(self, index):
+        since_disaster = self.time_since_disaster(index)
+        rows = [
+            ('DisasterTime', index.first_disaster_time),
+            ('DisasterCount', len(index.disaster_starts)),
+            ('SimulationClock', self.clock),
+            ('CloudletsSent', len(self.sent)),
+            ('CloudletsReceived', len(self.received)),
+            ('CloudletsInFlight', self.in_flight),
+            ('TimeSinceDisaster', since_disaster),
+            ('Complete', 'Yes' if self.finished else 'No'),
+        ]
+        rows += [(f"CompletedOnVM{vm}", count) for vm, count in sorted(self.completions_per_vm.items())]
+        # Keep the report's DisasterTime lookup working: only write it once a disaster happened
+        return pd.DataFrame([{'Parameter': k, 'Value': v} for k, v in rows if v is not None], dtype=object)
+
+    def progress_line(self, index):
+        since_disaster = self.time_since_disaster(index)
+        disaster = f", {since_disaster:.1f}s since disaster" if since_disaster is not None else ""
+        per_vm = ' '.join(f"VM{vm}:{n}" for vm, n in sorted(self.completions_per_vm.items()))
+        return (f"t={self.clock:.1f} received {len(self.received)}/{len(self.sent)}, "
+                f"in flight {self.in_flight}{disaster} [{per_vm}]")
+
+def _atomic_csv(df, path):
+    """Write a CSV next to its destination and swap it in, so readers never see half a file"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def write_snapshot(live, output_path, final=False, columnar=True):
+    """Flush metrics.csv and metadata.csv for the current state of the run"""
+    index = live.index()
+    df = live.metrics_frame(index)
+    _atomic_csv(df, output_path)
+    _atomic_csv(live.metadata_frame(index), output_path.parent / 'metadata.csv')
+    if final and columnar and not df.empty:
+        write_columns(df, columnar_path_for(output_path))
+    print(live.progress_line(index))
+    return df
+
+def follow_log(log_path, output_path, interval=5.0, idle_timeout=60.0, poll=0.2, columnar=True):
+    """Tail a simulation log while it is written, flushing metric snapshots every `interval` seconds.
+
+    Stops when the simulation prints its final line, or when the log has not
+    grown for `idle_timeout` seconds. Returns the final metrics DataFrame.
+    """
+    log_path, output_path = Path(log_path), Path(output_path)
+    if log_path.suffix.lower() in ('.gz', '.zst'):
+        raise ValueError("Compressed logs cannot be followed; use --log without --follow")
+
+    print(f"Waiting for {log_path}...")
+    started = time.monotonic()
+    while not log_path.exists():
+        if time.monotonic() - started > idle_timeout:
+            raise FileNotFoundError(f"Log file did not appear at {log_path}")
+        time.sleep(poll)
+
+    live = LiveMetrics()
+    partial = ''
+    last_flush = last_growth = time.monotonic()
+    with open(log_path, 'r', encoding='utf-8') as f:
+        while not live.finished:
+            chunk = f.readline()
+            if chunk:
+                last_growth = time.monotonic()
+                partial += chunk
+                # Only complete lines are parsed; a line still being written waits for its newline
+                if partial.endswith('\n'):
+                    live.feed(partial.rstrip('\r\n'))
+                    partial = ''
+            else:
+                if os.path.getsize(log_path) < f.tell():
+                    print("Log was truncated; starting over")
+                    f.seek(0)
+                    live, partial = LiveMetrics(), ''
+                    continue
+                if time.monotonic() - last_growth > idle_timeout:
+                    print(f"No new log output for {idle_timeout:.0f}s; stopping")
+                    break
+                time.sleep(poll)
+
+            if time.monotonic() - last_flush >= interval:
+                write_snapshot(live, output_path, columnar=columnar)
+                last_flush = time.monotonic()
+
+    if partial:
+        live.feed(partial.rstrip('\r\n'))
+    return write_snapshot(live, output_path, final=True, columnar=columnar)
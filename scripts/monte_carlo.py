@@ -0,0 +1,247 @@
+import argparse
+import csv
+import math
+import os
+import subprocess
+import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+from pipeline import CLASSES_DIR, PROJECT_DIR, PipelineState, compile_stage, java_classpath
+
+RUNNER_CLASS = 'org.cloudsim.disaster.MonteCarloRunner'
+DEFAULT_OUTPUT = PROJECT_DIR / 'results' / 'monte_carlo.csv'
+RUN_FIELDS = ['Seed', 'DisasterOccurred', 'DisasterTime', 'Makespan', 'AffectedCloudlets', 'TotalCloudlets',
+              'AffectedRatio']
+PERCENTILES = (5, 50, 95)
+# MonteCarloRunner's failure model spec; bernoulli takes its probability from the sample line
+DEFAULT_FAILURE_MODEL = 'bernoulli'
+SCHEDULERS = ('round-robin', 'mips-weighted', 'ect')  # CloudletSchedulingPolicy.parse
+DEFAULT_SCHEDULER = SCHEDULERS[0]
+
+class RunningStats:
+    """Welford's streaming mean and variance; values are also kept in a typed buffer for percentiles"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.values = array('d')
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.values.append(value)
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def confidence_interval(self, confidence):
+        """Normal-approximation interval for the mean"""
+        if self.count == 0:
+            return math.nan, math.nan
+        half = NormalDist().inv_cdf(0.5 + confidence / 2) * self.stdev / math.sqrt(self.count)
+        return self.mean - half, self.mean + half
+
+    def percentiles(self, q=PERCENTILES):
+        if self.count == 0:
+            return [math.nan] * len(q)
+        return np.percentile(np.frombuffer(self.values, dtype=np.float64), q).tolist()
+
+def wilson_interval(successes, trials, confidence):
+    """Confidence interval for a proportion; well behaved near 0 and 1, unlike the normal one"""
+    if trials == 0:
+        return math.nan, math.nan
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return centre - half, centre + half
+
+class MonteCarloAggregate:
+    """Distributions of the per-run metrics, updated one run at a time"""
+
+    def __init__(self):
+        self.runs = 0
+        self.disasters = 0
+        self.disaster_time = RunningStats()
+        self.makespan = RunningStats()
+        self.affected_ratio = RunningStats()
+
+    def add(self, run):
+        self.runs += 1
+        if run['DisasterOccurred']:
+            self.disasters += 1
+            self.disaster_time.add(run['DisasterTime'])
+        self.makespan.add(run['Makespan'])
+        self.affected_ratio.add(run['AffectedRatio'])
+
+    def summary_rows(self, confidence):
+        low, high = wilson_interval(self.disasters, self.runs, confidence)
+        rows = [{'Metric': 'DisasterProbability', 'Runs': self.runs,
+                 'Mean': self.disasters / self.runs if self.runs else math.nan,
+                 'StdDev': math.nan, 'CILow': low, 'CIHigh': high}]
+        # Disaster time is only defined for runs that had a disaster
+        for name, stats in (('DisasterTime', self.disaster_time), ('Makespan', self.makespan),
+                            ('AffectedRatio', self.affected_ratio)):
+            low, high = stats.confidence_interval(confidence)
+            row = {'Metric': name, 'Runs': stats.count, 'Mean': stats.mean if stats.count else math.nan,
+                   'StdDev': stats.stdev, 'CILow': low, 'CIHigh': high}
+            row.update({f"P{q}": value for q, value in zip(PERCENTILES, stats.percentiles())})
+            rows.append(row)
+        return rows
+
+class RunnerProcess:
+    """One MonteCarloRunner JVM that serves samples over stdin/stdout until closed"""
+
+    def __init__(self, cmd):
+        self.process = subprocess.Popen(cmd, cwd=PROJECT_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        text=True, bufsize=1)
+
+    def run(self, seed, failure_probability, failure_model=DEFAULT_FAILURE_MODEL, scheduler=DEFAULT_SCHEDULER):
+        self.process.stdin.write(f"{seed} {failure_probability!r} {failure_model} {scheduler}\n")
+        self.process.stdin.flush()
+        for line in self.process.stdout:
+            if line.startswith('RESULT '):
+                return parse_result(line)
+            if line.startswith('ERROR '):
+                raise RuntimeError(f"Run with seed {seed} failed: {line[6:].strip()}")
+        raise RuntimeError(f"Monte Carlo runner exited with code {self.process.wait()}")
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.process.wait()
+
+def parse_result(line):
+    _, seed, disaster, disaster_time, makespan, affected, total = line.split()
+    affected, total = int(affected), int(total)
+    return {
+        'Seed': int(seed),
+        'DisasterOccurred': disaster == '1',
+        'DisasterTime': float(disaster_time),
+        'Makespan': float(makespan),
+        'AffectedCloudlets': affected,
+        'TotalCloudlets': total,
+        'AffectedRatio': affected / total if total else 0.0,
+    }
+
+def sample_seeds(base_seed, runs):
+    """Independent 64-bit seeds for each run, reproducible from one base seed"""
+    state = np.random.SeedSequence(base_seed).generate_state(runs, dtype=np.uint64)
+    return state.view(np.int64).tolist()
+
+def run_samples(cmd, seeds, failure_probability, jvms, failure_model=DEFAULT_FAILURE_MODEL,
+                scheduler=DEFAULT_SCHEDULER):
+    """Yield each run's result as soon as it is ready; every pool thread keeps one JVM for all its samples"""
+    local = threading.local()
+    runners = []
+    runners_lock = threading.Lock()
+
+    def run_one(seed):
+        runner = getattr(local, 'runner', None)
+        if runner is None:
+            runner = local.runner = RunnerProcess(cmd)
+            with runners_lock:
+                runners.append(runner)
+        return runner.run(seed, failure_probability, failure_model, scheduler)
+
+    try:
+        with ThreadPoolExecutor(max_workers=jvms) as pool:
+            futures = [pool.submit(run_one, seed) for seed in seeds]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+    finally:
+        for runner in runners:
+            runner.close()
+
+def print_summary(rows, confidence, failure_label):
+    print(f"\nMonte Carlo summary ({failure_label}, {confidence:.0%} confidence)")
+    for row in rows:
+        line = (f"  {row['Metric']:<20} n={row['Runs']:<7} mean={row['Mean']:.4f} "
+                f"CI=[{row['CILow']:.4f}, {row['CIHigh']:.4f}]")
+        if 'P50' in row:
+            line += '  ' + ' '.join(f"p{q}={row[f'P{q}']:.4f}" for q in PERCENTILES)
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many seeded simulations and summarise recovery behaviour")
+    parser.add_argument("--runs", type=int, default=1000, help="Number of simulations")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed; each run's seed is derived from it")
+    parser.add_argument("--failure-probability", type=float, default=0.5,
+                        help="Chance of a disaster at each 10-second check")
+    parser.add_argument("--failure-model", default=DEFAULT_FAILURE_MODEL,
+                        help="Failure model spec as for DisasterRecoverySimulation --failure-model, "
+                             "e.g. exponential:300:60 (default: bernoulli with --failure-probability)")
+    parser.add_argument("--scheduler", choices=SCHEDULERS, default=DEFAULT_SCHEDULER,
+                        help="How the broker binds cloudlets to VMs and re-plans them on failover")
+    parser.add_argument("--jvms", type=int, default=os.cpu_count() or 1,
+                        help="Worker JVMs; each is reused for many runs")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT),
+                        help="Per-run CSV; the summary is written next to it with a _summary suffix")
+    parser.add_argument("--java", default="java", help="Java launcher")
+    parser.add_argument("--javac", default="javac", help="Java compiler")
+    args = parser.parse_args()
+    args.force = []
+
+    if args.runs < 1 or not 0.0 <= args.failure_probability <= 1.0 or not 0.0 < args.confidence < 1.0:
+        print("Error: --runs must be positive, --failure-probability in [0, 1] and --confidence in (0, 1)")
+        sys.exit(1)
+    if not args.failure_model or any(c.isspace() for c in args.failure_model):
+        print("Error: --failure-model must be a single word, e.g. weibull:1.5:400")
+        sys.exit(1)
+
+    output_path = Path(args.output)
+    summary_path = output_path.with_name(output_path.stem + '_summary.csv')
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    aggregate = MonteCarloAggregate()
+    try:
+        compile_stage(PipelineState(), args)
+        cmd = [args.java, '-cp', java_classpath(CLASSES_DIR), RUNNER_CLASS]
+        seeds = sample_seeds(args.seed, args.runs)
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=RUN_FIELDS)
+            writer.writeheader()
+            for run in run_samples(cmd, seeds, args.failure_probability, max(1, min(args.jvms, args.runs)),
+                                   args.failure_model, args.scheduler):
+                writer.writerow({**run, 'DisasterOccurred': 'Yes' if run['DisasterOccurred'] else 'No'})
+                aggregate.add(run)
+                if aggregate.runs % 100 == 0:
+                    print(f"{aggregate.runs}/{args.runs} runs complete")
+    except (RuntimeError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    rows = aggregate.summary_rows(args.confidence)
+    fields = ['Metric', 'Runs', 'Mean', 'StdDev', 'CILow', 'CIHigh'] + [f"P{q}" for q in PERCENTILES]
+    with open(summary_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    if args.failure_model == DEFAULT_FAILURE_MODEL:
+        failure_label = f"failure probability {args.failure_probability}"
+    else:
+        failure_label = f"failure model {args.failure_model}"
+    if args.scheduler != DEFAULT_SCHEDULER:
+        failure_label += f", {args.scheduler} scheduling"
+    print_summary(rows, args.confidence, failure_label)
+    print(f"\nPer-run results saved to {output_path}; summary saved to {summary_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import mmap
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from attribution import EventLog, match_disaster, match_event
+from generate_metrics import DETAILS_HEADER, ROW_FIELDS, ROW_ERROR, parse_cloudlet_row
+
+# Chunks per worker, so one slow range does not hold up the whole pool
+CHUNKS_PER_WORKER = 4
+
+# Column layout of the shared-memory block each worker hands back
+COLUMN_DTYPES = [
+    ('Offset', np.int64),
+    ('CloudletID', np.int32),
+    ('Status', np.int16),
+    ('DatacenterID', np.int32),
+    ('VMId', np.int32),
+    ('ExecutionTime', np.float64),
+    ('StartTime', np.float64),
+    ('FinishTime', np.float64),
+]
+
+DETAILS_MARKER = DETAILS_HEADER.encode('utf-8')
+
+class ChunkResult:
+    """What one worker found in its byte range of the log"""
+
+    def __init__(self):
+        self.shm_name = None
+        self.row_count = 0
+        self.status_names = []
+        self.marker_offsets = []
+        self.blank_offsets = []
+        self.error_offsets = []
+        self.disaster_transitions = []
+        self.events = EventLog()
+
+class ParallelScan:
+    """Merged result of a parallel scan, shaped like LogScanner for build_metrics_frame"""
+
+    def __init__(self, columns, events, disaster_transitions):
+        self.columns = columns
+        self.events = events
+        self.disaster_transitions = disaster_transitions
+
+def split_line_aligned(mm, size, parts):
+    """Split [0, size) into up to `parts` byte ranges that start at line boundaries"""
+    bounds = [0]
+    for i in range(1, parts):
+        pos = mm.find(b'\n', max(size * i // parts, bounds[-1]))
+        if pos == -1:
+            break
+        if pos + 1 > bounds[-1]:
+            bounds.append(pos + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _export_columns(columns, row_count):
+    """Pack column arrays into one shared-memory block and return its name"""
+    nbytes = sum(np.dtype(dtype).itemsize for _, dtype in COLUMN_DTYPES) * row_count
+    # The block stays registered with the parent's resource tracker, which scan_log_parallel
+    # starts before the pool, so it is reclaimed at exit even if the parent never unlinks it
+    shm = SharedMemory(create=True, size=max(nbytes, 1))
+    pos = 0
+    for name, dtype in COLUMN_DTYPES:
+        src = np.frombuffer(columns[name], dtype=dtype)
+        dst = np.ndarray(row_count, dtype=dtype, buffer=shm.buf, offset=pos)
+        dst[:] = src
+        pos += dst.nbytes
+        del dst
+    name = shm.name
+    shm.close()
+    return name
+
+def parse_chunk(log_file_path, start, end):
+    """Parse one line-aligned byte range of the log into column arrays"""
+    result = ChunkResult()
+    columns = {
+        'Offset': array('q'), 'CloudletID': array('i'), 'Status': array('h'),
+        'DatacenterID': array('i'), 'VMId': array('i'), 'ExecutionTime': array('d'),
+        'StartTime': array('d'), 'FinishTime': array('d'),
+    }
+    status_codes = {}
+
+    with open(log_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            nl = mm.find(b'\n', pos, end)
+            line_end = end if nl == -1 else nl
+            line = mm[pos:line_end].rstrip(b'\r')
+            offset = pos
+            pos = line_end + 1
+
+            if not line.strip():
+                result.blank_offsets.append(offset)
+                continue
+            if line.startswith(DETAILS_MARKER):
+                result.marker_offsets.append(offset)
+                continue
+
+            parts = line.split()
+            if parts[0].isdigit():
+                # Candidate CLOUDLET DETAILS row; the parent keeps only those inside the section
+                row = parse_cloudlet_row([p.decode('utf-8', 'replace') for p in parts])
+                if row is ROW_ERROR:
+                    result.error_offsets.append(offset)
+                elif row is not None:
+                    cloudlet_id, status, dc_id, vm_id, exec_time, start_time, finish_time = row
+                    columns['Offset'].append(offset)
+                    columns['CloudletID'].append(cloudlet_id)
+                    columns['Status'].append(status_codes.setdefault(status, len(status_codes)))
+                    columns['DatacenterID'].append(dc_id)
+                    columns['VMId'].append(vm_id)
+                    columns['ExecutionTime'].append(exec_time)
+                    columns['StartTime'].append(start_time)
+                    columns['FinishTime'].append(finish_time)
+                continue
+
+            text = line.decode('utf-8', 'replace')
+            transition = match_disaster(text)
+            if transition is not None:
+                result.disaster_transitions.append(transition)
+                continue
+            event = match_event(text)
+            if event is not None:
+                result.events.add(*event)
+
+    result.row_count = len(columns['Offset'])
+    result.status_names = list(status_codes)
+    result.shm_name = _export_columns(columns, result.row_count)
+    return result
+
+def _attach_columns(shm, row_count):
+    """Zero-copy views over a worker's shared-memory column block"""
+    views = {}
+    pos = 0
+    for name, dtype in COLUMN_DTYPES:
+        views[name] = np.ndarray(row_count, dtype=dtype, buffer=shm.buf, offset=pos)
+        pos += views[name].nbytes
+    return views
+
+def _section_bounds(mm, results):
+    """Byte offsets (header line, first blank line after it) of the first CLOUDLET DETAILS section"""
+    markers = sorted(o for r in results for o in r.marker_offsets)
+    if not markers:
+        return None
+    # The column header is the first non-blank line after the marker
+    pos = mm.find(b'\n', markers[0])
+    header = None
+    while pos != -1 and pos + 1 < len(mm):
+        line_start = pos + 1
+        pos = mm.find(b'\n', line_start)
+        line = mm[line_start:len(mm) if pos == -1 else pos]
+        if line.strip():
+            header = line_start
+            break
+    if header is None:
+        return markers[0], markers[0]
+    blanks = [o for r in results for o in r.blank_offsets if o > header]
+    return header, min(blanks) if blanks else len(mm)
+
+def _unlink_block(name):
+    try:
+        shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+def _section_rows(offsets, section_start, section_end):
+    """Row range of a chunk inside the section; a chunk's rows are in offset order"""
+    return (int(np.searchsorted(offsets, section_start, side='right')),
+            int(np.searchsorted(offsets, section_end, side='left')))
+
+def _copy_rows(views, lo, hi, remap, frame_columns, pos):
+    """Write rows [lo, hi) of a chunk's shared-memory columns into the output at `pos`"""
+    for name in ROW_FIELDS:
+        out = frame_columns[name][pos:pos + hi - lo]
+        if name == 'Status':
+            np.take(remap, views[name][lo:hi], out=out)
+        else:
+            out[:] = views[name][lo:hi]
+
+def scan_log_parallel(log_file_path, workers):
+    """Parse the log in a process pool over line-aligned, memory-mapped byte ranges"""
+    log_file_path = Path(log_file_path)
+    size = os.path.getsize(log_file_path)
+    if size == 0:
+        print("Warning: Could not find CLOUDLET DETAILS section in log")
+        return ParallelScan({name: [] for name in ROW_FIELDS}, EventLog(), [])
+
+    results, segments = [], []
+    try:
+        with open(log_file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = split_line_aligned(mm, size, workers * CHUNKS_PER_WORKER)
+            print(f"Parsing {size} bytes in {len(ranges)} chunks across {workers} workers")
+            error = None
+            # Workers share a tracker started now; one started by a worker unlinks its blocks when it exits
+            resource_tracker.ensure_running()
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(parse_chunk, str(log_file_path), start, end) for start, end in ranges]
+                # Wait for every chunk, even after one fails, so all their blocks are unlinked below
+                for future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        error = error or e
+            if error is not None:
+                raise error
+            bounds = _section_bounds(mm, results)
+
+        if bounds is None:
+            print("Warning: Could not find CLOUDLET DETAILS section in log")
+            section_start, section_end = 0, 0
+        else:
+            section_start, section_end = bounds
+
+        # Chunks are in log order and each one's section rows are contiguous, so every row is
+        # copied once, straight from shared memory into its place in the output
+        dtypes = dict(COLUMN_DTYPES)
+        row_ranges = []
+        for result in results:
+            shm = SharedMemory(name=result.shm_name)
+            segments.append(shm)
+            row_ranges.append(_section_rows(_attach_columns(shm, result.row_count)['Offset'],
+                                            section_start, section_end))
+        frame_columns = {name: np.empty(sum(hi - lo for lo, hi in row_ranges), dtype=dtypes[name])
+                         for name in ROW_FIELDS}
+        status_index = {}
+        pos = 0
+        for result, shm, (lo, hi) in zip(results, segments, row_ranges):
+            # Remap worker-local status codes onto one shared table
+            remap = np.array([status_index.setdefault(n, len(status_index)) for n in result.status_names]
+                             or [0], dtype=np.int16)
+            _copy_rows(_attach_columns(shm, result.row_count), lo, hi, remap, frame_columns, pos)
+            pos += hi - lo
+            for offset in result.error_offsets:
+                if section_start < offset < section_end:
+                    print(f"Warning: Error parsing cloudlet data line at byte {offset}")
+    finally:
+        for shm in segments:
+            shm.close()
+        for result in results:
+            _unlink_block(result.shm_name)
+
+    status_names = sorted(status_index, key=status_index.get)
+    frame_columns['Status'] = pd.Categorical.from_codes(frame_columns['Status'], categories=status_names)
+
+    # Chunks are in log order, so concatenating keeps events and transitions ordered
+    events = EventLog()
+    transitions = []
+    for result in results:
+        events.extend(result.events)
+        transitions.extend(result.disaster_transitions)
+    return ParallelScan(frame_columns, events, transitions)
@@ -0,0 +1,270 @@
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from columnar import columnar_path_for
+from quantile_sketch import SKETCH_DIR, SKETCH_SUFFIX
+from render_cache import content_key
+from run_history import DEFAULT_HISTORY
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = PROJECT_DIR / 'scripts'
+SOURCE_DIR = PROJECT_DIR / 'src' / 'org' / 'cloudsim' / 'disaster'
+CLASSPATH_JARS = [PROJECT_DIR / 'lib' / 'cloudsim-3.0.3.jar', PROJECT_DIR / 'lib' / 'commons-math3-3.6.1.jar']
+BUILD_DIR = PROJECT_DIR / 'build'
+CLASSES_DIR = BUILD_DIR / 'classes'
+STATE_PATH = BUILD_DIR / 'pipeline-state.json'
+MAIN_CLASS = 'org.cloudsim.disaster.DisasterRecoverySimulation'
+STAGES = ('compile', 'simulate', 'metrics', 'report')
+DEFAULT_SCENARIO = 'default'
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def tree_digest(paths, root=PROJECT_DIR):
+    """One key over the names and contents of a set of files"""
+    parts = []
+    for path in sorted(Path(p) for p in paths):
+        parts += [os.path.relpath(path, root).replace('\\', '/'), file_digest(path)]
+    return content_key(*parts)
+
+class PipelineState:
+    """Input key and output fingerprints of every stage that has run, persisted between runs.
+
+    A stage is fresh when its input key is unchanged, each recorded output
+    still has the size and modification time it had when the stage finished,
+    and each file it only needs to exist (such as a store shared with other
+    stages, which they keep changing) is still there.
+    """
+
+    def __init__(self, path=STATE_PATH):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        try:
+            self.stages = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            self.stages = {}
+
+    def fresh_output_key(self, stage_id, input_key):
+        """Output key of a stage that can be skipped, or None when it must run"""
+        entry = self.stages.get(stage_id)
+        if entry is None or entry['input_key'] != input_key:
+            return None
+        for name, fingerprint in entry['outputs'].items():
+            try:
+                stat = (PROJECT_DIR / name).stat()
+            except FileNotFoundError:
+                return None
+            if stat.st_size != fingerprint['size'] or stat.st_mtime_ns != fingerprint['mtime_ns']:
+                return None
+        if not all((PROJECT_DIR / name).exists() for name in entry.get('present', [])):
+            return None
+        return entry['output_key']
+
+    def record(self, stage_id, input_key, outputs, present=()):
+        """Fingerprint a stage's outputs, save the state and return the stage's output key"""
+        fingerprints = {}
+        for path in sorted(Path(p) for p in outputs):
+            stat = path.stat()
+            name = os.path.relpath(path, PROJECT_DIR).replace('\\', '/')
+            fingerprints[name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(path)}
+        output_key = content_key(*(f"{name}:{f['sha256']}" for name, f in fingerprints.items()))
+        with self.lock:
+            self.stages[stage_id] = {'input_key': input_key, 'output_key': output_key, 'outputs': fingerprints,
+                                     'present': [os.path.relpath(p, PROJECT_DIR).replace('\\', '/') for p in present]}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            tmp_path.write_text(json.dumps(self.stages, indent=2), encoding='utf-8')
+            os.replace(tmp_path, self.path)
+        return output_key
+
+def run_stage(state, stage_id, input_parts, action, outputs, force=False, present=()):
+    """Run `action` unless the stage's inputs match its last run; returns the stage's output key.
+
+    `outputs` returns the files the stage writes; `present` lists files that
+    must exist for the stage to be skipped but whose contents are not its own.
+    """
+    input_key = content_key(*input_parts)
+    if not force:
+        output_key = state.fresh_output_key(stage_id, input_key)
+        if output_key is not None:
+            print(f"[{stage_id}] inputs unchanged; skipping")
+            return output_key
+    print(f"[{stage_id}] running")
+    action()
+    return state.record(stage_id, input_key, outputs(), present)
+
+def run_command(cmd, stage_id, **kwargs):
+    completed = subprocess.run(cmd, **kwargs)
+    if completed.returncode != 0:
+        raise RuntimeError(f"[{stage_id}] {Path(cmd[0]).name} exited with code {completed.returncode}")
+
+class Scenario:
+    """One simulation run: its JVM arguments and where its outputs go"""
+
+    def __init__(self, name, java_args=()):
+        self.name = name
+        self.java_args = list(java_args)
+        # The simulation writes results/... relative to its working directory
+        self.workdir = PROJECT_DIR if name == DEFAULT_SCENARIO else PROJECT_DIR / 'results' / 'scenarios' / name
+        self.results_dir = self.workdir / 'results'
+        self.log_path = self.results_dir / 'simulation_log.txt'
+        self.events_path = self.results_dir / 'events.bin'
+        self.metrics_path = self.results_dir / 'metrics.csv'
+        self.report_path = self.workdir / 'index.html'
+
+    @property
+    def seeded(self):
+        """Whether the simulation's failure draws are fixed by --seed, so a rerun repeats them"""
+        return '--seed' in self.java_args
+
+    @classmethod
+    def parse(cls, spec):
+        """NAME or NAME=JAVA ARGS, e.g. 'storm=--failure-probability 0.9'"""
+        name, _, args = spec.partition('=')
+        name = name.strip()
+        if not name or os.sep in name or '/' in name:
+            raise ValueError(f"Invalid scenario name: {spec!r}")
+        return cls(name, shlex.split(args))
+
+def java_classpath(*entries):
+    return os.pathsep.join(str(e) for e in (*entries, *CLASSPATH_JARS))
+
+def compile_stage(state, args):
+    sources = sorted(SOURCE_DIR.glob('*.java'))
+
+    def action():
+        shutil.rmtree(CLASSES_DIR, ignore_errors=True)
+        CLASSES_DIR.mkdir(parents=True)
+        run_command([args.javac, '-d', str(CLASSES_DIR), '-cp', java_classpath(), *map(str, sources)], 'compile')
+
+    return run_stage(state, 'compile', [tree_digest(sources), tree_digest(CLASSPATH_JARS)],
+                     action, lambda: CLASSES_DIR.rglob('*.class'), force='compile' in args.force)
+
+def simulate_stage(state, args, scenario, classes_key):
+    def action():
+        scenario.results_dir.mkdir(parents=True, exist_ok=True)
+        for stale in (scenario.log_path, scenario.events_path):
+            stale.unlink(missing_ok=True)
+        cmd = [args.java, '-cp', java_classpath(CLASSES_DIR), MAIN_CLASS, *scenario.java_args]
+        with open(scenario.log_path, 'w', encoding='utf-8') as log:
+            jvm = subprocess.Popen(cmd, cwd=scenario.workdir, stdout=log)
+            try:
+                if args.follow:
+                    # Live snapshots while the JVM runs; the metrics stage replaces them at full precision
+                    subprocess.run([sys.executable, str(SCRIPTS_DIR / 'generate_metrics.py'), '--follow',
+                                    '--log', str(scenario.log_path), '--output', str(scenario.metrics_path)])
+            finally:
+                returncode = jvm.wait()
+        if returncode != 0:
+            raise RuntimeError(f"[simulate:{scenario.name}] java exited with code {returncode}")
+
+    def outputs():
+        return [p for p in (scenario.log_path, scenario.events_path) if p.exists()]
+
+    # Without --seed the JVM seeds from the clock, so an earlier run is not the run this one would give
+    return run_stage(state, f"simulate:{scenario.name}", [classes_key, MAIN_CLASS, scenario.name, *scenario.java_args],
+                     action, outputs, force='simulate' in args.force or not scenario.seeded)
+
+def metrics_stage(state, args, scenario, log_key, scripts_key):
+    source = ['--events', str(scenario.events_path)] if scenario.events_path.exists() \
+        else ['--log', str(scenario.log_path)]
+
+    def action():
+        run_command([sys.executable, str(SCRIPTS_DIR / 'generate_metrics.py'), *source,
+                     '--output', str(scenario.metrics_path)], f"metrics:{scenario.name}")
+
+    def outputs():
+        paths = [p for p in (scenario.metrics_path, scenario.results_dir / 'metadata.csv') if p.exists()]
+        columnar_path = columnar_path_for(scenario.metrics_path)
+        if columnar_path.is_dir():
+            paths += [p for p in columnar_path.iterdir() if p.is_file()]
+        return paths + sketch_paths(scenario)
+
+    # Every scenario adds its runs to the one history store, so it is only required to exist
+    return run_stage(state, f"metrics:{scenario.name}", [log_key, scripts_key, *source[:1]],
+                     action, outputs, force='metrics' in args.force, present=[DEFAULT_HISTORY])
+
+def sketch_paths(scenario):
+    """Quantile sketches of the scenario's runs, which the report pools"""
+    sketch_dir = scenario.results_dir / SKETCH_DIR
+    return sorted(sketch_dir.glob(f'*{SKETCH_SUFFIX}')) if sketch_dir.is_dir() else []
+
+def report_stage(state, args, scenario, metrics_key, scripts_key):
+    def action():
+        run_command([sys.executable, str(SCRIPTS_DIR / 'generate_html_report.py'),
+                     '--metrics', str(scenario.metrics_path), '--output', str(scenario.report_path)],
+                    f"report:{scenario.name}")
+
+    # The trend and percentile sections read the history store and every sketch, not just this run's metrics
+    history = [p for p in (DEFAULT_HISTORY, DEFAULT_HISTORY.with_name(DEFAULT_HISTORY.name + '-wal')) if p.exists()]
+    return run_stage(state, f"report:{scenario.name}",
+                     [metrics_key, scripts_key, str(scenario.report_path), tree_digest(history + sketch_paths(scenario))],
+                     action, lambda: [scenario.report_path], force='report' in args.force)
+
+def run_pipeline(args, scenarios):
+    state = PipelineState()
+    last = STAGES.index(args.until)
+    classes_key = compile_stage(state, args)
+    if last < STAGES.index('simulate'):
+        return
+    scripts_key = tree_digest(SCRIPTS_DIR.rglob('*.py'))
+
+    def simulate_and_extract(scenario):
+        log_key = simulate_stage(state, args, scenario, classes_key)
+        if last < STAGES.index('metrics'):
+            return None
+        return metrics_stage(state, args, scenario, log_key, scripts_key)
+
+    # Each scenario's simulate -> metrics chain is independent; at most --jvms run at once
+    with ThreadPoolExecutor(max_workers=max(1, min(args.jvms, len(scenarios)))) as pool:
+        metrics_keys = list(pool.map(simulate_and_extract, scenarios))
+
+    if last < STAGES.index('report'):
+        return
+    # Reports share the reports/ chart files, so they are rendered one at a time
+    for scenario, metrics_key in zip(scenarios, metrics_keys):
+        report_stage(state, args, scenario, metrics_key, scripts_key)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile, simulate, extract metrics and render reports, skipping stages whose inputs are unchanged")
+    parser.add_argument("--scenario", action="append", default=None, metavar="NAME[=JAVA ARGS]",
+                        help="Simulation run to execute (repeatable). 'default' writes to results/ and index.html; "
+                             "other scenarios write under results/scenarios/NAME/")
+    parser.add_argument("--jvms", type=int, default=os.cpu_count() or 1,
+                        help="Maximum number of simulations running at once")
+    parser.add_argument("--force", action="append", default=[], choices=STAGES + ('all',),
+                        help="Re-run a stage even if its inputs are unchanged (repeatable)")
+    parser.add_argument("--until", choices=STAGES, default='report', help="Stop after this stage")
+    parser.add_argument("--follow", action="store_true",
+                        help="Write live metric snapshots while each simulation runs")
+    parser.add_argument("--java", default="java", help="Java launcher")
+    parser.add_argument("--javac", default="javac", help="Java compiler")
+    args = parser.parse_args()
+    if 'all' in args.force:
+        args.force = list(STAGES)
+
+    try:
+        scenarios = [Scenario.parse(spec) for spec in (args.scenario or [DEFAULT_SCENARIO])]
+        if len({s.name for s in scenarios}) != len(scenarios):
+            raise ValueError("Scenario names must be unique")
+        run_pipeline(args, scenarios)
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
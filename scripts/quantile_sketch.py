@@ -0,0 +1,212 @@
+"""Mergeable t-digest sketches of cloudlet times, for percentiles pooled across runs.
+
+generate_metrics.py sketches each run it extracts and saves the sketch under
+results/sketches/, next to metadata.csv; batch ingestion does the same for
+every log its workers parse. A sketch keeps about compression / 2 weighted
+centroids per metric whatever the run size, and two sketches merge by
+concatenating and re-compressing their centroids, so the report can pool
+thousands of runs one file at a time in constant memory. Quantiles near 0
+and 1 get the smallest centroids, so p99 is estimated to within a fraction
+of a percent of rank.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_COMPRESSION = 200
+# Centroids buffered by merges before they are compressed, as a multiple of the compression
+BUFFER_FACTOR = 50
+SKETCH_DIR = 'sketches'
+SKETCH_SUFFIX = '.sketch'
+# RecoveryDelay is how long after the first disaster a cloudlet finished, for those still running at it
+METRICS = ('FinishTime', 'ExecutionTime', 'RecoveryDelay')
+CENTROID = np.dtype([('mean', '<f8'), ('weight', '<f8')])
+
+# A sketch file is a header, one DIGEST record per metric, then each digest's centroids in that order
+MAGIC = b'DRSKETCH'
+VERSION = 1
+HEADER = np.dtype([('magic', 'S8'), ('version', '<i4'), ('digests', '<i4'), ('runs', '<i8'), ('compression', '<f8')])
+DIGEST = np.dtype([('name', 'S16'), ('count', '<f8'), ('min', '<f8'), ('max', '<f8'), ('centroids', '<i8')])
+
+class TDigest:
+    """Merging t-digest over the k1 scale function, compressed in vectorised passes"""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.centroids = np.zeros(0, dtype=CENTROID)
+        self.count = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            centroids = np.empty(len(values), dtype=CENTROID)
+            centroids['mean'] = values
+            centroids['weight'] = 1.0
+            self._add(centroids, values.min(), values.max())
+        return self
+
+    def merge(self, other):
+        other.compress()
+        if other.count:
+            self._add(other.centroids, other.min, other.max)
+        return self
+
+    def _add(self, centroids, low, high):
+        self._buffer.append(centroids)
+        self._buffered += len(centroids)
+        self.count += float(centroids['weight'].sum())
+        self.min = min(self.min, float(low))
+        self.max = max(self.max, float(high))
+        if self._buffered > BUFFER_FACTOR * self.compression:
+            self.compress()
+
+    def compress(self):
+        """Merge buffered values into the centroids, which until then leave them out"""
+        if not self._buffer:
+            return
+        pending = np.concatenate([self.centroids] + self._buffer)
+        self._buffer, self._buffered = [], 0
+        pending = pending[np.argsort(pending['mean'], kind='stable')]
+        weights = pending['weight']
+        # Centroids whose left edge falls in the same unit of k(q) = c / 2pi * asin(2q - 1) are merged
+        left = (np.cumsum(weights) - weights) / self.count
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * left - 1, -1, 1))
+        groups = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        merged = np.empty(len(starts), dtype=CENTROID)
+        merged['weight'] = np.add.reduceat(weights, starts)
+        merged['mean'] = np.add.reduceat(pending['mean'] * weights, starts) / merged['weight']
+        self.centroids = merged
+
+    def _curve(self):
+        """Cumulative weight at each centroid's centre, pinned to the exact minimum and maximum"""
+        self.compress()
+        weights = self.centroids['weight']
+        centres = np.cumsum(weights) - weights / 2
+        return np.r_[0.0, centres, self.count], np.r_[self.min, self.centroids['mean'], self.max]
+
+    def quantile(self, q):
+        if not self.count:
+            return np.full(np.shape(q), np.nan)
+        ranks, values = self._curve()
+        return np.interp(np.asarray(q, dtype=np.float64) * self.count, ranks, values)
+
+    def cdf(self, x):
+        if not self.count:
+            return np.full(np.shape(x), np.nan)
+        ranks, values = self._curve()
+        return np.interp(np.asarray(x, dtype=np.float64), values, ranks) / self.count
+
+    def rank_error(self, q):
+        """Half the weight of the centroid covering each quantile, as a fraction of all values"""
+        if not self.count:
+            return np.full(np.shape(q), np.nan)
+        self.compress()
+        weights = self.centroids['weight']
+        covering = np.searchsorted(np.cumsum(weights), np.asarray(q, dtype=np.float64) * self.count)
+        return weights[np.minimum(covering, len(weights) - 1)] / 2 / self.count
+
+class RunSketches:
+    """One digest per metric in METRICS, plus how many runs were merged into them"""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, runs=0):
+        self.compression = compression
+        self.runs = runs
+        self.digests = {name: TDigest(compression) for name in METRICS}
+
+    def merge(self, other):
+        self.runs += other.runs
+        for name, digest in other.digests.items():
+            self.digests[name].merge(digest)
+        return self
+
+    def __repr__(self):
+        return f"RunSketches(runs={self.runs}, cloudlets={int(self.digests['FinishTime'].count)})"
+
+def sketch_run(df, disaster_time, compression=DEFAULT_COMPRESSION):
+    """Sketch one run's metrics DataFrame; RecoveryDelay stays empty for runs without a disaster"""
+    sketches = RunSketches(compression, runs=1)
+    if df.empty:
+        return sketches
+    finish = df['FinishTime'].to_numpy(dtype=np.float64, copy=False)
+    sketches.digests['FinishTime'].update(finish)
+    sketches.digests['ExecutionTime'].update(df['ExecutionTime'].to_numpy(dtype=np.float64, copy=False))
+    if disaster_time is not None:
+        sketches.digests['RecoveryDelay'].update(finish[finish > disaster_time] - disaster_time)
+    return sketches
+
+def save_sketches(sketches, path):
+    """Write the digests' centroids to a sketch file, replacing any previous one atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digests = list(sketches.digests.items())
+    for _, digest in digests:
+        digest.compress()
+    header = np.array([(MAGIC, VERSION, len(digests), sketches.runs, sketches.compression)], dtype=HEADER)
+    records = np.array([(name.encode('ascii'), digest.count, digest.min, digest.max, len(digest.centroids))
+                        for name, digest in digests], dtype=DIGEST)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(records.tobytes())
+        for _, digest in digests:
+            f.write(digest.centroids.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+def load_sketches(path):
+    data = Path(path).read_bytes()
+    header = np.frombuffer(data, dtype=HEADER, count=1) if len(data) >= HEADER.itemsize else []
+    if len(header) == 0 or header['magic'][0] != MAGIC:
+        raise ValueError(f"{path} is not a quantile sketch")
+    if int(header['version'][0]) != VERSION:
+        raise ValueError(f"Unsupported sketch version {int(header['version'][0])}")
+    records = np.frombuffer(data, dtype=DIGEST, count=int(header['digests'][0]), offset=HEADER.itemsize)
+    expected = HEADER.itemsize + records.nbytes + int(records['centroids'].sum()) * CENTROID.itemsize
+    if len(data) != expected:
+        raise ValueError(f"{path} is {len(data)} bytes, expected {expected}")
+    sketches = RunSketches(float(header['compression'][0]), runs=int(header['runs'][0]))
+    offset = HEADER.itemsize + records.nbytes
+    for record in records:
+        count = int(record['centroids'])
+        name = record['name'].decode('ascii')
+        if name in sketches.digests:
+            digest = sketches.digests[name]
+            digest.centroids = np.frombuffer(data, dtype=CENTROID, count=count, offset=offset)
+            digest.count, digest.min, digest.max = float(record['count']), float(record['min']), float(record['max'])
+        offset += count * CENTROID.itemsize
+    return sketches
+
+def sketch_files(directory):
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f'*{SKETCH_SUFFIX}'))
+
+def merge_sketch_files(paths, compression=DEFAULT_COMPRESSION):
+    """Pool sketch files one at a time; returns None if none could be read"""
+    pooled = None
+    for path in paths:
+        try:
+            sketches = load_sketches(path)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Skipping unreadable sketch {path}: {e}")
+            continue
+        if pooled is None:
+            pooled = RunSketches(compression)
+        pooled.merge(sketches)
+    return pooled
+
+def sketch_path_for(results_dir, source):
+    """Sketch file for a log, named after its path, size and modification time so re-extracting replaces it"""
+    source = Path(source).resolve()
+    stat = source.stat()
+    key = hashlib.sha256(f"{source}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8')).hexdigest()[:16]
+    return Path(results_dir) / SKETCH_DIR / f"{key}{SKETCH_SUFFIX}"
@@ -0,0 +1,151 @@
+"""Compare post-disaster recovery strategies from one disaster snapshot.
+
+The run up to the first failure of the primary is simulated once, or
+read from a snapshot written by `DisasterRecoverySimulation --snapshot`,
+and each strategy then continues from that snapshot in its own process
+(des_engine.resume). Every variant writes metrics.csv under
+results/variants/<strategy>/, and a summary compares them.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from attribution import FailoverIndex
+from columnar import columnar_path_for, write_columns
+from des_engine import (DEFAULT_FAILURE_PROBABILITY, STRATEGY_HELP, parse_strategy, resume,
+                        run_to_disaster)
+from failure_models import SPEC_HELP, parse_failure_model
+from generate_metrics import build_metrics_frame, write_metadata
+from scheduling import DEFAULT_POLICY, POLICIES
+from snapshot import PENDING, RECEIVED, RUNNING, read_snapshot, write_snapshot
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT_DIR = PROJECT_DIR / 'results' / 'variants'
+DEFAULT_VARIANTS = "reroute,reroute:ect,migrate,wait:30"
+SUMMARY_FILE = 'summary.csv'
+
+def variant_dir_name(strategy):
+    return strategy.replace(':', '-')
+
+def run_variant(snapshot_path, strategy, scheduler, failure_model_spec, failure_probability, seed, output_dir):
+    """Resume one strategy from the snapshot file and write its metrics; runs in a worker process"""
+    started = time.perf_counter()
+    snapshot = read_snapshot(snapshot_path)
+    failure_model = None
+    if failure_model_spec:
+        failure_model = parse_failure_model(failure_model_spec, failure_probability)
+    columns, events, transitions = resume(snapshot, strategy, scheduler, failure_model, seed)
+    index = FailoverIndex(events, transitions)
+    df = build_metrics_frame(columns, index)
+    elapsed = time.perf_counter() - started
+
+    variant_dir = Path(output_dir) / variant_dir_name(strategy)
+    variant_dir.mkdir(parents=True, exist_ok=True)
+    metrics_path = variant_dir / 'metrics.csv'
+    df.to_csv(metrics_path, index=False)
+    write_metadata(index, variant_dir)
+    write_columns(df, columnar_path_for(metrics_path))
+    return {
+        'Strategy': strategy,
+        'Cloudlets': len(df),
+        'Makespan': float(df['FinishTime'].max()) if len(df) else 0.0,
+        'MeanCompletion': float(df['FinishTime'].mean()) if len(df) else 0.0,
+        'AffectedCloudlets': int((df['AffectedByFailover'] == 'Yes').sum()) if len(df) else 0,
+        'Seconds': round(elapsed, 6),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run recovery strategies in parallel from one disaster snapshot")
+    parser.add_argument("--snapshot", default=None,
+                        help="Snapshot written by DisasterRecoverySimulation --snapshot; "
+                             "without it the run up to the disaster is simulated here")
+    parser.add_argument("--save-snapshot", default=None, help="Also keep the simulated snapshot in this file")
+    parser.add_argument("--variants", default=DEFAULT_VARIANTS,
+                        help=f"Comma-separated strategies, each {STRATEGY_HELP}")
+    parser.add_argument("--cloudlets", type=int, default=20, help="Number of cloudlets when simulating the run")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed of the failure draws; with --snapshot, only used if the snapshot has no random state")
+    parser.add_argument("--failure-probability", type=float, default=DEFAULT_FAILURE_PROBABILITY,
+                        help="Probability for the bernoulli failure model")
+    parser.add_argument("--failure-model", default='bernoulli',
+                        help=f"Failure model of the primary datacenter, before and after the snapshot: {SPEC_HELP}")
+    parser.add_argument("--disaster-time", type=float, default=None,
+                        help="Force the disaster at this time; the primary is then never repaired")
+    parser.add_argument("--scheduler", choices=POLICIES, default=DEFAULT_POLICY,
+                        help="Binds the cloudlets, and is the default policy of reroute and migrate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Variants run at once")
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR), help="Directory for the variants' results")
+    args = parser.parse_args()
+
+    variants = [v.strip() for v in args.variants.split(',') if v.strip()]
+    try:
+        for variant in variants:
+            parse_strategy(variant, args.scheduler)
+        failure_model = parse_failure_model(args.failure_model, args.failure_probability)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if not variants:
+        print("Error: No variants given")
+        sys.exit(1)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # A forced disaster is never followed by sampled repairs or failures
+    suffix_model = None if args.disaster_time is not None else args.failure_model
+
+    started = time.perf_counter()
+    if args.snapshot:
+        snapshot_path = Path(args.snapshot)
+        try:
+            snapshot = read_snapshot(snapshot_path)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Loaded {snapshot_path}")
+    else:
+        snapshot = run_to_disaster(args.cloudlets, seed=args.seed, failure_model=failure_model,
+                                   disaster_time=args.disaster_time, scheduler=args.scheduler)
+        if snapshot is None:
+            print("No failure occurred before the workload finished; nothing to branch from.")
+            return
+        snapshot_path = Path(args.save_snapshot) if args.save_snapshot else output_dir / 'snapshot.bin'
+        write_snapshot(snapshot, snapshot_path)
+        print(f"Simulated up to the disaster in {time.perf_counter() - started:.3f}s; snapshot saved to {snapshot_path}")
+    print(f"Disaster at time {snapshot.clock:.2f}: {snapshot.count(RECEIVED)} cloudlets received, "
+          f"{snapshot.count(RUNNING)} running, {snapshot.count(PENDING)} not yet submitted")
+
+    results = []
+    branched = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, min(args.workers, len(variants)))) as pool:
+        futures = {pool.submit(run_variant, str(snapshot_path), variant, args.scheduler, suffix_model,
+                               args.failure_probability, args.seed, str(output_dir)): variant
+                   for variant in variants}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except ValueError as e:
+                print(f"Error in variant {futures[future]}: {e}")
+    elapsed = time.perf_counter() - branched
+    if not results:
+        sys.exit(1)
+
+    # Report in the order the variants were given
+    results.sort(key=lambda r: variants.index(r['Strategy']))
+    summary = pd.DataFrame(results)
+    summary.to_csv(output_dir / SUMMARY_FILE, index=False)
+
+    print(f"{'strategy':>16} {'makespan':>10} {'mean completion':>16} {'affected':>9} {'time':>9}")
+    for r in results:
+        print(f"{r['Strategy']:>16} {r['Makespan']:>10.2f} {r['MeanCompletion']:>16.2f} "
+              f"{r['AffectedCloudlets']:>9} {r['Seconds']:>8.3f}s")
+    print(f"{len(results)} variants branched from time {snapshot.clock:.2f} in {elapsed:.3f}s; "
+          f"results in {output_dir}")
+
+if __name__ == "__main__":
+    main()
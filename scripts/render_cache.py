@@ -0,0 +1,126 @@
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+
+def content_key(*parts):
+    """SHA-256 over an ordered list of str/bytes parts; lengths are mixed in so parts cannot run together"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+class RenderCache:
+    """Content-addressed file cache for rendered charts and HTML, bounded by total size.
+
+    Entries are plain files named <key><suffix>. Reading an entry refreshes
+    its modification time, and eviction drops the least recently used
+    entries once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, root, max_bytes=256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key, suffix):
+        return self.root / f"{key}{suffix}"
+
+    def get(self, key, suffix):
+        """Path of a cached entry, or None on a miss"""
+        path = self._path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_bytes(self, key, suffix):
+        """Contents of a cached entry, or None on a miss"""
+        path = self.get(key, suffix)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, suffix, data):
+        """Store bytes under `key` and evict old entries if the cache is over budget"""
+        path = self._path(key, suffix)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def put_file(self, key, suffix, source):
+        """Store a copy of the file at `source`, without reading it into memory"""
+        path = self._path(key, suffix)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+        return path
+
+    def evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.root):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+class MemoryCache:
+    """In-process LRU of rendered bytes in front of an optional RenderCache.
+
+    Used by the report server, which re-renders in the same process: hits
+    are served from memory, misses fall through to the disk cache, and
+    puts go to both. Has the get_bytes/put half of RenderCache's interface.
+    """
+
+    def __init__(self, backing=None, max_bytes=64 * 1024 * 1024):
+        self.backing = backing
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total = 0
+
+    def get_bytes(self, key, suffix):
+        data = self.entries.get((key, suffix))
+        if data is not None:
+            self.entries.move_to_end((key, suffix))
+            return data
+        data = self.backing.get_bytes(key, suffix) if self.backing is not None else None
+        if data is not None:
+            self._remember(key, suffix, data)
+        return data
+
+    def put(self, key, suffix, data):
+        self._remember(key, suffix, data)
+        if self.backing is not None:
+            self.backing.put(key, suffix, data)
+
+    def _remember(self, key, suffix, data):
+        previous = self.entries.pop((key, suffix), None)
+        if previous is not None:
+            self.total -= len(previous)
+        self.entries[(key, suffix)] = data
+        self.total += len(data)
+        while self.total > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.total -= len(evicted)
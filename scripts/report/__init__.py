@@ -0,0 +1,8 @@
+"""HTML report of a simulation run, split so that a run imports only what it needs.
+
+cli drives the stages. metrics, sections and template read the inputs and
+fill in the HTML with the standard library and NumPy; charts works out
+which charts the render cache is missing and only then imports figures,
+which loads matplotlib. A report whose HTML or charts are cached, or one
+run with --no-charts, never loads the plotting stack.
+"""
@@ -0,0 +1,162 @@
+"""Report charts, keyed on the aggregates they draw and rendered only when the cache misses.
+
+Keys are computed with NumPy alone; figures.py, and with it matplotlib, is
+imported the first time a chart actually has to be drawn. Inline reports
+embed the panels composed into one PNG; with external assets each panel is
+its own file, as SVG when it draws few enough marks that vectors are
+smaller than pixels, and otherwise as WebP where Pillow supports it.
+"""
+import importlib.util
+
+import numpy as np
+
+from instrument import record as record_stage, stage
+from render_cache import content_key
+from timeline import RATE_BINS, payload_bytes, timeline_payload
+from report.sections import sketch_bytes
+from report.template import TEMPLATE_VERSION
+
+CHART_FORMATS = ('auto', 'svg', 'webp', 'png')
+# Above this many bars, points or steps a chart is written as pixels rather than SVG
+SVG_MAX_MARKS = 250
+
+# figures.py once imported and set up for rendering in this process
+_figures = None
+
+def load_figures():
+    """Import the drawing module, and matplotlib with it, on first use"""
+    global _figures
+    if _figures is None:
+        from report import figures
+        figures.init_render_worker()
+        _figures = figures
+    return _figures
+
+def webp_supported():
+    """Whether Pillow can write WebP, checked without importing it"""
+    try:
+        return importlib.util.find_spec('PIL._webp') is not None
+    except ModuleNotFoundError:
+        return False
+
+def figure_marks(kind, payload):
+    """Roughly how many marks a figure draws, which is what its SVG size grows with"""
+    if kind == 'timeline':
+        # The density timeline is an image already
+        return {'scatter': payload.get('rows', 0), 'rate': 2 * RATE_BINS, 'missing': 0}.get(payload['mode'], np.inf)
+    return len(payload['ids']) if payload is not None else 0
+
+def chart_format(marks, requested='auto'):
+    """Image format for a figure: the requested one, or for 'auto' SVG for few marks and WebP or PNG beyond"""
+    if requested == 'webp' and not webp_supported():
+        print("Warning: Pillow cannot write WebP here; writing PNG instead")
+        return 'png'
+    if requested != 'auto':
+        return requested
+    if marks <= SVG_MAX_MARKS:
+        return 'svg'
+    return 'webp' if webp_supported() else 'png'
+
+def render_missing(jobs, cache, workers):
+    """Image bytes for every job, rendering cache misses in parallel worker processes"""
+    results = {}
+    pending = []
+    for kind, key, payload, label, fmt in jobs:
+        hit = cache.get_bytes(key, f'.{fmt}') if cache is not None else None
+        if hit is not None:
+            print(f"Reused cached {label}")
+            results[kind] = hit
+        else:
+            pending.append((kind, key, payload, label, fmt))
+
+    if not pending:
+        return results
+
+    with stage('import_figures'):
+        figures = load_figures()
+    if workers > 1 and len(pending) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)),
+                                 initializer=figures.init_render_worker) as pool:
+            futures = [pool.submit(figures.render_job, kind, payload, fmt) for kind, _, payload, _, fmt in pending]
+            rendered = [future.result() for future in futures]
+    else:
+        rendered = [figures.render_job(kind, payload, fmt) for kind, _, payload, _, fmt in pending]
+
+    for (kind, key, _, label, fmt), (image, draw_s, savefig_s) in zip(pending, rendered):
+        # Workers time themselves; their records are added here in the parent
+        record_stage(f"draw.{kind}", wall_s=round(draw_s, 6))
+        record_stage(f"savefig.{kind}", wall_s=round(savefig_s, 6), bytes=len(image), format=fmt)
+        if cache is not None:
+            cache.put(key, f'.{fmt}', image)
+        print(f"Rendered {label}")
+        results[kind] = image
+    return results
+
+def aggregate_bytes(per_vm, *fields):
+    """Raw bytes of per-VM aggregates, so bar charts are keyed on what they draw rather than on every row"""
+    if per_vm is None:
+        return [b'missing']
+    parts = [np.ascontiguousarray(per_vm['ids'], dtype=np.int64).tobytes()]
+    for field in fields:
+        values = per_vm['counts'] if field == 'counts' else per_vm['means'].get(field, np.empty(0))
+        parts.append(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return parts
+
+def render_charts(df, stats, disaster_time, cache, workers=1, timeline_mode='auto', image_format=None):
+    """Render the report charts, re-drawing only the panels whose inputs changed.
+
+    Without `image_format` the panels are composed into the two PNGs the
+    inline report embeds. With one of CHART_FORMATS every panel is returned
+    as its own image, keyed by file name, e.g. 'timeline.webp'.
+    """
+    version = f"charts-v{TEMPLATE_VERSION}"
+    per_vm = stats['per_vm']
+    # The timeline is reduced to points or bins up front, so workers never see the full table
+    timeline = timeline_payload(df, disaster_time, timeline_mode)
+    if timeline['mode'] not in ('scatter', 'missing'):
+        print(f"Drawing {timeline['rows']} cloudlets as a binned {timeline['mode']} timeline")
+
+    panels = [
+        ('exec_by_vm', per_vm, aggregate_bytes(per_vm, 'ExecutionTime'), "execution time panel"),
+        ('tasks_per_vm', per_vm, aggregate_bytes(per_vm, 'counts'), "tasks per VM panel"),
+        ('timeline', timeline, payload_bytes(timeline), "completion timeline panel"),
+        ('vm_utilization', per_vm, aggregate_bytes(per_vm, 'counts'), "VM utilization chart"),
+    ]
+    jobs = []
+    for kind, payload, parts, label in panels:
+        fmt = 'png' if image_format is None else chart_format(figure_marks(kind, payload), image_format)
+        jobs.append((kind, content_key(version, kind, fmt, *parts), payload, label, fmt))
+    if image_format is not None:
+        images = render_missing(jobs, cache, workers)
+        return {f"{kind}.{fmt}": (key, images[kind]) for kind, key, _, _, fmt in jobs}
+
+    keys = {kind: key for kind, key, _, _, _ in jobs}
+    perf_key = content_key(version, 'performance_metrics', keys['exec_by_vm'], keys['tasks_per_vm'], keys['timeline'])
+    perf_png = cache.get_bytes(perf_key, '.png') if cache is not None else None
+    if perf_png is not None:
+        print("Reused cached performance metrics chart")
+        jobs = jobs[-1:]
+
+    pngs = render_missing(jobs, cache, workers)
+    if perf_png is None:
+        with stage('compose'):
+            perf_png = load_figures().compose_performance_chart(pngs['exec_by_vm'], pngs['tasks_per_vm'], pngs['timeline'])
+        if cache is not None:
+            cache.put(perf_key, '.png', perf_png)
+    return {'performance_metrics.png': (perf_key, perf_png), 'vm_utilization.png': (keys['vm_utilization'], pngs['vm_utilization'])}
+
+def render_percentile_chart(pooled, cache, image_format='png'):
+    """CDF chart of the pooled quantile sketches, keyed by file name like render_charts' images"""
+    # A few hundred points per line, so 'auto' always picks SVG
+    fmt = chart_format(len(pooled.digests), image_format)
+    key = content_key(f"charts-v{TEMPLATE_VERSION}", 'sketch_cdf', fmt, *sketch_bytes(pooled))
+    image = cache.get_bytes(key, f'.{fmt}') if cache is not None else None
+    if image is not None:
+        print("Reused cached percentile chart")
+    else:
+        image = load_figures().render_sketch_cdf(pooled, fmt)
+        if cache is not None:
+            cache.put(key, f'.{fmt}', image)
+        print("Rendered percentile chart")
+    return {f'percentiles.{fmt}': (key, image)}
@@ -0,0 +1,261 @@
+"""Command line of the HTML report: option parsing and the order of the stages.
+
+Everything up to the HTML cache lookup (run history, sketches, input
+digests) needs only the standard library and NumPy, as do loading and
+aggregating the metrics; charts.py imports matplotlib only for charts the
+render cache does not hold. pandas is not used at all.
+
+By default the charts are inlined and the report is one self-contained
+file. With --assets external they are written as separate files next to
+it, with the per-cloudlet table as paged JSON, so the HTML stays small and
+paints before any chart has loaded.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from aggregate import aggregate_metrics
+from instrument import TIMINGS_FILE, stage, start_run
+from quantile_sketch import SKETCH_DIR, merge_sketch_files, sketch_files
+from render_cache import RenderCache, content_key
+from run_history import DEFAULT_HISTORY, DEFAULT_TREND_RUNS
+from timeline import TIMELINE_MODES
+from report.charts import CHART_FORMATS, render_charts, render_percentile_chart
+from report.metrics import file_digest, input_files, load_metrics, read_disaster_time
+from report.sections import load_trend, render_percentile_section, render_trend_section, sketch_bytes
+from report.table import DEFAULT_PAGE_ROWS, TABLE_DIR, is_current, render_table_section, write_pages
+from report.template import (IMAGE_TYPES, TEMPLATE_VERSION, get_image_base64, html_sections, image_data_uri,
+                             render_asset_charts_html, render_charts_html, write_html)
+
+ASSETS_DIR = 'report_assets'
+
+def restore_charts(cache, manifest, chart_dir):
+    """Copy cached chart files into the chart directory; False if any has been evicted"""
+    for name, key in manifest['charts'].items():
+        cached = cache.get(key, Path(name).suffix)
+        if cached is None:
+            return False
+        target = chart_dir / name
+        if not target.exists() or target.stat().st_size != cached.stat().st_size:
+            chart_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cached, target)
+    return True
+
+def write_assets(images, assets_dir):
+    """Write chart images next to the report, removing copies in other formats left by earlier reports"""
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    for name, (_, data) in images.items():
+        (assets_dir / name).write_bytes(data)
+    stems = {Path(name).stem for name in images}
+    for path in assets_dir.iterdir():
+        if path.stem in stems and path.name not in images and path.suffix[1:] in IMAGE_TYPES:
+            path.unlink()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate HTML report from simulation metrics")
+    parser.add_argument("--metrics", default=None, help="Path to metrics CSV file")
+    parser.add_argument("--output", default=None, help="Output path for HTML report")
+    parser.add_argument("--no-cache", action="store_true", help="Re-render every chart and the HTML from scratch")
+    parser.add_argument("--cache-dir", default=None, help="Render cache directory (default: reports/.cache)")
+    parser.add_argument("--cache-max-mb", type=float, default=256, help="Evict least recently used renders above this size")
+    parser.add_argument("--timeline", choices=TIMELINE_MODES, default='auto',
+                        help="Completion timeline style; 'auto' switches from a scatter to a density raster for large runs")
+    parser.add_argument("--render-workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Processes used to render chart figures in parallel")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY),
+                        help="Run-history store for the trend section (default: results/history.sqlite)")
+    parser.add_argument("--trend-runs", type=int, default=DEFAULT_TREND_RUNS,
+                        help="Number of earlier runs the trend section compares with")
+    parser.add_argument("--no-history", action="store_true", help="Leave the trend section out")
+    parser.add_argument("--sketches", default=None,
+                        help="Directory of quantile sketches to pool for the percentile section "
+                             "(default: sketches/ next to the metrics file)")
+    parser.add_argument("--no-sketches", action="store_true", help="Leave the percentile section out")
+    parser.add_argument("--no-charts", action="store_true",
+                        help="Only the statistics and cross-run sections: no charts, and matplotlib is never imported")
+    parser.add_argument("--reports-dir", default=None, help="Directory the chart images are written to (default: reports/)")
+    parser.add_argument("--assets", choices=('inline', 'external'), default='inline',
+                        help="Inline the charts in the HTML, or write them and a paged cloudlet table as separate files")
+    parser.add_argument("--assets-dir", default=None,
+                        help=f"Directory for external assets (default: {ASSETS_DIR}/ next to the HTML report)")
+    parser.add_argument("--chart-format", choices=CHART_FORMATS, default='auto',
+                        help="Format of external charts; 'auto' writes SVG for charts with few marks and WebP otherwise")
+    parser.add_argument("--page-rows", type=int, default=DEFAULT_PAGE_ROWS,
+                        help="Cloudlets per page of the external cloudlet table")
+    parser.add_argument("--profile", nargs='?', const='render_charts', default=None, metavar="STAGE",
+                        help="Run one stage under cProfile and save its stats next to the timings "
+                             "(default stage: render_charts)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record per-stage peak memory with tracemalloc (slower)")
+    
+    args = parser.parse_args()
+    
+    # Use Path for cross-platform compatibility; this module lives in scripts/report/
+    project_dir = Path(__file__).resolve().parent.parent.parent
+    
+    # Set up directories using pathlib for cross-platform compatibility
+    reports_dir = Path(args.reports_dir) if args.reports_dir else project_dir / 'reports'
+    results_dir = project_dir / 'results'
+    
+    # Determine output path for HTML report
+    if args.output is None:
+        output_html_path = project_dir / 'index.html'
+    else:
+        output_html_path = Path(args.output)
+    
+    # Determine metrics file path
+    if args.metrics is None:
+        metrics_csv_path = results_dir / 'metrics.csv'
+    else:
+        metrics_csv_path = Path(args.metrics)
+    metadata_path = metrics_csv_path.parent / 'metadata.csv'
+    # Stage timings are appended next to metadata.csv, one NDJSON line per run
+    start_run('generate_html_report', metrics_csv_path.parent / TIMINGS_FILE, args.profile, args.trace_memory)
+    
+    # Ensure directories exist
+    reports_dir.mkdir(exist_ok=True, parents=True)
+    results_dir.mkdir(exist_ok=True, parents=True)
+    
+    print(f"Using metrics file: {metrics_csv_path}")
+    print(f"Output HTML report will be saved to: {output_html_path}")
+    
+    # Get relative path for results directory (for download link)
+    # Use a relative path that works in both Windows and Linux
+    rel_results_path = os.path.relpath(metrics_csv_path.parent, output_html_path.parent)
+    metrics_rel_path = os.path.join(rel_results_path, 'metrics.csv').replace('\\', '/')
+
+    external = args.assets == 'external'
+    assets_dir = Path(args.assets_dir) if args.assets_dir else output_html_path.parent / ASSETS_DIR
+    assets_rel_path = os.path.relpath(assets_dir, output_html_path.parent).replace('\\', '/')
+    # Inline reports keep their charts in reports/ as well; external ones only beside the HTML
+    chart_dir = assets_dir if external else reports_dir
+    layout = ['external', assets_rel_path, args.chart_format, str(args.page_rows)] if external else ['inline']
+
+    cache = None
+    if not args.no_cache:
+        cache_dir = Path(args.cache_dir) if args.cache_dir else reports_dir / '.cache'
+        cache = RenderCache(cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+    # Indexed queries, cheap enough to run before the cache lookup; the section is part of the cache key
+    trend_html = ''
+    if not args.no_history:
+        with stage('load_trend'):
+            trend_html = render_trend_section(load_trend(args.history, metrics_csv_path, args.trend_runs))
+    # Sketches are merged one file at a time, so memory stays flat however many runs there are
+    pooled = None
+    if not args.no_sketches:
+        sketch_dir = Path(args.sketches) if args.sketches else metrics_csv_path.parent / SKETCH_DIR
+        with stage('merge_sketches') as record:
+            paths = sketch_files(sketch_dir)
+            pooled = merge_sketch_files(paths)
+            record['files'] = len(paths)
+
+    inputs = []
+    if cache is not None or external:
+        with stage('digest_inputs'):
+            inputs = [f"{p.name}:{file_digest(p)}" for p in input_files(metrics_csv_path, metadata_path)]
+    # The cloudlet table depends on nothing but the metrics
+    table_key = content_key(f"cloudlets-v{TEMPLATE_VERSION}", *inputs) if external else None
+
+    # Fast path: identical inputs produce an identical report
+    html_key = None
+    if cache is not None:
+        with stage('cache_lookup') as record:
+            html_key = content_key(f"html-v{TEMPLATE_VERSION}", metrics_rel_path, str(datetime.now().year), trend_html,
+                                   'no-charts' if args.no_charts else 'charts', *layout, *sketch_bytes(pooled), *inputs)
+            cached_html = cache.get(html_key, '.html')
+            cached_manifest = cache.get(html_key, '.json')
+            record['hit'] = False
+            if cached_html is not None and cached_manifest is not None:
+                manifest = json.loads(cached_manifest.read_text(encoding='utf-8'))
+                if (restore_charts(cache, manifest, chart_dir)
+                        and (table_key is None or is_current(assets_dir / TABLE_DIR, table_key))):
+                    shutil.copyfile(cached_html, output_html_path)
+                    record['hit'] = True
+        if record['hit']:
+            print(f"Inputs unchanged; reused cached HTML report at {output_html_path}")
+            return
+
+    try:
+        with stage('load_metrics') as record:
+            df = load_metrics(metrics_csv_path)
+            record['rows'] = len(df)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    # Get disaster time from metadata or use default
+    disaster_time = read_disaster_time(metadata_path)
+    
+    try:
+        # One aggregation pass feeds both the charts and the HTML
+        with stage('aggregate', rows=len(df)):
+            stats = aggregate_metrics(df)
+        
+        charts, charts_html = {}, ''
+        if not args.no_charts:
+            # Keyed on the aggregates; matplotlib is only imported if a chart is not in the cache
+            with stage('render_charts', rows=len(df)):
+                charts = render_charts(df, stats, disaster_time, cache, workers=args.render_workers,
+                                       timeline_mode=args.timeline, image_format=args.chart_format if external else None)
+            if external:
+                with stage('write_charts'):
+                    write_assets(charts, assets_dir)
+                print(f"Saved {len(charts)} chart files to {assets_dir}")
+                charts_html = render_asset_charts_html({Path(name).stem: f"{assets_rel_path}/{name}" for name in charts})
+            else:
+                perf_metrics_path = reports_dir / 'performance_metrics.png'
+                vm_util_path = reports_dir / 'vm_utilization.png'
+                with stage('write_charts'):
+                    perf_metrics_path.write_bytes(charts['performance_metrics.png'][1])
+                    vm_util_path.write_bytes(charts['vm_utilization.png'][1])
+                print(f"Saved performance metrics chart to {perf_metrics_path}")
+                print(f"Saved VM utilization chart to {vm_util_path}")
+                
+                # Get base64 encoded images for inline display
+                with stage('get_image_base64'):
+                    charts_html = render_charts_html(get_image_base64(perf_metrics_path), get_image_base64(vm_util_path))
+        
+        percentile_html = ''
+        if pooled is not None:
+            with stage('render_percentiles'):
+                cdf_src = None
+                if not args.no_charts:
+                    cdf = render_percentile_chart(pooled, cache, args.chart_format if external else 'png')
+                    name, (_, image) = next(iter(cdf.items()))
+                    if external:
+                        write_assets(cdf, assets_dir)
+                        charts.update(cdf)
+                        cdf_src = f"{assets_rel_path}/{name}"
+                    else:
+                        cdf_src = image_data_uri(image)
+                percentile_html = render_percentile_section(pooled, cdf_src, lazy=external)
+        
+        table_html = ''
+        if external:
+            # Paged so the browser downloads one page at a time, and only when the table is opened
+            with stage('write_table', rows=len(df)):
+                index = write_pages(df, assets_dir / TABLE_DIR, table_key, args.page_rows)
+            table_html = render_table_section(index, f"{assets_rel_path}/{TABLE_DIR}")
+        
+        # Streamed to disk one section at a time rather than assembled as one string
+        with stage('write_html') as record:
+            record['bytes'] = write_html(output_html_path, html_sections(stats, disaster_time, charts_html, metrics_rel_path,
+                                                                         trend_html, percentile_html, table_html))
+        
+        if cache is not None:
+            with stage('cache_store'):
+                manifest = {'charts': {name: key for name, (key, _) in charts.items()}}
+                cache.put(html_key, '.json', json.dumps(manifest).encode('utf-8'))
+                cache.put_file(html_key, '.html', output_html_path)
+        
+        print(f"Enhanced HTML report generated at {output_html_path}")
+        
+    except Exception as e:
+        print(f"Error generating report: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)  # Exit with error code
@@ -0,0 +1,149 @@
+"""Chart drawing, the one part of the report that imports matplotlib.
+
+charts.py imports this module only when a chart is missing from the render
+cache, so cached reports and --no-charts runs never load the plotting stack.
+"""
+import io
+import time
+
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
+
+from aggregate import PRIMARY_VM_COUNT
+from timeline import render_timeline
+from report.sections import CDF_POINTS, SKETCH_LABELS
+
+DPI = 100
+IMAGE_FORMATS = ('png', 'svg', 'webp')
+# Keyword arguments per format so the same figure always encodes to the same bytes
+SAVEFIG_OPTIONS = {
+    'png': {},
+    'svg': {'metadata': {'Date': None}},
+    'webp': {'pil_kwargs': {'lossless': True, 'method': 4}},
+}
+
+# Seconds spent in savefig by the current render job, so drawing and encoding can be told apart
+savefig_seconds = 0.0
+# Format the current render job encodes its figure in
+image_format = 'png'
+
+def figure_image(fig):
+    """Render a figure to image bytes in the current job's format and close it"""
+    global savefig_seconds
+    buffer = io.BytesIO()
+    started = time.perf_counter()
+    fig.savefig(buffer, format=image_format, dpi=DPI, **SAVEFIG_OPTIONS[image_format])
+    savefig_seconds += time.perf_counter() - started
+    plt.close(fig)
+    return buffer.getvalue()
+
+def vm_colors(vm_ids, primary='blue', backup='orange'):
+    return [primary if i < PRIMARY_VM_COUNT else backup for i in vm_ids]
+
+def render_exec_by_vm_panel(per_vm):
+    # Plot 1: Execution Time by VM
+    fig = plt.figure(figsize=(7.5, 4))
+    if per_vm is not None and 'ExecutionTime' in per_vm['means']:
+        plt.bar(per_vm['ids'], per_vm['means']['ExecutionTime'], color=vm_colors(per_vm['ids']))
+        plt.title('Average Execution Time by VM')
+        plt.xlabel('VM ID')
+        plt.ylabel('Execution Time (seconds)')
+        plt.grid(axis='y', linestyle='--', alpha=0.7)
+    else:
+        plt.text(0.5, 0.5, 'Missing required data columns', 
+                horizontalalignment='center', verticalalignment='center')
+    plt.tight_layout()
+    return figure_image(fig)
+
+def render_tasks_per_vm_panel(per_vm):
+    # Plot 2: Tasks per VM
+    fig = plt.figure(figsize=(7.5, 4))
+    if per_vm is not None:
+        plt.bar(per_vm['ids'], per_vm['counts'], color=vm_colors(per_vm['ids']))
+        plt.title('Number of Tasks Processed by Each VM')
+        plt.xlabel('VM ID')
+        plt.ylabel('Number of Tasks')
+        plt.grid(axis='y', linestyle='--', alpha=0.7)
+    else:
+        plt.text(0.5, 0.5, 'Missing VM data', 
+                horizontalalignment='center', verticalalignment='center')
+    plt.tight_layout()
+    return figure_image(fig)
+
+def render_timeline_panel(payload):
+    # Plot 3: Task Completion Timeline
+    fig = plt.figure(figsize=(15, 4))
+    render_timeline(plt, payload)
+    plt.tight_layout()
+    return figure_image(fig)
+
+def compose_performance_chart(exec_png, tasks_png, timeline_png):
+    """Stitch the three panels into the 2x2 performance metrics layout"""
+    panels = [mpimg.imread(io.BytesIO(png), format='png') for png in (exec_png, tasks_png, timeline_png)]
+    top = np.hstack(panels[:2])
+    bottom = panels[2]
+    width = max(top.shape[1], bottom.shape[1])
+    pad = lambda img: np.pad(img, ((0, 0), (0, width - img.shape[1]), (0, 0)), constant_values=1.0)
+    buffer = io.BytesIO()
+    plt.imsave(buffer, np.vstack([pad(top), pad(bottom)]), format='png')
+    return buffer.getvalue()
+
+def render_vm_utilization(per_vm):
+    # Generate VM utilization chart
+    fig = plt.figure(figsize=(10, 6))
+    if per_vm is not None:
+        # Colors differentiate primary (steelblue) and backup (darkorange) VMs
+        plt.bar(per_vm['ids'], per_vm['counts'], color=vm_colors(per_vm['ids'], 'steelblue', 'darkorange'))
+        plt.title('Tasks Processed by Each VM')
+        plt.xlabel('VM ID')
+        plt.ylabel('Number of Tasks')
+        plt.grid(axis='y', linestyle='--', alpha=0.7)
+    else:
+        plt.text(0.5, 0.5, 'Missing VM data', 
+                horizontalalignment='center', verticalalignment='center')
+    return figure_image(fig)
+
+RENDERERS = {
+    'exec_by_vm': render_exec_by_vm_panel,
+    'tasks_per_vm': render_tasks_per_vm_panel,
+    'timeline': render_timeline_panel,
+    'vm_utilization': render_vm_utilization,
+}
+
+def init_render_worker():
+    # Configure matplotlib to use Agg backend which works on all platforms without display
+    plt.switch_backend('Agg')
+    # Set default matplotlib style for consistent appearance across platforms
+    plt.style.use('seaborn-v0_8-darkgrid')
+    # SVG element ids are otherwise random, which would change the bytes of every render
+    plt.rcParams['svg.hashsalt'] = 'disaster-recovery-report'
+    # Text stays text rather than glyph outlines, which is most of a chart's SVG otherwise
+    plt.rcParams['svg.fonttype'] = 'none'
+
+def render_job(kind, payload, fmt='png'):
+    """Render one figure to image bytes; runs in a worker process. Also returns (draw, savefig) seconds"""
+    global savefig_seconds, image_format
+    savefig_seconds = 0.0
+    image_format = fmt
+    started = time.perf_counter()
+    png = RENDERERS[kind](payload)
+    elapsed = time.perf_counter() - started
+    return png, elapsed - savefig_seconds, savefig_seconds
+
+def render_sketch_cdf(pooled, fmt='png'):
+    """CDF of each sketched metric, drawn from the pooled digests' quantile curves"""
+    global image_format
+    image_format = fmt
+    fig = plt.figure(figsize=(10, 4.5))
+    q = np.linspace(0, 1, CDF_POINTS)
+    for name, digest in pooled.digests.items():
+        if digest.count:
+            plt.plot(digest.quantile(q), q, label=SKETCH_LABELS[name])
+    plt.title(f"Cumulative Distribution Across {pooled.runs} Run{'s' if pooled.runs != 1 else ''}")
+    plt.xlabel('Seconds')
+    plt.ylabel('Fraction of cloudlets')
+    plt.grid(linestyle='--', alpha=0.7)
+    plt.legend(loc='lower right')
+    plt.tight_layout()
+    return figure_image(fig)
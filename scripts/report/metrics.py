@@ -0,0 +1,163 @@
+"""Metrics and metadata for the report, read with NumPy and the standard library only"""
+import csv
+import hashlib
+
+import numpy as np
+
+from columnar import columnar_path_for, is_fresh, read_column_arrays
+
+# Columns the report reads; the rest of the column store is not loaded
+REPORT_COLUMNS = ['CloudletID', 'DatacenterID', 'VMId', 'ExecutionTime', 'StartTime', 'FinishTime', 'WaitTime',
+                  'AffectedByFailover']
+INTEGER_COLUMNS = ('CloudletID', 'DatacenterID', 'VMId')
+
+class MetricsTable:
+    """Metrics columns as NumPy arrays, indexed like the DataFrame aggregate.py and timeline.py also accept.
+
+    AffectedByFailover is held as a boolean mask rather than Yes/No labels.
+    """
+
+    def __init__(self, data, rows):
+        self.data = dict(data)
+        self.rows = rows
+
+    @property
+    def columns(self):
+        return list(self.data)
+
+    def __len__(self):
+        return self.rows
+
+    def __contains__(self, name):
+        return name in self.data
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    def __setitem__(self, name, values):
+        self.data[name] = values
+
+def sample_metrics():
+    """Sample data based on the simulation log, used when no metrics are available"""
+    return MetricsTable({
+        'CloudletID': np.arange(20),
+        'VMId': np.array([0, 1, 2, 3, 4, 5] * 3 + [0, 1]),
+        'StartTime': np.full(20, 0.1),
+        'FinishTime': np.array([15.1] * 6 + [20.1] * 8 + [60.1] * 6),
+        'ExecutionTime': np.array([15.0] * 6 + [20.0] * 8 + [60.0] * 6),
+        'WaitTime': np.zeros(20),
+        'AffectedByFailover': np.arange(20) >= 14  # Assuming VMs 4 and 5 were affected
+    }, 20)
+
+def read_disaster_time(metadata_path, default=20.0):
+    """Disaster time recorded in metadata.csv, or the default when unavailable"""
+    if metadata_path.exists():
+        try:
+            with open(metadata_path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    if row.get('Parameter') == 'DisasterTime':
+                        return float(row['Value'])
+        except Exception as e:
+            print(f"Error reading metadata: {e}")
+    return default
+
+def read_store(store_path):
+    """The report's columns from a memory-mapped column store"""
+    rows, arrays, categories = read_column_arrays(store_path, names=REPORT_COLUMNS)
+    if 'AffectedByFailover' in arrays:
+        labels = categories.get('AffectedByFailover', [])
+        codes = arrays['AffectedByFailover']
+        arrays['AffectedByFailover'] = codes == labels.index('Yes') if 'Yes' in labels \
+            else np.zeros(rows, dtype=bool)
+    return MetricsTable(arrays, rows)
+
+def float_values(values):
+    """Parse CSV cells as float64; empty cells are missing values and become NaN"""
+    return np.array([value if value.strip() else 'nan' for value in values], dtype=np.float64)
+
+def read_csv(metrics_csv_path):
+    """The report's columns from a metrics CSV, parsed with the csv module.
+
+    Empty cells read as NaN, or -1 in the integer ID columns. A cell that
+    is not a number raises ValueError naming its column.
+    """
+    with open(metrics_csv_path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = list(reader)
+    data = {}
+    for i, name in enumerate(header):
+        if name not in REPORT_COLUMNS:
+            continue
+        values = [row[i] if i < len(row) else '' for row in rows]
+        if name == 'AffectedByFailover':
+            data[name] = np.array(values) == 'Yes'
+            continue
+        try:
+            parsed = float_values(values)
+        except ValueError as e:
+            raise ValueError(f"Column {name} of {metrics_csv_path} holds a value that is not a number ({e})") from e
+        if name in INTEGER_COLUMNS:
+            parsed = np.where(np.isnan(parsed), -1, parsed).astype(np.int64)
+        data[name] = parsed
+    return MetricsTable(data, len(rows))
+
+def load_metrics(metrics_csv_path):
+    """Load metrics, preferring the memory-mapped column store, and fill in missing columns.
+
+    Sample data stands in only when there is no metrics file at all; a file
+    that cannot be parsed raises ValueError rather than being replaced.
+    """
+    # Prefer the typed column store written by generate_metrics.py; it is memory-mapped
+    columnar_path = columnar_path_for(metrics_csv_path)
+
+    # Check if metrics file exists
+    if not metrics_csv_path.exists() and not is_fresh(columnar_path, metrics_csv_path):
+        print(f"Warning: Metrics file not found at {metrics_csv_path}")
+        print("Using sample metrics data")
+        return sample_metrics()
+
+    # Read the existing metrics file
+    if is_fresh(columnar_path, metrics_csv_path):
+        df = read_store(columnar_path)
+        print(f"Memory-mapped column store with {len(df)} records from {columnar_path}")
+    else:
+        df = read_csv(metrics_csv_path)
+        print(f"Read existing metrics file with {len(df)} records")
+
+    # Check for required columns and add if missing
+    required_columns = ['CloudletID', 'VMId', 'StartTime', 'FinishTime', 'ExecutionTime', 'WaitTime', 'AffectedByFailover']
+
+    for column in required_columns:
+        if column not in df.columns:
+            if column == 'AffectedByFailover':
+                # Based on the simulation log: VMs 4-5 took longer (60s), might be affected by failover
+                df['AffectedByFailover'] = np.isin(df['VMId'], [4, 5])
+            else:
+                print(f"Warning: Required column '{column}' missing from metrics file")
+                # Add default values for missing columns
+                if column == 'WaitTime':
+                    df['WaitTime'] = np.zeros(len(df))
+                elif column in ['StartTime', 'FinishTime', 'ExecutionTime']:
+                    df[column] = np.zeros(len(df))
+                elif column == 'CloudletID':
+                    df['CloudletID'] = np.arange(len(df))
+                elif column == 'VMId':
+                    df['VMId'] = np.zeros(len(df), dtype=np.int64)
+    return df
+
+def input_files(metrics_csv_path, metadata_path):
+    """Files whose bytes determine the report"""
+    columnar_path = columnar_path_for(metrics_csv_path)
+    if is_fresh(columnar_path, metrics_csv_path):
+        files = sorted(p for p in columnar_path.iterdir() if p.is_file())
+    else:
+        files = [metrics_csv_path]
+    return [p for p in files + [metadata_path] if p.exists()]
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
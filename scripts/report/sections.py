@@ -0,0 +1,149 @@
+"""Cross-run sections of the report: the run-history trend and the pooled percentiles.
+
+Both are built from small inputs (a few indexed SQLite rows, a few hundred
+sketch centroids) with NumPy and the standard library, so they are cheap
+enough to compute before the render cache lookup.
+"""
+import numpy as np
+
+from run_history import connect_readonly, latest_run, trend
+
+def load_trend(history_path, metrics_csv_path, runs):
+    """Trend data for the latest run recorded for this metrics file, or None without a run history"""
+    import sqlite3
+    try:
+        conn = connect_readonly(history_path)
+        if conn is None:
+            return None
+        try:
+            run_id = latest_run(conn, metrics_csv_path)
+            return trend(conn, run_id, runs) if run_id is not None else None
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Warning: Could not read run history from {history_path}: {e}")
+        return None
+
+def _change(value, baseline):
+    if value is None or not baseline:
+        return ''
+    return f' ({(value / baseline - 1) * 100:+.1f}%)'
+
+def _number(value, spec):
+    return '&ndash;' if value is None else format(value, spec)
+
+def _seconds(value):
+    return '&ndash;' if value is None else f'{value:.2f}s'
+
+def render_trend_section(data):
+    """Comparison of this run with earlier runs from the run history, as an HTML section"""
+    if data is None:
+        return ''
+    current = data['current']
+    affected_ratio = current['affected'] / current['cloudlets'] if current['cloudlets'] else None
+    rows = [f'<tr><td>This run (#{current["run_id"]})</td><td>{_seconds(current["makespan"])}</td>'
+            f'<td>{_seconds(current["mean_execution"])}</td>'
+            f'<td>{_number(affected_ratio, ".1%")}</td></tr>']
+    for label, baseline in ((f'Previous {len(data["previous"])} runs', data['recent']),
+                            ('Same scenario', data['scenario'])):
+        if baseline is None:
+            continue
+        if label == 'Same scenario':
+            label = f'Same scenario ({baseline["runs"]} runs)'
+        rows.append(f'<tr><td>{label}</td>'
+                    f'<td>{_seconds(baseline["makespan"])}{_change(current["makespan"], baseline["makespan"])}</td>'
+                    f'<td>{_seconds(baseline["mean_execution"])}'
+                    f'{_change(current["mean_execution"], baseline["mean_execution"])}</td>'
+                    f'<td>{baseline["affected_ratio"]:.1%}</td></tr>')
+    if len(rows) == 1:
+        return ('<div class="analysis-container"><h2>Trend Across Runs</h2>'
+                f'<p>Run #{current["run_id"]} is the first in the run history; later reports will compare with it.</p></div>')
+
+    recent = ''.join(
+        f'<tr><td>#{run["run_id"]}</td><td>{run["recorded_at"]}</td><td>{run["scheduler"] or "&ndash;"}</td>'
+        f'<td>{run["cloudlets"]}</td><td>{_seconds(run["makespan"])}</td><td>{_seconds(run["mean_execution"])}</td>'
+        f'<td>{run["affected"]}</td><td>{_seconds(run["disaster_time"])}</td></tr>'
+        for run in [current] + data['previous'])
+    datacenters = ''.join(
+        f'<tr><td>#{dc_id}</td><td>{dc["count"]}</td>'
+        f'<td>{_number(dc["previous_count"], ".1f")}</td>'
+        f'<td>{_seconds(dc["mean_execution"])}</td><td>{_seconds(dc["previous_mean_execution"])}</td></tr>'
+        for dc_id, dc in data['datacenters'].items())
+    scenario = ', '.join(f'{name} {current[key]}' for name, key in (('scheduler', 'scheduler'),
+                                                                    ('failure model', 'failure_model'))
+                         if current[key] is not None)
+    return f"""
+            <div class="analysis-container">
+                <h2>Trend Across Runs</h2>
+                <p>Run #{current['run_id']} from the run history, compared with the runs recorded before it{' and with earlier runs of the same scenario (' + scenario + ')' if scenario else ''}. Changes are relative to each baseline.</p>
+                <table class="trend-table">
+                    <tr><th></th><th>Makespan</th><th>Average execution time</th><th>Affected by failover</th></tr>
+                    {''.join(rows)}
+                </table>
+                <h3>Recent runs</h3>
+                <table class="trend-table">
+                    <tr><th>Run</th><th>Recorded</th><th>Scheduler</th><th>Tasks</th><th>Makespan</th><th>Average execution time</th><th>Affected</th><th>Disaster</th></tr>
+                    {recent}
+                </table>
+                <h3>By datacenter</h3>
+                <table class="trend-table">
+                    <tr><th>Datacenter</th><th>Tasks</th><th>Previous average</th><th>Average execution time</th><th>Previous average</th></tr>
+                    {datacenters}
+                </table>
+            </div>
+            """
+
+SKETCH_QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+SKETCH_LABELS = {
+    'FinishTime': 'Completion time',
+    'ExecutionTime': 'Execution time',
+    'RecoveryDelay': 'Completion after disaster',
+}
+CDF_POINTS = 512
+
+def sketch_bytes(pooled):
+    """Raw bytes of the pooled centroids, so the section is keyed on what it shows rather than on every file"""
+    if pooled is None:
+        return [b'missing']
+    parts = [str(pooled.runs).encode('utf-8')]
+    for name, digest in pooled.digests.items():
+        digest.compress()
+        parts += [name.encode('utf-8'), digest.centroids.tobytes(),
+                  np.array([digest.count, digest.min, digest.max]).tobytes()]
+    return parts
+
+def render_percentile_section(pooled, cdf_src=None, lazy=False):
+    """Percentiles pooled from every run's quantile sketches, as an HTML section.
+
+    The CDF chart is left out without `cdf_src`; with `lazy` the browser
+    fetches it from its own file only once it is scrolled near.
+    """
+    if pooled is None:
+        return ''
+    rows, errors = [], []
+    for name, digest in pooled.digests.items():
+        if not digest.count:
+            continue
+        values = digest.quantile(SKETCH_QUANTILES)
+        errors.append(digest.rank_error(SKETCH_QUANTILES).max())
+        rows.append(f'<tr><td>{SKETCH_LABELS[name]}</td><td>{int(digest.count)}</td>'
+                    + ''.join(f'<td>{_seconds(v)}</td>' for v in values)
+                    + f'<td>{_seconds(digest.max)}</td></tr>')
+    if not rows:
+        return ''
+    headers = ''.join(f'<th>p{q * 100:g}</th>' for q in SKETCH_QUANTILES)
+    chart = ''
+    if cdf_src is not None:
+        chart = (f'<img src="{cdf_src}" alt="Cumulative distribution of cloudlet times across runs"'
+                 + (' loading="lazy" decoding="async">' if lazy else '>'))
+    return f"""
+            <div class="analysis-container">
+                <h2>Percentiles Across Runs</h2>
+                <p>Pooled from the quantile sketches of {pooled.runs} run{'s' if pooled.runs != 1 else ''}. Each percentile is within <strong>{max(errors):.2%}</strong> of rank of the exact value; completion after disaster covers the cloudlets still running when the primary datacenter first failed.</p>
+                <table class="trend-table">
+                    <tr><th></th><th>Cloudlets</th>{headers}<th>Max</th></tr>
+                    {''.join(rows)}
+                </table>
+                {chart}
+            </div>
+            """
@@ -0,0 +1,333 @@
+"""Local report server: the report served from memory and rebuilt as the results change.
+
+One asyncio loop, standard library only, bound to localhost. It polls
+metrics.csv, metadata.csv and simulation_log.txt, and once a burst of writes
+has been quiet for --debounce seconds it rebuilds the report in a worker
+thread. Only what changed is recomputed: the metrics are reloaded and
+aggregated only when metrics.csv changes, and every chart goes through an
+in-memory cache keyed on what it draws, so only panels whose inputs moved
+are re-rendered. A finished log that is newer than metrics.csv is
+re-extracted first.
+
+Rebuilds are single-flight: one runs at a time, changes that arrive during
+it are folded into one follow-up rebuild, and requests only ever read the
+latest finished report, so any number of open browsers never cause a
+render. Browsers are told about each new report over server-sent events
+and reload.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import webbrowser
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from aggregate import aggregate_metrics
+from quantile_sketch import SKETCH_DIR, merge_sketch_files, sketch_files
+from render_cache import MemoryCache, RenderCache
+from run_history import DEFAULT_HISTORY, DEFAULT_TREND_RUNS
+from timeline import TIMELINE_MODES
+from report.charts import CHART_FORMATS, render_charts, render_percentile_chart
+from report.metrics import load_metrics, read_disaster_time
+from report.sections import load_trend, render_percentile_section, render_trend_section
+from report.table import DEFAULT_PAGE_ROWS, page_body, render_table_section, table_index, table_values
+from report.template import IMAGE_TYPES, html_sections, render_asset_charts_html
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+GENERATE_METRICS = PROJECT_DIR / 'scripts' / 'generate_metrics.py'
+# Comment lines sent to idle event streams so proxies and browsers keep them open
+KEEPALIVE_SECONDS = 15
+# Table pages kept per report; pages are cheap to rebuild from the arrays in memory
+MAX_CACHED_PAGES = 256
+
+# Reloads the page when the server announces a report newer than the one shown
+LIVE_SCRIPT = """
+            <script>
+            (function () {{
+                var shown = {version};
+                var source = new EventSource('/events');
+                source.addEventListener('report', function (event) {{
+                    if (JSON.parse(event.data).version !== shown) {{
+                        source.close();
+                        location.reload();
+                    }}
+                }});
+            }})();
+            </script>"""
+
+def signature(path):
+    """(modification time, size) of a file, or None while it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class ReportServer:
+    def __init__(self, args, metrics_path, log_path):
+        self.args = args
+        self.metrics_path = metrics_path
+        self.metadata_path = metrics_path.parent / 'metadata.csv'
+        self.watched = {'metrics': metrics_path, 'metadata': self.metadata_path, 'log': log_path}
+        backing = None
+        if not args.no_cache:
+            cache_dir = Path(args.cache_dir) if args.cache_dir else PROJECT_DIR / 'reports' / '.cache'
+            backing = RenderCache(cache_dir)
+        self.cache = MemoryCache(backing, max_bytes=int(args.memory_cache_mb * 1024 * 1024))
+        # Inputs of the last rebuild, reused by the next one when their files have not changed
+        self.df = None
+        self.stats = None
+        self.disaster_time = None
+        self.table = None
+        self.snapshot = None
+        self.version = 0
+        self.ready = asyncio.Event()
+        self.pending = set()
+        self.render_task = None
+        self.extract_task = None
+        self.subscribers = set()
+
+    # Rebuilding
+
+    def rebuild(self, changed):
+        """Build the next report from the inputs in `changed`; runs in a worker thread"""
+        args = self.args
+        df, stats, table = self.df, self.stats, self.table
+        if df is None or 'metrics' in changed:
+            df = load_metrics(self.metrics_path)
+            stats = aggregate_metrics(df)
+            index = table_index(df, None, args.page_rows)
+            table = {'index': index, 'values': table_values(df, index)}
+        disaster_time = self.disaster_time
+        if disaster_time is None or 'metadata' in changed:
+            disaster_time = read_disaster_time(self.metadata_path)
+
+        charts = render_charts(df, stats, disaster_time, self.cache, workers=args.render_workers,
+                               timeline_mode=args.timeline, image_format=args.chart_format)
+        trend_html = ''
+        if not args.no_history:
+            trend_html = render_trend_section(load_trend(args.history, self.metrics_path, args.trend_runs))
+        pooled = None
+        if not args.no_sketches:
+            pooled = merge_sketch_files(sketch_files(self.metrics_path.parent / SKETCH_DIR))
+            if pooled is not None:
+                charts.update(render_percentile_chart(pooled, self.cache, args.chart_format))
+
+        # Chart URLs carry their content key, so browsers re-fetch only the charts that changed
+        assets, sources = {}, {}
+        for name, (key, data) in charts.items():
+            stem, suffix = Path(name).stem, Path(name).suffix
+            url_name = f"{stem}-{key[:16]}{suffix}"
+            assets[url_name] = (IMAGE_TYPES[suffix[1:]], data)
+            sources[stem] = f"/charts/{url_name}"
+        version = self.version + 1
+        html = ''.join(html_sections(
+            stats, disaster_time, render_asset_charts_html(sources), '/metrics.csv', trend_html,
+            render_percentile_section(pooled, sources.get('percentiles'), lazy=True),
+            render_table_section(table['index'], '/cloudlets'), LIVE_SCRIPT.format(version=version)))
+
+        self.df, self.stats, self.disaster_time, self.table = df, stats, disaster_time, table
+        return {'version': version, 'html': html.encode('utf-8'), 'assets': assets, 'table': table, 'pages': {}}
+
+    def request_render(self, changed):
+        """Queue a rebuild; a rebuild already running picks the changes up when it finishes"""
+        self.pending |= set(changed)
+        if self.render_task is None or self.render_task.done():
+            self.render_task = asyncio.create_task(self.render_loop())
+
+    async def render_loop(self):
+        while self.pending:
+            changed, self.pending = self.pending, set()
+            started = time.perf_counter()
+            try:
+                snapshot = await asyncio.to_thread(self.rebuild, changed)
+            except Exception as e:
+                print(f"Error regenerating report: {e}")
+                continue
+            self.snapshot = snapshot
+            self.version = snapshot['version']
+            print(f"Report v{self.version} ready in {time.perf_counter() - started:.2f}s "
+                  f"({', '.join(sorted(changed))} changed)")
+            for queue in self.subscribers:
+                queue.put_nowait(self.version)
+        self.ready.set()
+
+    # Watching
+
+    def log_is_newer(self):
+        log, metrics = signature(self.watched['log']), signature(self.metrics_path)
+        return log is not None and (metrics is None or log[0] > metrics[0])
+
+    async def extract(self):
+        """Re-extract metrics from the log; the files it writes are picked up by the watcher"""
+        print(f"Extracting metrics from {self.watched['log']}")
+        # Recorded in the same run history the trend section reads
+        history = ['--no-history'] if self.args.no_history else ['--history', self.args.history]
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, str(GENERATE_METRICS), '--log', str(self.watched['log']),
+            '--output', str(self.metrics_path), *history, stdout=subprocess.DEVNULL)
+        if await process.wait() != 0:
+            print(f"Error: metrics extraction exited with code {process.returncode}")
+
+    async def watch(self):
+        """Poll the watched files and debounce bursts of writes into single rebuilds"""
+        loop = asyncio.get_running_loop()
+        signatures = {name: signature(path) for name, path in self.watched.items()}
+        first, last = {}, {}
+        while True:
+            await asyncio.sleep(self.args.poll)
+            now = loop.time()
+            for name, path in self.watched.items():
+                current = signature(path)
+                if current != signatures[name]:
+                    signatures[name] = current
+                    first.setdefault(name, now)
+                    last[name] = now
+
+            # metrics.csv and metadata.csv are written together, so they settle as one batch;
+            # --max-wait bounds the delay while a live run keeps rewriting them
+            batch = [name for name in first if name != 'log']
+            if batch and (now - max(last[name] for name in batch) >= self.args.debounce
+                          or now - min(first[name] for name in batch) >= self.args.max_wait):
+                for name in batch:
+                    del first[name], last[name]
+                self.request_render(batch)
+
+            # A log still being written is left to the live snapshots; a finished one is extracted once
+            if 'log' in first and now - last['log'] >= self.args.debounce:
+                del first['log'], last['log']
+                if self.args.extract and self.log_is_newer():
+                    if self.extract_task is None or self.extract_task.done():
+                        self.extract_task = asyncio.create_task(self.extract())
+                    else:
+                        first['log'] = last['log'] = now
+
+    # Serving
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 10)
+            while (await asyncio.wait_for(reader.readline(), 10)) not in (b'\r\n', b'\n', b''):
+                pass
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                return await self.respond(writer, HTTPStatus.BAD_REQUEST)
+            method, path = parts[0], urlsplit(parts[1]).path
+            if method not in ('GET', 'HEAD'):
+                return await self.respond(writer, HTTPStatus.METHOD_NOT_ALLOWED)
+            if path == '/events':
+                return await self.stream_events(writer)
+            await self.ready.wait()
+            await self.route(writer, path, head=method == 'HEAD')
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, writer, path, head=False):
+        snapshot = self.snapshot
+        if snapshot is None:
+            return await self.respond(writer, HTTPStatus.SERVICE_UNAVAILABLE, b'The report could not be built yet',
+                                      head=head)
+        if path in ('/', '/index.html'):
+            return await self.respond(writer, HTTPStatus.OK, snapshot['html'], 'text/html; charset=utf-8', head=head)
+        if path.startswith('/charts/') and path[len('/charts/'):] in snapshot['assets']:
+            content_type, data = snapshot['assets'][path[len('/charts/'):]]
+            return await self.respond(writer, HTTPStatus.OK, data, content_type, head=head,
+                                      cache_control='public, max-age=31536000, immutable')
+        if path.startswith('/cloudlets/page-') and path.endswith('.json'):
+            number = path[len('/cloudlets/page-'):-len('.json')]
+            table = snapshot['table']
+            if number.isdigit() and int(number) < table['index']['pages']:
+                page = int(number)
+                body = snapshot['pages'].get(page)
+                if body is None:
+                    body = page_body(table['values'], page, table['index']['page_rows']).encode('utf-8')
+                    if len(snapshot['pages']) < MAX_CACHED_PAGES:
+                        snapshot['pages'][page] = body
+                return await self.respond(writer, HTTPStatus.OK, body, 'application/json', head=head)
+        if path == '/metrics.csv' and self.metrics_path.exists():
+            data = await asyncio.to_thread(self.metrics_path.read_bytes)
+            return await self.respond(writer, HTTPStatus.OK, data, 'text/csv', head=head)
+        await self.respond(writer, HTTPStatus.NOT_FOUND, b'Not found', head=head)
+
+    async def respond(self, writer, status, body=b'', content_type='text/plain; charset=utf-8', head=False,
+                      cache_control='no-cache'):
+        writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nCache-Control: {cache_control}\r\n"
+                     "Connection: close\r\n\r\n".encode('latin-1'))
+        if not head:
+            writer.write(body)
+        await writer.drain()
+
+    async def stream_events(self, writer):
+        """Server-sent events: the current version on connect, then each new one as it is built"""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\n\r\nretry: 1000\n\n")
+        queue = asyncio.Queue()
+        if self.version:
+            queue.put_nowait(self.version)
+        self.subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    version = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                    writer.write(f"event: report\ndata: {json.dumps({'version': version})}\n\n".encode('utf-8'))
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                await writer.drain()
+        finally:
+            self.subscribers.discard(queue)
+
+    async def serve(self):
+        self.request_render({'metrics', 'metadata'})
+        server = await asyncio.start_server(self.handle, self.args.host, self.args.port)
+        url = f"http://{self.args.host}:{server.sockets[0].getsockname()[1]}/"
+        print(f"Serving the report at {url} (Ctrl+C to stop)")
+        watcher = asyncio.create_task(self.watch())
+        if self.args.open:
+            await self.ready.wait()
+            webbrowser.open(url)
+        async with server:
+            await asyncio.gather(server.serve_forever(), watcher)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the HTML report locally and rebuild it as the results change")
+    parser.add_argument("--metrics", default=None, help="Path to metrics CSV file (default: results/metrics.csv)")
+    parser.add_argument("--log", default=None,
+                        help="Simulation log to re-extract when it changes (default: simulation_log.txt next to the metrics)")
+    parser.add_argument("--no-extract", dest="extract", action="store_false",
+                        help="Only watch the metrics and metadata, never re-extract them from the log")
+    parser.add_argument("--host", default='127.0.0.1', help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (0 picks a free one)")
+    parser.add_argument("--open", action="store_true", help="Open the report in a browser once it is built")
+    parser.add_argument("--poll", type=float, default=0.25, help="Seconds between checks of the watched files")
+    parser.add_argument("--debounce", type=float, default=0.5,
+                        help="Seconds the files must stay unchanged before the report is rebuilt")
+    parser.add_argument("--max-wait", type=float, default=5.0,
+                        help="Rebuild at least this often while the metrics keep changing")
+    parser.add_argument("--chart-format", choices=CHART_FORMATS, default='auto', help="Format of the chart images")
+    parser.add_argument("--timeline", choices=TIMELINE_MODES, default='auto', help="Completion timeline style")
+    parser.add_argument("--render-workers", type=int, default=1, help="Processes used to render chart figures")
+    parser.add_argument("--page-rows", type=int, default=DEFAULT_PAGE_ROWS, help="Cloudlets per table page")
+    parser.add_argument("--no-cache", action="store_true", help="Keep rendered charts in memory only, not on disk")
+    parser.add_argument("--cache-dir", default=None, help="Render cache directory (default: reports/.cache)")
+    parser.add_argument("--memory-cache-mb", type=float, default=64, help="Rendered charts kept in memory")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY), help="Run-history store for the trend section")
+    parser.add_argument("--trend-runs", type=int, default=DEFAULT_TREND_RUNS,
+                        help="Number of earlier runs the trend section compares with")
+    parser.add_argument("--no-history", action="store_true", help="Leave the trend section out")
+    parser.add_argument("--no-sketches", action="store_true", help="Leave the percentile section out")
+    args = parser.parse_args()
+
+    metrics_path = Path(args.metrics) if args.metrics else PROJECT_DIR / 'results' / 'metrics.csv'
+    log_path = Path(args.log) if args.log else metrics_path.parent / 'simulation_log.txt'
+    try:
+        asyncio.run(ReportServer(args, metrics_path, log_path).serve())
+    except KeyboardInterrupt:
+        print("Stopped")
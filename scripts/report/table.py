@@ -0,0 +1,140 @@
+"""Per-cloudlet table of the report, written as paged JSON the page fetches one page at a time.
+
+Only the page being shown is downloaded, so a run of a million cloudlets
+costs the HTML no more than a run of twenty. The table is written next to
+the chart assets with an index.json recording its key; a report whose
+metrics have not changed keeps the pages it already wrote.
+"""
+import json
+import os
+
+import numpy as np
+
+from report.metrics import REPORT_COLUMNS
+
+TABLE_DIR = 'cloudlets'
+INDEX_FILE = 'index.json'
+DEFAULT_PAGE_ROWS = 1000
+# Times are shown to the millisecond; the CSV download keeps full precision
+DECIMALS = 3
+
+def read_index(directory):
+    try:
+        return json.loads((directory / INDEX_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+def is_current(directory, key):
+    """Whether the pages in `directory` were written for `key`"""
+    index = read_index(directory)
+    return index is not None and index.get('key') == key
+
+def column_values(values):
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        return np.round(values, DECIMALS)
+    return values
+
+def table_index(df, key, page_rows=DEFAULT_PAGE_ROWS):
+    """What the table section needs to know about the pages: row, page and column counts"""
+    rows = len(df)
+    return {'key': key, 'rows': rows, 'pages': -(-rows // page_rows), 'page_rows': page_rows,
+            'columns': [name for name in REPORT_COLUMNS if name in df]}
+
+def table_values(df, index):
+    return [column_values(df[name]) for name in index['columns']]
+
+def json_values(values):
+    """Column values as a list for json.dumps; NaN and infinities, which JSON cannot hold, become null"""
+    if values.dtype.kind == 'f':
+        finite = np.isfinite(values)
+        if not finite.all():
+            return [value if ok else None for value, ok in zip(values.tolist(), finite.tolist())]
+    return values.tolist()
+
+def page_body(values, page, page_rows):
+    """One page as JSON, holding one array per column rather than one per row, which serialises faster"""
+    start = page * page_rows
+    return json.dumps({'page': page, 'columns': [json_values(v[start:start + page_rows]) for v in values]},
+                      separators=(',', ':'), allow_nan=False)
+
+def write_pages(df, directory, key, page_rows=DEFAULT_PAGE_ROWS):
+    """Write the report's columns as page-<n>.json files and an index, unless the index already has `key`.
+
+    The index is written last, so pages from an interrupted write are never
+    taken for current ones; pages left over from a larger run are removed.
+    """
+    index = table_index(df, key, page_rows)
+    if read_index(directory) == index:
+        print(f"Reused cloudlet table pages in {directory}")
+        return index
+
+    directory.mkdir(parents=True, exist_ok=True)
+    values = table_values(df, index)
+    for page in range(index['pages']):
+        (directory / f'page-{page}.json').write_text(page_body(values, page, page_rows), encoding='utf-8')
+    for path in directory.glob('page-*.json'):
+        if not path.stem[len('page-'):].isdigit() or int(path.stem[len('page-'):]) >= index['pages']:
+            path.unlink()
+    tmp_path = directory / f'{INDEX_FILE}.tmp'
+    tmp_path.write_text(json.dumps(index), encoding='utf-8')
+    os.replace(tmp_path, directory / INDEX_FILE)
+    print(f"Wrote {index['rows']} cloudlets as {index['pages']} table page{'s' if index['pages'] != 1 else ''} to {directory}")
+    return index
+
+# Fetches and draws one page at a time; the values are numbers, booleans and null for missing ones
+TABLE_SCRIPT = """
+            <script>
+            (function () {
+                var section = document.getElementById('cloudlet-table');
+                var src = section.dataset.src, pages = Number(section.dataset.pages);
+                var table = section.querySelector('table'), label = section.querySelector('.page-label');
+                var load = section.querySelector('.load'), prev = section.querySelector('.prev'), next = section.querySelector('.next');
+                var current = 0;
+                function cell(value) {
+                    return '<td>' + (value === true ? 'Yes' : value === false ? 'No' : value === null ? '' : value) + '</td>';
+                }
+                function show(page) {
+                    label.textContent = 'Loading page ' + (page + 1) + ' of ' + pages + '...';
+                    fetch(src + '/page-' + page + '.json').then(function (response) {
+                        if (!response.ok) {
+                            throw new Error('HTTP ' + response.status);
+                        }
+                        return response.json();
+                    }).then(function (data) {
+                        var rows = [];
+                        for (var i = 0; i < data.columns[0].length; i++) {
+                            rows.push('<tr>' + data.columns.map(function (column) { return cell(column[i]); }).join('') + '</tr>');
+                        }
+                        table.tBodies[0].innerHTML = rows.join('');
+                        table.hidden = false;
+                        current = page;
+                        label.textContent = 'Page ' + (page + 1) + ' of ' + pages;
+                        prev.disabled = page === 0;
+                        next.disabled = page >= pages - 1;
+                    }).catch(function (error) {
+                        label.textContent = 'Could not load page ' + (page + 1) + ' (' + error.message + '); serve the report over HTTP to browse the table.';
+                    });
+                }
+                load.addEventListener('click', function () { load.hidden = true; show(0); });
+                prev.addEventListener('click', function () { show(current - 1); });
+                next.addEventListener('click', function () { show(current + 1); });
+            })();
+            </script>"""
+
+def render_table_section(index, src):
+    """Cloudlet table section for pages written by write_pages, served from the URL `src`"""
+    if index is None or not index['rows']:
+        return ''
+    headers = ''.join(f'<th>{name}</th>' for name in index['columns'])
+    return f"""
+            <div class="analysis-container" id="cloudlet-table" data-src="{src}" data-pages="{index['pages']}">
+                <h2>Cloudlet Details</h2>
+                <p>{index['rows']} cloudlets in {index['pages']} page{'s' if index['pages'] != 1 else ''} of up to {index['page_rows']} rows. Each page is fetched only when it is shown.</p>
+                <p class="table-pager"><button type="button" class="load">Show cloudlets</button><button type="button" class="prev" disabled>Previous</button><button type="button" class="next" disabled>Next</button><span class="page-label"></span></p>
+                <table class="trend-table" hidden>
+                    <thead><tr>{headers}</tr></thead>
+                    <tbody></tbody>
+                </table>
+            </div>{TABLE_SCRIPT}
+            """
@@ -0,0 +1,377 @@
+"""The report's HTML template, filled in from aggregate_metrics' statistics.
+
+html_sections yields the page one section at a time and write_html streams
+the sections to disk, so the page is never assembled as one string. With
+external assets the charts and the cloudlet table are separate files, and
+the page itself stays the same size however many cloudlets the run has.
+"""
+import base64
+import os
+from datetime import datetime
+from pathlib import Path
+
+from aggregate import PERCENTILES
+
+# Bump when the HTML template or chart styling changes so cached renders are not reused
+TEMPLATE_VERSION = 7
+
+IMAGE_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml', 'webp': 'image/webp'}
+
+# The page up to <body>, which has no placeholders
+HEAD = """
+        <!DOCTYPE html>
+        <html lang="en">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>Disaster Recovery Simulation Report</title>
+            <style>
+                :root {
+                    --primary-color: #2c3e50;
+                    --secondary-color: #3498db;
+                    --accent-color: #e74c3c;
+                    --background-color: #f8f9fa;
+                    --card-background: #ffffff;
+                    --text-color: #333333;
+                    --border-color: #dddddd;
+                }
+                
+                body {
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                    max-width: 1100px;
+                    margin: 0 auto;
+                    padding: 2rem;
+                    background-color: var(--background-color);
+                    color: var(--text-color);
+                    line-height: 1.6;
+                }
+                
+                h1, h2, h3 {
+                    color: var(--primary-color);
+                    margin-top: 2rem;
+                }
+                
+                h1 {
+                    text-align: center;
+                    border-bottom: 2px solid var(--secondary-color);
+                    padding-bottom: 1rem;
+                    margin-bottom: 2rem;
+                }
+                
+                .stats-container {
+                    display: flex;
+                    flex-wrap: wrap;
+                    justify-content: space-between;
+                    margin: 2rem 0;
+                }
+                
+                .stat-card {
+                    background-color: var(--card-background);
+                    border-radius: 8px;
+                    padding: 1.5rem;
+                    margin-bottom: 1rem;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                    flex: 1 1 200px;
+                    margin: 0.5rem;
+                    text-align: center;
+                }
+                
+                .stat-value {
+                    font-size: 2rem;
+                    font-weight: bold;
+                    color: var(--secondary-color);
+                    margin: 0.5rem 0;
+                }
+                
+                .stat-label {
+                    font-size: 0.9rem;
+                    color: #666;
+                }
+                
+                .chart-container {
+                    background-color: var(--card-background);
+                    border-radius: 8px;
+                    padding: 1.5rem;
+                    margin: 2rem 0;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                }
+                
+                .chart-container h2 {
+                    margin-top: 0;
+                    border-bottom: 1px solid var(--border-color);
+                    padding-bottom: 0.5rem;
+                }
+                
+                img {
+                    max-width: 100%;
+                    height: auto;
+                    margin: 1rem auto;
+                    display: block;
+                }
+                
+                .disaster-event {
+                    background-color: #fff3cd;
+                    border-left: 5px solid #ffc107;
+                    padding: 1rem;
+                    margin: 2rem 0;
+                    border-radius: 0 8px 8px 0;
+                }
+                
+                .disaster-event h3 {
+                    color: #856404;
+                    margin-top: 0;
+                }
+                
+                .analysis-container {
+                    background-color: var(--card-background);
+                    border-radius: 8px;
+                    padding: 1.5rem;
+                    margin: 2rem 0;
+                    box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+                }
+                
+                .trend-table {
+                    width: 100%;
+                    border-collapse: collapse;
+                    margin: 1rem 0;
+                }
+                
+                .trend-table th, .trend-table td {
+                    padding: 0.4rem 0.6rem;
+                    border-bottom: 1px solid var(--border-color);
+                    text-align: right;
+                }
+                
+                .trend-table th:first-child, .trend-table td:first-child {
+                    text-align: left;
+                }
+                
+                .download-link {
+                    display: inline-block;
+                    background-color: var(--secondary-color);
+                    color: white;
+                    padding: 0.8rem 1.5rem;
+                    text-decoration: none;
+                    border-radius: 8px;
+                    margin-top: 2rem;
+                    font-weight: bold;
+                    transition: background-color 0.3s;
+                }
+                
+                .download-link:hover {
+                    background-color: #2980b9;
+                }
+                
+                .chart-grid {
+                    display: grid;
+                    grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
+                    gap: 0 1rem;
+                }
+                
+                .chart-grid .wide {
+                    grid-column: 1 / -1;
+                }
+                
+                .table-pager button {
+                    margin-right: 0.5rem;
+                }
+                
+                footer {
+                    text-align: center;
+                    margin-top: 3rem;
+                    padding-top: 1rem;
+                    color: #666;
+                    font-size: 0.9rem;
+                    border-top: 1px solid var(--border-color);
+                }
+                
+                @media (max-width: 768px) {
+                    .stats-container {
+                        flex-direction: column;
+                    }
+                    
+                    .stat-card {
+                        margin-bottom: 1rem;
+                    }
+                }
+            </style>
+        </head>
+        <body>"""
+
+# Function to generate base64 encoded image
+def get_image_base64(image_path):
+    try:
+        if os.path.exists(image_path):
+            with open(image_path, "rb") as image_file:
+                return image_data_uri(image_file.read())
+        else:
+            print(f"Warning: Image file not found at {image_path}")
+    except Exception as e:
+        print(f"Error encoding image: {e}")
+    return ""
+
+def image_data_uri(data, fmt='png'):
+    return f"data:{IMAGE_TYPES[fmt]};base64,{base64.b64encode(data).decode('utf-8')}"
+
+def render_datacenter_summary(per_datacenter):
+    """Per-datacenter task counts and mean execution times as an HTML list"""
+    if per_datacenter is None or len(per_datacenter['ids']) == 0:
+        return ''
+    mean_exec = per_datacenter['means'].get('ExecutionTime')
+    items = ''.join(
+        f'<li>Datacenter #{dc_id}: <strong>{count}</strong> tasks'
+        + (f', average execution time <strong>{mean_exec[i]:.2f} seconds</strong>' if mean_exec is not None else '')
+        + '</li>'
+        for i, (dc_id, count) in enumerate(zip(per_datacenter['ids'], per_datacenter['counts'])))
+    return f'<p>Tasks by datacenter:</p><ul>{items}</ul>'
+
+def render_charts_html(perf_metrics_b64, vm_util_b64):
+    """The two chart sections, with the images inlined as data URIs"""
+    return f"""<div class="chart-container">
+                <h2>Performance Metrics Visualization</h2>
+                {'<img src="' + perf_metrics_b64 + '" alt="Performance Metrics Chart">' if perf_metrics_b64 else '<p>Performance metrics chart not available</p>'}
+            </div>
+            
+            <div class="chart-container">
+                <h2>VM Utilization</h2>
+                {'<img src="' + vm_util_b64 + '" alt="VM Utilization Chart">' if vm_util_b64 else '<p>VM utilization chart not available</p>'}
+                <p><strong>Note:</strong> Blue bars represent VMs in the Primary Datacenter, orange bars represent VMs in the Backup Datacenter.</p>
+            </div>
+            """
+
+def asset_image(src, alt, css_class=None):
+    """An image loaded from a separate file once it nears the viewport, so it never holds up first paint"""
+    class_attr = f' class="{css_class}"' if css_class else ''
+    return f'<img{class_attr} src="{src}" alt="{alt}" loading="lazy" decoding="async">'
+
+def render_asset_charts_html(sources):
+    """The chart sections for charts written as separate files, one per panel; `sources` maps panels to URLs"""
+    panels = [('exec_by_vm', 'Average Execution Time by VM', None),
+              ('tasks_per_vm', 'Number of Tasks Processed by Each VM', None),
+              ('timeline', 'Task Completion Timeline', 'wide')]
+    images = ''.join(asset_image(sources[kind], alt, css_class) for kind, alt, css_class in panels if kind in sources)
+    vm_util = sources.get('vm_utilization')
+    return f"""<div class="chart-container">
+                <h2>Performance Metrics Visualization</h2>
+                {'<div class="chart-grid">' + images + '</div>' if images else '<p>Performance metrics chart not available</p>'}
+            </div>
+            
+            <div class="chart-container">
+                <h2>VM Utilization</h2>
+                {asset_image(vm_util, 'VM Utilization Chart') if vm_util else '<p>VM utilization chart not available</p>'}
+                <p><strong>Note:</strong> Blue bars represent VMs in the Primary Datacenter, orange bars represent VMs in the Backup Datacenter.</p>
+            </div>
+            """
+
+def render_summary(stats, disaster_time):
+    """Headline statistics, the disaster event and the failover analysis"""
+    total_tasks = stats['total_tasks']
+    affected_tasks = stats['affected_tasks']
+    affected_percentage = stats['affected_percentage']
+    avg_exec_time = stats['avg_exec_time']
+    avg_wait_time = stats['avg_wait_time']
+    avg_affected = stats['avg_affected']
+    avg_unaffected = stats['avg_unaffected']
+    impact_ratio = stats['impact_ratio']
+    p50, p95, p99 = (stats['finish_percentiles'][p] for p in PERCENTILES)
+    datacenter_summary = render_datacenter_summary(stats['per_datacenter'])
+    return f"""
+            <h1>Disaster Recovery Simulation Report</h1>
+            
+            <div class="stats-container">
+                <div class="stat-card">
+                    <div class="stat-value">{total_tasks}</div>
+                    <div class="stat-label">Total Tasks Processed</div>
+                </div>
+                
+                <div class="stat-card">
+                    <div class="stat-value">{affected_tasks}</div>
+                    <div class="stat-label">Tasks Affected by Failover ({affected_percentage:.1f}%)</div>
+                </div>
+                
+                <div class="stat-card">
+                    <div class="stat-value">{avg_exec_time:.2f}s</div>
+                    <div class="stat-label">Average Execution Time</div>
+                </div>
+                
+                <div class="stat-card">
+                    <div class="stat-value">{avg_wait_time:.2f}s</div>
+                    <div class="stat-label">Average Wait Time</div>
+                </div>
+            </div>
+            
+            <div class="stats-container">
+                <div class="stat-card">
+                    <div class="stat-value">{p50:.2f}s</div>
+                    <div class="stat-label">Median (p50) Completion Time</div>
+                </div>
+                
+                <div class="stat-card">
+                    <div class="stat-value">{p95:.2f}s</div>
+                    <div class="stat-label">p95 Completion Time</div>
+                </div>
+                
+                <div class="stat-card">
+                    <div class="stat-value">{p99:.2f}s</div>
+                    <div class="stat-label">p99 Completion Time</div>
+                </div>
+            </div>
+            
+            <div class="disaster-event">
+                <h3>Disaster Event Information</h3>
+                <p>A disaster event occurred at simulation time <strong>{disaster_time:.1f} seconds</strong>.</p>
+                <p>Tasks rerouted to backup datacenter: <strong>{affected_tasks}</strong></p>
+            </div>
+            
+            <div class="analysis-container">
+                <h2>Failover Analysis</h2>
+                
+                {'<p>Based on the simulation results, the following tasks were affected by the disaster event:</p>' if affected_tasks > 0 else '<p>No tasks were directly affected by the failover, which suggests one of the following scenarios:</p>'}
+                
+                {f'<ul><li>Average execution time for tasks affected by failover: <strong>{avg_affected:.2f} seconds</strong></li><li>Average execution time for unaffected tasks: <strong>{avg_unaffected:.2f} seconds</strong></li><li>Performance impact ratio (affected/unaffected): <strong>{impact_ratio:.2f}</strong></li></ul>' if affected_tasks > 0 else '<ul><li>All tasks had already completed before the disaster</li><li>The remaining tasks were able to continue execution without interruption</li><li>The backup datacenter successfully handled the workload with minimal impact</li></ul>'}
+                
+                {datacenter_summary}
+            </div>"""
+
+def html_sections(stats, disaster_time, charts_html, metrics_rel_path, trend_html='', percentile_html='', table_html='',
+                  script_html=''):
+    """The report page in order, one section at a time; `script_html` is for the report server's live reload"""
+    yield HEAD
+    yield render_summary(stats, disaster_time)
+    for section in (trend_html, percentile_html):
+        yield '\n            '
+        yield section
+    yield '\n            \n            '
+    yield charts_html
+    yield table_html
+    yield script_html
+    yield f"""
+            <a class="download-link" href="{metrics_rel_path}" download="metrics.csv" type="text/csv">Download Raw Metrics (CSV)</a>
+            
+            <footer>
+                <p>Generated by CloudSim Disaster Recovery Simulation</p>
+                <p>© Cloud Computing Tools and Techniques Lab {datetime.now().year}</p>
+            </footer>
+        </body>
+        </html>
+        """
+
+def render_html(stats, disaster_time, perf_metrics_b64, vm_util_b64, metrics_rel_path, trend_html='',
+                percentile_html='', include_charts=True):
+    """The whole report as one string, with the charts inlined.
+
+    With `include_charts` off (--no-charts) the chart sections are left out
+    rather than shown as unavailable.
+    """
+    charts_html = render_charts_html(perf_metrics_b64, vm_util_b64) if include_charts else ''
+    return ''.join(html_sections(stats, disaster_time, charts_html, metrics_rel_path, trend_html, percentile_html))
+
+def write_html(path, sections):
+    """Stream the sections to `path`, replacing it atomically; returns the bytes written"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return path.stat().st_size
@@ -0,0 +1,5 @@
+"""Serve the HTML report on localhost and rebuild it as the results change; see report/server.py."""
+from report.server import main
+
+if __name__ == "__main__":
+    main()
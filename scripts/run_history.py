@@ -0,0 +1,259 @@
+"""SQLite store of every run's cloudlet rows and metadata, for comparisons across runs.
+
+generate_metrics.py records each run it extracts into results/history.sqlite,
+and generate_html_report.py queries it for the report's trend section. The
+runs table keeps one summary row per run next to its scenario parameters,
+so trend queries read a handful of index entries no matter how many runs
+are stored; the cloudlets table keeps the rows themselves for per-VM and
+per-datacenter queries. The database is in WAL mode, so a report can read
+it while pipeline scenarios are recording runs.
+"""
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_HISTORY = Path(__file__).resolve().parent.parent / 'results' / 'history.sqlite'
+DEFAULT_TREND_RUNS = 10
+# Rows per executemany call; all batches of a run go in one transaction
+BATCH_ROWS = 50_000
+# Seconds a writer waits for another one to commit
+BUSY_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at TEXT NOT NULL,
+    source TEXT,
+    source_size INTEGER,
+    source_mtime REAL,
+    metrics_path TEXT,
+    seed INTEGER,
+    failure_probability REAL,
+    failure_model TEXT,
+    scheduler TEXT,
+    cloudlets INTEGER NOT NULL,
+    makespan REAL,
+    mean_execution REAL,
+    mean_wait REAL,
+    affected INTEGER NOT NULL,
+    disaster_time REAL,
+    disaster_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_scenario ON runs(scheduler, failure_model, failure_probability, run_id);
+CREATE INDEX IF NOT EXISTS runs_metrics_path ON runs(metrics_path, run_id);
+CREATE INDEX IF NOT EXISTS runs_source ON runs(source, source_size, source_mtime);
+CREATE TABLE IF NOT EXISTS cloudlets (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    cloudlet_id INTEGER NOT NULL,
+    status TEXT,
+    datacenter_id INTEGER,
+    vm_id INTEGER,
+    execution_time REAL,
+    start_time REAL,
+    finish_time REAL,
+    wait_time REAL,
+    affected INTEGER NOT NULL
+);
+-- Leads with run_id, so it also serves lookups by run alone
+CREATE INDEX IF NOT EXISTS cloudlets_run_vm ON cloudlets(run_id, datacenter_id, vm_id);
+"""
+
+# Scenario lines DisasterRecoverySimulation prints before the simulation starts
+SEED_PATTERN = re.compile(r'^Random seed: (-?\d+)(?:, failure probability: ([\d.eE+-]+))?')
+FAILURE_MODEL_PATTERN = re.compile(r'^Failure model for PrimaryDC: (.+)$')
+SCHEDULER_PATTERN = re.compile(r'^Cloudlet scheduling: (\S+)')
+HEADER_END = 'Starting CloudSim'
+HEADER_MAX_LINES = 100
+SIMULATION_LOG = 'simulation_log.txt'
+
+def connect(path=DEFAULT_HISTORY):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # Durable up to the last checkpoint, which is enough for a cache of derived data
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def connect_readonly(path=DEFAULT_HISTORY):
+    """Open an existing store for queries only; returns None if there is none"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True, timeout=BUSY_TIMEOUT)
+
+def read_scenario(lines):
+    """Seed, failure probability, failure model and scheduler from a simulation log's header lines"""
+    scenario = {'seed': None, 'failure_probability': None, 'failure_model': None, 'scheduler': None}
+    for number, line in enumerate(lines):
+        line = line.strip()
+        if line.startswith(HEADER_END) or number >= HEADER_MAX_LINES:
+            break
+        match = SEED_PATTERN.match(line)
+        if match:
+            scenario['seed'] = int(match.group(1))
+            if match.group(2):
+                scenario['failure_probability'] = float(match.group(2))
+            continue
+        match = FAILURE_MODEL_PATTERN.match(line)
+        if match:
+            scenario['failure_model'] = match.group(1)
+            continue
+        match = SCHEDULER_PATTERN.match(line)
+        if match:
+            scenario['scheduler'] = match.group(1)
+    return scenario
+
+def find_run(conn, source):
+    """ID of a run already recorded from this exact file (same path, size and modification time), or None"""
+    source = Path(source).resolve()
+    stat = source.stat()
+    row = conn.execute("SELECT run_id FROM runs WHERE source = ? AND source_size = ? AND source_mtime = ?",
+                       (str(source), stat.st_size, stat.st_mtime)).fetchone()
+    return row[0] if row else None
+
+def _column(df, name, dtype):
+    return df[name].to_numpy(dtype=dtype, copy=False)
+
+def record_run(conn, df, index, source=None, metrics_path=None, scenario=None):
+    """Insert one run's summary and cloudlet rows in a single transaction and return its run ID"""
+    scenario = scenario or {}
+    affected = (df['AffectedByFailover'] == 'Yes').to_numpy() if len(df) else np.zeros(0, dtype=bool)
+    finish = _column(df, 'FinishTime', np.float64)
+    source = Path(source).resolve() if source is not None else None
+    stat = source.stat() if source is not None else None
+    run = (
+        datetime.now().isoformat(timespec='seconds'),
+        str(source) if source is not None else None,
+        stat.st_size if stat else None,
+        stat.st_mtime if stat else None,
+        str(Path(metrics_path).resolve()) if metrics_path is not None else None,
+        scenario.get('seed'), scenario.get('failure_probability'),
+        scenario.get('failure_model'), scenario.get('scheduler'),
+        len(df),
+        float(finish.max()) if len(df) else None,
+        float(df['ExecutionTime'].mean()) if len(df) else None,
+        float(df['WaitTime'].mean()) if len(df) else None,
+        int(affected.sum()),
+        index.first_disaster_time,
+        len(index.disaster_starts),
+    )
+    columns = [
+        _column(df, 'CloudletID', np.int64), df['Status'].astype(str).to_numpy(),
+        _column(df, 'DatacenterID', np.int64), _column(df, 'VMId', np.int64),
+        _column(df, 'ExecutionTime', np.float64), _column(df, 'StartTime', np.float64), finish,
+        _column(df, 'WaitTime', np.float64), affected.astype(np.int64),
+    ]
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (recorded_at, source, source_size, source_mtime, metrics_path, seed, "
+            "failure_probability, failure_model, scheduler, cloudlets, makespan, mean_execution, mean_wait, "
+            "affected, disaster_time, disaster_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", run)
+        run_id = cursor.lastrowid
+        for begin in range(0, len(df), BATCH_ROWS):
+            batch = [column[begin:begin + BATCH_ROWS].tolist() for column in columns]
+            conn.executemany("INSERT INTO cloudlets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             zip([run_id] * len(batch[0]), *batch))
+    return run_id
+
+def latest_run(conn, metrics_path=None):
+    """Most recent run, or the most recent one written to `metrics_path`"""
+    if metrics_path is None:
+        row = conn.execute("SELECT MAX(run_id) FROM runs").fetchone()
+    else:
+        row = conn.execute("SELECT MAX(run_id) FROM runs WHERE metrics_path = ?",
+                           (str(Path(metrics_path).resolve()),)).fetchone()
+    return row[0] if row else None
+
+RUN_FIELDS = ['run_id', 'recorded_at', 'scheduler', 'failure_model', 'cloudlets', 'makespan',
+              'mean_execution', 'affected', 'disaster_time']
+
+def trend(conn, run_id, runs=DEFAULT_TREND_RUNS):
+    """Compare one run with the `runs` runs recorded before it, and with the last `runs` runs of its scenario.
+
+    Every query reads an index range: the primary key for the recent runs,
+    runs_scenario for the scenario baseline and cloudlets_run_vm for the
+    per-datacenter breakdown, so the cost follows `runs`, not the size of
+    the store. Returns None if the run is not in the store.
+    """
+    current = conn.execute(f"SELECT {', '.join(RUN_FIELDS)}, failure_probability FROM runs WHERE run_id = ?",
+                           (run_id,)).fetchone()
+    if current is None:
+        return None
+    previous = conn.execute(f"SELECT {', '.join(RUN_FIELDS)} FROM runs WHERE run_id < ? "
+                            "ORDER BY run_id DESC LIMIT ?", (run_id, runs)).fetchall()
+
+    # Averages over the previous runs, and over as many earlier runs of the same scenario
+    recent = None
+    if previous:
+        recent = conn.execute(
+            "SELECT COUNT(*), AVG(makespan), AVG(mean_execution), AVG(affected * 1.0 / cloudlets) FROM runs "
+            "WHERE run_id BETWEEN ? AND ? AND cloudlets > 0", (previous[-1][0], previous[0][0])).fetchone()
+    scheduler, failure_model, failure_probability = current[2], current[3], current[-1]
+    scenario = conn.execute(
+        "SELECT COUNT(*), AVG(makespan), AVG(mean_execution), AVG(affected * 1.0 / cloudlets) FROM "
+        "(SELECT makespan, mean_execution, affected, cloudlets FROM runs "
+        " WHERE scheduler IS ? AND failure_model IS ? AND failure_probability IS ? AND run_id < ? "
+        " ORDER BY run_id DESC LIMIT ?) WHERE cloudlets > 0",
+        (scheduler, failure_model, failure_probability, run_id, runs)).fetchone()
+
+    # Per-datacenter tasks and execution times, this run against the average of the previous runs
+    datacenters = {}
+    for dc_id, count, mean_exec in conn.execute(
+            "SELECT datacenter_id, COUNT(*), AVG(execution_time) FROM cloudlets WHERE run_id = ? "
+            "GROUP BY datacenter_id", (run_id,)):
+        datacenters[dc_id] = {'count': count, 'mean_execution': mean_exec, 'previous_count': None,
+                              'previous_mean_execution': None}
+    if previous:
+        for dc_id, count, mean_exec in conn.execute(
+                "SELECT datacenter_id, COUNT(*) * 1.0 / ?, AVG(execution_time) FROM cloudlets "
+                "WHERE run_id BETWEEN ? AND ? GROUP BY datacenter_id",
+                (len(previous), previous[-1][0], previous[0][0])):
+            entry = datacenters.setdefault(dc_id, {'count': 0, 'mean_execution': None})
+            entry['previous_count'] = count
+            entry['previous_mean_execution'] = mean_exec
+
+    def averages(row):
+        if row is None or not row[0]:
+            return None
+        return {'runs': row[0], 'makespan': row[1], 'mean_execution': row[2], 'affected_ratio': row[3]}
+
+    return {
+        'current': dict(zip(RUN_FIELDS, current)),
+        'previous': [dict(zip(RUN_FIELDS, row)) for row in previous],
+        'recent': averages(recent),
+        'scenario': averages(scenario),
+        'datacenters': dict(sorted(datacenters.items())),
+    }
+
+def record_log_run(history_path, df, index, source, metrics_path=None):
+    """Record a run extracted by generate_metrics.py; problems with the store are reported, not raised"""
+    from event_stream import is_event_stream
+    from generate_metrics import open_log  # generate_metrics imports this module
+
+    source = Path(source)
+    # Event streams carry no scenario lines; the log is written next to them
+    log_path = source.with_name(SIMULATION_LOG) if is_event_stream(source) else source
+    scenario = None
+    if log_path.exists():
+        with open_log(log_path) as f:
+            scenario = read_scenario(f)
+    try:
+        conn = connect(history_path)
+        try:
+            existing = find_run(conn, source)
+            if existing is not None:
+                print(f"Run from {source} is already recorded as run {existing} in {history_path}")
+                return existing
+            run_id = record_run(conn, df, index, source, metrics_path, scenario)
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Warning: Could not record the run in {history_path}: {e}")
+        return None
+    print(f"Recorded run {run_id} ({len(df)} cloudlets) in {history_path}")
+    return run_id
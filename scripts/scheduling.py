@@ -0,0 +1,77 @@
+"""Cloudlet-to-VM scheduling policies of the Java broker (CloudletSchedulingPolicy.java and subclasses).
+
+Each policy takes cloudlet lengths and the candidate VMs' MIPS, PEs and
+queued work (MI already bound to them), and returns the position in the
+VM list each cloudlet goes to. The results match the Java policies, so
+des_engine.py binds cloudlets exactly as `DisasterRecoverySimulation
+--scheduler` does.
+"""
+import heapq
+import math
+from functools import reduce
+
+import numpy as np
+
+POLICIES = ('round-robin', 'mips-weighted', 'ect')
+DEFAULT_POLICY = 'round-robin'
+
+def round_robin(lengths, mips, pes, queued):
+    """DatacenterBroker's own binding: the VMs in turn"""
+    return np.arange(len(lengths)) % len(mips)
+
+def mips_weighted(lengths, mips, pes, queued):
+    """Smooth weighted round-robin with weights of total MIPS; ignores lengths and queued work"""
+    weights = [float(m) * p for m, p in zip(mips, pes)]
+    total = sum(weights)
+    # With whole-number weights the sequence repeats every total / gcd picks
+    if all(w.is_integer() for w in weights):
+        period = int(total) // reduce(math.gcd, (int(w) for w in weights))
+    else:
+        period = len(lengths)
+    current = [0.0] * len(weights)
+    picks = []
+    for _ in range(min(period, len(lengths))):
+        best = 0
+        for i, weight in enumerate(weights):
+            current[i] += weight
+            if current[i] > current[best]:
+                best = i
+        current[best] -= total
+        picks.append(best)
+    return np.resize(np.array(picks, dtype=np.int64), len(lengths))
+
+def earliest_completion(lengths, mips, pes, queued):
+    """Longest cloudlets first, each to the VM where it would finish soonest; one heap per VM type"""
+    heaps = {}
+    for position, (m, p) in enumerate(zip(mips, pes)):
+        heaps.setdefault((float(m), int(p)), []).append((float(queued[position]), position))
+    types = []
+    for (m, p), heap in heaps.items():
+        heapq.heapify(heap)
+        types.append((m, m * p, heap))
+
+    chosen = np.empty(len(lengths), dtype=np.int64)
+    for cloudlet in np.argsort(-np.asarray(lengths, dtype=np.float64), kind='stable').tolist():
+        length = float(lengths[cloudlet])
+        best, best_finish, best_position = None, math.inf, -1
+        for m, capacity, heap in types:
+            work, position = heap[0]
+            # A VM without capacity never finishes anything
+            finish = max((work + length) / capacity, length / m) if capacity > 0 else math.inf
+            if best is None or finish < best_finish or (finish == best_finish and position < best_position):
+                best, best_finish, best_position = heap, finish, position
+        heapq.heapreplace(best, (best[0][0] + length, best_position))
+        chosen[cloudlet] = best_position
+    return chosen
+
+ASSIGN = {'round-robin': round_robin, 'mips-weighted': mips_weighted, 'ect': earliest_completion}
+
+def assign(policy, lengths, mips, pes, queued=None):
+    """Position in the VM list for each cloudlet, as CloudletSchedulingPolicy.parse(policy).assign would bind it"""
+    if policy not in ASSIGN:
+        raise ValueError(f"Unknown scheduling policy '{policy}' (expected {', '.join(POLICIES)})")
+    if queued is None:
+        queued = np.zeros(len(mips))
+    if len(lengths) == 0:
+        return np.empty(0, dtype=np.int64)
+    return ASSIGN[policy](lengths, mips, pes, queued)
@@ -0,0 +1,68 @@
+"""Disaster snapshots: the state of a run when the primary datacenter first fails.
+
+Written by SimulationSnapshot.java (DisasterRecoverySimulation --snapshot)
+and by des_engine.run_to_disaster; des_engine.resume continues a run from
+one with any recovery strategy, so variants branch at the disaster instead
+of re-running from t=0. The file is a big-endian header followed by one
+fixed-size record per VM and one per cloudlet.
+"""
+from pathlib import Path
+
+import numpy as np
+
+MAGIC = b'DRSSNAP\0'
+VERSION = 1
+# random_state is the java.util.Random state of the failure draws, or -1 if the writer cannot see it
+HEADER = np.dtype([('magic', 'S8'), ('version', '>i4'), ('clock', '>f8'), ('random_state', '>i8'),
+                   ('vm_count', '>i4'), ('cloudlet_count', '>i4')])
+VM_RECORD = np.dtype([('id', '>i4'), ('datacenter', '>i4'), ('mips', '>f8'), ('pes', '>i4')])
+# remaining is MI left on the VM at the snapshot; start and finish are NaN until they happen
+CLOUDLET_RECORD = np.dtype([('id', '>i4'), ('vm', '>i4'), ('state', 'i1'), ('length', '>f8'),
+                            ('remaining', '>f8'), ('start', '>f8'), ('finish', '>f8')])
+
+# Cloudlet states, mirrored by SimulationSnapshot.java
+PENDING, RUNNING, RECEIVED = 0, 1, 2
+
+class Snapshot:
+    def __init__(self, clock, vms, cloudlets, random_state=-1):
+        self.clock = float(clock)
+        # VMs and cloudlets are kept in ID order
+        vms = np.asarray(vms, dtype=VM_RECORD)
+        self.vms = vms[np.argsort(vms['id'], kind='stable')]
+        cloudlets = np.asarray(cloudlets, dtype=CLOUDLET_RECORD)
+        self.cloudlets = cloudlets[np.argsort(cloudlets['id'], kind='stable')]
+        self.random_state = int(random_state)
+
+    def count(self, state):
+        return int(np.count_nonzero(self.cloudlets['state'] == state))
+
+    def __repr__(self):
+        return (f"Snapshot(clock={self.clock}, vms={len(self.vms)}, received={self.count(RECEIVED)}, "
+                f"running={self.count(RUNNING)}, pending={self.count(PENDING)})")
+
+def write_snapshot(snapshot, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = np.array([(MAGIC, VERSION, snapshot.clock, snapshot.random_state,
+                        len(snapshot.vms), len(snapshot.cloudlets))], dtype=HEADER)
+    with open(path, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(snapshot.vms.tobytes())
+        f.write(snapshot.cloudlets.tobytes())
+    return path
+
+def read_snapshot(path):
+    data = Path(path).read_bytes()
+    header = np.frombuffer(data, dtype=HEADER, count=1) if len(data) >= HEADER.itemsize else []
+    if len(header) == 0 or header['magic'][0] != MAGIC.rstrip(b'\0'):
+        raise ValueError(f"{path} is not a simulation snapshot")
+    if int(header['version'][0]) != VERSION:
+        raise ValueError(f"Unsupported snapshot version {int(header['version'][0])}")
+    vm_count, cloudlet_count = int(header['vm_count'][0]), int(header['cloudlet_count'][0])
+    expected = HEADER.itemsize + vm_count * VM_RECORD.itemsize + cloudlet_count * CLOUDLET_RECORD.itemsize
+    if len(data) != expected:
+        raise ValueError(f"{path} is {len(data)} bytes, expected {expected}")
+    vms = np.frombuffer(data, dtype=VM_RECORD, count=vm_count, offset=HEADER.itemsize)
+    cloudlets = np.frombuffer(data, dtype=CLOUDLET_RECORD, count=cloudlet_count,
+                              offset=HEADER.itemsize + vms.nbytes)
+    return Snapshot(header['clock'][0], vms, cloudlets, header['random_state'][0])
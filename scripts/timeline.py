@@ -0,0 +1,120 @@
+import numpy as np
+
+from aggregate import affected_mask
+
+# Above this many cloudlets a per-point scatter stops being readable or cheap
+SCATTER_MAX_POINTS = 5000
+TIME_BINS = 400
+ID_BINS = 160
+RATE_BINS = 200
+TIMELINE_MODES = ('auto', 'scatter', 'density', 'rate')
+
+def choose_mode(row_count, mode='auto'):
+    """Resolve 'auto' to scatter for small runs and a density raster otherwise"""
+    if mode != 'auto':
+        return mode
+    return 'scatter' if row_count <= SCATTER_MAX_POINTS else 'density'
+
+def timeline_payload(df, disaster_time, mode='auto'):
+    """Reduce the completion timeline to what the chosen mode draws.
+
+    Scatter keeps the points; density and rate bin them here, so the size of
+    what is hashed, pickled to a render worker and drawn depends on the bin
+    counts, not on the number of cloudlets.
+    """
+    if not all(col in df.columns for col in ['FinishTime', 'CloudletID', 'AffectedByFailover']):
+        return {'mode': 'missing', 'disaster_time': disaster_time}
+
+    finish = np.asarray(df['FinishTime'], dtype=np.float64)
+    ids = np.asarray(df['CloudletID'], dtype=np.float64)
+    affected = affected_mask(df)
+
+    mode = choose_mode(len(df), mode)
+    payload = {'mode': mode, 'disaster_time': disaster_time, 'rows': len(df)}
+    if mode == 'scatter':
+        order = np.argsort(finish, kind='stable')
+        payload.update(finish=finish[order], ids=ids[order], affected=affected[order])
+        return payload
+
+    t_lo, t_hi = (float(finish.min()), float(finish.max())) if len(finish) else (0.0, 1.0)
+    if t_hi <= t_lo:
+        t_hi = t_lo + 1.0
+    if mode == 'rate':
+        edges = np.linspace(t_lo, t_hi, RATE_BINS + 1)
+        payload.update(
+            edges=edges,
+            affected=np.histogram(finish[affected], bins=edges)[0],
+            unaffected=np.histogram(finish[~affected], bins=edges)[0],
+        )
+        return payload
+
+    id_lo, id_hi = (float(ids.min()), float(ids.max())) if len(ids) else (0.0, 1.0)
+    if id_hi <= id_lo:
+        id_hi = id_lo + 1.0
+    extent = [t_lo, t_hi, id_lo, id_hi]
+    bins = [np.linspace(t_lo, t_hi, TIME_BINS + 1), np.linspace(id_lo, id_hi, ID_BINS + 1)]
+    payload.update(
+        extent=extent,
+        affected=np.histogram2d(finish[affected], ids[affected], bins=bins)[0],
+        unaffected=np.histogram2d(finish[~affected], ids[~affected], bins=bins)[0],
+    )
+    return payload
+
+def payload_bytes(payload):
+    """Stable byte parts of a payload for cache keys"""
+    parts = [repr((payload['mode'], payload['disaster_time'], payload.get('rows'))).encode()]
+    for name in ('finish', 'ids', 'affected', 'unaffected', 'edges', 'extent'):
+        if name in payload:
+            parts.append(np.ascontiguousarray(payload[name]).tobytes())
+    return parts
+
+def _density_rgb(affected, unaffected):
+    """Blend log-scaled affected (red) and unaffected (green) counts into one RGB raster"""
+    scale = np.log1p(max(affected.max(initial=0), unaffected.max(initial=0), 1))
+    red = np.log1p(affected) / scale
+    green = np.log1p(unaffected) / scale
+    rgb = np.ones(affected.shape + (3,))
+    # Empty cells stay white; occupied cells darken towards their colour
+    rgb[..., 0] -= green * 0.8
+    rgb[..., 1] -= red * 0.8
+    rgb[..., 2] -= (red + green).clip(0, 1) * 0.8
+    # histogram2d is indexed [time, id]; imshow wants rows = id
+    return rgb.clip(0, 1).transpose(1, 0, 2)
+
+def render_timeline(plt, payload):
+    """Draw the Task Completion Timeline panel for a payload from timeline_payload"""
+    from matplotlib.patches import Patch
+
+    disaster_time = payload['disaster_time']
+    mode = payload['mode']
+    if mode == 'missing':
+        plt.text(0.5, 0.5, 'Missing timeline data',
+                horizontalalignment='center', verticalalignment='center')
+        return
+
+    handles = []
+    if mode == 'scatter':
+        colors = np.where(payload['affected'], 'red', 'green')
+        plt.scatter(payload['finish'], payload['ids'], c=colors)
+        plt.ylabel('Cloudlet ID')
+    elif mode == 'rate':
+        edges = payload['edges']
+        plt.stairs(payload['unaffected'], edges, color='green', label='Unaffected completions')
+        plt.stairs(payload['affected'], edges, color='red', label='Affected completions')
+        plt.ylabel(f"Completions per {edges[1] - edges[0]:.2f}s")
+    else:
+        plt.imshow(_density_rgb(payload['affected'], payload['unaffected']), extent=payload['extent'],
+                   origin='lower', aspect='auto', interpolation='nearest')
+        handles = [Patch(color='red', label='Affected (density)'), Patch(color='green', label='Unaffected (density)')]
+        plt.ylabel('Cloudlet ID')
+
+    # Add failover event marker
+    plt.axvline(x=disaster_time, color='r', linestyle='--', label=f'Disaster Event ({disaster_time}s)')
+    existing, _ = plt.gca().get_legend_handles_labels()
+    plt.legend(handles=existing + handles)
+    title = 'Task Completion Timeline'
+    if mode != 'scatter':
+        title += f" ({payload['rows']:,} cloudlets, binned)"
+    plt.title(title)
+    plt.xlabel('Simulation Time (seconds)')
+    plt.grid(True, linestyle='--', alpha=0.7)
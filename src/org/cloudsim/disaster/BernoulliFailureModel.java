@@ -0,0 +1,59 @@
+package org.cloudsim.disaster;
+
+import java.util.Random;
+
+/**
+ * The original failure model: at every check, one CHECK_INTERVAL apart from
+ * time zero, the domain fails with a fixed probability.
+ *
+ * The number of checks up to and including the failing one is geometric,
+ * so it is drawn with a single random number rather than one draw (and one
+ * simulation event) per check. The distribution of failure times is the
+ * same as polling; a failed domain is never repaired.
+ */
+public class BernoulliFailureModel extends FailureModel {
+
+    public static final double DEFAULT_INTERVAL = 10.0;
+
+    private final double probability;
+    private final double interval;
+
+    public BernoulliFailureModel(double probability) {
+        this(probability, DEFAULT_INTERVAL);
+    }
+
+    public BernoulliFailureModel(double probability, double interval) {
+        if (!(probability >= 0.0 && probability <= 1.0)) {
+            throw new IllegalArgumentException("Failure probability must be in [0, 1], got " + probability);
+        }
+        requirePositive("Check interval", interval);
+        this.probability = probability;
+        this.interval = interval;
+    }
+
+    @Override
+    public double nextFailure(double time, Random random) {
+        if (probability <= 0.0) {
+            return NEVER;
+        }
+        double firstCheck = (Math.floor(time / interval) + 1) * interval;
+        if (probability >= 1.0) {
+            return firstCheck;
+        }
+        double checks = Math.floor(Math.log(1.0 - random.nextDouble()) / Math.log1p(-probability));
+        return firstCheck + checks * interval;
+    }
+
+    public double getProbability() {
+        return probability;
+    }
+
+    public double getInterval() {
+        return interval;
+    }
+
+    @Override
+    public String toString() {
+        return "bernoulli (probability " + probability + " every " + interval + ")";
+    }
+}
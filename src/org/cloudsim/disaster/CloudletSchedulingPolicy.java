@@ -0,0 +1,44 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Vm;
+
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Decides which VM each cloudlet runs on. The broker asks for a plan when
+ * it first submits cloudlets, and again on failover for the cloudlets
+ * leaving the failed datacenter, with only the surviving VMs to choose from.
+ */
+public abstract class CloudletSchedulingPolicy {
+
+    /**
+     * Returns the VM ID for each cloudlet ID, in cloudlet order.
+     *
+     * @param queuedWork MI already bound to each VM ID and not yet returned;
+     *                   VMs missing from the map have none
+     */
+    public abstract Map<Integer, Integer> assign(List<Cloudlet> cloudlets, List<Vm> vms, Map<Integer, Double> queuedWork);
+
+    public abstract String getName();
+
+    public static CloudletSchedulingPolicy parse(String name) {
+        switch (name.toLowerCase()) {
+            case "round-robin":
+                return new RoundRobinSchedulingPolicy();
+            case "mips-weighted":
+                return new MipsWeightedSchedulingPolicy();
+            case "ect":
+                return new EarliestCompletionSchedulingPolicy();
+            default:
+                throw new IllegalArgumentException("Unknown scheduling policy '" + name +
+                        "' (expected round-robin, mips-weighted or ect)");
+        }
+    }
+
+    /** Total MIPS of a VM across its PEs */
+    protected static double capacity(Vm vm) {
+        return vm.getMips() * vm.getNumberOfPes();
+    }
+}
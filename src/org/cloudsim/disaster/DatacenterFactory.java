@@ -92,7 +92,7 @@ public class DatacenterFactory {
                 bw, 
                 size, 
                 vmm, 
-                new CloudletSchedulerTimeShared()
+                new ProgressCloudletScheduler()
             );
             vms.add(vm);
         }
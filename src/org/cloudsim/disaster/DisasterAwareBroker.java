@@ -0,0 +1,238 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.DatacenterBroker;
+import org.cloudbus.cloudsim.Log;
+import org.cloudbus.cloudsim.Vm;
+import org.cloudbus.cloudsim.core.CloudSim;
+import org.cloudbus.cloudsim.core.CloudSimTags;
+import org.cloudbus.cloudsim.core.SimEvent;
+
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * DatacenterBroker that creates each VM in the datacenter it is bound to,
+ * binds cloudlets to VMs with a CloudletSchedulingPolicy, keeps an index of
+ * in-flight cloudlets and can move them to another datacenter on failover.
+ * VM creation, cloudlet submission, receipt and reroutes are reported to an
+ * EventStreamWriter as they happen.
+ */
+public class DisasterAwareBroker extends DatacenterBroker {
+
+    /** Sent to observers once every submitted cloudlet has come back */
+    public static final int WORKLOAD_FINISHED = 1000;
+
+    private EventStreamWriter eventStream;
+    private int submittedReported = 0;
+    private final Map<Integer, Integer> vmPlacement = new HashMap<>();
+    private final InFlightIndex inFlight = new InFlightIndex();
+    // cloudlet ID -> VM it moves to once its cancellation comes back
+    private final Map<Integer, Integer> pendingReroutes = new HashMap<>();
+    private final List<Integer> finishObservers = new ArrayList<>();
+    private CloudletSchedulingPolicy schedulingPolicy = new RoundRobinSchedulingPolicy();
+
+    public DisasterAwareBroker(String name) throws Exception {
+        super(name);
+    }
+
+    public void setEventStream(EventStreamWriter eventStream) {
+        this.eventStream = eventStream;
+    }
+
+    public void setSchedulingPolicy(CloudletSchedulingPolicy schedulingPolicy) {
+        this.schedulingPolicy = schedulingPolicy;
+    }
+
+    public CloudletSchedulingPolicy getSchedulingPolicy() {
+        return schedulingPolicy;
+    }
+
+    /** Create this VM only in the given datacenter; unbound VMs go to the first that accepts them */
+    public void bindVmToDatacenter(int vmId, int datacenterId) {
+        vmPlacement.put(vmId, datacenterId);
+    }
+
+    /** Sends WORKLOAD_FINISHED to the entity when the last cloudlet returns */
+    public void notifyWhenFinished(int entityId) {
+        finishObservers.add(entityId);
+    }
+
+    public InFlightIndex getInFlightIndex() {
+        return inFlight;
+    }
+
+    /** VM ID -> ID of the datacenter it was created in; public so SimulationSnapshot can record it */
+    @Override
+    public Map<Integer, Integer> getVmsToDatacentersMap() {
+        return super.getVmsToDatacentersMap();
+    }
+
+    /**
+     * Cancels every cloudlet queued or running in one datacenter and
+     * resubmits it to the VMs of another, re-planned by the scheduling
+     * policy around the work those VMs already have. Cloudlets restart from
+     * the beginning on their new VM. Returns the number of cloudlets being
+     * moved; each move completes when the cancellation is acknowledged.
+     */
+    public int rerouteCloudlets(int fromDatacenterId, int toDatacenterId) {
+        List<Vm> targets = new ArrayList<>();
+        for (Vm vm : getVmsCreatedList()) {
+            if (getVmsToDatacentersMap().get(vm.getId()) == toDatacenterId) {
+                targets.add(vm);
+            }
+        }
+        if (targets.isEmpty()) {
+            Log.printLine(CloudSim.clock() + ": " + getName() + ": No VMs in " +
+                          CloudSim.getEntityName(toDatacenterId) + " to reroute cloudlets to");
+            return 0;
+        }
+
+        List<Cloudlet> moving = new ArrayList<>();
+        for (Cloudlet cloudlet : inFlight.inDatacenter(fromDatacenterId)) {
+            if (!pendingReroutes.containsKey(cloudlet.getCloudletId())) {
+                moving.add(cloudlet);
+            }
+        }
+        Map<Integer, Integer> plan = schedulingPolicy.assign(moving, targets, queuedWork(targets));
+        for (Cloudlet cloudlet : moving) {
+            pendingReroutes.put(cloudlet.getCloudletId(), plan.get(cloudlet.getCloudletId()));
+            sendNow(fromDatacenterId, CloudSimTags.CLOUDLET_CANCEL,
+                    new int[] {cloudlet.getCloudletId(), cloudlet.getUserId(), cloudlet.getVmId()});
+        }
+        return moving.size();
+    }
+
+    /** Full length of the cloudlets in flight on each VM; the broker does not see their progress */
+    private Map<Integer, Double> queuedWork(List<Vm> vms) {
+        Map<Integer, Double> work = new HashMap<>();
+        for (Vm vm : vms) {
+            double total = 0.0;
+            for (Cloudlet cloudlet : inFlight.inVm(vm.getId())) {
+                total += cloudlet.getCloudletLength();
+            }
+            work.put(vm.getId(), total);
+        }
+        return work;
+    }
+
+    @Override
+    protected void createVmsInDatacenter(int datacenterId) {
+        // Same as the base class, except that VMs bound elsewhere are skipped
+        int requestedVms = 0;
+        String datacenterName = CloudSim.getEntityName(datacenterId);
+        for (Vm vm : getVmList()) {
+            Integer boundTo = vmPlacement.get(vm.getId());
+            if (getVmsToDatacentersMap().containsKey(vm.getId()) || (boundTo != null && boundTo != datacenterId)) {
+                continue;
+            }
+            Log.printLine(CloudSim.clock() + ": " + getName() + ": Trying to Create VM #" + vm.getId() + " in " + datacenterName);
+            sendNow(datacenterId, CloudSimTags.VM_CREATE_ACK, vm);
+            requestedVms++;
+        }
+        getDatacenterRequestedIdsList().add(datacenterId);
+        setVmsRequested(requestedVms);
+        setVmsAcks(0);
+
+        if (requestedVms == 0) {
+            // No acknowledgements will arrive, so move on as processVmCreate would
+            for (int nextDatacenterId : getDatacenterIdsList()) {
+                if (!getDatacenterRequestedIdsList().contains(nextDatacenterId)) {
+                    createVmsInDatacenter(nextDatacenterId);
+                    return;
+                }
+            }
+            if (!getVmsCreatedList().isEmpty()) {
+                submitCloudlets();
+            }
+        }
+    }
+
+    @Override
+    protected void processVmCreate(SimEvent ev) {
+        int[] data = (int[]) ev.getData();
+        if (eventStream != null && data[2] == CloudSimTags.TRUE) {
+            eventStream.vmCreated(CloudSim.clock(), data[1], data[0]);
+        }
+        super.processVmCreate(ev);
+    }
+
+    @Override
+    protected void submitCloudlets() {
+        // Bind the cloudlets the user left unbound before the base class would bind them round-robin
+        List<Cloudlet> unbound = new ArrayList<>();
+        for (Cloudlet cloudlet : getCloudletList()) {
+            if (cloudlet.getVmId() == -1) {
+                unbound.add(cloudlet);
+            }
+        }
+        if (!unbound.isEmpty() && !getVmsCreatedList().isEmpty()) {
+            Map<Integer, Integer> plan = schedulingPolicy.assign(unbound, getVmsCreatedList(), queuedWork(getVmsCreatedList()));
+            for (Cloudlet cloudlet : unbound) {
+                cloudlet.setVmId(plan.get(cloudlet.getCloudletId()));
+            }
+        }
+        super.submitCloudlets();
+        // The base class binds and sends cloudlets, then appends them to the submitted list
+        List<Cloudlet> submitted = getCloudletSubmittedList();
+        for (int i = submittedReported; i < submitted.size(); i++) {
+            Cloudlet cloudlet = submitted.get(i);
+            inFlight.add(cloudlet, getVmsToDatacentersMap().get(cloudlet.getVmId()));
+            if (eventStream != null) {
+                eventStream.cloudletSubmitted(CloudSim.clock(), cloudlet.getCloudletId(), cloudlet.getVmId());
+            }
+        }
+        submittedReported = submitted.size();
+    }
+
+    @Override
+    protected void processCloudletReturn(SimEvent ev) {
+        Cloudlet cloudlet = (Cloudlet) ev.getData();
+        inFlight.remove(cloudlet.getCloudletId());
+        pendingReroutes.remove(cloudlet.getCloudletId());
+        if (eventStream != null) {
+            eventStream.cloudletReceived(CloudSim.clock(), cloudlet.getCloudletId(), cloudlet.getVmId());
+        }
+        super.processCloudletReturn(ev);
+        if (getCloudletList().isEmpty() && inFlight.size() == 0) {
+            for (int observer : finishObservers) {
+                sendNow(observer, WORKLOAD_FINISHED);
+            }
+        }
+    }
+
+    @Override
+    protected void processOtherEvent(SimEvent ev) {
+        if (ev.getTag() == CloudSimTags.CLOUDLET_CANCEL) {
+            processCloudletCancel(ev);
+            return;
+        }
+        super.processOtherEvent(ev);
+    }
+
+    /** Resubmits a cancelled cloudlet to the VM chosen for it in rerouteCloudlets */
+    private void processCloudletCancel(SimEvent ev) {
+        Cloudlet cloudlet = (Cloudlet) ev.getData();
+        if (cloudlet == null) {
+            // It finished before the cancellation arrived; its return is already on the way
+            return;
+        }
+        Integer targetVmId = pendingReroutes.remove(cloudlet.getCloudletId());
+        if (targetVmId == null) {
+            return;
+        }
+        int fromVmId = cloudlet.getVmId();
+        int datacenterId = getVmsToDatacentersMap().get(targetVmId);
+        cloudlet.setVmId(targetVmId);
+        inFlight.add(cloudlet, datacenterId);
+
+        Log.printLine(CloudSim.clock() + ": " + getName() + ": Cloudlet " + cloudlet.getCloudletId() +
+                      " rerouted from VM #" + fromVmId + " to VM #" + targetVmId);
+        if (eventStream != null) {
+            eventStream.reroute(CloudSim.clock(), cloudlet.getCloudletId(), fromVmId, targetVmId);
+        }
+        sendNow(datacenterId, CloudSimTags.CLOUDLET_SUBMIT, cloudlet);
+    }
+}
@@ -19,68 +19,179 @@ public class DisasterRecoverySimulation {
     private static FailoverManager failoverManager;
     private static MetricsCollector metricsCollector;
 
-    public static void main(String[] args) {
-        Log.printLine("Initialising...");
+    /** Structured counterpart of the log, read by scripts/generate_metrics.py --events */
+    private static final String EVENTS_FILE = "results/events.bin";
 
-        try {
-            // Number of users/brokers
-            int numUsers = 1;
-            Calendar calendar = Calendar.getInstance();
-            boolean traceFlag = false;  // trace events
+    public static final double DEFAULT_FAILURE_PROBABILITY = 0.5;
 
-            // Initialize the CloudSim library
-            CloudSim.init(numUsers, calendar, traceFlag);
+    public static void main(String[] args) {
+        double failureProbability = DEFAULT_FAILURE_PROBABILITY;
+        long seed = System.currentTimeMillis();
+        String failureModelSpec = "bernoulli";
+        String backupFailureModelSpec = null;
+        FailureModel primaryModel = null;
+        FailureModel backupModel = null;
+        CloudletSchedulingPolicy schedulingPolicy = new RoundRobinSchedulingPolicy();
+        String snapshotFile = null;
+        try {
+            for (int i = 0; i < args.length; i++) {
+                if (args[i].equals("--seed") && i + 1 < args.length) {
+                    seed = Long.parseLong(args[++i]);
+                } else if (args[i].equals("--failure-probability") && i + 1 < args.length) {
+                    failureProbability = Double.parseDouble(args[++i]);
+                } else if (args[i].equals("--failure-model") && i + 1 < args.length) {
+                    failureModelSpec = args[++i];
+                } else if (args[i].equals("--backup-failure-model") && i + 1 < args.length) {
+                    backupFailureModelSpec = args[++i];
+                } else if (args[i].equals("--scheduler") && i + 1 < args.length) {
+                    schedulingPolicy = CloudletSchedulingPolicy.parse(args[++i]);
+                } else if (args[i].equals("--snapshot") && i + 1 < args.length) {
+                    snapshotFile = args[++i];
+                } else {
+                    throw new IllegalArgumentException("Unknown argument: " + args[i]);
+                }
+            }
+            primaryModel = FailureModel.parse(failureModelSpec, failureProbability);
+            if (backupFailureModelSpec != null) {
+                backupModel = FailureModel.parse(backupFailureModelSpec, failureProbability);
+            }
+        } catch (IllegalArgumentException e) {
+            System.err.println(e.getMessage());
+            System.err.println("Usage: DisasterRecoverySimulation [--seed N] [--failure-probability P]" +
+                               " [--failure-model SPEC] [--backup-failure-model SPEC]" +
+                               " [--scheduler round-robin|mips-weighted|ect] [--snapshot FILE]");
+            System.exit(2);
+        }
 
-            // Create a datacenter broker
-            DatacenterBroker broker = new DatacenterBroker("Broker_0");
-            int brokerId = broker.getId();
+        Log.printLine("Initialising...");
+        // Printed so any run can be reproduced with --seed
+        if (primaryModel instanceof BernoulliFailureModel) {
+            Log.printLine("Random seed: " + seed + ", failure probability: " +
+                          ((BernoulliFailureModel) primaryModel).getProbability());
+        } else {
+            Log.printLine("Random seed: " + seed);
+        }
 
-            // Create primary and backup datacenters
-            Datacenter primaryDC = DatacenterFactory.createDatacenter("PrimaryDC", true);
-            Datacenter backupDC = DatacenterFactory.createDatacenter("BackupDC", false);
+        EventStreamWriter eventStream = null;
+        try {
+            eventStream = new EventStreamWriter(EVENTS_FILE);
 
-            // Create VMs for primary datacenter (4 VMs)
-            vmList = DatacenterFactory.createVms(4, true, brokerId);
-            
-            // Create VMs for backup datacenter (2 VMs)
-            vmList.addAll(DatacenterFactory.createVms(2, false, brokerId));
-            
-            // Submit VM list to the broker
-            broker.submitVmList(vmList);
+            // Configure the failure domains; failures are sampled up front, one event each
+            failoverManager = new FailoverManager(primaryModel, seed);
+            if (backupModel != null) {
+                failoverManager.setFailureModel("BackupDC", backupModel);
+            }
+            for (Map.Entry<String, FailureModel> domain : failoverManager.getFailureModels().entrySet()) {
+                Log.printLine("Failure model for " + domain.getKey() + ": " + domain.getValue());
+            }
+            failoverManager.setEventStream(eventStream);
+            Log.printLine("Cloudlet scheduling: " + schedulingPolicy.getName());
 
-            // Create cloudlets (20 tasks)
-            cloudletList = CloudletManager.createCloudlets(20, brokerId);
-            
-            // Submit cloudlet list to the broker
-            broker.submitCloudletList(cloudletList);
-            
-            // Configure disaster event (50% chance of failure at simulation time 50)
-            failoverManager = new FailoverManager(0.5);
-            DisasterRecoverySimulationEventListener listener = new DisasterRecoverySimulationEventListener(failoverManager, broker, primaryDC, backupDC);
-            
             // Set up metrics collector
             metricsCollector = new MetricsCollector();
 
-            // Start the simulation
-            CloudSim.startSimulation();
-
-            // Stop the simulation
-            CloudSim.stopSimulation();
-
             // Process the results
-            List<Cloudlet> newList = broker.getCloudletReceivedList();
+            List<Cloudlet> newList = runSimulation(failoverManager, eventStream, schedulingPolicy, snapshotFile);
             
             // Print results
             printResults(newList);
+            for (Cloudlet cloudlet : newList) {
+                eventStream.cloudletRecord(cloudlet);
+            }
             
             // Save metrics to CSV file
             metricsCollector.saveToCSV(newList, failoverManager, "results/metrics.csv");
 
+            // Flush the event stream before the last log line, which tells log followers the run is over
+            eventStream.close();
+
             Log.printLine("Simulation finished!");
         } catch (Exception e) {
             e.printStackTrace();
             Log.printLine("Simulation error: " + e.getMessage());
+        } finally {
+            if (eventStream != null) {
+                eventStream.close();
+            }
+        }
+    }
+
+    /**
+     * Builds the datacenters, VMs and cloudlets, runs one simulation and
+     * returns the cloudlets the broker received. CloudSim state is reset by
+     * CloudSim.init, so this can be called repeatedly in one JVM.
+     *
+     * @param eventStream may be null when no event stream is wanted
+     */
+    public static List<Cloudlet> runSimulation(FailoverManager failoverManager, EventStreamWriter eventStream)
+            throws Exception {
+        return runSimulation(failoverManager, eventStream, new RoundRobinSchedulingPolicy());
+    }
+
+    /** As above, binding cloudlets to VMs (and re-planning them on failover) with the given policy */
+    public static List<Cloudlet> runSimulation(FailoverManager failoverManager, EventStreamWriter eventStream,
+                                               CloudletSchedulingPolicy schedulingPolicy) throws Exception {
+        return runSimulation(failoverManager, eventStream, schedulingPolicy, null);
+    }
+
+    /**
+     * As above, also writing a SimulationSnapshot to `snapshotFile` at the
+     * first failure of the primary datacenter, unless it is null
+     */
+    public static List<Cloudlet> runSimulation(FailoverManager failoverManager, EventStreamWriter eventStream,
+                                               CloudletSchedulingPolicy schedulingPolicy, String snapshotFile)
+            throws Exception {
+        // Number of users/brokers
+        int numUsers = 1;
+        Calendar calendar = Calendar.getInstance();
+        boolean traceFlag = false;  // trace events
+
+        // Initialize the CloudSim library
+        CloudSim.init(numUsers, calendar, traceFlag);
+
+        // Create a datacenter broker
+        DisasterAwareBroker broker = new DisasterAwareBroker("Broker_0");
+        broker.setEventStream(eventStream);
+        broker.setSchedulingPolicy(schedulingPolicy);
+        int brokerId = broker.getId();
+
+        // Create primary and backup datacenters
+        Datacenter primaryDC = DatacenterFactory.createDatacenter("PrimaryDC", true);
+        Datacenter backupDC = DatacenterFactory.createDatacenter("BackupDC", false);
+
+        // Create VMs for primary datacenter (4 VMs)
+        vmList = DatacenterFactory.createVms(4, true, brokerId);
+        for (Vm vm : vmList) {
+            broker.bindVmToDatacenter(vm.getId(), primaryDC.getId());
+        }
+        
+        // Create VMs for backup datacenter (2 VMs), where failover moves work to
+        List<Vm> backupVms = DatacenterFactory.createVms(2, false, brokerId);
+        for (Vm vm : backupVms) {
+            broker.bindVmToDatacenter(vm.getId(), backupDC.getId());
         }
+        vmList.addAll(backupVms);
+        
+        // Submit VM list to the broker
+        broker.submitVmList(vmList);
+
+        // Create cloudlets (20 tasks)
+        cloudletList = CloudletManager.createCloudlets(20, brokerId);
+        
+        // Submit cloudlet list to the broker
+        broker.submitCloudletList(cloudletList);
+        
+        DisasterRecoverySimulationEventListener listener = new DisasterRecoverySimulationEventListener(failoverManager, broker, primaryDC, backupDC);
+        listener.setEventStream(eventStream);
+        listener.setSnapshotFile(snapshotFile);
+
+        // Start the simulation
+        CloudSim.startSimulation();
+
+        // Stop the simulation
+        CloudSim.stopSimulation();
+
+        return broker.getCloudletReceivedList();
     }
 
     private static void printResults(List<Cloudlet> list) {
@@ -4,77 +4,176 @@ import org.cloudbus.cloudsim.*;
 import org.cloudbus.cloudsim.core.CloudSim;
 import org.cloudbus.cloudsim.core.SimEvent;
 import org.cloudbus.cloudsim.core.SimEntity;
+import org.cloudbus.cloudsim.core.predicates.PredicateType;
 
-import java.util.List;
+import java.io.IOException;
 import java.util.ArrayList;
+import java.util.List;
 
 public class DisasterRecoverySimulationEventListener extends SimEntity {
-    
-    private static final int DISASTER_CHECK = 999;
-    private static final double CHECK_INTERVAL = 10.0;
-    
+
+    private static final int DOMAIN_FAILURE = 999;
+    private static final int DOMAIN_REPAIR = 998;
+
     private FailoverManager failoverManager;
-    private DatacenterBroker broker;
+    private DisasterAwareBroker broker;
     private Datacenter primaryDC;
     private Datacenter backupDC;
-    
+    private EventStreamWriter eventStream;
+    private String snapshotFile;
+    private boolean snapshotTaken = false;
+    private List<FailureDomain> domains = new ArrayList<>();
+
+    /** A datacenter that can fail, and where its work goes when it does */
+    private static class FailureDomain {
+        final Datacenter datacenter;
+        final Datacenter failoverTarget;
+        boolean down = false;
+
+        FailureDomain(Datacenter datacenter, Datacenter failoverTarget) {
+            this.datacenter = datacenter;
+            this.failoverTarget = failoverTarget;
+        }
+    }
+
     public DisasterRecoverySimulationEventListener(
             FailoverManager failoverManager,
-            DatacenterBroker broker,
+            DisasterAwareBroker broker,
             Datacenter primaryDC,
             Datacenter backupDC) {
-        
+
         super("DisasterRecoveryListener");
         this.failoverManager = failoverManager;
         this.broker = broker;
         this.primaryDC = primaryDC;
         this.backupDC = backupDC;
-        
-        // Schedule the first disaster check
-        CloudSim.send(getId(), getId(), CHECK_INTERVAL, DISASTER_CHECK, null);
+
+        // Each datacenter with a failure model is a domain; the two fail over to each other
+        for (String name : failoverManager.getFailureModels().keySet()) {
+            if (name.equals(primaryDC.getName())) {
+                domains.add(new FailureDomain(primaryDC, backupDC));
+            } else if (name.equals(backupDC.getName())) {
+                domains.add(new FailureDomain(backupDC, primaryDC));
+            } else {
+                throw new IllegalArgumentException("No datacenter named " + name + " to attach a failure model to");
+            }
+        }
+        broker.notifyWhenFinished(getId());
     }
-    
+
+    public void setEventStream(EventStreamWriter eventStream) {
+        this.eventStream = eventStream;
+    }
+
+    /** Write a SimulationSnapshot to this file when the primary datacenter first fails, before failover */
+    public void setSnapshotFile(String snapshotFile) {
+        this.snapshotFile = snapshotFile;
+    }
+
     @Override
     public void startEntity() {
-        // Entity is started when it's created
+        // One event per failure: each domain's first failure is sampled now
+        for (FailureDomain domain : domains) {
+            scheduleFailure(domain, CloudSim.clock());
+        }
     }
-    
+
     @Override
     public void processEvent(SimEvent ev) {
         switch (ev.getTag()) {
-            case DISASTER_CHECK:
-                checkForDisaster();
+            case DOMAIN_FAILURE:
+                failDomain((FailureDomain) ev.getData());
+                break;
+            case DOMAIN_REPAIR:
+                repairDomain((FailureDomain) ev.getData());
+                break;
+            case DisasterAwareBroker.WORKLOAD_FINISHED:
+                // Nothing is left to fail over; pending failures would only keep the simulation running
+                CloudSim.cancelAll(getId(), new PredicateType(new int[] {DOMAIN_FAILURE, DOMAIN_REPAIR}));
                 break;
             default:
                 break;
         }
     }
-    
-    private void checkForDisaster() {
+
+    private void scheduleFailure(FailureDomain domain, double time) {
+        double failureTime = failoverManager.sampleFailure(domain.datacenter.getName(), time);
+        if (failureTime != FailureModel.NEVER) {
+            send(getId(), Math.max(0.0, failureTime - CloudSim.clock()), DOMAIN_FAILURE, domain);
+        }
+    }
+
+    private void failDomain(FailureDomain domain) {
         double currentTime = CloudSim.clock();
-        
-        if (failoverManager.shouldTriggerFailure(currentTime)) {
-            performFailover();
+        if (domain.down || brokerFinished()) {
+            return;
+        }
+
+        domain.down = true;
+        failoverManager.recordFailure(domain.datacenter.getName(), currentTime);
+        if (snapshotFile != null && !snapshotTaken && domain.datacenter == primaryDC) {
+            writeSnapshot(currentTime);
+        }
+        performFailover(domain);
+
+        double repairDuration = failoverManager.sampleRepair(domain.datacenter.getName(), currentTime);
+        if (repairDuration != FailureModel.NEVER) {
+            send(getId(), repairDuration, DOMAIN_REPAIR, domain);
+        }
+    }
+
+    private void repairDomain(FailureDomain domain) {
+        double currentTime = CloudSim.clock();
+        domain.down = false;
+        failoverManager.recordRecovery(domain.datacenter.getName(), currentTime);
+        scheduleFailure(domain, currentTime);
+    }
+
+    private void writeSnapshot(double currentTime) {
+        snapshotTaken = true;
+        try {
+            SimulationSnapshot.capture(broker, currentTime).write(snapshotFile);
+            Log.printLine("Snapshot at time " + currentTime + " written to " + snapshotFile);
+        } catch (IOException e) {
+            Log.printLine("Could not write snapshot to " + snapshotFile + ": " + e.getMessage());
         }
-        
-        // Schedule next check if simulation is still running and failure hasn't occurred
-        if (!failoverManager.didFailureOccur()) {
-            CloudSim.send(getId(), getId(), CHECK_INTERVAL, DISASTER_CHECK, null);
+    }
+
+    private boolean brokerFinished() {
+        List<Cloudlet> submitted = broker.getCloudletSubmittedList();
+        return broker.getCloudletList().isEmpty() && !submitted.isEmpty()
+                && broker.getCloudletReceivedList().size() >= submitted.size();
+    }
+
+    private boolean isDown(Datacenter datacenter) {
+        for (FailureDomain domain : domains) {
+            if (domain.datacenter == datacenter && domain.down) {
+                return true;
+            }
         }
+        return false;
     }
-    
-    private void performFailover() {
-        // Move all waiting cloudlets from primary to backup datacenter
-        List<Cloudlet> cloudletsToReroute = new ArrayList<>();
-        
-        // Logic to reroute cloudlets
-        // In a real implementation, we would find all waiting cloudlets and reroute them
-        
-        Log.printLine("Rerouted " + cloudletsToReroute.size() + " cloudlets to backup datacenter.");
+
+    private void performFailover(FailureDomain domain) {
+        if (isDown(domain.failoverTarget)) {
+            Log.printLine(domain.failoverTarget.getName() + " is down too; cloudlets stay in " +
+                          domain.datacenter.getName() + ".");
+            return;
+        }
+
+        // Cancel everything queued or running in the failed datacenter and resubmit it to the target's VMs;
+        // the broker logs and records each cloudlet as its cancellation is acknowledged
+        int rerouted = broker.rerouteCloudlets(domain.datacenter.getId(), domain.failoverTarget.getId());
+
+        Log.printLine("Rerouted " + rerouted + " cloudlets to " +
+                      (domain.failoverTarget == backupDC ? "backup datacenter." : domain.failoverTarget.getName() + "."));
+        if (eventStream != null) {
+            eventStream.rerouteSummary(CloudSim.clock(), rerouted);
+        }
     }
-    
+
     @Override
     public void shutdownEntity() {
         // Nothing special to do
     }
-}
\ No newline at end of file
+}
@@ -0,0 +1,104 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Vm;
+
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.Comparator;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.PriorityQueue;
+
+/**
+ * Earliest completion time: longest cloudlets first, each one goes to the VM
+ * where it would finish soonest given the work already bound to that VM.
+ *
+ * A VM with total capacity C and queued work W finishes a new cloudlet of
+ * length L at about max((W + L) / C, L / MIPS), since one cloudlet cannot
+ * use more than one PE. VMs with the same MIPS and PEs are kept in a heap
+ * ordered by queued work, so each cloudlet only compares the heads of the
+ * heaps: O(log VMs) per cloudlet for the usual handful of VM types. If no
+ * VM has any capacity, cloudlets still go to the least loaded VM of the
+ * first type rather than nowhere.
+ */
+public class EarliestCompletionSchedulingPolicy extends CloudletSchedulingPolicy {
+
+    private static class VmLoad {
+        final Vm vm;
+        final int position;
+        double work;
+
+        VmLoad(Vm vm, int position, double work) {
+            this.vm = vm;
+            this.position = position;
+            this.work = work;
+        }
+
+        double finishTimeWith(double length) {
+            if (!(vm.getMips() > 0.0 && vm.getNumberOfPes() > 0)) {
+                // A VM without capacity never finishes anything
+                return Double.POSITIVE_INFINITY;
+            }
+            return Math.max((work + length) / capacity(vm), length / vm.getMips());
+        }
+    }
+
+    private static final Comparator<VmLoad> LEAST_LOADED = (a, b) -> {
+        int byWork = Double.compare(a.work, b.work);
+        return byWork != 0 ? byWork : Integer.compare(a.position, b.position);
+    };
+
+    @Override
+    public Map<Integer, Integer> assign(List<Cloudlet> cloudlets, List<Vm> vms, Map<Integer, Double> queuedWork) {
+        // One heap per VM type, in the order the types first appear
+        Map<String, PriorityQueue<VmLoad>> heaps = new LinkedHashMap<>();
+        for (int i = 0; i < vms.size(); i++) {
+            Vm vm = vms.get(i);
+            String type = vm.getMips() + "x" + vm.getNumberOfPes();
+            PriorityQueue<VmLoad> heap = heaps.get(type);
+            if (heap == null) {
+                heap = new PriorityQueue<>(11, LEAST_LOADED);
+                heaps.put(type, heap);
+            }
+            Double queued = queuedWork.get(vm.getId());
+            heap.add(new VmLoad(vm, i, queued == null ? 0.0 : queued));
+        }
+
+        List<Cloudlet> longestFirst = new ArrayList<>(cloudlets);
+        // Stable, so equal lengths keep their submission order
+        Collections.sort(longestFirst, (a, b) -> Long.compare(b.getCloudletLength(), a.getCloudletLength()));
+
+        Map<Integer, Integer> chosen = new HashMap<>();
+        for (Cloudlet cloudlet : longestFirst) {
+            double length = cloudlet.getCloudletLength();
+            PriorityQueue<VmLoad> best = null;
+            double bestFinish = Double.POSITIVE_INFINITY;
+            for (PriorityQueue<VmLoad> heap : heaps.values()) {
+                double finish = heap.peek().finishTimeWith(length);
+                // When no VM can finish the cloudlet, every finish is infinite and the earliest VM takes it
+                if (best == null || finish < bestFinish || (finish == bestFinish && heap.peek().position < best.peek().position)) {
+                    best = heap;
+                    bestFinish = finish;
+                }
+            }
+            VmLoad load = best.poll();
+            load.work += length;
+            best.add(load);
+            chosen.put(cloudlet.getCloudletId(), load.vm.getId());
+        }
+
+        Map<Integer, Integer> plan = new LinkedHashMap<>();
+        for (Cloudlet cloudlet : cloudlets) {
+            plan.put(cloudlet.getCloudletId(), chosen.get(cloudlet.getCloudletId()));
+        }
+        return plan;
+    }
+
+    @Override
+    public String getName() {
+        return "ect";
+    }
+}
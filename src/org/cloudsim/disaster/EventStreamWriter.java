@@ -0,0 +1,123 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Log;
+
+import java.io.BufferedOutputStream;
+import java.io.DataOutputStream;
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+
+/**
+ * Writes simulation events as fixed-size big-endian binary records.
+ *
+ * The file starts with the 8-byte magic "DRSEVENT", a format version and
+ * the record size, so readers can skip fields added by later versions.
+ * Every record has the same layout (see scripts/event_stream.py), which
+ * lets the Python side load the whole stream with one NumPy call instead
+ * of parsing text, and times keep full double precision instead of the
+ * DecimalFormat-rounded values printed to the log.
+ */
+public class EventStreamWriter {
+
+    public static final int VERSION = 1;
+    public static final int RECORD_SIZE = 56;
+    private static final int BUFFER_SIZE = 1 << 16;
+
+    // Event kinds, mirrored by EVENT_KINDS in scripts/event_stream.py
+    public static final byte VM_CREATED = 0;
+    public static final byte SUBMIT = 1;
+    public static final byte RECEIPT = 2;
+    public static final byte DISASTER = 3;
+    public static final byte RECOVERY = 4;
+    public static final byte REROUTE = 5;
+    public static final byte REROUTE_SUMMARY = 6;
+    public static final byte MIGRATION = 7;
+    public static final byte CLOUDLET = 8;
+
+    private final DataOutputStream out;
+    private boolean closed = false;
+
+    public EventStreamWriter(String fileName) throws IOException {
+        File file = new File(fileName);
+        if (file.getParentFile() != null) {
+            file.getParentFile().mkdirs();
+        }
+        out = new DataOutputStream(new BufferedOutputStream(new FileOutputStream(file), BUFFER_SIZE));
+        out.writeBytes("DRSEVENT");
+        out.writeInt(VERSION);
+        out.writeInt(RECORD_SIZE);
+    }
+
+    public void vmCreated(double time, int vmId, int datacenterId) {
+        event(VM_CREATED, time, -1, vmId, datacenterId);
+    }
+
+    public void cloudletSubmitted(double time, int cloudletId, int vmId) {
+        event(SUBMIT, time, cloudletId, vmId, -1);
+    }
+
+    public void cloudletReceived(double time, int cloudletId, int vmId) {
+        event(RECEIPT, time, cloudletId, vmId, -1);
+    }
+
+    /** A failure domain going down; `domain` is its index in FailoverManager, or -1 if unknown */
+    public void disaster(double time, int domain) {
+        event(DISASTER, time, -1, -1, domain);
+    }
+
+    public void recovery(double time, int domain) {
+        event(RECOVERY, time, -1, -1, domain);
+    }
+
+    public void reroute(double time, int cloudletId, int fromVmId, int toVmId) {
+        event(REROUTE, time, cloudletId, toVmId, fromVmId);
+    }
+
+    public void rerouteSummary(double time, int count) {
+        event(REROUTE_SUMMARY, time, -1, -1, count);
+    }
+
+    /** Final state of a returned cloudlet, at full precision */
+    public void cloudletRecord(Cloudlet cloudlet) {
+        write(CLOUDLET, cloudlet.getStatus(), cloudlet.getFinishTime(), cloudlet.getCloudletId(),
+              cloudlet.getVmId(), cloudlet.getResourceId(), cloudlet.getActualCPUTime(),
+              cloudlet.getExecStartTime(), cloudlet.getFinishTime(), cloudlet.getWaitingTime());
+    }
+
+    public void close() {
+        if (closed) {
+            return;
+        }
+        closed = true;
+        try {
+            out.close();
+        } catch (IOException e) {
+            Log.printLine("Error closing event stream: " + e.getMessage());
+        }
+    }
+
+    private void event(byte kind, double time, int cloudletId, int vmId, int aux) {
+        write(kind, 0, time, cloudletId, vmId, aux, 0.0, 0.0, 0.0, 0.0);
+    }
+
+    private void write(byte kind, int status, double time, int cloudletId, int vmId, int aux,
+                       double exec, double start, double finish, double wait) {
+        try {
+            out.writeByte(kind);
+            out.writeByte(status);
+            out.writeShort(0);
+            out.writeInt(cloudletId);
+            out.writeInt(vmId);
+            out.writeInt(aux);
+            out.writeDouble(time);
+            out.writeDouble(exec);
+            out.writeDouble(start);
+            out.writeDouble(finish);
+            out.writeDouble(wait);
+        } catch (IOException e) {
+            Log.printLine("Error writing event stream: " + e.getMessage());
+        }
+    }
+}
@@ -0,0 +1,39 @@
+package org.cloudsim.disaster;
+
+import java.util.Random;
+
+/**
+ * Failures arrive as a Poisson process: the time between a start or repair
+ * and the next failure is exponential with mean MTBF.
+ */
+public class ExponentialFailureModel extends FailureModel {
+
+    private final double meanTimeBetweenFailures;
+    private final double meanTimeToRepair;
+
+    public ExponentialFailureModel(double meanTimeBetweenFailures) {
+        this(meanTimeBetweenFailures, NEVER);
+    }
+
+    public ExponentialFailureModel(double meanTimeBetweenFailures, double meanTimeToRepair) {
+        requirePositive("MTBF", meanTimeBetweenFailures);
+        requirePositive("MTTR", meanTimeToRepair);
+        this.meanTimeBetweenFailures = meanTimeBetweenFailures;
+        this.meanTimeToRepair = meanTimeToRepair;
+    }
+
+    @Override
+    public double nextFailure(double time, Random random) {
+        return time + sampleExponential(meanTimeBetweenFailures, random);
+    }
+
+    @Override
+    public double repairDuration(double failureTime, Random random) {
+        return meanTimeToRepair == NEVER ? NEVER : sampleExponential(meanTimeToRepair, random);
+    }
+
+    @Override
+    public String toString() {
+        return "exponential (MTBF " + meanTimeBetweenFailures + ", MTTR " + meanTimeToRepair + ")";
+    }
+}
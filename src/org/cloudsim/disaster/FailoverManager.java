@@ -2,37 +2,183 @@ package org.cloudsim.disaster;
 
 import org.cloudbus.cloudsim.Log;
 
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
 import java.util.Random;
+import java.util.Set;
 
+/**
+ * Failure domains of a run and what happened to them.
+ *
+ * Each domain is a datacenter with its own FailureModel and its own random
+ * stream, so domains fail independently and adding one does not change
+ * when the others fail. The primary datacenter uses Random(seed) directly.
+ * didFailureOccur() and getFailureTime() describe the first failure of any
+ * domain, which is what the metrics treat as the disaster.
+ * getDisasterIntervals() gives the periods that any domain was down, built
+ * from the DISASTER!/RECOVERY! lines the way scripts/attribution.py does:
+ * each domain's recovery ends only its own failure.
+ */
 public class FailoverManager {
+    public static final String PRIMARY_DATACENTER = "PrimaryDC";
+
     private double failureProbability;
     private boolean failureOccurred;
     private double failureTime;
-    private Random random;
-    
+    private int failureCount;
+    private long seed;
+    private final Map<String, FailureModel> failureModels = new LinkedHashMap<>();
+    private final Map<String, Random> randoms = new HashMap<>();
+    // Closed {start, end} disaster intervals, the domains down now and when the first of them failed
+    private final List<double[]> disasterIntervals = new ArrayList<>();
+    private final Set<String> downDomains = new HashSet<>();
+    private double openDisasterStart = Double.NaN;
+    private EventStreamWriter eventStream;
+
     public FailoverManager(double failureProbability) {
-        this.failureProbability = failureProbability;
+        this(failureProbability, System.currentTimeMillis());
+    }
+
+    public FailoverManager(double failureProbability, long seed) {
+        this(new BernoulliFailureModel(failureProbability), seed);
+    }
+
+    public FailoverManager(FailureModel primaryModel, long seed) {
         this.failureOccurred = false;
         this.failureTime = -1;
-        this.random = new Random(System.currentTimeMillis());
+        this.seed = seed;
+        setFailureModel(PRIMARY_DATACENTER, primaryModel);
     }
-    
-    public boolean shouldTriggerFailure(double currentTime) {
-        // Only check once and if failure hasn't occurred yet
-        if (!failureOccurred && random.nextDouble() < failureProbability) {
+
+    /** Makes a datacenter a failure domain, or replaces its model */
+    public void setFailureModel(String datacenterName, FailureModel model) {
+        failureModels.put(datacenterName, model);
+        if (datacenterName.equals(PRIMARY_DATACENTER)) {
+            failureProbability = model instanceof BernoulliFailureModel
+                    ? ((BernoulliFailureModel) model).getProbability() : Double.NaN;
+        }
+    }
+
+    public Map<String, FailureModel> getFailureModels() {
+        return Collections.unmodifiableMap(failureModels);
+    }
+
+    /** Time of the domain's next failure at or after `time`, or FailureModel.NEVER */
+    public double sampleFailure(String datacenterName, double time) {
+        return failureModels.get(datacenterName).nextFailure(time, randomFor(datacenterName));
+    }
+
+    /** How long a failure of the domain at `failureTime` lasts, or FailureModel.NEVER */
+    public double sampleRepair(String datacenterName, double failureTime) {
+        return failureModels.get(datacenterName).repairDuration(failureTime, randomFor(datacenterName));
+    }
+
+    public void recordFailure(String datacenterName, double time) {
+        if (!failureOccurred) {
             failureOccurred = true;
-            failureTime = currentTime;
-            Log.printLine("DISASTER! Primary datacenter failure at time: " + failureTime);
-            return true;
+            failureTime = time;
+        }
+        failureCount++;
+        if (downDomains.isEmpty()) {
+            openDisasterStart = time;
+        }
+        downDomains.add(datacenterName);
+        Log.printLine("DISASTER! " + describe(datacenterName) + " failure at time: " + time);
+        if (eventStream != null) {
+            eventStream.disaster(time, domainIndex(datacenterName));
         }
-        return false;
     }
-    
+
+    public void recordRecovery(String datacenterName, double time) {
+        if (downDomains.remove(datacenterName) && downDomains.isEmpty()) {
+            disasterIntervals.add(new double[] {openDisasterStart, Math.max(time, openDisasterStart)});
+            openDisasterStart = Double.NaN;
+        }
+        Log.printLine("RECOVERY! " + describe(datacenterName) + " restored at time: " + time);
+        if (eventStream != null) {
+            eventStream.recovery(time, domainIndex(datacenterName));
+        }
+    }
+
+    public void setEventStream(EventStreamWriter eventStream) {
+        this.eventStream = eventStream;
+    }
+
     public boolean didFailureOccur() {
         return failureOccurred;
     }
-    
+
     public double getFailureTime() {
         return failureTime;
     }
-}
\ No newline at end of file
+
+    public int getFailureCount() {
+        return failureCount;
+    }
+
+    /**
+     * Periods during which a domain was down, as {start, end} pairs merged
+     * and sorted like scripts/attribution.py's disaster_intervals. The first
+     * domain to fail opens an interval, which closes once every failed domain
+     * has recovered; one never recovered from ends at infinity.
+     */
+    public List<double[]> getDisasterIntervals() {
+        List<double[]> intervals = new ArrayList<>(disasterIntervals);
+        if (!Double.isNaN(openDisasterStart)) {
+            intervals.add(new double[] {openDisasterStart, Double.POSITIVE_INFINITY});
+        }
+        Collections.sort(intervals, (a, b) -> Double.compare(a[0], b[0]));
+
+        List<double[]> merged = new ArrayList<>();
+        for (double[] interval : intervals) {
+            double[] last = merged.isEmpty() ? null : merged.get(merged.size() - 1);
+            if (last != null && interval[0] <= last[1]) {
+                last[1] = Math.max(last[1], interval[1]);
+            } else {
+                merged.add(new double[] {interval[0], interval[1]});
+            }
+        }
+        return merged;
+    }
+
+    /** The primary datacenter's chance of failing per check, or NaN if it uses another model */
+    public double getFailureProbability() {
+        return failureProbability;
+    }
+
+    public long getSeed() {
+        return seed;
+    }
+
+    private Random randomFor(String datacenterName) {
+        Random random = randoms.get(datacenterName);
+        if (random == null) {
+            random = datacenterName.equals(PRIMARY_DATACENTER)
+                    ? new Random(seed) : new Random(seed ^ (datacenterName.hashCode() * 0x9E3779B97F4A7C15L));
+            randoms.put(datacenterName, random);
+        }
+        return random;
+    }
+
+    /** Position of the domain among the failure models, which the event stream records for it */
+    private int domainIndex(String datacenterName) {
+        int index = 0;
+        for (String name : failureModels.keySet()) {
+            if (name.equals(datacenterName)) {
+                return index;
+            }
+            index++;
+        }
+        return -1;
+    }
+
+    private static String describe(String datacenterName) {
+        // The primary's wording is what the log readers have always matched
+        return datacenterName.equals(PRIMARY_DATACENTER) ? "Primary datacenter" : "Datacenter " + datacenterName;
+    }
+}
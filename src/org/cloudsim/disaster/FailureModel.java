@@ -0,0 +1,72 @@
+package org.cloudsim.disaster;
+
+import java.util.Random;
+
+/**
+ * When a failure domain fails and how long each failure lasts.
+ *
+ * Failure and repair times are sampled up front, so the listener schedules
+ * exactly one event per failure and one per repair instead of polling.
+ * Models draw from the Random they are given, which keeps seeded runs
+ * reproducible and lets independent domains share one model.
+ */
+public abstract class FailureModel {
+
+    /** Returned for a failure or repair that never happens */
+    public static final double NEVER = Double.POSITIVE_INFINITY;
+
+    /** Time of the first failure at or after `time` (a start or a repair), or NEVER */
+    public abstract double nextFailure(double time, Random random);
+
+    /** How long the failure at `failureTime` lasts before the domain is repaired, or NEVER */
+    public double repairDuration(double failureTime, Random random) {
+        return NEVER;
+    }
+
+    /**
+     * Builds a model from a command-line spec:
+     *
+     *   bernoulli[:P[:INTERVAL]]    chance P of failing at each check (the original model)
+     *   exponential:MTBF[:MTTR]     exponential time between failures
+     *   weibull:SHAPE:SCALE[:MTTR]  Weibull time between failures
+     *   trace:FILE                  failure times (and repair durations) replayed from a file
+     *
+     * Repairs take an exponentially distributed time with mean MTTR; without
+     * MTTR a failed domain is never repaired.
+     */
+    public static FailureModel parse(String spec, double defaultProbability) {
+        String[] parts = spec.split(":", -1);
+        String name = parts[0].toLowerCase();
+        try {
+            if (name.equals("bernoulli") && parts.length <= 3) {
+                double probability = parts.length > 1 ? Double.parseDouble(parts[1]) : defaultProbability;
+                double interval = parts.length > 2 ? Double.parseDouble(parts[2]) : BernoulliFailureModel.DEFAULT_INTERVAL;
+                return new BernoulliFailureModel(probability, interval);
+            } else if (name.equals("exponential") && (parts.length == 2 || parts.length == 3)) {
+                return new ExponentialFailureModel(Double.parseDouble(parts[1]),
+                                                   parts.length > 2 ? Double.parseDouble(parts[2]) : NEVER);
+            } else if (name.equals("weibull") && (parts.length == 3 || parts.length == 4)) {
+                return new WeibullFailureModel(Double.parseDouble(parts[1]), Double.parseDouble(parts[2]),
+                                               parts.length > 3 ? Double.parseDouble(parts[3]) : NEVER);
+            } else if (name.equals("trace") && parts.length >= 2) {
+                // Windows paths contain a colon of their own
+                return TraceFailureModel.load(spec.substring(spec.indexOf(':') + 1));
+            }
+        } catch (NumberFormatException e) {
+            throw new IllegalArgumentException("Invalid number in failure model '" + spec + "'");
+        }
+        throw new IllegalArgumentException("Unknown failure model '" + spec +
+                "' (expected bernoulli[:P[:INTERVAL]], exponential:MTBF[:MTTR], weibull:SHAPE:SCALE[:MTTR] or trace:FILE)");
+    }
+
+    protected static double sampleExponential(double mean, Random random) {
+        // 1 - nextDouble() is in (0, 1], so the logarithm is finite
+        return -mean * Math.log(1.0 - random.nextDouble());
+    }
+
+    protected static void requirePositive(String what, double value) {
+        if (!(value > 0)) {
+            throw new IllegalArgumentException(what + " must be positive, got " + value);
+        }
+    }
+}
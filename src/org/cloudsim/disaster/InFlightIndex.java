@@ -0,0 +1,73 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+
+import java.util.Collection;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.Map;
+
+/**
+ * Cloudlets that have been submitted but not yet returned, indexed by VM and
+ * by datacenter.
+ *
+ * Adding and removing a cloudlet is O(1), so the broker can keep the index
+ * current on every submission and receipt, and failover can list what is
+ * running in a datacenter in O(affected cloudlets) instead of scanning the
+ * broker's submitted and received lists. Iteration follows submission order.
+ */
+public class InFlightIndex {
+
+    private final Map<Integer, Map<Integer, Cloudlet>> byVm = new HashMap<>();
+    private final Map<Integer, Map<Integer, Cloudlet>> byDatacenter = new HashMap<>();
+    // cloudlet ID -> {vm ID, datacenter ID} it was indexed under
+    private final Map<Integer, int[]> locations = new HashMap<>();
+
+    public void add(Cloudlet cloudlet, int datacenterId) {
+        int cloudletId = cloudlet.getCloudletId();
+        remove(cloudletId);
+        int vmId = cloudlet.getVmId();
+        bucket(byVm, vmId).put(cloudletId, cloudlet);
+        bucket(byDatacenter, datacenterId).put(cloudletId, cloudlet);
+        locations.put(cloudletId, new int[] {vmId, datacenterId});
+    }
+
+    /** Removes a cloudlet wherever it is indexed; returns it, or null if it was not in flight */
+    public Cloudlet remove(int cloudletId) {
+        int[] location = locations.remove(cloudletId);
+        if (location == null) {
+            return null;
+        }
+        Cloudlet cloudlet = byVm.get(location[0]).remove(cloudletId);
+        byDatacenter.get(location[1]).remove(cloudletId);
+        return cloudlet;
+    }
+
+    public boolean contains(int cloudletId) {
+        return locations.containsKey(cloudletId);
+    }
+
+    public Collection<Cloudlet> inVm(int vmId) {
+        Map<Integer, Cloudlet> cloudlets = byVm.get(vmId);
+        return cloudlets == null ? Collections.<Cloudlet>emptyList() : Collections.unmodifiableCollection(cloudlets.values());
+    }
+
+    public Collection<Cloudlet> inDatacenter(int datacenterId) {
+        Map<Integer, Cloudlet> cloudlets = byDatacenter.get(datacenterId);
+        return cloudlets == null ? Collections.<Cloudlet>emptyList() : Collections.unmodifiableCollection(cloudlets.values());
+    }
+
+    public int size() {
+        return locations.size();
+    }
+
+    private static Map<Integer, Cloudlet> bucket(Map<Integer, Map<Integer, Cloudlet>> index, int key) {
+        Map<Integer, Cloudlet> cloudlets = index.get(key);
+        if (cloudlets == null) {
+            cloudlets = new LinkedHashMap<>();
+            index.put(key, cloudlets);
+        }
+        return cloudlets;
+    }
+}
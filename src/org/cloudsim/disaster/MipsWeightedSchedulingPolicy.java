@@ -0,0 +1,47 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Vm;
+
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Weighted round-robin: each VM gets a share of the cloudlets proportional
+ * to its total MIPS. Uses smooth weighted round-robin, so the picks for a
+ * VM are spread evenly through the sequence rather than bunched together.
+ * Cloudlet lengths and queued work are not considered.
+ */
+public class MipsWeightedSchedulingPolicy extends CloudletSchedulingPolicy {
+
+    @Override
+    public Map<Integer, Integer> assign(List<Cloudlet> cloudlets, List<Vm> vms, Map<Integer, Double> queuedWork) {
+        double[] weights = new double[vms.size()];
+        double totalWeight = 0.0;
+        for (int i = 0; i < vms.size(); i++) {
+            weights[i] = capacity(vms.get(i));
+            totalWeight += weights[i];
+        }
+
+        Map<Integer, Integer> plan = new LinkedHashMap<>();
+        double[] current = new double[vms.size()];
+        for (Cloudlet cloudlet : cloudlets) {
+            int best = 0;
+            for (int i = 0; i < vms.size(); i++) {
+                current[i] += weights[i];
+                if (current[i] > current[best]) {
+                    best = i;
+                }
+            }
+            current[best] -= totalWeight;
+            plan.put(cloudlet.getCloudletId(), vms.get(best).getId());
+        }
+        return plan;
+    }
+
+    @Override
+    public String getName() {
+        return "mips-weighted";
+    }
+}
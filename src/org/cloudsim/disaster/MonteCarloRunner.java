@@ -0,0 +1,89 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Log;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.util.List;
+
+/**
+ * Long-lived worker for Monte Carlo sweeps (driven by scripts/monte_carlo.py).
+ *
+ * Reads one "SEED FAILURE_PROBABILITY [FAILURE_MODEL [SCHEDULER]]" line at a
+ * time from stdin (as for DisasterRecoverySimulation --failure-model and
+ * --scheduler; Bernoulli and round-robin by default), runs a full simulation
+ * for it and prints one result line, so a single JVM serves many samples and
+ * start-up is paid once per worker:
+ *
+ *   RESULT seed disasterOccurred disasterTime makespan affected total
+ *
+ * A sample that throws prints "ERROR seed message" instead. CloudSim's own
+ * logging is disabled; any other output lines should be ignored by readers.
+ */
+public class MonteCarloRunner {
+
+    public static void main(String[] args) throws IOException {
+        Log.disable();
+        PrintStream out = System.out;
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in));
+
+        String line;
+        while ((line = in.readLine()) != null) {
+            line = line.trim();
+            if (line.isEmpty()) {
+                continue;
+            }
+            String[] parts = line.split("\\s+");
+            String seedText = parts[0];
+            try {
+                long seed = Long.parseLong(seedText);
+                double failureProbability = parts.length > 1
+                        ? Double.parseDouble(parts[1])
+                        : DisasterRecoverySimulation.DEFAULT_FAILURE_PROBABILITY;
+                FailureModel model = FailureModel.parse(parts.length > 2 ? parts[2] : "bernoulli", failureProbability);
+                CloudletSchedulingPolicy policy = CloudletSchedulingPolicy.parse(parts.length > 3 ? parts[3] : "round-robin");
+                out.println(runSample(seed, model, policy));
+            } catch (Exception e) {
+                out.println("ERROR " + seedText + " " + e);
+            }
+            out.flush();
+        }
+    }
+
+    static String runSample(long seed, FailureModel model, CloudletSchedulingPolicy policy) throws Exception {
+        FailoverManager failoverManager = new FailoverManager(model, seed);
+        List<Cloudlet> received = DisasterRecoverySimulation.runSimulation(failoverManager, null, policy);
+
+        boolean disaster = failoverManager.didFailureOccur();
+        double failureTime = failoverManager.getFailureTime();
+        List<double[]> intervals = failoverManager.getDisasterIntervals();
+        double makespan = 0.0;
+        int affected = 0;
+        for (Cloudlet cloudlet : received) {
+            makespan = Math.max(makespan, cloudlet.getFinishTime());
+            if (overlapsDisaster(intervals, cloudlet.getExecStartTime(), cloudlet.getFinishTime())) {
+                affected++;
+            }
+        }
+        return "RESULT " + seed + " " + (disaster ? 1 : 0) + " " + (disaster ? failureTime : Double.NaN)
+                + " " + makespan + " " + affected + " " + received.size();
+    }
+
+    /**
+     * Same rule as FailoverIndex.classify in scripts/attribution.py: the
+     * cloudlet's [start, finish] window overlaps a disaster interval, which
+     * closes when the domain is repaired. Rerouted cloudlets restart at the
+     * failure, inside its interval, so they count without a reroute log.
+     */
+    static boolean overlapsDisaster(List<double[]> intervals, double startTime, double finishTime) {
+        for (double[] interval : intervals) {
+            if (interval[0] < finishTime && interval[1] > startTime) {
+                return true;
+            }
+        }
+        return false;
+    }
+}
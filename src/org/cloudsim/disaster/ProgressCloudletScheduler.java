@@ -0,0 +1,55 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.CloudletSchedulerTimeShared;
+import org.cloudbus.cloudsim.ResCloudlet;
+
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * CloudletSchedulerTimeShared that can report how much work each running
+ * cloudlet has left, which SimulationSnapshot records at the disaster.
+ * Scheduling is unchanged.
+ */
+public class ProgressCloudletScheduler extends CloudletSchedulerTimeShared {
+
+    /**
+     * Returns the remaining length in MI of each running cloudlet by ID at
+     * `currentTime`, counting the progress since the last update at the MIPS
+     * share of that update, as the datacenter would on its next event. The
+     * scheduler itself is not advanced, so the run is unaffected. Cloudlets
+     * that have finished but not yet gone back to the broker have none left.
+     */
+    public Map<Integer, Double> remainingLengths(double currentTime) {
+        double elapsed = Math.max(0.0, currentTime - getPreviousTime());
+        double capacity = getCurrentMipsShare() == null ? 0.0 : capacityPerPe(getCurrentMipsShare());
+        Map<Integer, Double> remaining = new LinkedHashMap<>();
+        for (ResCloudlet rcl : this.<ResCloudlet>getCloudletExecList()) {
+            double progress = capacity * elapsed * rcl.getNumberOfPes();
+            remaining.put(rcl.getCloudletId(), Math.max(0.0, rcl.getRemainingCloudletLength() - progress));
+        }
+        for (ResCloudlet rcl : this.<ResCloudlet>getCloudletFinishedList()) {
+            remaining.put(rcl.getCloudletId(), 0.0);
+        }
+        return remaining;
+    }
+
+    /** MIPS per PE of a running cloudlet, as getCapacity computes it but without updating currentCPUs */
+    private double capacityPerPe(List<Double> mipsShare) {
+        double capacity = 0.0;
+        int cpus = 0;
+        for (double mips : mipsShare) {
+            capacity += mips;
+            if (mips > 0.0) {
+                cpus++;
+            }
+        }
+        int pesInUse = 0;
+        for (ResCloudlet rcl : this.<ResCloudlet>getCloudletExecList()) {
+            pesInUse += rcl.getNumberOfPes();
+        }
+        int sharedBy = Math.max(pesInUse, cpus);
+        return sharedBy == 0 ? 0.0 : capacity / sharedBy;
+    }
+}
@@ -0,0 +1,29 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Vm;
+
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * DatacenterBroker's own binding: cloudlets take the VMs in turn, whatever
+ * their speed or load.
+ */
+public class RoundRobinSchedulingPolicy extends CloudletSchedulingPolicy {
+
+    @Override
+    public Map<Integer, Integer> assign(List<Cloudlet> cloudlets, List<Vm> vms, Map<Integer, Double> queuedWork) {
+        Map<Integer, Integer> plan = new LinkedHashMap<>();
+        for (int i = 0; i < cloudlets.size(); i++) {
+            plan.put(cloudlets.get(i).getCloudletId(), vms.get(i % vms.size()).getId());
+        }
+        return plan;
+    }
+
+    @Override
+    public String getName() {
+        return "round-robin";
+    }
+}
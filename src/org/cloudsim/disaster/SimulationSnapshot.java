@@ -0,0 +1,151 @@
+package org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Vm;
+
+import java.io.BufferedOutputStream;
+import java.io.DataOutputStream;
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * The state of a run at the first failure of the primary datacenter: the
+ * clock, the VMs, and for each cloudlet whether it is pending, running or
+ * received, with how much work the running ones have left.
+ *
+ * CloudSim keeps its state in static fields, so a run cannot be restored
+ * in the JVM. The snapshot is written in the format of scripts/snapshot.py
+ * instead, and scripts/recovery_variants.py continues it with several
+ * recovery strategies in the in-process engine.
+ */
+public class SimulationSnapshot {
+
+    public static final int VERSION = 1;
+
+    // Cloudlet states, mirrored by scripts/snapshot.py
+    public static final byte PENDING = 0;
+    public static final byte RUNNING = 1;
+    public static final byte RECEIVED = 2;
+
+    /** One cloudlet's row in the snapshot */
+    public static class CloudletState {
+        public final int cloudletId;
+        public final int vmId;
+        public final byte state;
+        public final double length;
+        public final double remaining;
+        public final double startTime;
+        public final double finishTime;
+
+        CloudletState(int cloudletId, int vmId, byte state, double length, double remaining,
+                      double startTime, double finishTime) {
+            this.cloudletId = cloudletId;
+            this.vmId = vmId;
+            this.state = state;
+            this.length = length;
+            this.remaining = remaining;
+            this.startTime = startTime;
+            this.finishTime = finishTime;
+        }
+    }
+
+    private final double clock;
+    private final List<Vm> vms;
+    private final Map<Integer, Integer> vmDatacenters;
+    private final List<CloudletState> cloudlets;
+
+    public SimulationSnapshot(double clock, List<Vm> vms, Map<Integer, Integer> vmDatacenters,
+                              List<CloudletState> cloudlets) {
+        this.clock = clock;
+        this.vms = vms;
+        this.vmDatacenters = vmDatacenters;
+        this.cloudlets = cloudlets;
+    }
+
+    /**
+     * Captures the broker's VMs and cloudlets at `clock`. Running cloudlets'
+     * progress is read from their VM's ProgressCloudletScheduler; on VMs
+     * with another scheduler they are recorded with all their work left.
+     */
+    public static SimulationSnapshot capture(DisasterAwareBroker broker, double clock) {
+        List<Vm> vms = new ArrayList<>(broker.getVmsCreatedList());
+        Collections.sort(vms, (a, b) -> Integer.compare(a.getId(), b.getId()));
+        Map<Integer, Integer> vmDatacenters = new HashMap<>(broker.getVmsToDatacentersMap());
+        List<CloudletState> cloudlets = new ArrayList<>();
+
+        for (Cloudlet cloudlet : broker.getCloudletReceivedList()) {
+            cloudlets.add(new CloudletState(cloudlet.getCloudletId(), cloudlet.getVmId(), RECEIVED,
+                    cloudlet.getCloudletLength(), 0.0, cloudlet.getExecStartTime(), cloudlet.getFinishTime()));
+        }
+        InFlightIndex inFlight = broker.getInFlightIndex();
+        for (Vm vm : vms) {
+            Map<Integer, Double> progress = Collections.emptyMap();
+            if (vm.getCloudletScheduler() instanceof ProgressCloudletScheduler) {
+                progress = ((ProgressCloudletScheduler) vm.getCloudletScheduler()).remainingLengths(clock);
+            }
+            for (Cloudlet cloudlet : inFlight.inVm(vm.getId())) {
+                Double remaining = progress.get(cloudlet.getCloudletId());
+                cloudlets.add(new CloudletState(cloudlet.getCloudletId(), vm.getId(), RUNNING,
+                        cloudlet.getCloudletLength(),
+                        remaining == null ? cloudlet.getCloudletLength() : remaining,
+                        cloudlet.getExecStartTime(), Double.NaN));
+            }
+        }
+        for (Cloudlet cloudlet : broker.getCloudletList()) {
+            cloudlets.add(new CloudletState(cloudlet.getCloudletId(), cloudlet.getVmId(), PENDING,
+                    cloudlet.getCloudletLength(), cloudlet.getCloudletLength(), Double.NaN, Double.NaN));
+        }
+        return new SimulationSnapshot(clock, vms, vmDatacenters, cloudlets);
+    }
+
+    public double getClock() {
+        return clock;
+    }
+
+    public List<CloudletState> getCloudlets() {
+        return cloudlets;
+    }
+
+    /**
+     * Writes the snapshot as big-endian records: a header with the magic
+     * "DRSSNAP\0", the version, the clock, the random state (-1, as the
+     * failure draws' java.util.Random cannot be read) and the VM and
+     * cloudlet counts, then one record per VM and one per cloudlet.
+     */
+    public void write(String fileName) throws IOException {
+        File file = new File(fileName);
+        if (file.getParentFile() != null) {
+            file.getParentFile().mkdirs();
+        }
+        try (DataOutputStream out = new DataOutputStream(new BufferedOutputStream(new FileOutputStream(file)))) {
+            out.writeBytes("DRSSNAP\0");
+            out.writeInt(VERSION);
+            out.writeDouble(clock);
+            out.writeLong(-1L);
+            out.writeInt(vms.size());
+            out.writeInt(cloudlets.size());
+            for (Vm vm : vms) {
+                Integer datacenterId = vmDatacenters.get(vm.getId());
+                out.writeInt(vm.getId());
+                out.writeInt(datacenterId == null ? -1 : datacenterId);
+                out.writeDouble(vm.getMips());
+                out.writeInt(vm.getNumberOfPes());
+            }
+            for (CloudletState cloudlet : cloudlets) {
+                out.writeInt(cloudlet.cloudletId);
+                out.writeInt(cloudlet.vmId);
+                out.writeByte(cloudlet.state);
+                out.writeDouble(cloudlet.length);
+                out.writeDouble(cloudlet.remaining);
+                out.writeDouble(cloudlet.startTime);
+                out.writeDouble(cloudlet.finishTime);
+            }
+        }
+    }
+}
@@ -0,0 +1,102 @@
+package org.cloudsim.disaster;
+
+import java.io.BufferedReader;
+import java.io.FileReader;
+import java.io.IOException;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+import java.util.Random;
+
+/**
+ * Replays failures recorded in a trace file instead of sampling them.
+ *
+ * Each line holds a failure time and, optionally, how long the failure
+ * lasted ("inf" or no value for a failure that is never repaired). Blank
+ * lines and lines starting with '#' are skipped. A failure that starts
+ * while the domain is still down from an earlier one is ignored.
+ */
+public class TraceFailureModel extends FailureModel {
+
+    private final String source;
+    private final double[] failureTimes;
+    private final double[] repairDurations;
+
+    public TraceFailureModel(String source, double[] failureTimes, double[] repairDurations) {
+        this.source = source;
+        this.failureTimes = failureTimes;
+        this.repairDurations = repairDurations;
+    }
+
+    public static TraceFailureModel load(String fileName) {
+        List<double[]> rows = new ArrayList<>();
+        try (BufferedReader reader = new BufferedReader(new FileReader(fileName))) {
+            String line;
+            int lineNumber = 0;
+            while ((line = reader.readLine()) != null) {
+                lineNumber++;
+                line = line.trim();
+                if (line.isEmpty() || line.startsWith("#")) {
+                    continue;
+                }
+                String[] fields = line.split("[\\s,]+");
+                try {
+                    double time = Double.parseDouble(fields[0]);
+                    double duration = fields.length < 2 || fields[1].equalsIgnoreCase("inf")
+                            ? NEVER : Double.parseDouble(fields[1]);
+                    if (time < 0 || !(duration > 0)) {
+                        throw new NumberFormatException();
+                    }
+                    rows.add(new double[] {time, duration});
+                } catch (NumberFormatException e) {
+                    throw new IllegalArgumentException("Invalid failure on line " + lineNumber + " of " + fileName + ": " + line);
+                }
+            }
+        } catch (IOException e) {
+            throw new IllegalArgumentException("Cannot read failure trace " + fileName + ": " + e.getMessage());
+        }
+
+        double[][] sorted = rows.toArray(new double[rows.size()][]);
+        Arrays.sort(sorted, (a, b) -> Double.compare(a[0], b[0]));
+        double[] times = new double[sorted.length];
+        double[] durations = new double[sorted.length];
+        for (int i = 0; i < sorted.length; i++) {
+            times[i] = sorted[i][0];
+            durations[i] = sorted[i][1];
+        }
+        return new TraceFailureModel(fileName, times, durations);
+    }
+
+    @Override
+    public double nextFailure(double time, Random random) {
+        int i = firstAtOrAfter(time);
+        return i < failureTimes.length ? failureTimes[i] : NEVER;
+    }
+
+    @Override
+    public double repairDuration(double failureTime, Random random) {
+        int i = firstAtOrAfter(failureTime);
+        return i < failureTimes.length && failureTimes[i] == failureTime ? repairDurations[i] : NEVER;
+    }
+
+    public int size() {
+        return failureTimes.length;
+    }
+
+    private int firstAtOrAfter(double time) {
+        int i = Arrays.binarySearch(failureTimes, time);
+        if (i < 0) {
+            return -i - 1;
+        }
+        // Step back over equal times so the first of them is found
+        while (i > 0 && failureTimes[i - 1] == time) {
+            i--;
+        }
+        return i;
+    }
+
+    @Override
+    public String toString() {
+        return "trace (" + failureTimes.length + " failures from " + source + ")";
+    }
+}
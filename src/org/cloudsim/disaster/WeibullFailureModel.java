@@ -0,0 +1,39 @@
+package org.cloudsim.disaster;
+
+import java.util.Random;
+
+/**
+ * Weibull time between failures, sampled by inverting the CDF. A shape
+ * below 1 models infant mortality, above 1 wear-out; shape 1 is the
+ * exponential model. A repaired domain is as good as new.
+ */
+public class WeibullFailureModel extends FailureModel {
+
+    private final double shape;
+    private final double scale;
+    private final double meanTimeToRepair;
+
+    public WeibullFailureModel(double shape, double scale, double meanTimeToRepair) {
+        requirePositive("Weibull shape", shape);
+        requirePositive("Weibull scale", scale);
+        requirePositive("MTTR", meanTimeToRepair);
+        this.shape = shape;
+        this.scale = scale;
+        this.meanTimeToRepair = meanTimeToRepair;
+    }
+
+    @Override
+    public double nextFailure(double time, Random random) {
+        return time + scale * Math.pow(-Math.log(1.0 - random.nextDouble()), 1.0 / shape);
+    }
+
+    @Override
+    public double repairDuration(double failureTime, Random random) {
+        return meanTimeToRepair == NEVER ? NEVER : sampleExponential(meanTimeToRepair, random);
+    }
+
+    @Override
+    public String toString() {
+        return "weibull (shape " + shape + ", scale " + scale + ", MTTR " + meanTimeToRepair + ")";
+    }
+}
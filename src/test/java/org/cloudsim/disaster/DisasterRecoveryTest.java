@@ -1,13 +1,34 @@
 package test.java.org.cloudsim.disaster;
 
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.CloudletSchedulerTimeShared;
 import org.cloudbus.cloudsim.Datacenter;
 import org.cloudbus.cloudsim.Vm;
 import org.cloudbus.cloudsim.core.CloudSim;
+import org.cloudsim.disaster.BernoulliFailureModel;
+import org.cloudsim.disaster.CloudletManager;
+import org.cloudsim.disaster.CloudletSchedulingPolicy;
 import org.cloudsim.disaster.DatacenterFactory;
+import org.cloudsim.disaster.DisasterRecoverySimulation;
+import org.cloudsim.disaster.EventStreamWriter;
+import org.cloudsim.disaster.ExponentialFailureModel;
 import org.cloudsim.disaster.FailoverManager;
+import org.cloudsim.disaster.FailureModel;
+import org.cloudsim.disaster.InFlightIndex;
+import org.cloudsim.disaster.ProgressCloudletScheduler;
+import org.cloudsim.disaster.RoundRobinSchedulingPolicy;
 
+import java.io.DataInputStream;
+import java.io.File;
+import java.io.FileInputStream;
+import java.io.PrintWriter;
+import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Calendar;
+import java.util.HashMap;
 import java.util.List;
+import java.util.Map;
+import java.util.Random;
 
 public class DisasterRecoveryTest {
     
@@ -67,22 +88,42 @@ public class DisasterRecoveryTest {
             // Create failover manager with 100% failure probability
             FailoverManager manager = new FailoverManager(1.0);
             
-            // Should trigger failure
-            boolean triggered = manager.shouldTriggerFailure(10.0);
-            if (!triggered) {
-                throw new Exception("Failure should be triggered with 100% probability");
-            }
-            
-            // Get failure time
-            double failureTime = manager.getFailureTime();
+            // Should fail at the first check
+            double failureTime = manager.sampleFailure(FailoverManager.PRIMARY_DATACENTER, 0.0);
             if (Math.abs(failureTime - 10.0) > 0.001) {
                 throw new Exception("Failure time should be 10.0, but got " + failureTime);
             }
             
-            // Second try should not trigger (already failed)
-            boolean secondTry = manager.shouldTriggerFailure(20.0);
-            if (secondTry) {
-                throw new Exception("Should not trigger second failure");
+            // The Bernoulli model is never repaired
+            if (manager.sampleRepair(FailoverManager.PRIMARY_DATACENTER, failureTime) != FailureModel.NEVER) {
+                throw new Exception("Bernoulli failures should not be repaired");
+            }
+            
+            // Only the first failure counts as the disaster
+            manager.recordFailure(FailoverManager.PRIMARY_DATACENTER, 10.0);
+            manager.recordFailure(FailoverManager.PRIMARY_DATACENTER, 20.0);
+            if (!manager.didFailureOccur() || manager.getFailureTime() != 10.0 || manager.getFailureCount() != 2) {
+                throw new Exception("Disaster should be the first of 2 failures");
+            }
+            
+            // The second failure falls inside the first's interval; repairs close it, as in attribution.py
+            manager.recordRecovery(FailoverManager.PRIMARY_DATACENTER, 30.0);
+            manager.recordFailure(FailoverManager.PRIMARY_DATACENTER, 50.0);
+            List<double[]> intervals = manager.getDisasterIntervals();
+            if (intervals.size() != 2 || intervals.get(0)[0] != 10.0 || intervals.get(0)[1] != 30.0
+                    || intervals.get(1)[0] != 50.0 || intervals.get(1)[1] != Double.POSITIVE_INFINITY) {
+                throw new Exception("Disaster intervals should be [10, 30] and [50, inf)");
+            }
+            
+            // The backup's repair at 20 leaves the primary down until its own repair at 40
+            FailoverManager overlapping = new FailoverManager(0.0);
+            overlapping.recordFailure(FailoverManager.PRIMARY_DATACENTER, 10.0);
+            overlapping.recordFailure("BackupDC", 15.0);
+            overlapping.recordRecovery("BackupDC", 20.0);
+            overlapping.recordRecovery(FailoverManager.PRIMARY_DATACENTER, 40.0);
+            intervals = overlapping.getDisasterIntervals();
+            if (intervals.size() != 1 || intervals.get(0)[0] != 10.0 || intervals.get(0)[1] != 40.0) {
+                throw new Exception("Overlapping domain outages should give the one interval [10, 40]");
             }
             
             System.out.println("FailoverLogic test passed");
@@ -91,11 +132,353 @@ public class DisasterRecoveryTest {
         }
     }
     
+    public void testSeededFailover() {
+        try {
+            // Two managers with the same seed must fail at the same time
+            FailoverManager first = new FailoverManager(0.3, 42L);
+            FailoverManager second = new FailoverManager(0.3, 42L);
+            double a = first.sampleFailure(FailoverManager.PRIMARY_DATACENTER, 0.0);
+            double b = second.sampleFailure(FailoverManager.PRIMARY_DATACENTER, 0.0);
+            if (a != b) {
+                throw new Exception("Seeded managers should fail at the same time");
+            }
+            
+            // Bernoulli failures land on a check
+            if (a % 10.0 != 0.0) {
+                throw new Exception("Failure at " + a + " is not on a 10-second check");
+            }
+            
+            // Adding a domain does not change when the primary fails
+            FailoverManager withBackup = new FailoverManager(0.3, 42L);
+            withBackup.setFailureModel("BackupDC", new ExponentialFailureModel(100.0));
+            withBackup.sampleFailure("BackupDC", 0.0);
+            if (withBackup.sampleFailure(FailoverManager.PRIMARY_DATACENTER, 0.0) != a) {
+                throw new Exception("Failure domains should draw independently");
+            }
+            
+            // Zero probability never fails
+            FailoverManager never = new FailoverManager(0.0, 42L);
+            if (never.sampleFailure(FailoverManager.PRIMARY_DATACENTER, 0.0) != FailureModel.NEVER) {
+                throw new Exception("Failure should never trigger with 0% probability");
+            }
+            
+            System.out.println("SeededFailover test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    public void testFailureModels() {
+        try {
+            Random random = new Random(7L);
+            int samples = 20000;
+            
+            // Sampled times between failures should average close to the model's mean
+            FailureModel exponential = FailureModel.parse("exponential:200:20", 0.5);
+            double total = 0.0;
+            double repairs = 0.0;
+            for (int i = 0; i < samples; i++) {
+                total += exponential.nextFailure(50.0, random) - 50.0;
+                repairs += exponential.repairDuration(0.0, random);
+            }
+            if (Math.abs(total / samples - 200.0) > 10.0 || Math.abs(repairs / samples - 20.0) > 1.0) {
+                throw new Exception("Exponential MTBF/MTTR means are off: " + total / samples + ", " + repairs / samples);
+            }
+            
+            // Weibull with shape 1 is exponential with mean equal to its scale
+            FailureModel weibull = FailureModel.parse("weibull:1:300", 0.5);
+            total = 0.0;
+            for (int i = 0; i < samples; i++) {
+                total += weibull.nextFailure(0.0, random);
+            }
+            if (Math.abs(total / samples - 300.0) > 15.0) {
+                throw new Exception("Weibull mean is off: " + total / samples);
+            }
+            
+            // Geometric sampling matches the per-check probability
+            FailureModel bernoulli = FailureModel.parse("bernoulli:0.25", 0.5);
+            total = 0.0;
+            for (int i = 0; i < samples; i++) {
+                total += bernoulli.nextFailure(0.0, random) / BernoulliFailureModel.DEFAULT_INTERVAL;
+            }
+            if (Math.abs(total / samples - 4.0) > 0.2) {
+                throw new Exception("Bernoulli should fail after 4 checks on average, got " + total / samples);
+            }
+            
+            // A trace is replayed as written, in time order
+            File trace = File.createTempFile("failures", ".txt");
+            trace.deleteOnExit();
+            try (PrintWriter writer = new PrintWriter(trace)) {
+                writer.println("# time duration");
+                writer.println("300 25");
+                writer.println("40.5 10");
+                writer.println("900");
+            }
+            FailureModel replay = FailureModel.parse("trace:" + trace.getPath(), 0.5);
+            if (replay.nextFailure(0.0, random) != 40.5 || replay.repairDuration(40.5, random) != 10.0) {
+                throw new Exception("Trace should start with the failure at 40.5 lasting 10");
+            }
+            if (replay.nextFailure(50.5, random) != 300.0 || replay.nextFailure(325.0, random) != 900.0) {
+                throw new Exception("Trace failures should be replayed in order");
+            }
+            if (replay.repairDuration(900.0, random) != FailureModel.NEVER || replay.nextFailure(901.0, random) != FailureModel.NEVER) {
+                throw new Exception("Trace should end with an unrepaired failure");
+            }
+            
+            System.out.println("FailureModels test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    public void testFailureRepairCycle() {
+        try {
+            // Down at 10 for 5 seconds, then down for good at 30, while the rerouted work is still running
+            File trace = File.createTempFile("failures", ".txt");
+            trace.deleteOnExit();
+            try (PrintWriter writer = new PrintWriter(trace)) {
+                writer.println("10 5");
+                writer.println("30");
+            }
+            FailoverManager manager = new FailoverManager(FailureModel.parse("trace:" + trace.getPath(), 0.5), 1L);
+            List<Cloudlet> received = DisasterRecoverySimulation.runSimulation(manager, null);
+            
+            if (manager.getFailureCount() != 2 || manager.getFailureTime() != 10.0) {
+                throw new Exception("The listener should fail the primary at 10 and again after its repair, got " +
+                                    manager.getFailureCount() + " failures from " + manager.getFailureTime());
+            }
+            if (received.size() != 20) {
+                throw new Exception("All 20 cloudlets should come back, but got " + received.size());
+            }
+            
+            System.out.println("FailureRepairCycle test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    public void testSchedulingPolicies() {
+        try {
+            List<Vm> vms = DatacenterFactory.createVms(4, true, 0);
+            vms.addAll(DatacenterFactory.createVms(2, false, 0));
+            List<Cloudlet> cloudlets = CloudletManager.createCloudlets(18, 0);
+            Map<Integer, Double> noQueue = new HashMap<>();
+            
+            // Round-robin takes the VMs in turn
+            Map<Integer, Integer> plan = CloudletSchedulingPolicy.parse("round-robin").assign(cloudlets, vms, noQueue);
+            for (Cloudlet cloudlet : cloudlets) {
+                if (plan.get(cloudlet.getCloudletId()) != cloudlet.getCloudletId() % 6) {
+                    throw new Exception("Round-robin should bind cloudlet " + cloudlet.getCloudletId() + " to VM " + cloudlet.getCloudletId() % 6);
+                }
+            }
+            
+            // 2000 MIPS primaries get four times the cloudlets of 500 MIPS backups
+            int[] counts = countPerVm(CloudletSchedulingPolicy.parse("mips-weighted").assign(cloudlets, vms, noQueue));
+            if (counts[0] != 4 || counts[3] != 4 || counts[4] != 1 || counts[5] != 1) {
+                throw new Exception("MIPS-weighted shares should be 4:1, got " + Arrays.toString(counts));
+            }
+            
+            // ECT skips VMs whose queued work would make the cloudlet finish late
+            Map<Integer, Double> queued = new HashMap<>();
+            queued.put(0, 1000000.0);
+            counts = countPerVm(CloudletSchedulingPolicy.parse("ect").assign(cloudlets, vms, queued));
+            if (counts[0] != 0 || counts[1] + counts[2] + counts[3] + counts[4] + counts[5] != 18) {
+                throw new Exception("ECT should avoid the loaded VM, got " + Arrays.toString(counts));
+            }
+            
+            // With no capacity anywhere, ECT still binds every cloudlet, spread by queued work
+            List<Vm> stalled = new ArrayList<>();
+            for (int id = 0; id < 2; id++) {
+                stalled.add(new Vm(id, 0, 0.0, 1, 512, 100, 1000, "Xen", new CloudletSchedulerTimeShared()));
+            }
+            plan = CloudletSchedulingPolicy.parse("ect").assign(cloudlets, stalled, noQueue);
+            counts = countPerVm(plan);
+            if (plan.size() != 18 || counts[0] != 9 || counts[1] != 9) {
+                throw new Exception("ECT should spread cloudlets over VMs without capacity, got " + plan);
+            }
+            
+            System.out.println("SchedulingPolicies test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    private static int[] countPerVm(Map<Integer, Integer> plan) {
+        int[] counts = new int[6];
+        for (int vmId : plan.values()) {
+            counts[vmId]++;
+        }
+        return counts;
+    }
+    
+    public void testInFlightIndex() {
+        try {
+            List<Cloudlet> cloudlets = CloudletManager.createCloudlets(6, 0);
+            InFlightIndex index = new InFlightIndex();
+            for (Cloudlet cloudlet : cloudlets) {
+                cloudlet.setVmId(cloudlet.getCloudletId() % 3);
+                index.add(cloudlet, cloudlet.getVmId() < 2 ? 3 : 4);
+            }
+            
+            // VMs 0 and 1 are in datacenter 3, VM 2 in datacenter 4
+            if (index.inDatacenter(3).size() != 4 || index.inDatacenter(4).size() != 2) {
+                throw new Exception("Cloudlets should be indexed by datacenter");
+            }
+            if (index.inVm(1).size() != 2) {
+                throw new Exception("VM 1 should have 2 cloudlets in flight");
+            }
+            
+            // A returned cloudlet leaves both indexes
+            index.remove(0);
+            if (index.contains(0) || index.inVm(0).size() != 1 || index.inDatacenter(3).size() != 3) {
+                throw new Exception("Removed cloudlet should leave the index");
+            }
+            
+            // Re-adding under a new VM moves it
+            Cloudlet moved = cloudlets.get(1);
+            moved.setVmId(2);
+            index.add(moved, 4);
+            if (index.inVm(1).size() != 1 || index.inDatacenter(4).size() != 3 || index.size() != 5) {
+                throw new Exception("Rerouted cloudlet should move to its new VM and datacenter");
+            }
+            
+            System.out.println("InFlightIndex test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    public void testFailoverReroute() {
+        try {
+            // A certain failure at 10 seconds, while every cloudlet is still running
+            FailoverManager manager = new FailoverManager(1.0);
+            List<Cloudlet> received = DisasterRecoverySimulation.runSimulation(manager, null, new RoundRobinSchedulingPolicy());
+            
+            if (received.size() != 20) {
+                throw new Exception("All 20 cloudlets should come back once, but got " + received.size());
+            }
+            int restarted = 0;
+            for (Cloudlet cloudlet : received) {
+                if (cloudlet.getStatus() != Cloudlet.SUCCESS) {
+                    throw new Exception("Cloudlet " + cloudlet.getCloudletId() + " ended as " + cloudlet.getCloudletStatusString());
+                }
+                // Everything finishes on the backup VMs (IDs 4 and 5)
+                if (cloudlet.getVmId() < 4) {
+                    throw new Exception("Cloudlet " + cloudlet.getCloudletId() + " finished on primary VM " + cloudlet.getVmId());
+                }
+                if (cloudlet.getExecStartTime() >= manager.getFailureTime()) {
+                    restarted++;
+                }
+            }
+            // Round-robin put 14 of the 20 cloudlets on the 4 primary VMs; they restart after the failure
+            if (restarted != 14) {
+                throw new Exception("14 cloudlets should have restarted on the backup VMs, but " + restarted + " did");
+            }
+            
+            System.out.println("FailoverReroute test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    public void testEventStreamWriter() {
+        try {
+            File file = File.createTempFile("events", ".bin");
+            file.deleteOnExit();
+            
+            EventStreamWriter writer = new EventStreamWriter(file.getPath());
+            writer.cloudletSubmitted(0.1, 0, 0);
+            writer.disaster(20.0, 0);
+            writer.cloudletReceived(20.0995, 0, 0);
+            writer.close();
+            
+            // 16-byte header followed by one fixed-size record per event
+            long expected = 16 + 3L * EventStreamWriter.RECORD_SIZE;
+            if (file.length() != expected) {
+                throw new Exception("Event stream should be " + expected + " bytes, but got " + file.length());
+            }
+            
+            System.out.println("EventStreamWriter test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    public void testSimulationSnapshot() {
+        try {
+            File file = File.createTempFile("snapshot", ".bin");
+            file.deleteOnExit();
+            
+            // A certain failure happens at the first check, 10 seconds in
+            DisasterRecoverySimulation.runSimulation(new FailoverManager(1.0), null,
+                                                     new RoundRobinSchedulingPolicy(), file.getPath());
+            
+            // 36-byte header, 20 bytes per VM and 41 per cloudlet
+            long expected = 36 + 6 * 20 + 20 * 41;
+            if (file.length() != expected) {
+                throw new Exception("Snapshot should be " + expected + " bytes, but got " + file.length());
+            }
+            try (DataInputStream in = new DataInputStream(new FileInputStream(file))) {
+                in.skipBytes(12);
+                double clock = in.readDouble();
+                if (Math.abs(clock - 10.0) > 0.001) {
+                    throw new Exception("Snapshot should be taken at the failure, 10.0, but was at " + clock);
+                }
+            }
+            
+            System.out.println("SimulationSnapshot test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
+    public void testSchedulerProgress() {
+        try {
+            CloudSim.init(1, Calendar.getInstance(), false);
+            ProgressCloudletScheduler scheduler = new ProgressCloudletScheduler();
+            List<Double> mipsShare = Arrays.asList(1000.0, 1000.0);
+            scheduler.updateVmProcessing(0.0, mipsShare);
+            for (Cloudlet cloudlet : CloudletManager.createCloudlets(2, 0)) {
+                scheduler.cloudletSubmit(cloudlet);
+            }
+            
+            // One cloudlet per 1000 MIPS PE: 4000 of the 10000 MI are done after 4 seconds
+            Map<Integer, Double> remaining = scheduler.remainingLengths(4.0);
+            if (Math.abs(remaining.get(0) - 6000.0) > 1.0 || Math.abs(remaining.get(1) - 6000.0) > 1.0) {
+                throw new Exception("Each cloudlet should have 6000 MI left, got " + remaining);
+            }
+            
+            // Reading the progress must not advance the scheduler
+            if (scheduler.getPreviousTime() != 0.0 || !scheduler.remainingLengths(4.0).equals(remaining)) {
+                throw new Exception("remainingLengths should leave the scheduler where it was");
+            }
+            
+            // The datacenter's own update at that time agrees
+            scheduler.updateVmProcessing(4.0, mipsShare);
+            if (Math.abs(scheduler.remainingLengths(4.0).get(0) - 6000.0) > 1.0) {
+                throw new Exception("Progress should match updateVmProcessing, got " + scheduler.remainingLengths(4.0));
+            }
+            
+            System.out.println("SchedulerProgress test passed");
+        } catch (Exception e) {
+            System.err.println("Test failed: " + e.getMessage());
+        }
+    }
+    
     // Main method to run all tests
     public static void main(String[] args) {
         DisasterRecoveryTest test = new DisasterRecoveryTest();
         test.testDatacenterCreation();
         test.testVmCreation();
         test.testFailoverLogic();
+        test.testSeededFailover();
+        test.testFailureModels();
+        test.testFailureRepairCycle();
+        test.testSchedulingPolicies();
+        test.testInFlightIndex();
+        test.testFailoverReroute();
+        test.testEventStreamWriter();
+        test.testSimulationSnapshot();
+        test.testSchedulerProgress();
     }
 }
\ No newline at end of file
@@ -0,0 +1,44 @@
+package test.java.org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudbus.cloudsim.Log;
+import org.cloudsim.disaster.DisasterRecoverySimulation;
+import org.cloudsim.disaster.EventStreamWriter;
+import org.cloudsim.disaster.FailoverManager;
+import org.cloudsim.disaster.RoundRobinSchedulingPolicy;
+
+import java.util.List;
+
+/**
+ * Runs a simulation whose primary datacenter fails at the first check,
+ * writing its event stream to FILE, and prints what the stream should hold.
+ * tests/test_java_parity.py reads FILE back with scripts/event_stream.py and
+ * compares it with these lines, so the record layout is checked against a
+ * real JVM rather than on paper.
+ *
+ * Usage: EventStreamSample FILE
+ * Prints "disaster TIME" and one "cloudlet ID STATUS VM DATACENTER EXEC
+ * START FINISH WAIT" line per returned cloudlet, at full precision.
+ */
+public class EventStreamSample {
+
+    public static void main(String[] args) throws Exception {
+        Log.disable();
+        FailoverManager manager = new FailoverManager(1.0);
+        EventStreamWriter writer = new EventStreamWriter(args[0]);
+        manager.setEventStream(writer);
+        List<Cloudlet> received = DisasterRecoverySimulation.runSimulation(manager, writer,
+                                                                           new RoundRobinSchedulingPolicy());
+        for (Cloudlet cloudlet : received) {
+            writer.cloudletRecord(cloudlet);
+        }
+        writer.close();
+
+        System.out.println("disaster " + manager.getFailureTime());
+        for (Cloudlet cloudlet : received) {
+            System.out.println("cloudlet " + cloudlet.getCloudletId() + " " + cloudlet.getStatus() + " "
+                    + cloudlet.getVmId() + " " + cloudlet.getResourceId() + " " + cloudlet.getActualCPUTime() + " "
+                    + cloudlet.getExecStartTime() + " " + cloudlet.getFinishTime() + " " + cloudlet.getWaitingTime());
+        }
+    }
+}
@@ -0,0 +1,88 @@
+package test.java.org.cloudsim.disaster;
+
+import org.cloudbus.cloudsim.Cloudlet;
+import org.cloudsim.disaster.CloudletManager;
+import org.cloudsim.disaster.InFlightIndex;
+
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Set;
+
+/**
+ * Times the broker-side work of a failover against queue depth: finding the
+ * cloudlets in flight in the primary datacenter and moving them to backup
+ * VMs in the InFlightIndex, versus scanning the submitted list against the
+ * received list. Half of the submitted cloudlets have already returned.
+ *
+ * Usage: FailoverLatencyBenchmark [depth ...]  (default 1000 10000 100000)
+ */
+public class FailoverLatencyBenchmark {
+
+    private static final int PRIMARY_DC = 3;
+    private static final int BACKUP_DC = 4;
+    private static final int VMS = 6;
+    private static final int PRIMARY_VMS = 4;
+    private static final int REPEATS = 5;
+
+    public static void main(String[] args) {
+        int[] depths = args.length > 0 ? new int[args.length] : new int[] {1000, 10000, 100000};
+        for (int i = 0; i < args.length; i++) {
+            depths[i] = Integer.parseInt(args[i]);
+        }
+
+        System.out.printf("%12s %12s %10s %12s %12s%n", "in flight", "submitted", "rerouted", "indexed", "list scan");
+        for (int depth : depths) {
+            benchmark(depth);
+        }
+    }
+
+    private static void benchmark(int depth) {
+        int total = depth * 2;
+        List<Cloudlet> submitted = CloudletManager.createCloudlets(total, 0);
+        Set<Integer> received = new HashSet<>();
+        for (Cloudlet cloudlet : submitted) {
+            cloudlet.setVmId(cloudlet.getCloudletId() % VMS);
+            if (cloudlet.getCloudletId() < total - depth) {
+                received.add(cloudlet.getCloudletId());
+            }
+        }
+
+        long bestIndexed = Long.MAX_VALUE;
+        long bestScan = Long.MAX_VALUE;
+        int rerouted = 0;
+        for (int repeat = 0; repeat < REPEATS; repeat++) {
+            InFlightIndex index = new InFlightIndex();
+            for (Cloudlet cloudlet : submitted) {
+                cloudlet.setVmId(cloudlet.getCloudletId() % VMS);
+                if (!received.contains(cloudlet.getCloudletId())) {
+                    index.add(cloudlet, cloudlet.getVmId() < PRIMARY_VMS ? PRIMARY_DC : BACKUP_DC);
+                }
+            }
+
+            // Without an index: walk every submitted cloudlet and skip the ones already received
+            long started = System.nanoTime();
+            List<Cloudlet> scanned = new ArrayList<>();
+            for (Cloudlet cloudlet : submitted) {
+                if (!received.contains(cloudlet.getCloudletId()) && cloudlet.getVmId() < PRIMARY_VMS) {
+                    scanned.add(cloudlet);
+                }
+            }
+            bestScan = Math.min(bestScan, System.nanoTime() - started);
+
+            started = System.nanoTime();
+            Collection<Cloudlet> affected = new ArrayList<>(index.inDatacenter(PRIMARY_DC));
+            int next = 0;
+            for (Cloudlet cloudlet : affected) {
+                cloudlet.setVmId(PRIMARY_VMS + next++ % (VMS - PRIMARY_VMS));
+                index.add(cloudlet, BACKUP_DC);
+            }
+            bestIndexed = Math.min(bestIndexed, System.nanoTime() - started);
+            rerouted = affected.size();
+        }
+
+        System.out.printf("%12d %12d %10d %10.2fms %10.2fms%n", depth, total, rerouted,
+                          bestIndexed / 1e6, bestScan / 1e6);
+    }
+}
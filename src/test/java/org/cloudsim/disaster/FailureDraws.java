@@ -0,0 +1,35 @@
+package test.java.org.cloudsim.disaster;
+
+import org.cloudsim.disaster.FailoverManager;
+import org.cloudsim.disaster.FailureModel;
+
+/**
+ * Prints the primary datacenter's failure and repair times for a failure
+ * model spec and seed, drawn in the order the listener draws them: a
+ * failure, its repair, the next failure from the repair, and so on.
+ * tests/test_java_parity.py checks that scripts/failure_models.py draws the
+ * same times from its JavaRandom.
+ *
+ * Usage: FailureDraws SPEC SEED [FAILURES]  (default 20 failures)
+ * Prints one "failure repair" pair per line; Infinity stands for never.
+ */
+public class FailureDraws {
+
+    public static void main(String[] args) {
+        FailureModel model = FailureModel.parse(args[0], 0.5);
+        FailoverManager manager = new FailoverManager(model, Long.parseLong(args[1]));
+        int failures = args.length > 2 ? Integer.parseInt(args[2]) : 20;
+
+        double time = 0.0;
+        for (int i = 0; i < failures; i++) {
+            double failure = manager.sampleFailure(FailoverManager.PRIMARY_DATACENTER, time);
+            double repair = failure == FailureModel.NEVER
+                    ? FailureModel.NEVER : manager.sampleRepair(FailoverManager.PRIMARY_DATACENTER, failure);
+            System.out.println(failure + " " + repair);
+            if (repair == FailureModel.NEVER) {
+                break;
+            }
+            time = failure + repair;
+        }
+    }
+}
@@ -0,0 +1,66 @@
+"""Failover attribution in attribution.py."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from attribution import EventLog, FailoverIndex, disaster_intervals, match_disaster, match_event  # noqa: E402
+
+def test_overlapping_domain_outages_end_with_the_last_recovery():
+    lines = ["DISASTER! Primary datacenter failure at time: 10.0",
+             "DISASTER! Datacenter BackupDC failure at time: 15.0",
+             "RECOVERY! Datacenter BackupDC restored at time: 20.0",
+             "RECOVERY! Primary datacenter restored at time: 40.0",
+             "DISASTER! Datacenter BackupDC failure at time: 50.0"]
+    transitions = [match_disaster(line) for line in lines]
+    assert transitions[1] == ('start', 15.0, 'BackupDC')
+    starts, ends = disaster_intervals(transitions)
+    assert starts.tolist() == [10.0, 50.0]
+    assert ends.tolist() == [40.0, float('inf')]
+
+def test_recovery_of_a_domain_that_is_up_is_ignored():
+    starts, ends = disaster_intervals([('end', 5.0, 'BackupDC'), ('start', 10.0, 'PrimaryDC'),
+                                       ('start', 20.0, 'PrimaryDC'), ('end', 30.0, 'PrimaryDC')])
+    assert starts.tolist() == [10.0]
+    assert ends.tolist() == [30.0]
+
+def failover_index(lines):
+    events, transitions = EventLog(), []
+    for line in lines:
+        transition = match_disaster(line)
+        if transition is not None:
+            transitions.append(transition)
+        elif match_event(line) is not None:
+            events.add(*match_event(line))
+    return FailoverIndex(events, transitions)
+
+def test_classify_moved_cloudlets_and_disaster_overlap():
+    index = failover_index([
+        "0.1: Broker: Sending cloudlet 0 to VM #0",
+        "DISASTER! Primary datacenter failure at time: 20.0",
+        "20.0: Broker: Cloudlet 1 rerouted from VM #1 to VM #4",
+        "20.0: Broker: Cloudlet 2 migrated from VM #2 to VM #5",
+        "RECOVERY! Primary datacenter restored at time: 30.0",
+        "DISASTER! Primary datacenter failure at time: 50.0",
+        "RECOVERY! Primary datacenter restored at time: 60.0",
+        "15.1: Broker: Cloudlet 0 received",
+    ])
+    assert index.events_for(1) == [('reroute', 20.0)]
+    assert index.events_for(2) == [('migration', 20.0)]
+    # (start, finish) per cloudlet 0-7
+    windows = [(0.1, 15.1),   # finished before the first disaster
+               (0.1, 80.0),   # rerouted, and also overlapping
+               (40.0, 45.0),  # migrated, though it ran between the disasters
+               (10.0, 25.0),  # running when the first disaster began
+               (32.0, 48.0),  # between the disasters
+               (55.0, 70.0),  # started during the second disaster
+               (60.0, 70.0),  # started as the second was repaired
+               (30.0, 30.0)]  # at the first repair
+    ids = list(range(len(windows)))
+    affected = index.classify(ids, [w[0] for w in windows], [w[1] for w in windows])
+    assert affected.tolist() == [False, True, True, True, False, True, False, False]
+
+def test_classify_without_disasters_counts_only_moved_cloudlets():
+    index = failover_index(["5.0: Broker: Cloudlet 3 rerouted from VM #0 to VM #4"])
+    assert index.first_disaster_time is None
+    assert index.classify([2, 3], [0.1, 0.1], [90.0, 90.0]).tolist() == [False, True]
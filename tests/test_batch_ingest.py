@@ -0,0 +1,28 @@
+"""Batch ingestion into one combined dataset with batch_ingest.py."""
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from batch_ingest import METRICS_FILE, RUN_COLUMNS, RUNS_FILE, ingest_batch  # noqa: E402
+
+def test_interrupted_ingest_does_not_duplicate_metrics(tmp_path):
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    shutil.copy(ROOT / 'results' / 'simulation_log.txt', logs / 'run.txt')
+    output = tmp_path / 'batch'
+    assert ingest_batch(str(logs), output) == 1
+    rows = len(pd.read_csv(output / METRICS_FILE))
+
+    # As if the batch stopped after appending the metrics but before recording the run
+    pd.DataFrame(columns=RUN_COLUMNS).to_csv(output / RUNS_FILE, index=False)
+    assert ingest_batch(str(logs), output) == 1
+
+    metrics = pd.read_csv(output / METRICS_FILE, dtype={'RunID': str})
+    runs = pd.read_csv(output / RUNS_FILE, dtype={'RunID': str})
+    assert len(metrics) == rows
+    assert metrics['RunID'].unique().tolist() == runs['RunID'].tolist()
@@ -0,0 +1,32 @@
+"""The benchmarks in benchmarks/: memory budgets of metric extraction, and module names that must not shadow scripts/."""
+import subprocess
+import sys
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent.parent / 'benchmarks'
+sys.path.insert(0, str(BENCH_DIR))
+
+from run_benchmarks import MEMORY_BUDGET_MIN_ROWS, check_memory_budget, traced_extraction_mb_per_million  # noqa: E402
+from synthetic_log import write_synthetic_log  # noqa: E402
+
+# Typed columns need about 100 MB per million rows at any size, so this leaves over 50% headroom
+TRACED_BUDGET_MB = 160.0
+
+def record(size, growth_mb):
+    return {'size': size, 'stages': {'metrics.extract': {'rss_growth_mb': growth_mb}}}
+
+def test_rss_budget_applies_only_to_large_runs():
+    report = {'results': [record(100000, 20.0), record(MEMORY_BUDGET_MIN_ROWS, 250.0),
+                          record(2 * MEMORY_BUDGET_MIN_ROWS, 300.0)]}
+    # 100k rows at 20 MB is 200 MB per million, but RSS at that size is mostly fixed costs
+    assert check_memory_budget(report, 200.0) == [(MEMORY_BUDGET_MIN_ROWS, 250.0)]
+
+def test_extraction_stays_within_traced_budget(tmp_path):
+    log_path = write_synthetic_log(tmp_path / 'simulation_log.txt', 100000)
+    assert traced_extraction_mb_per_million(log_path) <= TRACED_BUDGET_MB
+
+def test_scripts_import_with_benchmarks_first_on_the_path():
+    # No benchmark may shadow a module of scripts/, whichever directory comes first
+    code = ("import sys; sys.path[:0] = [sys.argv[1], sys.argv[2]]; "
+            "import generate_metrics, run_history; assert 'scripts' in run_history.__file__")
+    subprocess.run([sys.executable, '-c', code, str(BENCH_DIR), str(BENCH_DIR.parent / 'scripts')], check=True)
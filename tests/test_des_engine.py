@@ -0,0 +1,20 @@
+"""The in-process engine in des_engine.py must reproduce the Java simulation."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from des_engine import validate  # noqa: E402
+
+LOG_PATH = ROOT / 'results' / 'simulation_log.txt'
+
+def test_engine_matches_the_java_simulation_log():
+    assert validate(LOG_PATH) == []
+
+def test_validation_reports_a_drifted_log(tmp_path):
+    # As if the Java model had changed how long cloudlet 2 runs
+    log_path = tmp_path / 'simulation_log.txt'
+    log_path.write_text(LOG_PATH.read_text(encoding='utf-8').replace(
+        "\t2\tSuccess\t3\t2\t15\t0.1\t15.1", "\t2\tSuccess\t3\t2\t16\t0.1\t16.1"), encoding='utf-8')
+    assert validate(log_path) == ["ExecutionTime differs by up to 1.0000", "FinishTime differs by up to 1.0000"]
@@ -0,0 +1,86 @@
+"""The Python side must agree with the Java simulation it mirrors.
+
+These tests run test classes from src/test/java, so they need a JDK and the
+compiled classes. CI points JAVA_CLASSPATH at them; without it, the tests
+look in build/ and are skipped if the classes are not there.
+"""
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'scripts'))
+
+from des_engine import JavaRandom  # noqa: E402
+from event_stream import CLOUDLET_STATUS_NAMES, KIND_CODES, read_records, scan_events  # noqa: E402
+from failure_models import NEVER, parse_failure_model  # noqa: E402
+
+TEST_PACKAGE = 'test.java.org.cloudsim.disaster'
+DEFAULT_CLASSPATH = os.pathsep.join(['build/test-classes', 'build/classes', 'lib/*'])
+
+def run_java(main_class, *args):
+    """Run a test class's main from the repository root and return its stdout"""
+    classpath = os.environ.get('JAVA_CLASSPATH')
+    if classpath is None:
+        classpath = DEFAULT_CLASSPATH
+        if not (ROOT / 'build' / 'test-classes' / Path(*TEST_PACKAGE.split('.')) / f'{main_class}.class').exists():
+            pytest.skip("Java test classes are not built; set JAVA_CLASSPATH to run against them")
+    if shutil.which('java') is None:
+        pytest.skip("java is not installed")
+    result = subprocess.run(['java', '-cp', classpath, f'{TEST_PACKAGE}.{main_class}', *map(str, args)],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout
+
+def python_draws(spec, seed, failures):
+    """FailureDraws, with failure_models.py and JavaRandom"""
+    model = parse_failure_model(spec, 0.5)
+    random = JavaRandom(seed)
+    draws = []
+    time = 0.0
+    for _ in range(failures):
+        failure = model.next_failure(time, random)
+        repair = NEVER if failure == NEVER else model.repair_duration(failure, random)
+        draws.append((failure, repair))
+        if repair == NEVER:
+            break
+        time = failure + repair
+    return draws
+
+@pytest.mark.parametrize('spec', ['bernoulli:0.3', 'exponential:300:60', 'weibull:1.5:400:30'])
+@pytest.mark.parametrize('seed', [42, -7, 1700000000000])
+def test_failure_draws_match_java(spec, seed):
+    java = [float(value) for value in run_java('FailureDraws', spec, seed, 20).split()]
+    python = [value for draw in python_draws(spec, seed, 20) for value in draw]
+    # Java's Math.log and Math.pow may differ from the C library in the last bit
+    assert java == pytest.approx(python, rel=1e-12)
+
+def test_event_stream_round_trip(tmp_path):
+    path = tmp_path / 'events.bin'
+    lines = [line.split() for line in run_java('EventStreamSample', path).splitlines()]
+    disaster = [float(fields[1]) for fields in lines if fields[0] == 'disaster']
+    cloudlets = [fields[1:] for fields in lines if fields[0] == 'cloudlet']
+
+    scan = scan_events(path)
+    assert scan.disaster_transitions == [('start', disaster[0], 0)]
+    columns = scan.columns
+    assert columns['CloudletID'].tolist() == [int(fields[0]) for fields in cloudlets]
+    assert columns['Status'].astype(str).tolist() == [CLOUDLET_STATUS_NAMES[int(fields[1])] for fields in cloudlets]
+    assert columns['VMId'].tolist() == [int(fields[2]) for fields in cloudlets]
+    assert columns['DatacenterID'].tolist() == [int(fields[3]) for fields in cloudlets]
+    # Doubles are written and printed at full precision, so they match exactly
+    for i, name in enumerate(['ExecutionTime', 'StartTime', 'FinishTime', 'WaitTime'], start=4):
+        assert columns[name].tolist() == [float(fields[i]) for fields in cloudlets]
+
+    # Every cloudlet is submitted and received; reroutes go from a primary VM (aux) to a backup one
+    records = read_records(path)
+    kinds = records['kind']
+    assert (kinds == KIND_CODES['submit']).sum() >= len(cloudlets)
+    assert (kinds == KIND_CODES['receipt']).sum() == len(cloudlets)
+    reroutes = records[kinds == KIND_CODES['reroute']]
+    assert len(reroutes) > 0
+    assert (reroutes['aux'] < 4).all() and (reroutes['vm'] >= 4).all()
+    assert (reroutes['time'] >= disaster[0]).all()
@@ -0,0 +1,54 @@
+"""The parallel parser must read a log exactly as the serial LogScanner does."""
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import parallel_parse  # noqa: E402
+from generate_metrics import DETAILS_HEADER, parse_log  # noqa: E402
+
+ROW = "\t{id}\tSuccess\t3\t{vm}\t15\t0.1\t15.1"
+
+def write_log(path, section_lines):
+    lines = ["Starting CloudSim version 3.0", "   ", "0.1: Broker_0: Sending cloudlet 0 to VM #0", "\t",
+             DETAILS_HEADER, "\tID\tSTATUS\tDC\tVM\tTime\tStart Time\tFinish Time",
+             *section_lines, "", "Simulation completed.", "  \t  "]
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+def assert_parallel_matches_serial(log_path):
+    serial, _ = parse_log(log_path, workers=1)
+    parallel, _ = parse_log(log_path, workers=2)
+    pd.testing.assert_frame_equal(parallel.reset_index(drop=True), serial.reset_index(drop=True))
+    return serial
+
+def test_whitespace_only_lines_outside_details(tmp_path):
+    log_path = tmp_path / 'simulation_log.txt'
+    write_log(log_path, [ROW.format(id=i, vm=i % 6) for i in range(50)])
+    assert len(assert_parallel_matches_serial(log_path)) == 50
+
+def test_whitespace_only_line_ends_details(tmp_path):
+    log_path = tmp_path / 'simulation_log.txt'
+    rows = [ROW.format(id=i, vm=i % 6) for i in range(50)]
+    write_log(log_path, rows[:20] + ["    "] + rows[20:])
+    assert len(assert_parallel_matches_serial(log_path)) == 20
+
+parse_chunk = parallel_parse.parse_chunk
+
+def failing_parse_chunk(log_file_path, start, end):
+    if start > 0:
+        raise RuntimeError("chunk failed")
+    return parse_chunk(log_file_path, start, end)
+
+@pytest.mark.skipif(not Path('/dev/shm').is_dir(), reason="needs /dev/shm to list shared memory blocks")
+def test_failed_chunk_leaves_no_shared_memory(tmp_path, monkeypatch):
+    log_path = tmp_path / 'simulation_log.txt'
+    write_log(log_path, [ROW.format(id=i, vm=i % 6) for i in range(500)])
+    before = set(Path('/dev/shm').iterdir())
+    # Pool workers are forked, so they see the patched function too
+    monkeypatch.setattr(parallel_parse, 'parse_chunk', failing_parse_chunk)
+    with pytest.raises(RuntimeError, match="chunk failed"):
+        parallel_parse.scan_log_parallel(log_path, 2)
+    assert set(Path('/dev/shm').iterdir()) - before == set()
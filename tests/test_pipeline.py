@@ -0,0 +1,39 @@
+"""Stage skipping in pipeline.py."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from pipeline import PipelineState, Scenario, run_stage  # noqa: E402
+
+def test_stage_reruns_when_an_output_or_required_file_is_deleted(tmp_path):
+    state = PipelineState(tmp_path / 'state.json')
+    output, store = tmp_path / 'metrics.csv', tmp_path / 'history.sqlite'
+    runs = []
+
+    def action():
+        runs.append(1)
+        output.write_text('CloudletID\n0\n', encoding='utf-8')
+        store.write_bytes(b'store')
+
+    def stage():
+        run_stage(state, 'metrics:default', ['inputs'], action, lambda: [output], present=[store])
+
+    stage()
+    stage()
+    assert len(runs) == 1
+    # Another stage changing the shared store does not make this one stale
+    store.write_bytes(b'store with another run')
+    stage()
+    assert len(runs) == 1
+    store.unlink()
+    stage()
+    assert len(runs) == 2
+    output.unlink()
+    stage()
+    assert len(runs) == 3
+
+def test_only_seeded_scenarios_are_reused():
+    assert Scenario.parse('storm=--seed 7 --failure-probability 0.9').seeded
+    assert not Scenario.parse('storm=--failure-probability 0.9').seeded
+    assert not Scenario.parse('default').seeded
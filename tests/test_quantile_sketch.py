@@ -0,0 +1,16 @@
+"""T-digests in quantile_sketch.py."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from quantile_sketch import TDigest  # noqa: E402
+
+def test_compress_moves_buffered_values_into_centroids():
+    digest = TDigest().update(np.arange(1000.0))
+    assert len(digest.centroids) == 0
+    digest.compress()
+    assert digest.centroids['weight'].sum() == 1000.0
+    assert len(digest.centroids) <= 2 * digest.compression
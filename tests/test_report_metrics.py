@@ -0,0 +1,28 @@
+"""Reading the report's metrics with report/metrics.py."""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from report.metrics import load_metrics  # noqa: E402
+
+HEADER = 'CloudletID,Status,DatacenterID,VMId,ExecutionTime,StartTime,FinishTime,WaitTime,AffectedByFailover\n'
+
+def test_empty_cells_are_missing_values(tmp_path):
+    path = tmp_path / 'metrics.csv'
+    path.write_text(HEADER + '0,SUCCESS,2,,15.0,0.1,15.1,,No\n'
+                             '1,SUCCESS,3,4,60.0,20.1,80.1,0.0,Yes\n', encoding='utf-8')
+    df = load_metrics(path)
+    assert len(df) == 2
+    assert df['VMId'].tolist() == [-1, 4]
+    assert np.isnan(df['WaitTime'][0]) and df['WaitTime'][1] == 0.0
+    assert df['AffectedByFailover'].tolist() == [False, True]
+
+def test_unparseable_metrics_are_not_replaced_by_sample_data(tmp_path):
+    path = tmp_path / 'metrics.csv'
+    path.write_text(HEADER + '0,SUCCESS,2,0,fast,0.1,15.1,0.0,No\n', encoding='utf-8')
+    with pytest.raises(ValueError, match='ExecutionTime'):
+        load_metrics(path)
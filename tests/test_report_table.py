@@ -0,0 +1,17 @@
+"""Cloudlet table pages written by report/table.py."""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from report.table import page_body  # noqa: E402
+
+def test_missing_values_are_written_as_null():
+    values = [np.array([0, 1, 2]), np.array([1.5, np.nan, np.inf]), np.array([True, False, True])]
+    body = page_body(values, 0, 2)
+    assert 'NaN' not in body
+    assert json.loads(body) == {'page': 0, 'columns': [[0, 1], [1.5, None], [True, False]]}
+    assert json.loads(page_body(values, 1, 2))['columns'] == [[2], [None], [True]]
@@ -0,0 +1,17 @@
+"""Scheduling policies in scheduling.py, which mirror the Java ones."""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from scheduling import assign  # noqa: E402
+
+def test_ect_without_capacity_spreads_by_queued_work():
+    picks = assign('ect', np.full(18, 10000.0), [0.0, 0.0], [1, 1])
+    assert np.bincount(picks, minlength=2).tolist() == [9, 9]
+
+def test_ect_prefers_the_vm_with_capacity():
+    picks = assign('ect', np.full(6, 10000.0), [0.0, 500.0], [1, 1])
+    assert picks.tolist() == [1] * 6